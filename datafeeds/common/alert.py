@@ -1,4 +1,22 @@
+"""Send alerts about scraper runs to Slack
+
+post_slack_message posts a message right away. Alerts that a run may raise many times (eg
+for each meter in a batch) are queued with queue_alert instead: a background thread collects
+them, combines repeats of the same kind of alert for the same meter, and sends one digest
+message per channel when the run ends (flush_alerts), after config.ALERT_WINDOW seconds, or
+when the process exits.
+
+Alerts are posted to Slack, or with config.ALERT_SINK, appended to a file as JSON lines.
+"""
+import atexit
+from collections import OrderedDict
+import json
 import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import slack
 from sqlalchemy.orm import joinedload
@@ -31,6 +49,167 @@ def post_slack_message(message, channel, icon_emoji=None, username=None):
         log.error("Failed to post message to Slack: %s", e)
 
 
+class Alert(NamedTuple):
+    kind: str
+    message: str
+    meter: Optional[int] = None
+    channel: str = "#scrapers"
+    icon_emoji: Optional[str] = ":exclamation:"
+    username: Optional[str] = "Scraper monitor"
+
+
+class SlackSink:
+    def post(self, channel, message, icon_emoji=None, username=None):
+        post_slack_message(message, channel, icon_emoji, username=username)
+
+
+class FileSink:
+    """Append messages to a file as JSON lines, instead of posting them."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def post(self, channel, message, icon_emoji=None, username=None):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "channel": channel,
+                        "message": message,
+                        "icon_emoji": icon_emoji,
+                        "username": username,
+                    }
+                )
+                + "\n"
+            )
+
+
+class AlertDispatcher:
+    """Queue alerts, and send them from a background thread as one digest per channel."""
+
+    def __init__(self, sink, window: float):
+        self.sink = sink
+        self.window = window
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        # (channel, kind, meter) -> the first alert, and the count of each message
+        self._pending: Dict[
+            Tuple[str, str, Optional[int]], Tuple[Alert, Dict[str, int]]
+        ] = OrderedDict()
+        self._oldest: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="alerts", daemon=True)
+        self._thread.start()
+
+    def send(self, alert: Alert):
+        self._queue.put(alert)
+
+    def flush(self, timeout: float = 30) -> bool:
+        """Send the queued alerts; return False if they weren't sent within timeout seconds."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 30):
+        """Send the queued alerts, and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._oldest is not None:
+                timeout = max(0.0, self._oldest + self.window - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._send()
+                continue
+            if isinstance(item, Alert):
+                self._add(item)
+                continue
+            self._send()
+            if item is None:
+                return
+            item.set()
+
+    def _add(self, alert: Alert):
+        _, messages = self._pending.setdefault(
+            (alert.channel, alert.kind, alert.meter), (alert, OrderedDict())
+        )
+        messages[alert.message] = messages.get(alert.message, 0) + 1
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+
+    def _send(self):
+        channels: Dict[str, List[Tuple[Alert, Dict[str, int]]]] = OrderedDict()
+        for (channel, _, _), pending in self._pending.items():
+            channels.setdefault(channel, []).append(pending)
+        self._pending.clear()
+        self._oldest = None
+        for channel, alerts in channels.items():
+            try:
+                self.sink.post(channel, digest(alerts), *_sender(alerts))
+            except Exception:
+                log.exception("Failed to send alerts to %s", channel)
+
+
+def _sender(alerts: List[Tuple[Alert, Dict[str, int]]]) -> Tuple[str, str]:
+    first, _ = alerts[0]
+    return first.icon_emoji, first.username
+
+
+def digest(alerts: List[Tuple[Alert, Dict[str, int]]]) -> str:
+    """One message for alerts: each kind of alert for each meter, with repeats counted."""
+    total = sum(sum(messages.values()) for _, messages in alerts)
+    if total == 1:
+        return next(iter(alerts[0][1]))
+    lines = ["%s alerts:" % total]
+    for alert, messages in alerts:
+        count = sum(messages.values())
+        line = "- %s" % next(iter(messages))
+        if len(messages) > 1:
+            line += " (and %s similar)" % (len(messages) - 1)
+        if count > 1:
+            line += " (x%s)" % count
+        lines.append(line)
+    return "\n".join(lines)
+
+
+_dispatcher: Optional[AlertDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def dispatcher() -> AlertDispatcher:
+    """The process's dispatcher; started on first use, and flushed when the process exits."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            sink = FileSink(config.ALERT_SINK) if config.ALERT_SINK else SlackSink()
+            _dispatcher = AlertDispatcher(sink, config.ALERT_WINDOW)
+            atexit.register(_dispatcher.close)
+        return _dispatcher
+
+
+def queue_alert(
+    kind: str,
+    message: str,
+    meter: Optional[int] = None,
+    channel: str = "#scrapers",
+    icon_emoji: Optional[str] = ":exclamation:",
+    username: Optional[str] = "Scraper monitor",
+):
+    """Queue an alert, to be sent with the others like it; see AlertDispatcher."""
+    log.info("alert %s: %s", kind, message)
+    dispatcher().send(Alert(kind, message, meter, channel, icon_emoji, username))
+
+
+def flush_alerts():
+    """Send the queued alerts (eg at the end of a run)."""
+    if _dispatcher is not None and not _dispatcher.flush():
+        log.warning("Timed out sending alerts")
+
+
 def disable_logins(acct_ds: SnapmeterAccountDataSource):
     """Send a Slack message listing meters that were disabled."""
     # get meter names and accounts for alert
@@ -0,0 +1,161 @@
+"""Archive the working directory of a scraper run to S3
+
+The archive ({name}.tar.gz) is streamed into an S3 multipart upload while it's being
+compressed, so it's never written to local disk, and parts are uploaded while the next
+part is compressed.
+
+Each file in the archive starts at a deflate full flush point: the compressed stream can be
+decoded from there without any of the data before it. A manifest ({name}.manifest.json)
+records where each file starts, so that fetch_archived_file can get a single file with a
+ranged request instead of downloading the whole archive.
+
+Files that were uploaded to S3 during the run (eg bill pdfs) aren't added to the archive
+again; the manifest records where they were uploaded instead.
+"""
+import gzip
+import json
+import logging
+import os
+import tarfile
+from typing import Any, Dict, List, Optional
+import zlib
+
+from datafeeds.common.util.s3 import (
+    read_file_from_s3,
+    s3_client,
+    uploaded_copy,
+    S3MultipartWriter,
+)
+
+log = logging.getLogger(__name__)
+
+# tarfile's default for gz is 9, which is several times slower for a slightly smaller archive
+COMPRESS_LEVEL = 6
+
+
+def archive_key(name: str) -> str:
+    return "%s.tar.gz" % name
+
+
+def manifest_key(name: str) -> str:
+    return "%s.manifest.json" % name
+
+
+def _walk(directory: str):
+    yield directory
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for filename in sorted(dirs + files):
+            yield os.path.join(root, filename)
+
+
+def archive_directory(
+    directory: str,
+    bucket: str,
+    name: str,
+    extra_files: Optional[Dict[str, str]] = None,
+    part_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Upload a tar.gz of directory and its manifest to bucket; return the manifest.
+
+    Files are stored under their full path, without the leading /, as with tarfile.add.
+
+    Args:
+        directory: The directory to archive.
+        bucket: The S3 bucket to upload the archive and manifest to.
+        name: The archive is uploaded to {name}.tar.gz and the manifest to {name}.manifest.json
+        extra_files: Files from elsewhere to archive as if they were in directory: a map of
+            the filename to use in directory to the path of the file.
+        part_size: Size of each part of the multipart upload; defaults to s3.PART_SIZE.
+    """
+    arcnames = {
+        source: os.path.join(directory, filename)
+        for filename, source in sorted((extra_files or {}).items())
+        if os.path.isfile(source)
+    }
+    paths = list(_walk(directory)) + list(arcnames)
+
+    files: List[Dict[str, Any]] = []
+    kwargs = {"part_size": part_size} if part_size else {}
+    with S3MultipartWriter(
+        bucket,
+        archive_key(name),
+        StorageClass="STANDARD_IA",
+        ContentEncoding="gzip",
+        **kwargs,
+    ) as writer:
+        with gzip.GzipFile(
+            filename="", mode="wb", compresslevel=COMPRESS_LEVEL, fileobj=writer
+        ) as compressed:
+            with tarfile.open(fileobj=compressed, mode="w") as tar:
+                for path in paths:
+                    info = tar.gettarinfo(path, arcname=arcnames.get(path, path))
+                    if not info.isfile():
+                        tar.addfile(info)
+                        continue
+
+                    entry: Dict[str, Any] = {"name": info.name, "size": info.size}
+                    files.append(entry)
+                    uploaded = uploaded_copy(path)
+                    if uploaded:
+                        entry["s3"] = {"bucket": uploaded[0], "key": uploaded[1]}
+                        continue
+
+                    compressed.flush(zlib.Z_FULL_FLUSH)
+                    entry["offset"] = writer.tell()
+                    entry["header"] = len(
+                        info.tobuf(tar.format, tar.encoding, tar.errors)
+                    )
+                    with open(path, "rb") as f:
+                        tar.addfile(info, f)
+
+    manifest = {"archive": archive_key(name), "files": files}
+    s3_client().put_object(
+        Bucket=bucket,
+        Key=manifest_key(name),
+        Body=json.dumps(manifest).encode("utf-8"),
+        ContentType="application/json",
+    )
+    log.info(
+        "archived %s files from %s to %s/%s (%s bytes)",
+        len(files),
+        directory,
+        bucket,
+        archive_key(name),
+        writer.tell(),
+    )
+    return manifest
+
+
+def fetch_archived_file(bucket: str, name: str, filename: str) -> Optional[bytes]:
+    """Return the contents of one file from an archive, or None if it's not there.
+
+    Fetches only the part of the archive containing the file, using the manifest.
+    filename is the name of the file in the archive; see archive_directory.
+    """
+    manifest = json.loads(read_file_from_s3(bucket, manifest_key(name)) or "{}")
+    files = manifest.get("files", [])
+    entry = None
+    end = ""
+    for archived in reversed(files):
+        if archived["name"] == filename:
+            entry = archived
+            break
+        if "offset" in archived:
+            # the file ends where the next one in the archive starts
+            end = str(archived["offset"] - 1)
+    if entry is None:
+        return None
+    if "s3" in entry:
+        return read_file_from_s3(entry["s3"]["bucket"], entry["s3"]["key"])
+
+    response = s3_client().get_object(
+        Bucket=bucket,
+        Key=manifest["archive"],
+        Range="bytes=%s-%s" % (entry["offset"], end),
+    )
+    # raw deflate data, starting from a full flush point
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    data = decompressor.decompress(response["Body"].read())
+    start = entry["header"]
+    return data[start:][: entry["size"]]
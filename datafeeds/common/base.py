@@ -9,15 +9,20 @@ import logging
 from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
 from retrying import retry
 from typing import Optional
 from datafeeds import config
+from datafeeds.common import tracing
+from datafeeds.common.checkpoint import Checkpoint
 from datafeeds.common.typing import BillingDatum, Status
 from datafeeds.common.support import Configuration
 from datafeeds.common.webdriver.virtualdisplay import VirtualDisplay
-from datafeeds.common.util.selenium import ec_or, file_exists_in_dir
+from datafeeds.common.util.selenium import (
+    ec_or,
+    wait_for_download,
+    wait_until_settled,
+)
 from datafeeds.models.bill import PartialBillProviderType
 
 log = logging.getLogger(__name__)
@@ -60,6 +65,9 @@ class BaseScraper(Abstract):
         self._date_range = date_range
         self._configuration = configuration or Configuration()
         self.utility_service = None
+        # sub-ranges completed during this run (run_datafeed replaces it with a saved
+        # checkpoint for the meter); see common/checkpoint.py
+        self.checkpoint = Checkpoint()
 
     @property
     def username(self):
@@ -140,7 +148,8 @@ class BaseScraper(Abstract):
             log.info("\t%s: %s", prop, value)
 
         try:
-            results = self._execute()
+            with tracing.span("execute"):
+                results = self._execute()
 
             bills_status = None
             readings_status = None
@@ -265,6 +274,10 @@ class BaseWebScraper(BaseScraper):
     methods like screenshotting.
     """
 
+    # How many sub-ranges the utility's portal tolerates downloading at once; 1 if the scraper
+    # can't replay its export requests. (See common/subrange_download.py.)
+    max_subrange_downloads = 1
+
     @abstractmethod
     def _execute(self):
         pass
@@ -286,8 +299,9 @@ class BaseWebScraper(BaseScraper):
         if config.USE_VIRTUAL_DISPLAY:
             self._display.start()
 
-        self._driver = self._get_driver()
-        self._driver.start()
+        with tracing.span("start_browser"):
+            self._driver = self._get_driver()
+            self._driver.start()
 
     def stop(self):
         self._driver.stop()
@@ -322,17 +336,34 @@ class BaseWebScraper(BaseScraper):
     def screenshot(self, filename, whole=False):
         self._driver.screenshot(BaseWebScraper.screenshot_path(filename), whole=whole)
 
+    @tracing.traced("download")
     def download_file(self, extension: str, timeout: Optional[int] = 60):
         # Wait for csv to download
-        wait = WebDriverWait(self._driver, timeout)
-        download_dir = self._driver.download_dir
-        filename = wait.until(
-            file_exists_in_dir(download_dir, r".*\.{}".format(extension))
+        file_path = wait_for_download(
+            self._driver,
+            self._driver.download_dir,
+            r".*\.{}$".format(extension),
+            seconds=timeout,
         )
-        file_path = os.path.join(download_dir, filename)
+        tracing.record_download(os.path.getsize(file_path))
 
         return file_path
 
+    def wait_until_settled(
+        self, seconds: float = 30, spinner: Optional[str] = None
+    ) -> bool:
+        """Wait until the page has finished updating, for up to seconds; use in place of a sleep.
+
+        See util.selenium.wait_until_settled.
+        """
+        return wait_until_settled(self._driver, seconds, spinner)
+
+    def subrange_downloads(self) -> int:
+        """The number of sub-ranges to download at once (config.SUBRANGE_DOWNLOADS, up to
+        max_subrange_downloads).
+        """
+        return max(1, min(config.SUBRANGE_DOWNLOADS, self.max_subrange_downloads))
+
     def _get_driver(self):
         """
         Return an instance of ChromeDriver trying several times to load the
@@ -386,6 +417,7 @@ class CSSSelectorBasePageObject(object):
             return False
         return True
 
+    @tracing.traced("selenium_wait")
     def wait_for_condition_or_error(
         self,
         condition,
@@ -476,6 +508,15 @@ class CSSSelectorBasePageObject(object):
             error_msg=error_msg,
         )
 
+    def wait_until_settled(
+        self, seconds: float = 30, spinner: Optional[str] = None
+    ) -> bool:
+        """Wait until the page has finished updating, for up to seconds; use in place of a sleep.
+
+        See util.selenium.wait_until_settled.
+        """
+        return wait_until_settled(self._driver, seconds, spinner)
+
     def wait_until_text_visible(
         self,
         selector: str,
@@ -7,10 +7,12 @@ from dateutil import parser as dateparser
 
 from datafeeds.common.typing import Status
 from datafeeds import db, config
-from datafeeds.common import alert, index
+from datafeeds.common import alert, cassette, index, tracing
+from datafeeds.common.checkpoint import Checkpoint, store_from_config
 from datafeeds.common.exceptions import DataSourceConfigurationError, LoginError
 from datafeeds.common.support import Credentials, DateRange
 from datafeeds.models.bill import PartialBillProviderType
+from datafeeds.models.meter import MeterReading
 from datafeeds.urjanet.datasource.pymysql_adapter import UrjanetPyMySqlDataSource
 from datafeeds.urjanet.transformer.base import UrjanetGridiumTransformer
 from datafeeds.urjanet.scraper import (
@@ -27,6 +29,7 @@ from datafeeds.models import (
 from datafeeds.common.upload import (
     upload_bills,
     upload_readings,
+    upload_completed_readings,
     attach_bill_pdfs,
     upload_partial_bills,
 )
@@ -113,6 +116,7 @@ def run_datafeed(
     notify_on_login_error: Optional[bool] = True,
     meter_only: Optional[bool] = False,
 ) -> Status:
+    tracing.reset()
     transforms = [] if transforms is None else transforms
     bill_handler = ft.partial(
         upload_bills,
@@ -121,8 +125,15 @@ def run_datafeed(
         task_id,
         datasource.name,
     )
+    # readings uploaded during the run, as each checkpoint sub-range is completed
+    completed: List[MeterReading] = []
     readings_handler = ft.partial(
-        upload_readings, transforms, meter.oid, datasource.name, task_id
+        upload_readings,
+        transforms,
+        meter.oid,
+        datasource.name,
+        task_id,
+        completed=completed,
     )
     pdfs_handler = ft.partial(attach_bill_pdfs, meter.oid, task_id, meter_only)
     partial_bill_handler = ft.partial(upload_partial_bills, meter, task_id)
@@ -159,18 +170,33 @@ def run_datafeed(
             )
         index.index_etl_run(task_id, doc)
 
-    index_doc: Dict[str, str] = {}
+    index_doc: Dict[str, Any] = {}
     # create a non-persisted copy
     utility_service = UtilityService.copy_from(meter.utility_service)
     try:
-        with scraper_class(credentials, date_range, configuration) as scraper:
+        with tracing.profile(), cassette.from_config(), scraper_class(
+            credentials, date_range, configuration
+        ) as scraper:
             scraper.utility_service = utility_service
-            scraper_status = scraper.scrape(
-                readings_handler=readings_handler,
-                bills_handler=bill_handler,
-                pdfs_handler=pdfs_handler,
-                partial_bills_handler=partial_bill_handler,
+            scraper.checkpoint = Checkpoint(
+                "%s-%s" % (meter.oid, datasource.name),
+                store_from_config(),
+                on_complete=ft.partial(
+                    upload_completed_readings,
+                    transforms,
+                    meter.oid,
+                    datasource.name,
+                    task_id,
+                    completed=completed,
+                ),
             )
+            with tracing.span("scrape"):
+                scraper_status = scraper.scrape(
+                    readings_handler=readings_handler,
+                    bills_handler=bill_handler,
+                    pdfs_handler=pdfs_handler,
+                    partial_bills_handler=partial_bill_handler,
+                )
             if scraper_status == Status.SUCCEEDED:
                 # Avoid muddying Elasticsearch results
                 index_doc = {"status": "SUCCESS"}
@@ -178,6 +204,7 @@ def run_datafeed(
                 index_doc = {"status": scraper_status.name}
             if scraper_status in [Status.SUCCEEDED, Status.COMPLETED]:
                 retval = Status.SUCCEEDED
+                scraper.checkpoint.clear()
             else:
                 retval = Status.FAILED
             # sce-metascraper needs to be able to get the completed status back
@@ -202,10 +229,14 @@ def run_datafeed(
                 alert.disable_logins(parent)
 
     index_doc.update(update_utility_service(meter.utility_service, utility_service))
+    index_doc.update(tracing.summary())
+    log.info("run phases: %s", index_doc["phases"])
     if task_id and config.enabled("ES_INDEX_JOBS"):
         log.info("Uploading final task status to Elasticsearch.")
         index.index_etl_run(task_id, index_doc)
 
+    # send the alerts queued during the run
+    alert.flush_alerts()
     return retval
 
 
@@ -1,27 +1,130 @@
+"""Solve reCAPTCHAs with a solving service, in the background
+
+Solving a captcha takes 20-60 seconds. Start solving as soon as the captcha appears, keep
+filling in the rest of the form, and wait for the token only when it's needed:
+
+    future = start_recaptcha_v2(driver, iframe_parent, page_url, utility="utility:sce")
+    ...  # fill in other fields
+    set_recaptcha_response(driver, future.result())
+
+Only the request to the solving service runs in the background; the browser is only used
+from the calling thread. set_recaptcha_response pauses (5 seconds by default) after setting
+the token, before the caller submits the form. recaptcha_v2 starts solving and waits for it.
+
+The solver is 2captcha.com by default. Tests and benchmarks can set a LocalSolver (or any
+CaptchaSolver) with set_solver.
+
+The time to solve and the outcome are added to the run's phases (see tracing), as
+"captcha <utility> solved" and "captcha <utility> failed".
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
 import json
 import logging
 import re
 import time
+from typing import Any, Dict, Optional
 
 import requests
 from selenium.webdriver.remote.webelement import WebElement
 
 from datafeeds import config
+from datafeeds.common import tracing
 from datafeeds.common.exceptions import ScraperPreconditionError
 from datafeeds.common.webdriver.drivers.base import BaseDriver
 
 log = logging.getLogger(__name__)
 
+SUBMIT_URL = "https://2captcha.com/in.php"
+RESULT_URL = "https://2captcha.com/res.php"
+
 
 class CaptchaFailed(Exception):
     pass
 
 
-def recaptcha_v2(driver: BaseDriver, iframe_parent: WebElement, page_url: str):
+class CaptchaSolver:
+    def solve(self, site_key: str, page_url: str) -> str:
+        """Return the response token for a reCAPTCHA v2; raise CaptchaFailed if it can't."""
+        raise NotImplementedError()
+
+
+class TwoCaptchaSolver(CaptchaSolver):
     """Use 2captcha.com (https://2captcha.com/2captcha-api) to solve captchas.
 
-    Send request to 2captcha.com with cookies and request; wait up to a minute for a response.
+    Submit the captcha, wait for a worker to pick it up, then poll for the answer until timeout.
     """
+
+    def __init__(
+        self,
+        first_poll: float = 15,
+        poll_interval: float = 5,
+        timeout: float = 120,
+    ):
+        self.first_poll = first_poll
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def solve(self, site_key: str, page_url: str) -> str:
+        session = requests.Session()
+        # including cookies started returning ERROR_BAD_PARAMETERS; 2Captcha support said cookies aren't needed in most cases
+        data = {
+            "key": config.CAPTCHA_API_KEY,
+            "method": "userrecaptcha",
+            "googlekey": site_key,
+            "pageurl": page_url,
+            "json": 1,
+        }
+        log.debug("POST to %s:\n%s", SUBMIT_URL, json.dumps(data, indent=2))
+        resp = session.post(SUBMIT_URL, data=data)
+        log.info("captcha response=%s", resp.text)
+        req_id = json.loads(resp.text).get("request")
+        params: Dict[str, Any] = {
+            "key": config.CAPTCHA_API_KEY,
+            "action": "get",
+            "id": req_id,
+            "json": 1,
+        }
+        deadline = time.monotonic() + self.timeout
+        time.sleep(self.first_poll)
+        while True:
+            text = session.get(RESULT_URL, params=params).text
+            log.info("captcha response = %s", text)
+            response = json.loads(text)
+            answer = response.get("request")
+            # error messages look like CAPCHA_NOT_READY
+            if not re.match(r"^[A-Z_]+$", answer or ""):
+                return answer
+            if answer != "CAPCHA_NOT_READY" or time.monotonic() >= deadline:
+                raise CaptchaFailed("%s: %s" % (answer, response.get("error_text", "")))
+            time.sleep(self.poll_interval)
+
+
+class LocalSolver(CaptchaSolver):
+    """A stand-in solver for tests and benchmarks: return token after delay seconds."""
+
+    def __init__(self, token: str = "local-captcha-token", delay: float = 0):
+        self.token = token
+        self.delay = delay
+
+    def solve(self, site_key: str, page_url: str) -> str:
+        time.sleep(self.delay)
+        if not self.token:
+            raise CaptchaFailed("ERROR_CAPTCHA_UNSOLVABLE: ")
+        return self.token
+
+
+_solver: CaptchaSolver = TwoCaptchaSolver()
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="captcha")
+
+
+def set_solver(solver: Optional[CaptchaSolver]):
+    """Use solver for captchas; None restores the default (2captcha.com)."""
+    global _solver
+    _solver = solver or TwoCaptchaSolver()
+
+
+def recaptcha_site_key(driver: BaseDriver, iframe_parent: WebElement) -> str:
+    """Get the site key for a reCAPTCHA from its iframe."""
     # try to get key from iframe src attribute
     iframe = driver.find_element_by_tag_name("iframe")
     iframe_url = iframe.get_attribute("src")
@@ -29,9 +132,9 @@ def recaptcha_v2(driver: BaseDriver, iframe_parent: WebElement, page_url: str):
     captcha_key = None
     if "?" in iframe_url:
         # should be https://www.google.com/recaptcha/api2/anchor?ar=1&..., but might be javascript:false
-        (url, params) = iframe_url.get_attribute("src").split("?")
+        (_, params) = iframe_url.split("?", 1)
         for param in params.split("&"):
-            (key, value) = param.split("=")
+            (key, _, value) = param.partition("=")
             if key == "k":
                 captcha_key = value
     else:
@@ -45,48 +148,50 @@ def recaptcha_v2(driver: BaseDriver, iframe_parent: WebElement, page_url: str):
         raise ScraperPreconditionError("unable to find captcha key")
 
     log.info("found captcha key %s", captcha_key)
-    # including cookies started returning ERROR_BAD_PARAMETERS; 2Captcha support said cookies aren't needed in most cases
-    params = {
-        "key": config.CAPTCHA_API_KEY,
-        "method": "userrecaptcha",
-        "googlekey": captcha_key,
-        "pageurl": page_url,
-        "json": 1,
-    }
-    log.debug("POST to https://2captcha.com/in.php:\n%s", json.dumps(params, indent=2))
-    resp = requests.post("https://2captcha.com/in.php", data=params)
-    log.info("captcha response=%s", resp.text)
-    req_id = json.loads(resp.text).get("request")
-    log.info("waiting 30s for a human to solve the captcha")
-    time.sleep(30)
-    params = {
-        "key": config.CAPTCHA_API_KEY,
-        "action": "get",
-        "id": req_id,
-        "json": 1,
-    }
-    answer = None
-    for idx in range(5):
-        log.info("get captcha answer %s", idx + 1)
-        log.debug(
-            "POST to https://2captcha.com/res.php:\n%s", json.dumps(params, indent=2)
-        )
-        text = requests.get("https://2captcha.com/res.php", params=params).text
-        log.info("captcha response = %s", text)
-        response = json.loads(text)
-        answer = response.get("request")
-        # error messages look like CAPCHA_NOT_READY
-        if not re.match(r"^[A-Z_]+$", answer):
-            break
-        log.info("trying again in 12s")
-        time.sleep(12)
-    if answer == "CAPCHA_NOT_READY" or "error_text" in response:
-        error = "%s: %s" % (answer, response.get("error_text", ""))
-        log.warning("error solving captcha: %s", error)
-        raise CaptchaFailed(error)
-    log.info("setting captcha answer=%s", answer)
+    return captcha_key
+
+
+def _solve(solver: CaptchaSolver, site_key: str, page_url: str, utility: str) -> str:
+    start = time.perf_counter()
+    try:
+        token = solver.solve(site_key, page_url)
+    except Exception as exc:
+        elapsed = time.perf_counter() - start
+        tracing.record("captcha %s failed" % utility, elapsed)
+        log.warning("error solving captcha after %.1fs: %s", elapsed, exc)
+        if isinstance(exc, CaptchaFailed):
+            raise
+        raise CaptchaFailed(str(exc)) from exc
+    elapsed = time.perf_counter() - start
+    tracing.record("captcha %s solved" % utility, elapsed)
+    log.info("solved captcha in %.1fs", elapsed)
+    return token
+
+
+def start_recaptcha_v2(
+    driver: BaseDriver, iframe_parent: WebElement, page_url: str, utility: str = ""
+) -> "Future[str]":
+    """Start solving a reCAPTCHA v2; return a future for the response token.
+
+    The future's result raises CaptchaFailed if the captcha can't be solved.
+    """
+    site_key = recaptcha_site_key(driver, iframe_parent)
+    return _executor.submit(_solve, _solver, site_key, page_url, utility)
+
+
+def set_recaptcha_response(driver: BaseDriver, token: str, settle: float = 5):
+    """Set the response token on the page, then wait settle seconds before continuing."""
+    log.info("setting captcha answer=%s", token)
     driver.execute_script(
-        'document.getElementById("g-recaptcha-response").innerHTML="%s";' % answer
+        'document.getElementById("g-recaptcha-response").innerHTML="%s";' % token
     )
-    time.sleep(5)
+    time.sleep(settle)
+
+
+def recaptcha_v2(
+    driver: BaseDriver, iframe_parent: WebElement, page_url: str, utility: str = ""
+):
+    """Solve a reCAPTCHA v2, and set the response on the page."""
+    future = start_recaptcha_v2(driver, iframe_parent, page_url, utility)
+    set_recaptcha_response(driver, future.result())
     return True
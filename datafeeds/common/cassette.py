@@ -0,0 +1,267 @@
+"""Record and replay the HTTP requests an API scraper makes
+
+Within a Cassette, every request made with the requests library (requests.get, or a
+requests.Session) goes through the cassette:
+  - record: the request is sent, and the request and response are saved to the cassette
+    file when the cassette is closed.
+  - replay: the response is read from the cassette file; nothing is sent. A request that
+    wasn't recorded raises CassetteError.
+
+Requests are matched on their method, URL, and body, after sanitizing: query parameters and
+JSON or form fields that look like credentials (api_key, password, token, ...) are
+replaced with REDACTED, so the cassette matches whatever credentials were used to record
+it. Request headers (eg Authorization) and Set-Cookie response headers aren't saved.
+Response bodies are saved as-is, so check a cassette for tokens (eg in a login response)
+before committing it.
+
+When the same request is made more than once, responses are replayed in the order they were
+recorded; after the last one, the last response is repeated.
+
+latency (seconds) is added to each replayed request, varied by +/- jitter (a fraction of
+latency), to approximate a vendor API's response time; requests made from several threads
+wait concurrently.
+
+To run a scraper against a cassette with run_datafeed, set HTTP_CASSETTE to the cassette
+file (and HTTP_CASSETTE_MODE, HTTP_CASSETTE_LATENCY; see config.py).
+
+Only requests made with requests are recorded; browser (Selenium) scrapers aren't affected.
+"""
+import base64
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from datafeeds import config
+
+log = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = [RECORD, REPLAY]
+
+REDACTED = "REDACTED"
+SENSITIVE = re.compile(r"key|pass|secret|token|auth|session|signature", re.IGNORECASE)
+# response headers that aren't saved; bodies are saved decoded
+RESPONSE_HEADERS = ["set-cookie", "content-encoding"]
+
+
+class CassetteError(Exception):
+    pass
+
+
+def _redact_pairs(pairs):
+    return [(key, REDACTED if SENSITIVE.search(key) else val) for key, val in pairs]
+
+
+def _redact_json(data):
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if SENSITIVE.search(key) else _redact_json(val)
+            for key, val in data.items()
+        }
+    if isinstance(data, list):
+        return [_redact_json(val) for val in data]
+    return data
+
+
+def sanitize_url(url: str) -> str:
+    """Redact credentials from the query string, and sort its parameters."""
+    parts = urlsplit(url)
+    query = sorted(_redact_pairs(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def sanitize_body(body: Any, content_type: Any) -> Optional[str]:
+    """Redact credentials from a JSON or form-encoded request body."""
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return hashlib.sha256(body).hexdigest()
+    if not isinstance(body, str):
+        # a file or generator; these aren't matched on
+        return None
+    content_type = str(content_type or "")
+    if "json" in content_type:
+        try:
+            return json.dumps(_redact_json(json.loads(body)), sort_keys=True)
+        except ValueError:
+            return body
+    if "x-www-form-urlencoded" in content_type:
+        return urlencode(sorted(_redact_pairs(parse_qsl(body, keep_blank_values=True))))
+    return body
+
+
+def _request_record(request: requests.PreparedRequest) -> Dict[str, Any]:
+    return {
+        "method": request.method,
+        "url": sanitize_url(request.url),
+        "body": sanitize_body(request.body, request.headers.get("Content-Type")),
+    }
+
+
+def _request_key(record: Dict[str, Any]) -> str:
+    return json.dumps([record["method"], record["url"], record["body"]])
+
+
+def _response_record(response: requests.Response) -> Dict[str, Any]:
+    record: Dict[str, Any] = {
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {
+            key: val
+            for key, val in response.headers.items()
+            if key.lower() not in RESPONSE_HEADERS
+        },
+    }
+    content = response.content or b""
+    try:
+        record["body"] = content.decode("utf-8")
+    except UnicodeDecodeError:
+        record["base64"] = base64.b64encode(content).decode("ascii")
+    return record
+
+
+def _build_response(
+    adapter: HTTPAdapter, request: requests.PreparedRequest, record: Dict[str, Any]
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = record["status"]
+    response.reason = record["reason"]
+    response.headers = CaseInsensitiveDict(record["headers"])
+    if "base64" in record:
+        response._content = base64.b64decode(record["base64"])
+    else:
+        response._content = record["body"].encode("utf-8")
+    response._content_consumed = True
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.connection = adapter
+    return response
+
+
+class Cassette:
+    """Record or replay requests made with requests; use as a context manager."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = REPLAY,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError("cassette mode must be one of %s" % MODES)
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.interactions: List[Dict[str, Any]] = []
+        # request key -> responses, and the number replayed so far
+        self._responses: Dict[str, List[Dict[str, Any]]] = {}
+        self._replayed: Dict[str, int] = {}
+        self._send = None
+
+    def load(self):
+        with open(self.path) as f:
+            self.interactions = json.load(f)["interactions"]
+        for interaction in self.interactions:
+            key = _request_key(interaction["request"])
+            self._responses.setdefault(key, []).append(interaction["response"])
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"interactions": self.interactions}, f, indent=2)
+            f.write("\n")
+        log.info("recorded %s requests to %s", len(self.interactions), self.path)
+
+    def delay(self) -> float:
+        """Seconds to wait before returning a replayed response."""
+        if not self.latency:
+            return 0.0
+        with self._lock:
+            variation = self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, self.latency * (1 + variation))
+
+    def replay(
+        self, adapter: HTTPAdapter, request: requests.PreparedRequest
+    ) -> requests.Response:
+        key = _request_key(_request_record(request))
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise CassetteError(
+                    "%s %s not found in cassette %s"
+                    % (request.method, sanitize_url(request.url), self.path)
+                )
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+        time.sleep(self.delay())
+        return _build_response(
+            adapter, request, responses[min(index, len(responses) - 1)]
+        )
+
+    def record(self, send, adapter: HTTPAdapter, request, **kwargs):
+        response = send(adapter, request, **kwargs)
+        interaction = {
+            "request": _request_record(request),
+            "response": _response_record(response),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        return response
+
+    def __enter__(self):
+        if self.mode == REPLAY:
+            self.load()
+        send = HTTPAdapter.send
+        cassette = self
+
+        def cassette_send(adapter, request, **kwargs):
+            if cassette.mode == RECORD:
+                return cassette.record(send, adapter, request, **kwargs)
+            return cassette.replay(adapter, request)
+
+        self._send = send
+        HTTPAdapter.send = cassette_send
+        log.info("%s HTTP requests with cassette %s", self.mode, self.path)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        HTTPAdapter.send = self._send
+        self._send = None
+        if self.mode == RECORD:
+            self.save()
+
+
+def from_config():
+    """Return a Cassette for HTTP_CASSETTE if it's set, or a context that does nothing."""
+    if not config.HTTP_CASSETTE:
+        return contextlib.nullcontext()
+    return Cassette(
+        config.HTTP_CASSETTE,
+        mode=config.HTTP_CASSETTE_MODE,
+        latency=config.HTTP_CASSETTE_LATENCY,
+    )
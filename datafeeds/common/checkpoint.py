@@ -0,0 +1,266 @@
+"""Checkpoints for scrapers that download interval data a sub-range at a time
+
+A long interval scrape downloads its date range in sub-ranges (eg 30 days at a time). When
+it fails part way through, a retry (or the next run) would download every sub-range again.
+A Checkpoint records each sub-range as it's completed: the sha256 of the downloaded file, and
+the readings parsed from it. A retry, or another run within config.CHECKPOINT_MAX_AGE hours,
+restores completed sub-ranges from the checkpoint instead of downloading them.
+
+As each sub-range is completed, its readings are passed to on_complete; run_datafeed uploads
+them, so a run that fails part way through keeps the readings it got. If a sub-range is
+downloaded again and the file hasn't changed, its readings aren't uploaded again.
+
+Checkpoints are kept for the run, and saved to config.CHECKPOINT_STORE: a directory, or s3 to
+save them in ARTIFACT_S3_BUCKET next to run archives. A checkpoint is cleared when the
+scraper run succeeds.
+
+A scraper uses its checkpoint like this:
+
+    for sub_range in date_range.split_iter(delta=interval_size):
+        if self.checkpoint.restore(timeline, sub_range):
+            continue
+        path = ...  # download the sub-range
+        readings = Timeline(sub_range.start_date, sub_range.end_date)
+        ...  # parse the file into readings
+        self.checkpoint.complete(sub_range, readings.serialize(include_empty=False), path)
+        timeline.update(readings.serialize(include_empty=False))
+"""
+from datetime import date, datetime, timedelta
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from datafeeds import config
+from datafeeds.common.support import DateRange
+from datafeeds.common.timeline import Timeline
+from datafeeds.common.util.s3 import read_file_from_s3, s3_client
+
+log = logging.getLogger(__name__)
+
+# serialized readings: {"%Y-%m-%d": [N float or None]}
+Readings = Dict[str, List[Optional[float]]]
+
+S3 = "s3"
+S3_PREFIX = "checkpoints"
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LocalStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, "%s.json" % name)
+
+    def read(self, name: str) -> Optional[bytes]:
+        try:
+            with open(self._path(name), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, name: str, body: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        # write a new file and rename it, so a checkpoint is never half written
+        path = self._path(name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)
+
+    def delete(self, name: str):
+        if os.path.exists(self._path(name)):
+            os.remove(self._path(name))
+
+
+class S3Store:
+    def __init__(self, bucket: str, prefix: str = S3_PREFIX):
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, name: str) -> str:
+        return "%s/%s.json" % (self.prefix, name)
+
+    def read(self, name: str) -> Optional[bytes]:
+        if not self.bucket:
+            return None
+        try:
+            s3_client().head_object(Bucket=self.bucket, Key=self._key(name))
+        except:  # noqa: E722
+            return None
+        return read_file_from_s3(self.bucket, self._key(name))
+
+    def write(self, name: str, body: bytes):
+        s3_client().put_object(
+            Bucket=self.bucket,
+            Key=self._key(name),
+            Body=body,
+            ContentType="application/json",
+        )
+
+    def delete(self, name: str):
+        s3_client().delete_object(Bucket=self.bucket, Key=self._key(name))
+
+
+def store_from_config():
+    """The store configured with CHECKPOINT_STORE, or None to keep checkpoints in memory."""
+    if not config.CHECKPOINT_STORE:
+        return None
+    if config.CHECKPOINT_STORE == S3:
+        return S3Store(config.ARTIFACT_S3_BUCKET)
+    return LocalStore(config.CHECKPOINT_STORE)
+
+
+class Checkpoint:
+    """The completed sub-ranges of a scraper's date range, and their readings."""
+
+    def __init__(
+        self,
+        name: str = "",
+        store=None,
+        on_complete: Optional[Callable[[Readings], Any]] = None,
+        max_age: Optional[timedelta] = None,
+    ):
+        self.name = name
+        self.store = store
+        self.on_complete = on_complete
+        self.max_age = (
+            timedelta(hours=config.CHECKPOINT_MAX_AGE) if max_age is None else max_age
+        )
+        # [{"start": date, "end": date, "sha256": str, "completed": datetime}]
+        self.ranges: List[Dict[str, Any]] = []
+        self.readings: Readings = {}
+        # (start, end) -> sha256 of each sub-range downloaded, including expired ones
+        self._hashes: Dict[Tuple[date, date], str] = {}
+        self._load()
+
+    def _load(self):
+        body = self.store.read(self.name) if self.store else None
+        if not body:
+            return
+        try:
+            saved = json.loads(body)
+            ranges = [
+                {
+                    "start": date.fromisoformat(rng["start"]),
+                    "end": date.fromisoformat(rng["end"]),
+                    "sha256": rng["sha256"],
+                    "completed": datetime.fromisoformat(rng["completed"]),
+                }
+                for rng in saved["ranges"]
+            ]
+        except (ValueError, KeyError, TypeError):
+            log.warning("ignoring invalid checkpoint %s", self.name)
+            return
+        self._hashes = {(rng["start"], rng["end"]): rng["sha256"] for rng in ranges}
+        oldest = datetime.utcnow() - self.max_age
+        self.ranges = [rng for rng in ranges if rng["completed"] >= oldest]
+        self.readings = {
+            day: values
+            for day, values in saved.get("readings", {}).items()
+            if self._covered(date.fromisoformat(day), date.fromisoformat(day))
+        }
+        log.info(
+            "loaded checkpoint %s: %s of %s sub-ranges are current",
+            self.name,
+            len(self.ranges),
+            len(ranges),
+        )
+
+    def _save(self):
+        if not self.store:
+            return
+        body = {
+            "ranges": [
+                {
+                    "start": rng["start"].isoformat(),
+                    "end": rng["end"].isoformat(),
+                    "sha256": rng["sha256"],
+                    "completed": rng["completed"].isoformat(),
+                }
+                for rng in self.ranges
+            ],
+            "readings": self.readings,
+        }
+        try:
+            self.store.write(self.name, json.dumps(body).encode("utf-8"))
+        except Exception:
+            log.exception("saving checkpoint %s failed", self.name)
+
+    def _covered(self, start: date, end: date) -> bool:
+        """Whether each day from start to end is in a completed sub-range."""
+        day = start
+        while day <= end:
+            rng = next(
+                (rng for rng in self.ranges if rng["start"] <= day <= rng["end"]), None
+            )
+            if not rng:
+                return False
+            day = rng["end"] + timedelta(days=1)
+        return True
+
+    def restore(self, timeline: Timeline, sub_range: DateRange) -> bool:
+        """If sub_range was completed, insert its readings into timeline and return True."""
+        if not self._covered(sub_range.start_date, sub_range.end_date):
+            return False
+        log.info("restoring %s from checkpoint %s", sub_range, self.name)
+        timeline.update(
+            {
+                day: values
+                for day, values in self.readings.items()
+                if sub_range.start_date <= date.fromisoformat(day) <= sub_range.end_date
+            }
+        )
+        return True
+
+    def complete(
+        self, sub_range: DateRange, readings: Readings, path: Optional[str] = None
+    ):
+        """Record a completed sub-range: the readings from it, and the file they were read from.
+
+        The readings are passed to on_complete, unless the same file was downloaded before.
+        """
+        sha256 = file_hash(path) if path else ""
+        key = (sub_range.start_date, sub_range.end_date)
+        unchanged = bool(sha256) and self._hashes.get(key) == sha256
+        self._hashes[key] = sha256
+        self.ranges = [
+            rng
+            for rng in self.ranges
+            if rng["end"] < sub_range.start_date or rng["start"] > sub_range.end_date
+        ]
+        self.ranges.append(
+            {
+                "start": sub_range.start_date,
+                "end": sub_range.end_date,
+                "sha256": sha256,
+                "completed": datetime.utcnow(),
+            }
+        )
+        self.readings.update(readings)
+        self._save()
+        if self.on_complete and readings and not unchanged:
+            try:
+                self.on_complete(readings)
+            except Exception:
+                # the readings will be uploaded with the rest at the end of the run
+                log.exception("uploading readings for %s failed", sub_range)
+
+    def clear(self):
+        """Forget completed sub-ranges (eg when the scraper run has succeeded)."""
+        self.ranges = []
+        self.readings = {}
+        self._hashes = {}
+        if self.store:
+            try:
+                self.store.delete(self.name)
+            except Exception:
+                log.exception("deleting checkpoint %s failed", self.name)
@@ -0,0 +1,99 @@
+"""Decrypt credentials stored in the database, and cache them for the process
+
+Usernames and passwords (account data sources, SMD credentials) are encrypted with AES-256
+in CTR mode, with pyaes's default counter (starting at 1). Every value encrypted with a key
+uses the same keystream, so a batch of values is decrypted by generating the keystream once,
+for the longest value, and XORing each value with it.
+
+The keystream is generated with the cryptography package (OpenSSL) if it's installed, and
+with pyaes (pure Python) if not; the output is the same.
+
+Decrypted values are cached in credentials, by key and encrypted value, for the life of the
+process: a run that reads the same account's credentials several times decrypts them once.
+Use decrypt_all to decrypt the credentials for a batch of meters in one pass. The cached
+values are kept in bytearrays, and overwritten with zeros when the process exits.
+"""
+import atexit
+import threading
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import pyaes
+
+try:
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    Cipher = None  # type: ignore
+
+# pyaes.Counter's default initial value, as a 16 byte block
+INITIAL_COUNTER = (1).to_bytes(16, "big")
+
+
+def keystream(key: bytes, length: int) -> bytes:
+    """The first length bytes of the AES-CTR keystream for key."""
+    if Cipher is not None:
+        encryptor = Cipher(
+            algorithms.AES(key), modes.CTR(INITIAL_COUNTER), backend=default_backend()
+        ).encryptor()
+        return encryptor.update(bytes(length)) + encryptor.finalize()
+    return pyaes.AESModeOfOperationCTR(key).encrypt(bytes(length))
+
+
+def _xor(data: bytes, stream: bytes) -> bytearray:
+    return bytearray(a ^ b for a, b in zip(data, stream))
+
+
+def _to_bytes(text: Union[str, bytes]) -> bytes:
+    """Convert text to bytes the way pyaes does: one byte per character.
+
+    Characters above U+00FF raise ValueError, as they do with pyaes.
+    """
+    if isinstance(text, str):
+        return bytes(ord(c) for c in text)
+    return text
+
+
+def ctr_encrypt(key: bytes, text: Union[str, bytes]) -> bytes:
+    """Encrypt text and return bytes; a str is converted to bytes as pyaes does."""
+    data = _to_bytes(text)
+    return bytes(_xor(data, keystream(key, len(data))))
+
+
+class CredentialCache:
+    """Decrypted values, by key and encrypted value."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[bytes, bytes], bytearray] = {}
+
+    def decrypt_all(self, key: bytes, encrypted: Iterable[Optional[bytes]]):
+        """Decrypt and cache values that aren't cached yet, with one keystream."""
+        with self._lock:
+            missing = {
+                bytes(value)
+                for value in encrypted
+                if value and (key, bytes(value)) not in self._values
+            }
+            if not missing:
+                return
+            stream = keystream(key, max(len(value) for value in missing))
+            for value in missing:
+                self._values[(key, value)] = _xor(value, stream)
+
+    def decrypt(self, key: bytes, encrypted: bytes) -> str:
+        """Decrypt the given bytes and return a string."""
+        if not encrypted:
+            return ""
+        self.decrypt_all(key, [encrypted])
+        return self._values[(key, bytes(encrypted))].decode("utf-8")
+
+    def clear(self):
+        """Overwrite the decrypted values with zeros, and forget them."""
+        with self._lock:
+            for value in self._values.values():
+                value[:] = bytes(len(value))
+            self._values.clear()
+
+
+credentials = CredentialCache()
+atexit.register(credentials.clear)
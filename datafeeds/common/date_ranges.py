@@ -0,0 +1,66 @@
+"""date_ranges
+
+This module provides an ordered collection of non-overlapping, inclusive
+date ranges (e.g. bill periods), each with an associated item.
+
+Because the ranges never overlap, their start and end dates are both in
+ascending order, so finding the ranges that overlap a candidate range is
+two binary searches: every range that could overlap starts on or before
+the candidate's end, and ends on or after its start.
+
+It's used to accept or reject bills in O(log n) each, instead of comparing
+every candidate with every accepted bill.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class DisjointDateRanges(Generic[T]):
+    def __init__(self):
+        self._starts: List[date] = []
+        self._ends: List[date] = []
+        self._items: List[T] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _overlapping(self, start: date, end: date) -> Tuple[int, int]:
+        """Return the [lo, hi) index range of ranges that overlap start - end (inclusive)."""
+        hi = bisect_right(self._starts, end)
+        lo = bisect_left(self._ends, start, 0, hi)
+        return lo, hi
+
+    def find_overlap(self, start: date, end: date) -> Optional[T]:
+        """Return the item for the earliest range that overlaps start - end, if any."""
+        lo, hi = self._overlapping(start, end)
+        return self._items[lo] if lo < hi else None
+
+    def overlaps(self, start: date, end: date) -> bool:
+        lo, hi = self._overlapping(start, end)
+        return lo < hi
+
+    def add(self, start: date, end: date, item: T) -> bool:
+        """Add a range if it doesn't overlap an existing range.
+
+        Return True if the range was added, False if it was rejected.
+        """
+        if start > end:
+            raise ValueError("Invalid date range %s - %s" % (start, end))
+        lo, hi = self._overlapping(start, end)
+        if lo < hi:
+            return False
+        self._starts.insert(hi, start)
+        self._ends.insert(hi, end)
+        self._items.insert(hi, item)
+        return True
+
+    def items(self) -> List[T]:
+        """Return items in chronological order."""
+        return list(self._items)
+
+    def ranges(self) -> Iterable[Tuple[date, date, T]]:
+        return zip(self._starts, self._ends, self._items)
@@ -1,19 +1,168 @@
-from datetime import datetime
+"""Daylight savings time calendars
+
+DSTCalendar lists the local days in a date range for a timezone, and the number of intervals
+in each: fewer on the day daylight savings time starts (92 15 minute intervals in the US),
+and more on the day it ends (100). Zones without daylight savings time (eg Pacific/Honolulu,
+America/Phoenix) always have the same number.
+
+Interval data is stored as a fixed number of readings for each local day, by wall clock
+time. to_fixed and fixed_day place readings for each actual interval (eg 100 readings on the
+day daylight savings time ends) into fixed daily arrays: intervals that don't exist are None,
+and repeated intervals are combined with a duplicates policy (see interval_csv).
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence, Set
 
 from dateutil.rrule import rrule, YEARLY, SU
 
-# Daylight savings time starts on the second Sunday in March.
-DST_STARTS = set(
-    dt.date()
-    for dt in rrule(
-        YEARLY, bymonth=3, byweekday=SU(2), dtstart=datetime(2000, 1, 1), count=100
-    )
-)
+import numpy as np
+import pandas as pd
+
+from datafeeds.common.interval_csv import AVERAGE, DUPLICATE_POLICIES, FIRST, LAST
+
+
+def _combine(cells: np.ndarray, readings: np.ndarray, size: int, duplicates: str):
+    """Combine readings into an array of size, where cells is the position of each."""
+    if duplicates not in DUPLICATE_POLICIES:
+        raise ValueError("duplicates must be one of %s" % DUPLICATE_POLICIES)
+    if duplicates == FIRST:
+        fixed = np.full(size, np.nan)
+        found, first = np.unique(cells, return_index=True)
+        fixed[found] = readings[first]
+        return fixed
+    present = ~np.isnan(readings)
+    if duplicates == LAST:
+        fixed = np.full(size, np.nan)
+        # the first of each cell in reverse order is the last present reading
+        found, last = np.unique(cells[present][::-1], return_index=True)
+        fixed[found] = readings[present][::-1][last]
+        return fixed
+    totals = np.bincount(cells[present], weights=readings[present], minlength=size)
+    counts = np.bincount(cells[present], minlength=size)
+    if duplicates == AVERAGE:
+        return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+    return np.where(counts > 0, totals, np.nan)
+
+
+class DSTCalendar:
+    """The local days from start to end (inclusive) in timezone, and their intervals."""
+
+    def __init__(self, timezone: str, start: date, end: date, interval: int = 15):
+        self.timezone = timezone
+        self.interval = interval
+        self.per_day = 24 * 60 // interval
+        days = pd.date_range(start, end + timedelta(days=1), freq="D")
+        # a day starts at the first midnight (in the rare zones that change at midnight)
+        midnights = days.tz_localize(
+            timezone,
+            ambiguous=np.ones(len(days), dtype=bool),
+            nonexistent="shift_forward",
+        ).tz_convert("UTC")
+        self._days = days[:-1]
+        self._first_slot = midnights[0]
+        self.days: List[date] = [day.date() for day in self._days]
+        lengths = midnights[1:] - midnights[:-1]
+        self.counts: np.ndarray = np.asarray(
+            lengths // pd.Timedelta(minutes=interval), dtype=int
+        )
+        self._day_index = {day: idx for idx, day in enumerate(self.days)}
+        # index of each day's first interval
+        self._offsets = np.concatenate([[0], np.cumsum(self.counts)])
+        self._positions: Optional[np.ndarray] = None
+
+    @property
+    def starts(self) -> List[date]:
+        """Days when daylight savings time starts (the short days)."""
+        return [day for day, n in zip(self.days, self.counts) if n < self.per_day]
+
+    @property
+    def ends(self) -> List[date]:
+        """Days when daylight savings time ends (the long days)."""
+        return [day for day, n in zip(self.days, self.counts) if n > self.per_day]
 
-# Daylight savings time ends on the first Sunday in November.
-DST_ENDS = set(
-    dt.date()
-    for dt in rrule(
-        YEARLY, bymonth=11, byweekday=SU(1), dtstart=datetime(2000, 1, 1), count=100
+    def count(self, day: date) -> int:
+        """The number of intervals in a local day."""
+        return int(self.counts[self._day_index[day]])
+
+    def slots(self) -> pd.DatetimeIndex:
+        """The start of each interval, in UTC."""
+        return pd.date_range(
+            self._first_slot,
+            periods=int(self._offsets[-1]),
+            freq="%smin" % self.interval,
+        )
+
+    def utc_offsets(self) -> np.ndarray:
+        """The UTC offset of each interval, in minutes."""
+        utc = self.slots()
+        local = utc.tz_convert(self.timezone).tz_localize(None)
+        offsets = (local - utc.tz_localize(None)) // pd.Timedelta(minutes=1)
+        return np.asarray(offsets, dtype=int)
+
+    def positions(self) -> np.ndarray:
+        """The position of each interval in its day's fixed array, by wall clock time."""
+        if self._positions is None:
+            local = self.slots().tz_convert(self.timezone).tz_localize(None)
+            midnight = self._days.repeat(self.counts)
+            positions = (local - midnight) // pd.Timedelta(minutes=self.interval)
+            self._positions = np.clip(
+                np.asarray(positions, dtype=int), 0, self.per_day - 1
+            )
+        return self._positions
+
+    def _readings(self, values: Sequence, expected: int) -> np.ndarray:
+        readings = np.array(
+            [np.nan if value is None else value for value in values], dtype=float
+        )
+        if len(readings) != expected:
+            raise ValueError(
+                "Expected %s readings, found %s." % (expected, len(values))
+            )
+        return readings
+
+    def to_fixed(self, values: Sequence, duplicates: str = AVERAGE) -> np.ndarray:
+        """Place a reading for each interval (None if missing) into fixed daily arrays.
+
+        Returns an array of shape (days, per_day), with NaN where there's no reading.
+        Repeated intervals are combined with the duplicates policy; missing readings aren't
+        included in an average or sum.
+        """
+        readings = self._readings(values, int(self._offsets[-1]))
+        day_index = np.repeat(np.arange(len(self.days)), self.counts)
+        cells = day_index * self.per_day + self.positions()
+        fixed = _combine(cells, readings, len(self.days) * self.per_day, duplicates)
+        return fixed.reshape(len(self.days), self.per_day)
+
+    def fixed_day(
+        self, day: date, values: Sequence, duplicates: str = AVERAGE
+    ) -> List[Optional[float]]:
+        """Place the readings for each interval in a day into a fixed array (see to_fixed)."""
+        idx = self._day_index[day]
+        first, last = self._offsets[idx], self._offsets[idx + 1]
+        readings = self._readings(values, int(last - first))
+        fixed = _combine(
+            self.positions()[first:last], readings, self.per_day, duplicates
+        )
+        return [None if np.isnan(value) else float(value) for value in fixed]
+
+
+def _sundays(month: int, week: int, first_year: int, last_year: int) -> Set[date]:
+    """The week'th Sunday (-1 for the last) in month, each year from first_year to last_year."""
+    return set(
+        dt.date()
+        for dt in rrule(
+            YEARLY,
+            bymonth=month,
+            byweekday=SU(week),
+            dtstart=datetime(first_year, 1, 1),
+            until=datetime(last_year, 12, 31),
+        )
     )
-)
+
+
+# Days daylight savings time starts and ends in the US, 2000 - 2099. These come from the US
+# rules rather than the tz database, since pytz's transitions end in 2037.
+# Before 2007, daylight savings time started on the first Sunday in April, and ended on the
+# last Sunday in October; since then, the second Sunday in March, and the first in November.
+DST_STARTS = _sundays(4, 1, 2000, 2006) | _sundays(3, 2, 2007, 2099)
+DST_ENDS = _sundays(10, -1, 2000, 2006) | _sundays(11, 1, 2007, 2099)
@@ -1,6 +1,8 @@
 from datetime import datetime, date
-from typing import List, Set, Dict, Any, Tuple
+from typing import List, Set, Dict, Any, Tuple, Iterator, Optional
 import logging
+import os
+import re
 
 from dateutil import parser as date_parser
 from dateutil import tz
@@ -10,6 +12,7 @@ from elasticsearch.helpers import bulk
 from sqlalchemy.orm import joinedload
 
 from datafeeds import db, config
+from datafeeds.common import tracing
 from datafeeds.common.typing import (
     BillingData,
     BillingRange,
@@ -30,6 +33,7 @@ INDEX = "etl-tasks"  # write alias
 INDEX_PATTERN = "etl-tasks-*"
 INTERVAL_ISSUE_INDEX = "etl-interval-issues"
 BILLS_INDEX = "bills-log"
+LOG_INDEX = "etl-logs"
 LOG_URL_PATTERN = "https://snapmeter.com/api/v2/admin/scraper-archive?id=%s"
 
 
@@ -93,6 +97,7 @@ def get_index_doc(task_id: str) -> Tuple[Dict[str, Any], str]:
         return {}, INDEX
 
 
+@tracing.traced("elasticsearch")
 def index_etl_run(task_id: str, run: dict):
     """Index an ETL run: get the existing doc and update with fields in run."""
     es = _get_es_connection()
@@ -118,6 +123,7 @@ def index_etl_run(task_id: str, run: dict):
     es.index(index=INDEX, doc_type="_doc", id=task_id, body=doc, refresh="wait_for")
 
 
+@tracing.traced("elasticsearch")
 def index_bill_records(scraper: str, change_records: List[Dict[str, Any]]):
     """Index a list of bill change records."""
     # get meter log info for all referenced meters
@@ -297,6 +303,7 @@ def _interval_issues_docs(
         }
 
 
+@tracing.traced("elasticsearch")
 def index_etl_interval_issues(
     task_id: str,
     account_hex: str,
@@ -324,11 +331,119 @@ def index_etl_interval_issues(
     )
 
 
-def index_logs(task_id: str):
-    """Upload the logs for this task to elasticsearch for later analysis."""
+# 2021-03-12 15:14:56,074 : INFO : datafeeds.common.index : message
+# 2021-03-12 15:14:56,074 : WARNING : urllib3.connectionpool : message
+# (the logger name is missing from logs written before it was added to the format)
+LOG_LINE = re.compile(
+    r"(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),(\d{3}) : ([A-Z]+) : (?:(\S+) : )?(.*)"
+)
+# log records per bulk request, and max size of a request
+LOG_CHUNK_SIZE = 2000
+LOG_CHUNK_BYTES = 5 * 1024 * 1024
+# messages longer than this (eg a page source) are truncated
+LOG_MESSAGE_CHARS = 32 * 1024
+# how much of the end of the log to store on the ETL run doc
+LOG_TAIL_BYTES = 1024 * 1024
+
+
+def _log_doc(task_id: str, line_number: int, source: Dict[str, Any], lines: List[str]):
+    source["message"] = "".join(lines).rstrip("\n")[:LOG_MESSAGE_CHARS]
+    return {
+        "_index": LOG_INDEX,
+        "_type": "_doc",
+        "_id": "%s-%s" % (task_id, line_number),
+        "_source": source,
+    }
+
+
+def _log_docs(
+    path: str, task_id: str, meter_oid: Optional[int], min_level: int
+) -> Iterator[Dict[str, Any]]:
+    """Parse a log file into a doc per record, reading a line at a time.
+
+    Lines that don't start with a timestamp (eg a traceback) are part of the previous record.
+    """
+    levels: Dict[str, int] = {}
+    source: Optional[Dict[str, Any]] = None
+    start = 0
+    lines: List[str] = []
+    with open(path, "r", errors="replace") as f:
+        for line_number, line in enumerate(f, 1):
+            match = LOG_LINE.match(line)
+            if not match:
+                if source is not None and sum(map(len, lines)) < LOG_MESSAGE_CHARS:
+                    lines.append(line)
+                continue
+
+            if source is not None:
+                yield _log_doc(task_id, start, source, lines)
+                source = None
+
+            timestamp, millis, level, logger, message = match.groups()
+            if level not in levels:
+                value = logging.getLevelName(level)
+                levels[level] = value if isinstance(value, int) else logging.INFO
+            if levels[level] < min_level:
+                continue
+            source = {
+                "time": "%sT%s.%s" % (timestamp[:10], timestamp[11:], millis),
+                "level": level,
+                "logger": logger,
+                "task_id": task_id,
+                "meter": meter_oid,
+            }
+            start = line_number
+            lines = [message + "\n"]
+
+    if source is not None:
+        yield _log_doc(task_id, start, source, lines)
+
+
+def index_log_records(
+    task_id: str, meter_oid: Optional[int] = None, path: Optional[str] = None
+) -> int:
+    """Index each record in the log as a doc in LOG_INDEX; return the number indexed.
+
+    Records below config.ES_LOG_LEVEL are skipped; if the log is larger than
+    config.ES_LOG_MAX_BYTES, so are records below WARNING. Docs are sent in bulk requests
+    of LOG_CHUNK_SIZE records, as the log is read.
+    """
+    path = path or config.LOGPATH
+    min_level = logging.getLevelName(config.ES_LOG_LEVEL)
+    if not isinstance(min_level, int):
+        min_level = logging.INFO
+    if os.path.getsize(path) > config.ES_LOG_MAX_BYTES:
+        min_level = max(min_level, logging.WARNING)
+    indexed, _ = bulk(
+        _get_es_connection(),
+        _log_docs(path, task_id, meter_oid, min_level),
+        chunk_size=LOG_CHUNK_SIZE,
+        max_chunk_bytes=LOG_CHUNK_BYTES,
+        stats_only=True,
+    )
+    return indexed
+
+
+@tracing.traced("elasticsearch")
+def index_logs(task_id: str, meter_oid: Optional[int] = None):
+    """Upload the logs for this task to elasticsearch for later analysis.
+
+    Log records are indexed separately (see index_log_records); the ETL run doc gets the end
+    of the log.
+    """
+    try:
+        indexed = index_log_records(task_id, meter_oid)
+        log.info("Indexed %s log records to %s.", indexed, LOG_INDEX)
+    except:  # noqa E722
+        log.exception("Failed to index run log records to elasticsearch.")
+
     try:
-        with open(config.LOGPATH, "r") as f:
-            log_contents = f.read()
+        with open(config.LOGPATH, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - LOG_TAIL_BYTES, 0))
+            if size > LOG_TAIL_BYTES:
+                f.readline()  # skip a partial line
+            log_contents = f.read().decode("utf-8", errors="replace")
         doc = {"log": log_contents}
         index_etl_run(task_id, doc)
     except:  # noqa E722
@@ -0,0 +1,227 @@
+"""Read interval data from a utility's CSV download a column at a time
+
+Utility portals provide interval data as a CSV file with a timestamp and a reading on each row,
+often after some lines of metadata. read_interval_csv finds the header row, reads the file
+with pandas, and parses the whole timestamp column with one format (detected from the first
+rows), and the value column, at once; this is much faster than parsing each timestamp with
+dateutil.
+
+In the fall, when daylight savings time ends, the readings for 1:00 - 2:00 are usually
+repeated with the same timestamps. The duplicates policy combines them:
+  - average: the mean of the readings (for demand, eg kW)
+  - sum: the total of the readings (for usage, eg kWh)
+  - first: the first reading
+  - last: the last reading that isn't missing (as repeated Timeline.insert calls would keep)
+
+Columns are specified by header name (a case-insensitive exact match, or else the first header
+that contains the name), by a compiled regex matched against the header names, or by position.
+"""
+import csv
+from datetime import datetime
+import logging
+from typing import List, Optional, Pattern, Sequence, Union
+
+import pandas as pd
+
+from datafeeds.common.exceptions import InvalidMeterDataException
+from datafeeds.common.timeline import Timeline
+from datafeeds.common.typing import IntervalReading
+
+log = logging.getLogger(__name__)
+
+Column = Union[str, int, Pattern]
+
+
+class HeaderNotFoundError(InvalidMeterDataException):
+    pass
+
+
+AVERAGE = "average"
+SUM = "sum"
+FIRST = "first"
+LAST = "last"
+DUPLICATE_POLICIES = [AVERAGE, SUM, FIRST, LAST]
+
+# what to do with a row with a timestamp or value that can't be parsed
+RAISE = "raise"
+SKIP = "skip"
+
+# timestamp formats to try, in order; if none match, pandas infers one
+TIMESTAMP_FORMATS = [
+    "%m/%d/%y %H:%M",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%y %I:%M %p",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %I:%M %p",
+]
+
+# rows to check when detecting the timestamp format
+FORMAT_SAMPLE = 20
+
+
+def column_name(headers: List[str], column: Column) -> Optional[str]:
+    if isinstance(column, int):
+        return headers[column] if column < len(headers) else None
+    if isinstance(column, str):
+        name = column.lower()
+        for header in headers:
+            if header.lower() == name:
+                return header
+        for header in headers:
+            if name in header.lower():
+                return header
+        return None
+    for header in headers:
+        if column.match(header):
+            return header
+    return None
+
+
+def find_header(lines: Sequence[str], columns: Sequence[Column]) -> int:
+    """Return the index of the first line that has a header for each of columns."""
+    for idx, row in enumerate(csv.reader(lines)):
+        headers = [cell.strip() for cell in row]
+        if len(headers) > 1 and all(
+            column_name(headers, column) is not None for column in columns
+        ):
+            return idx
+    raise HeaderNotFoundError(
+        "No header row found with columns %s."
+        % ", ".join(str(getattr(column, "pattern", column)) for column in columns)
+    )
+
+
+def detect_timestamp_format(timestamps: Sequence[str]) -> Optional[str]:
+    """Return the first of TIMESTAMP_FORMATS that parses each of timestamps, if any."""
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            for timestamp in timestamps:
+                datetime.strptime(timestamp, fmt)
+        except ValueError:
+            continue
+        return fmt
+    return None
+
+
+def invalid(name: str, bad: pd.Series, text: pd.Series, errors: str):
+    if not bad.any():
+        return
+    first = bad.idxmax()
+    msg = "%s %s invalid %s values; the first is %r" % (
+        bad.sum(),
+        "row has an" if bad.sum() == 1 else "rows have",
+        name,
+        text[first],
+    )
+    if errors == RAISE:
+        raise InvalidMeterDataException(msg)
+    log.info("skipping: %s", msg)
+
+
+def combine_duplicates(readings: pd.Series, duplicates: str = AVERAGE) -> pd.Series:
+    """Combine readings with the same timestamp (see the duplicates policies above)."""
+    if duplicates not in DUPLICATE_POLICIES:
+        raise ValueError("duplicates must be one of %s" % DUPLICATE_POLICIES)
+    if readings.index.is_unique:
+        return readings
+    log.info(
+        "combining %s duplicate readings (%s)",
+        readings.index.duplicated().sum(),
+        duplicates,
+    )
+    if duplicates == FIRST:
+        return readings[~readings.index.duplicated(keep="first")]
+    grouped = readings.groupby(level=0, sort=False)
+    if duplicates == SUM:
+        return grouped.sum(min_count=1)
+    if duplicates == LAST:
+        return grouped.last()
+    return grouped.mean()
+
+
+def read_interval_csv(
+    path: str,
+    timestamp: Union[Column, Sequence[Column]],
+    value: Column,
+    names: Optional[List[str]] = None,
+    skip_rows: int = 0,
+    timestamp_format: Optional[str] = None,
+    na_values: Sequence[str] = ("null",),
+    duplicates: str = AVERAGE,
+    errors: str = RAISE,
+) -> pd.Series:
+    """Read interval data from a CSV file; return a Series of readings indexed by timestamp.
+
+    timestamp is the timestamp column, or a list of columns (eg date and time) to join with
+    spaces. The header row is the first that has each column, unless names is set: then the
+    file has no header, and rows start after skip_rows lines. A blank value, or one of
+    na_values, is a missing reading (NaN); commas in values are ignored. Rows with a blank
+    timestamp are dropped. A timestamp or value that can't be parsed raises
+    InvalidMeterDataException, or with errors="skip", the row is dropped.
+    """
+    timestamp_columns: List[Column] = (
+        list(timestamp) if isinstance(timestamp, (list, tuple)) else [timestamp]  # type: ignore
+    )
+    options = dict(dtype=str, keep_default_na=False, skipinitialspace=True)
+    if names:
+        frame = pd.read_csv(
+            path,
+            header=None,
+            names=names,
+            skiprows=skip_rows,
+            index_col=False,
+            **options
+        )
+    else:
+        with open(path) as f:
+            lines = f.readlines()
+        header = find_header(lines, timestamp_columns + [value])
+        frame = pd.read_csv(path, skiprows=header, index_col=False, **options)
+    frame.columns = [str(column).strip() for column in frame.columns]
+    headers = list(frame.columns)
+
+    text = frame[column_name(headers, timestamp_columns[0])].fillna("").str.strip()
+    for column in timestamp_columns[1:]:
+        text = text + " " + frame[column_name(headers, column)].fillna("").str.strip()
+    text = text.str.strip()
+    rows = text != ""
+    text = text[rows]
+    if timestamp_format is None:
+        timestamp_format = detect_timestamp_format(list(text.iloc[:FORMAT_SAMPLE]))
+    if timestamp_format:
+        when = pd.to_datetime(text, format=timestamp_format, errors="coerce")
+    else:
+        when = pd.to_datetime(text, errors="coerce")
+    invalid("timestamp", when.isna(), text, errors)
+
+    raw = frame[column_name(headers, value)][rows].fillna("")
+    raw = raw.str.strip().str.replace(",", "", regex=False)
+    missing = (raw == "") | raw.isin(list(na_values))
+    values = pd.to_numeric(raw.where(~missing), errors="coerce")
+    invalid("reading", values.isna() & ~missing, raw, errors)
+
+    valid = when.notna() & (values.notna() | missing)
+    readings = pd.Series(
+        values[valid].to_numpy(dtype=float), index=pd.DatetimeIndex(when[valid])
+    )
+    return combine_duplicates(readings, duplicates)
+
+
+def to_readings(readings: pd.Series) -> List[IntervalReading]:
+    """Return readings as a list of IntervalReading; missing readings have value None."""
+    values = readings.astype(object).where(readings.notna(), None)
+    return [
+        IntervalReading(dt=dt, value=value)
+        for dt, value in zip(readings.index.to_pydatetime(), values)
+    ]
+
+
+def insert_readings(timeline: Timeline, readings: pd.Series):
+    """Insert readings into a timeline; missing readings are inserted as None."""
+    for reading in to_readings(readings):
+        timeline.insert(reading.dt, reading.value)
@@ -0,0 +1,289 @@
+"""Read interval data from a utility's spreadsheet (xls or xlsx) download a column at a time
+
+Like interval_csv, for spreadsheets: read_interval_sheet finds the header row once, then
+reads the timestamp and value columns of the rows below it as whole columns, and converts
+them at once: Excel serial dates (days since 1899-12-30, or 1904-01-01 for workbooks that use
+the 1904 date system) with pandas, and values with pd.to_numeric and an optional scale (eg to
+convert kWh per interval to kW).
+
+Workbooks are read without loading every cell: xlsx worksheets are streamed from the archive
+with ElementTree.iterparse, keeping only the cells in the two columns (xlsx dates are stored as
+serial numbers, so no styles are needed); xls files are opened with xlrd, loading sheets on
+demand.
+
+Columns are specified as for interval_csv: by header name, by a compiled regex, or by
+position. Repeated timestamps are combined with a duplicates policy (see interval_csv).
+"""
+from datetime import date, datetime
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from xml.etree import ElementTree
+import zipfile
+
+import numpy as np
+import pandas as pd
+import xlrd
+
+from datafeeds.common.interval_csv import (
+    AVERAGE,
+    RAISE,
+    FORMAT_SAMPLE,
+    Column,
+    HeaderNotFoundError,
+    column_name,
+    combine_duplicates,
+    detect_timestamp_format,
+    invalid,
+)
+
+log = logging.getLogger(__name__)
+
+# the first bytes of each format: xlsx files are zip archives; xls files are OLE2 documents
+XLSX_SIGNATURE = b"PK\x03\x04"
+XLS_SIGNATURE = b"\xd0\xcf\x11\xe0"
+
+XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+# day 0 for Excel serial dates in each date system (datemode)
+EXCEL_EPOCHS = {0: pd.Timestamp("1899-12-30"), 1: pd.Timestamp("1904-01-01")}
+
+
+def _header_index(row: Sequence, columns: Sequence[Column]) -> Optional[List[int]]:
+    """The index of each of columns in a header row, or None if the row doesn't have them."""
+    headers = ["" if cell is None else str(cell).strip() for cell in row]
+    if sum(1 for header in headers if header) < 2:
+        return None
+    index = []
+    for column in columns:
+        if isinstance(column, int):
+            if column >= len(headers):
+                return None
+            index.append(column)
+            continue
+        name = column_name(headers, column)
+        if name is None:
+            return None
+        index.append(headers.index(name))
+    return index
+
+
+def _column_number(ref: str) -> int:
+    """The 0-based column of a cell reference, eg 1 for "B12"."""
+    number = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        number = number * 26 + ord(char.upper()) - ord("A") + 1
+    return number - 1
+
+
+def _sheet_path(archive: zipfile.ZipFile, sheet: Union[int, str]) -> str:
+    """The path in the archive of a worksheet, by index or name."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    sheets = workbook.findall("%ssheets/%ssheet" % (XLSX_NS, XLSX_NS))
+    if isinstance(sheet, int):
+        rel_id = sheets[sheet].get(REL_NS + "id")
+    else:
+        rel_id = next(
+            (node.get(REL_NS + "id") for node in sheets if node.get("name") == sheet),
+            None,
+        )
+        if rel_id is None:
+            raise KeyError("Worksheet %s does not exist." % sheet)
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    target = next(rel.get("Target") for rel in rels if rel.get("Id") == rel_id)
+    return target.lstrip("/") if target.startswith("/") else "xl/" + target
+
+
+def _datemode(archive: zipfile.ZipFile) -> int:
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    properties = workbook.find(XLSX_NS + "workbookPr")
+    date1904 = properties.get("date1904", "") if properties is not None else ""
+    return 1 if date1904.lower() in ("1", "true") else 0
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    table = ElementTree.fromstring(archive.read("xl/sharedStrings.xml"))
+    # a string with rich text formatting is split into runs
+    return [
+        "".join(text.text or "" for text in item.iter(XLSX_NS + "t"))
+        for item in table.iter(XLSX_NS + "si")
+    ]
+
+
+def _cell_value(cell: ElementTree.Element, strings: List[str]):
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return "".join(text.text or "" for text in cell.iter(XLSX_NS + "t"))
+    value = cell.findtext(XLSX_NS + "v")
+    if value is None:
+        return None
+    if kind == "n":
+        return float(value)
+    if kind == "s":
+        return strings[int(value)]
+    if kind == "b":
+        return value == "1"
+    # formula strings (str), errors (e) and ISO 8601 dates (d) are text
+    return value
+
+
+def _xlsx_rows(
+    archive: zipfile.ZipFile, path: str, strings: List[str]
+) -> Iterator[Dict[int, Any]]:
+    """Each row in a worksheet, as {0-based column: value} for its non-empty cells."""
+    with archive.open(path) as f:
+        for _event, elem in ElementTree.iterparse(f):
+            if elem.tag != XLSX_NS + "row":
+                continue
+            row = {}
+            for cell in elem.iter(XLSX_NS + "c"):
+                value = _cell_value(cell, strings)
+                if value is not None:
+                    row[_column_number(cell.get("r", ""))] = value
+            elem.clear()
+            yield row
+
+
+def _xlsx_columns(
+    path: str, sheet: Union[int, str], columns: Sequence[Column]
+) -> Tuple[List[list], int]:
+    with zipfile.ZipFile(path) as archive:
+        strings = _shared_strings(archive)
+        rows = _xlsx_rows(archive, _sheet_path(archive, sheet), strings)
+        for row in rows:
+            width = max(row) + 1 if row else 0
+            index = _header_index([row.get(idx) for idx in range(width)], columns)
+            if index is not None:
+                break
+        else:
+            raise _not_found(columns)
+        result: List[list] = [[] for _ in index]
+        for row in rows:
+            for values, idx in zip(result, index):
+                values.append(row.get(idx))
+        return result, _datemode(archive)
+
+
+def _xls_columns(
+    path: str, sheet: Union[int, str], columns: Sequence[Column]
+) -> Tuple[List[list], int]:
+    workbook = xlrd.open_workbook(path, on_demand=True)
+    try:
+        worksheet = (
+            workbook.sheet_by_index(sheet)
+            if isinstance(sheet, int)
+            else workbook.sheet_by_name(sheet)
+        )
+        for row_number in range(worksheet.nrows):
+            index = _header_index(worksheet.row_values(row_number), columns)
+            if index is not None:
+                break
+        else:
+            raise _not_found(columns)
+        start = row_number + 1
+        result = []
+        for idx in index:
+            values = worksheet.col_values(idx, start_rowx=start)
+            types = worksheet.col_types(idx, start_rowx=start)
+            result.append(
+                [
+                    None if kind == xlrd.XL_CELL_EMPTY else v
+                    for v, kind in zip(values, types)
+                ]
+            )
+        return result, workbook.datemode
+    finally:
+        workbook.release_resources()
+
+
+def _not_found(columns: Sequence[Column]) -> HeaderNotFoundError:
+    return HeaderNotFoundError(
+        "No header row found with columns %s."
+        % ", ".join(str(getattr(column, "pattern", column)) for column in columns)
+    )
+
+
+def excel_timestamps(cells: Sequence, datemode: int = 0) -> pd.Series:
+    """Convert timestamp cells to datetimes; cells that can't be converted are NaT.
+
+    A cell is an Excel serial date (a number), a datetime, or text.
+    """
+    values = pd.Series(list(cells), dtype=object)
+    serial = np.array(
+        [
+            isinstance(cell, (int, float)) and not isinstance(cell, bool)
+            for cell in cells
+        ],
+        dtype=bool,
+    )
+    when = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    if serial.any():
+        # round to the second: serial dates are floating point fractions of a day
+        seconds = np.round(values[serial].to_numpy(dtype=float) * 86400)
+        when[serial] = (
+            EXCEL_EPOCHS[datemode] + pd.to_timedelta(seconds, unit="s")
+        ).values
+    stamped = values.map(lambda cell: isinstance(cell, (datetime, date)))
+    if stamped.any():
+        when[stamped] = pd.to_datetime(values[stamped]).values
+    text = values.map(lambda cell: isinstance(cell, str))
+    if text.any():
+        strings = values[text].str.strip()
+        fmt = detect_timestamp_format(list(strings.iloc[:FORMAT_SAMPLE]))
+        when[text] = pd.to_datetime(strings, format=fmt, errors="coerce").values
+    return when
+
+
+def read_interval_sheet(
+    path: str,
+    timestamp: Column,
+    value: Column,
+    sheet: Union[int, str] = 0,
+    scale: float = 1.0,
+    duplicates: str = AVERAGE,
+    errors: str = RAISE,
+) -> pd.Series:
+    """Read interval data from a spreadsheet; return a Series of readings indexed by timestamp.
+
+    The header row is the first with a cell for each column (and at least two cells). The
+    data starts at the first row below it with a timestamp; rows with a blank timestamp are
+    dropped, and a blank value is a missing reading (NaN).
+    Values are multiplied by scale. A timestamp or value that can't be read raises
+    InvalidMeterDataException, or with errors="skip", the row is dropped.
+    """
+    with open(path, "rb") as f:
+        signature = f.read(4)
+    if signature == XLSX_SIGNATURE:
+        (stamps, cells), datemode = _xlsx_columns(path, sheet, [timestamp, value])
+    elif signature == XLS_SIGNATURE:
+        (stamps, cells), datemode = _xls_columns(path, sheet, [timestamp, value])
+    else:
+        raise ValueError("%s is not an xls or xlsx file" % path)
+
+    raw = pd.Series(stamps, dtype=object)
+    rows = raw.map(lambda cell: cell is not None and str(cell).strip() != "")
+    when = excel_timestamps(list(raw[rows]), datemode)
+    when.index = raw[rows].index
+    # the data starts at the first timestamp; skip rows between it and the header (eg units)
+    if when.notna().any():
+        rows &= raw.index >= when.first_valid_index()
+        when = when[when.index >= when.first_valid_index()]
+    invalid("timestamp", when.isna(), raw[rows].astype(str), errors)
+
+    text = pd.Series(cells, dtype=object)[rows].map(
+        lambda cell: cell.strip().replace(",", "") if isinstance(cell, str) else cell
+    )
+    missing = text.isna() | (text == "")
+    values = pd.to_numeric(text.where(~missing), errors="coerce")
+    invalid("reading", values.isna() & ~missing, text.astype(str), errors)
+
+    valid = when.notna() & (values.notna() | missing)
+    readings = pd.Series(
+        values[valid].to_numpy(dtype=float) * scale,
+        index=pd.DatetimeIndex(when[valid]),
+    )
+    return combine_duplicates(readings, duplicates)
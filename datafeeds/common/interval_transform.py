@@ -9,7 +9,7 @@ from dateutil import parser as date_parser
 from dateutil import tz
 
 from datafeeds import db
-from datafeeds.common.alert import post_slack_message
+from datafeeds.common.alert import queue_alert
 from datafeeds.common.exceptions import InvalidMeterDataException
 from datafeeds.models import Meter, SnapmeterAccount, SnapmeterAccountMeter
 from datafeeds.common.typing import IntervalReadings, IntervalIssue
@@ -136,12 +136,11 @@ def to_positive(
             )
         else:
             url = "Meter %s (%s)" % (meter.name, meter.oid)
-        post_slack_message(
+        queue_alert(
+            "mixed readings",
             "Scraper found mixed positive and negative readings for meter %s (%s); create a submeter to capture these."
             % (url, meter.direction),
-            "#scrapers",
-            ":exclamation:",
-            username="Scraper monitor",
+            meter=meter.oid,
         )
         raise (
             InvalidMeterDataException(
@@ -0,0 +1,167 @@
+"""Download the sub-ranges of a date range concurrently, in one logged in browser session
+
+Browser scrapers split a date range into sub-ranges (eg 30 days) that a portal will export,
+and download each with the export form, one at a time. When the export is a plain form
+submission, the remaining sub-ranges can be fetched concurrently without the browser:
+  - the first sub-range is downloaded with the browser, as usual
+  - form_request reads the export form's method, URL, and fields, with the dates for each
+    remaining sub-range filled in
+  - session_from_driver makes a requests Session with the browser's cookies and user agent,
+    and a connection pool sized for the number of concurrent downloads
+  - download_subranges replays the requests from a thread pool; each sub-range is saved to
+    its own directory (download_dir/<start>_<end>), so files can't be mixed up.
+
+Concurrent downloads are opt-in: config.SUBRANGE_DOWNLOADS is the number of downloads to
+request at once (default 1: download each sub-range with the browser), capped for each
+scraper by BaseWebScraper.max_subrange_downloads (what the utility's portal tolerates).
+"""
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import re
+import shutil
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from datafeeds.common import tracing
+from datafeeds.common.support import DateRange
+
+log = logging.getLogger(__name__)
+
+
+class ReplayError(Exception):
+    """A replayed request didn't return a file (eg the session expired)."""
+
+    pass
+
+
+class FormRequest(NamedTuple):
+    method: str
+    url: str
+    fields: List[Tuple[str, str]]
+
+
+# Set the values of inputs in the form (by CSS selector), then return the request the form
+# would send if submitted with arguments[0] (as a browser does, including the button's value).
+FORM_REQUEST_SCRIPT = """
+var submit = arguments[0], values = arguments[1];
+var form = submit.form || submit;
+Object.keys(values).forEach(function(selector) {
+    form.querySelector(selector).value = values[selector];
+});
+var fields = [];
+new FormData(form).forEach(function(value, name) {
+    if (typeof value === "string") fields.push([name, value]);
+});
+if (submit.name) fields.push([submit.name, submit.value]);
+return {method: (form.method || "get").toUpperCase(), url: form.action, fields: fields};
+"""
+
+
+def form_request(
+    driver, submit, values: Optional[Dict[str, str]] = None
+) -> FormRequest:
+    """Return the request the form with the submit button would send.
+
+    values sets inputs in the form first, by CSS selector (eg {"#reportStart": "01/01/2021"}).
+    """
+    request = driver.execute_script(FORM_REQUEST_SCRIPT, submit, values or {})
+    return FormRequest(
+        method=request["method"],
+        url=request["url"],
+        fields=[(name, value) for name, value in request["fields"]],
+    )
+
+
+def session_from_driver(driver, pool_size: int) -> requests.Session:
+    """Return a requests Session with the browser's cookies (for the current page) and user agent."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+        )
+    return session
+
+
+def _filename(response: requests.Response, default: str) -> str:
+    match = re.search(
+        r'filename="?([^";]+)"?', response.headers.get("Content-Disposition", "")
+    )
+    return os.path.basename(match.group(1)) if match else default
+
+
+def replay(
+    session: requests.Session,
+    request: FormRequest,
+    directory: str,
+    filename: str,
+    timeout: int = 180,
+) -> str:
+    """Send a form request, and save the file it returns to directory; return its path.
+
+    The file is saved with the name from the response's Content-Disposition header, or
+    filename. An HTML response (eg the login page, when the session has expired) raises
+    ReplayError.
+    """
+    if request.method == "GET":
+        response = session.get(request.url, params=request.fields, timeout=timeout)
+    else:
+        response = session.post(request.url, data=request.fields, timeout=timeout)
+    if response.status_code != requests.codes.ok:
+        raise ReplayError(
+            "%s %s returned %s" % (request.method, request.url, response.status_code)
+        )
+    if "html" in response.headers.get("Content-Type", "") and (
+        "Content-Disposition" not in response.headers
+    ):
+        raise ReplayError("%s %s returned a page" % (request.method, request.url))
+    path = os.path.join(directory, _filename(response, filename))
+    with open(path, "wb") as f:
+        f.write(response.content)
+    tracing.record_download(len(response.content))
+    return path
+
+
+def subrange_directory(download_dir: str, sub_range: DateRange) -> str:
+    """Make an empty directory for a sub-range's download: download_dir/<start>_<end>."""
+    path = os.path.join(
+        download_dir,
+        "%s_%s"
+        % (
+            sub_range.start_date.strftime("%Y%m%d"),
+            sub_range.end_date.strftime("%Y%m%d"),
+        ),
+    )
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    return path
+
+
+def download_subranges(
+    sub_ranges: List[DateRange],
+    download: Callable[[DateRange, str], str],
+    download_dir: str,
+    workers: int,
+) -> List[Tuple[DateRange, str]]:
+    """Download sub-ranges concurrently; return (sub-range, path) in the order of sub_ranges.
+
+    download(sub_range, directory) saves a sub-range's file to directory and returns its path;
+    it's called from up to workers threads at once. If a download fails, its exception is
+    raised after the rest finish.
+    """
+    directories = [subrange_directory(download_dir, rng) for rng in sub_ranges]
+    log.info("downloading %s sub-ranges, %s at a time", len(sub_ranges), workers)
+    with tracing.span("download_subranges"):
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            paths = list(executor.map(download, sub_ranges, directories))
+    return list(zip(sub_ranges, paths))
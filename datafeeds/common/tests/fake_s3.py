@@ -0,0 +1,77 @@
+from io import BytesIO
+from typing import Dict, Iterable, List, Tuple
+
+from botocore.exceptions import ClientError
+
+
+class FakeS3Client:
+    """An in-memory stand-in for the boto3 S3 operations datafeeds uses.
+
+    Records each request as (operation, key) in calls. Existing keys hold b"existing".
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self.objects = {key: b"existing" for key in keys}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.calls: List[Tuple[str, str]] = []
+
+    def operations(self) -> List[str]:
+        return [operation for operation, _ in self.calls]
+
+    def head_object(self, Bucket, Key):
+        self.calls.append(("head_object", Key))
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls.append(("put_object", Key))
+        self.objects[Key] = Body if isinstance(Body, bytes) else Body.read()
+        return {}
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.calls.append(("get_object", Key))
+        body = self.objects[Key]
+        if Range:
+            # bytes=first-last, inclusive, or bytes=first-
+            first, last = Range[6:].split("-")
+            start = int(first)
+            end = int(last) + 1 if last else len(body)
+            body = body[start:end]
+        return {"Body": BytesIO(body)}
+
+    def get_paginator(self, operation):
+        client = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                keys = sorted(k for k in client.objects if k.startswith(Prefix))
+                # two keys per page
+                pages = [keys[idx:][:2] for idx in range(0, max(len(keys), 1), 2)]
+                for page in pages:
+                    client.calls.append(("list_objects_v2", Prefix))
+                    yield {"Contents": [{"Key": key} for key in page]}
+
+        return Paginator()
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.calls.append(("create_multipart_upload", Key))
+        upload_id = str(len(self.uploads) + 1)
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append(("upload_part", Key))
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": str(PartNumber)}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append(("complete_multipart_upload", Key))
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(
+            parts[part["PartNumber"]] for part in MultipartUpload["Parts"]
+        )
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append(("abort_multipart_upload", Key))
+        self.uploads.pop(UploadId)
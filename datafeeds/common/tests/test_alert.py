@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from datafeeds.common import alert
+
+
+class AlertDispatcherTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "alerts", "alerts.jsonl")
+
+    def dispatcher(self, window: float = 300) -> alert.AlertDispatcher:
+        dispatcher = alert.AlertDispatcher(alert.FileSink(self.path), window)
+        self.addCleanup(dispatcher.close)
+        return dispatcher
+
+    def sent(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_digest(self):
+        dispatcher = self.dispatcher()
+        for idx in range(3):
+            dispatcher.send(alert.Alert("mixed readings", "meter 1 is mixed", meter=1))
+        dispatcher.send(alert.Alert("mixed readings", "meter 2 is mixed", meter=2))
+        dispatcher.send(
+            alert.Alert("mixed readings", "meter 2 is still mixed", meter=2)
+        )
+        dispatcher.send(alert.Alert("logins", "login disabled", channel="#logins"))
+        # nothing is sent until the run ends
+        time.sleep(0.1)
+        self.assertEqual([], self.sent())
+
+        self.assertTrue(dispatcher.flush())
+        sent = self.sent()
+        self.assertEqual(["#scrapers", "#logins"], [msg["channel"] for msg in sent])
+        self.assertEqual(
+            "5 alerts:\n"
+            "- meter 1 is mixed (x3)\n"
+            "- meter 2 is mixed (and 1 similar) (x2)",
+            sent[0]["message"],
+        )
+        # a single alert is sent as is
+        self.assertEqual("login disabled", sent[1]["message"])
+        self.assertEqual("Scraper monitor", sent[1]["username"])
+
+        # flushed alerts aren't sent again
+        self.assertTrue(dispatcher.flush())
+        self.assertEqual(2, len(self.sent()))
+
+    def test_window(self):
+        dispatcher = self.dispatcher(window=0.2)
+        dispatcher.send(alert.Alert("bill corrections", "bill corrected", meter=1))
+        deadline = time.monotonic() + 5
+        while not self.sent() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(["bill corrected"], [msg["message"] for msg in self.sent()])
+
+    def test_close(self):
+        dispatcher = self.dispatcher()
+        dispatcher.send(alert.Alert("empty interval data", "no data", meter=1))
+        dispatcher.close()
+        self.assertEqual(["no data"], [msg["message"] for msg in self.sent()])
@@ -0,0 +1,123 @@
+from io import BytesIO
+import json
+import os
+import random
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+from datafeeds.common import archive
+from datafeeds.common.tests.fake_s3 import FakeS3Client
+from datafeeds.common.util import s3
+
+BUCKET = "archive"
+
+
+class ArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeS3Client()
+        mock.patch.object(s3, "_client", self.client).start()
+        mock.patch.object(s3, "_uploaded", {}).start()
+        self.addCleanup(mock.patch.stopall)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.workdir = os.path.join(tmp.name, "workdir")
+        os.makedirs(os.path.join(self.workdir, "current", "downloaded"))
+        rand = random.Random(0)
+        self.files = {
+            "screenshot.png": bytes(rand.getrandbits(8) for _ in range(20000)),
+            "readings.csv": b"date,value\n" * 5000,
+            "current/empty.txt": b"",
+            "current/downloaded/bill.pdf": b"%PDF-1.4 bill",
+        }
+        for filename, data in self.files.items():
+            with open(os.path.join(self.workdir, filename), "wb") as f:
+                f.write(data)
+        self.log = os.path.join(tmp.name, "datafeeds.log")
+        with open(self.log, "wb") as f:
+            f.write(b"log message\n")
+
+    def arcname(self, filename: str) -> str:
+        return os.path.join(self.workdir, filename).lstrip("/")
+
+    def test_archive_directory(self):
+        # the bill pdf was uploaded during the run
+        s3.S3Inventory("bills").upload(
+            s3.S3Upload("abc.pdf", BytesIO(b"%PDF-1.4 bill"))
+        )
+        self.client.calls = []
+
+        manifest = archive.archive_directory(
+            self.workdir,
+            BUCKET,
+            "task",
+            extra_files={"datafeeds.log": self.log, "missing.log": "/no/such/file"},
+            part_size=10000,
+        )
+        self.assertEqual("task.tar.gz", manifest["archive"])
+        self.assertEqual(
+            json.loads(self.client.objects["task.manifest.json"]), manifest
+        )
+        self.assertEqual("create_multipart_upload", self.client.operations()[0])
+        self.assertIn("upload_part", self.client.operations())
+        self.assertEqual(
+            ["complete_multipart_upload", "put_object"], self.client.operations()[-2:]
+        )
+
+        with tarfile.open(
+            fileobj=BytesIO(self.client.objects["task.tar.gz"]), mode="r:gz"
+        ) as tar:
+            names = tar.getnames()
+            for filename in ["screenshot.png", "readings.csv", "current/empty.txt"]:
+                self.assertEqual(
+                    self.files[filename],
+                    tar.extractfile(self.arcname(filename)).read(),
+                )
+            self.assertEqual(
+                b"log message\n",
+                tar.extractfile(self.arcname("datafeeds.log")).read(),
+            )
+        self.assertIn(self.arcname("current/downloaded"), names)
+        self.assertNotIn(self.arcname("current/downloaded/bill.pdf"), names)
+
+        pdf = [
+            f
+            for f in manifest["files"]
+            if f["name"] == self.arcname("current/downloaded/bill.pdf")
+        ]
+        self.assertEqual(
+            [{"bucket": "bills", "key": "abc.pdf"}], [f["s3"] for f in pdf]
+        )
+
+    def test_fetch_archived_file(self):
+        archive.archive_directory(
+            self.workdir, BUCKET, "task", extra_files={"datafeeds.log": self.log}
+        )
+        # small enough for a single put
+        self.assertNotIn("create_multipart_upload", self.client.operations())
+        self.client.calls = []
+
+        for filename, data in self.files.items():
+            self.assertEqual(
+                data,
+                archive.fetch_archived_file(BUCKET, "task", self.arcname(filename)),
+            )
+        self.assertEqual(
+            b"log message\n",
+            archive.fetch_archived_file(BUCKET, "task", self.arcname("datafeeds.log")),
+        )
+        self.assertIsNone(
+            archive.fetch_archived_file(BUCKET, "task", self.arcname("other.csv"))
+        )
+
+    def test_abort(self):
+        """A failed archive aborts the multipart upload."""
+        with mock.patch.object(
+            self.client, "upload_part", side_effect=Exception("network error")
+        ):
+            with self.assertRaises(Exception):
+                archive.archive_directory(self.workdir, BUCKET, "task", part_size=10000)
+        self.assertEqual("abort_multipart_upload", self.client.operations()[-1])
+        self.assertEqual({}, self.client.objects)
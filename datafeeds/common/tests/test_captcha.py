@@ -0,0 +1,82 @@
+import json
+import unittest
+from unittest import mock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from datafeeds.common import captcha, tracing
+
+IFRAME_URL = "https://www.google.com/recaptcha/api2/anchor?ar=1&k=site-key&co=abc"
+
+
+class FakeElement:
+    def __init__(self, attributes):
+        self.attributes = attributes
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.scripts = []
+
+    def find_element_by_tag_name(self, name):
+        return FakeElement({"src": IFRAME_URL})
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+
+
+class CaptchaTests(unittest.TestCase):
+    def setUp(self):
+        tracing.reset()
+        self.addCleanup(captcha.set_solver, None)
+        self.driver = FakeDriver()
+        self.parent = FakeElement({})
+
+    def test_local_solver(self):
+        captcha.set_solver(captcha.LocalSolver("token-123", delay=0.2))
+        future = captcha.start_recaptcha_v2(
+            self.driver, self.parent, "https://example.com", utility="utility:test"
+        )
+        # solving doesn't block the caller
+        self.assertFalse(future.done())
+        captcha.set_recaptcha_response(self.driver, future.result(), settle=0)
+        self.assertIn('innerHTML="token-123"', self.driver.scripts[0])
+        phases = tracing.summary()["phases"]
+        self.assertEqual(1, phases["captcha utility:test solved"]["calls"])
+        self.assertGreaterEqual(phases["captcha utility:test solved"]["seconds"], 0.2)
+
+    def test_failed(self):
+        captcha.set_solver(captcha.LocalSolver(token=""))
+        future = captcha.start_recaptcha_v2(
+            self.driver, self.parent, "https://example.com", utility="utility:test"
+        )
+        with self.assertRaises(captcha.CaptchaFailed):
+            future.result()
+        self.assertIn("captcha utility:test failed", tracing.summary()["phases"])
+
+    def test_two_captcha(self):
+        bodies = [
+            {"status": 1, "request": "12345"},
+            {"status": 0, "request": "CAPCHA_NOT_READY"},
+            {"status": 1, "request": "token-456"},
+        ]
+        sent = []
+
+        def send(adapter, request, **kwargs):
+            sent.append(request)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(bodies[len(sent) - 1]).encode("utf-8")
+            response.request = request
+            return response
+
+        solver = captcha.TwoCaptchaSolver(first_poll=0, poll_interval=0)
+        with mock.patch.object(HTTPAdapter, "send", send):
+            self.assertEqual("token-456", solver.solve("site-key", "https://x.com"))
+        self.assertIn("googlekey=site-key", sent[0].body)
+        self.assertIn("id=12345", sent[1].url)
+        self.assertEqual(3, len(sent))
@@ -0,0 +1,152 @@
+from datetime import datetime
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from datafeeds.common import cassette
+from datafeeds.scrapers.solaredge import Session
+from datafeeds.scrapers.tests.data.solaredge import meter_example, site_details
+
+
+class FakeAdapter:
+    """Stand-in for sending requests: respond with the body for the request's path."""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requests = []
+
+    def send(self, adapter, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        path = request.path_url.split("?")[0]
+        response.status_code = 200 if path in self.bodies else 404
+        response.reason = "OK"
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Set-Cookie"] = "session=abc"
+        response._content = self.bodies.get(path, "").encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class CassetteTests(unittest.TestCase):
+    def setUp(self):
+        send = HTTPAdapter.send
+        # the cassette restores the adapter
+        self.addCleanup(lambda: self.assertIs(send, HTTPAdapter.send))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cassettes", "api.json")
+
+    def record(self, bodies, fn):
+        fake = FakeAdapter(bodies)
+        with mock.patch.object(HTTPAdapter, "send", fake.send):
+            with cassette.Cassette(self.path, cassette.RECORD):
+                fn()
+        return fake
+
+    def test_record_and_replay(self):
+        def requests_made():
+            session = requests.Session()
+            session.headers["Authorization"] = "Bearer secret-token"
+            login = session.post(
+                "https://api.example.com/login",
+                json={"username": "user", "password": "secret"},
+            )
+            data = [
+                session.get(
+                    "https://api.example.com/data",
+                    params={"day": day, "api_key": "secret"},
+                ).json()
+                for day in [1, 2]
+            ]
+            return login.json(), data
+
+        fake = self.record(
+            {"/login": '{"ok": true}', "/data": '{"value": 1}'}, requests_made
+        )
+        self.assertEqual(3, len(fake.requests))
+        with open(self.path) as f:
+            recorded = f.read()
+        self.assertNotIn("secret", recorded)
+        self.assertNotIn("session=abc", recorded)
+        self.assertEqual(
+            "https://api.example.com/data?api_key=REDACTED&day=1",
+            json.loads(recorded)["interactions"][1]["request"]["url"],
+        )
+
+        # replayed with different credentials; nothing is sent
+        with mock.patch.object(HTTPAdapter, "send", side_effect=AssertionError):
+            with cassette.Cassette(self.path):
+                self.assertEqual(
+                    ({"ok": True}, [{"value": 1}, {"value": 1}]), requests_made()
+                )
+                with self.assertRaises(cassette.CassetteError):
+                    requests.get("https://api.example.com/data?day=3")
+
+    def test_repeated_requests(self):
+        """Responses to the same request are replayed in order; then the last is repeated."""
+        fake = FakeAdapter({"/status": '{"state": "pending"}'})
+        with mock.patch.object(HTTPAdapter, "send", fake.send):
+            with cassette.Cassette(self.path, cassette.RECORD):
+                requests.get("https://api.example.com/status")
+                fake.bodies["/status"] = '{"state": "done"}'
+                requests.get("https://api.example.com/status")
+
+        with cassette.Cassette(self.path):
+            states = [
+                requests.get("https://api.example.com/status").json()["state"]
+                for _ in range(3)
+            ]
+        self.assertEqual(["pending", "done", "done"], states)
+
+    def test_latency(self):
+        self.record(
+            {"/data": "{}"}, lambda: requests.get("https://api.example.com/data")
+        )
+        replay = cassette.Cassette(self.path, latency=0.05, jitter=0.5, seed=0)
+        delays = [replay.delay() for _ in range(20)]
+        self.assertTrue(all(0.025 <= delay <= 0.075 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+        with replay:
+            start = time.monotonic()
+            requests.get("https://api.example.com/data")
+            self.assertGreaterEqual(time.monotonic() - start, 0.02)
+
+    def test_solaredge(self):
+        """An API scraper's session can be run against a cassette."""
+
+        def fetch():
+            session = Session("https://monitoringapi.solaredge.com/site/1", "key")
+            site = session.site()
+            intervals = session.get_intervals(
+                session.api_base,
+                datetime(2019, 11, 1),
+                datetime(2019, 11, 2),
+                site.installation_date,
+            )
+            return site.id, intervals[0][0].kwh
+
+        self.record(
+            {
+                "/site/1/details": site_details.site_details,
+                "/site/1/meters": meter_example.meter_example,
+            },
+            fetch,
+        )
+        with cassette.Cassette(self.path):
+            self.assertEqual((12345678, 15655.772), fetch())
+
+    def test_from_config(self):
+        with mock.patch.object(cassette.config, "HTTP_CASSETTE", None):
+            self.assertNotIsInstance(cassette.from_config(), cassette.Cassette)
+        with mock.patch.object(cassette.config, "HTTP_CASSETTE", self.path):
+            replay = cassette.from_config()
+        self.assertEqual((self.path, cassette.REPLAY), (replay.path, replay.mode))
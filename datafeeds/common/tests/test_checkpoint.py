@@ -0,0 +1,91 @@
+from datetime import date, datetime, timedelta
+import os
+import tempfile
+import unittest
+
+from datafeeds.common.checkpoint import Checkpoint, LocalStore
+from datafeeds.common.support import DateRange
+from datafeeds.common.timeline import Timeline
+
+
+class CheckpointTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.store = LocalStore(os.path.join(self.tmp, "checkpoints"))
+        self.uploaded = []
+
+    def checkpoint(self, **kwargs) -> Checkpoint:
+        return Checkpoint("123-srp", self.store, self.uploaded.append, **kwargs)
+
+    def download(self, text: str) -> str:
+        path = os.path.join(self.tmp, "interval.csv")
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def readings(self, start: date, end: date, value: float):
+        timeline = Timeline(start, end)
+        day = start
+        while day <= end:
+            timeline.insert(datetime.combine(day, datetime.min.time()), value)
+            day += timedelta(days=1)
+        return timeline.serialize(include_empty=False)
+
+    def test_restore(self):
+        first = DateRange(date(2021, 1, 1), date(2021, 1, 10))
+        second = DateRange(date(2021, 1, 11), date(2021, 1, 20))
+        checkpoint = self.checkpoint()
+        checkpoint.complete(
+            first,
+            self.readings(first.start_date, first.end_date, 1.0),
+            self.download("1"),
+        )
+        self.assertEqual(
+            [sorted(self.readings(first.start_date, first.end_date, 1.0))],
+            [sorted(readings) for readings in self.uploaded],
+        )
+
+        # a retry (or the next run) restores the completed sub-range
+        resumed = self.checkpoint()
+        timeline = Timeline(date(2021, 1, 1), date(2021, 1, 20))
+        self.assertTrue(resumed.restore(timeline, first))
+        self.assertFalse(resumed.restore(timeline, second))
+        self.assertFalse(
+            resumed.restore(timeline, DateRange(date(2021, 1, 5), date(2021, 1, 15)))
+        )
+        serialized = timeline.serialize()
+        self.assertEqual([1.0] + [None] * 95, serialized["2021-01-10"])
+        self.assertEqual([None] * 96, serialized["2021-01-11"])
+
+        resumed.clear()
+        self.assertFalse(self.checkpoint().restore(timeline, first))
+        self.assertFalse(os.listdir(self.store.directory))
+
+    def test_expired(self):
+        sub_range = DateRange(date(2021, 1, 1), date(2021, 1, 10))
+        readings = self.readings(sub_range.start_date, sub_range.end_date, 1.0)
+        self.checkpoint().complete(sub_range, readings, self.download("1"))
+
+        expired = self.checkpoint(max_age=timedelta(0))
+        timeline = Timeline(sub_range.start_date, sub_range.end_date)
+        self.assertFalse(expired.restore(timeline, sub_range))
+        # downloaded again: the same file isn't uploaded again
+        expired.complete(sub_range, readings, self.download("1"))
+        self.assertEqual(1, len(self.uploaded))
+        expired.complete(sub_range, readings, self.download("2"))
+        self.assertEqual(2, len(self.uploaded))
+
+    def test_upload_error(self):
+        def fail(readings):
+            raise ValueError("database is down")
+
+        sub_range = DateRange(date(2021, 1, 1), date(2021, 1, 2))
+        checkpoint = Checkpoint("123-srp", None, fail)
+        checkpoint.complete(
+            sub_range, self.readings(date(2021, 1, 1), date(2021, 1, 2), 1.0)
+        )
+        self.assertTrue(
+            checkpoint.restore(Timeline(date(2021, 1, 1), date(2021, 1, 2)), sub_range)
+        )
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+import unittest
+from unittest import mock
+
+import pyaes
+
+from datafeeds.common import crypto
+from datafeeds.models import datasource
+from datafeeds.smd import encryption
+
+KEY = ("snapmeter" * 4)[:32].encode("utf-8")
+VALUES = [
+    "",
+    "a",
+    "user@example.com",
+    "a password longer than one 16 byte block!",
+    "x" * 300,
+]
+# encrypted as pyaes does (one byte per character), but not valid UTF-8 to decrypt
+NON_ASCII = ["pässword", "ÿ", "café".encode("utf-8")]
+
+
+class CryptoTests(unittest.TestCase):
+    def setUp(self):
+        crypto.credentials.clear()
+        self.addCleanup(crypto.credentials.clear)
+
+    def test_matches_pyaes(self):
+        """Values encrypted by pyaes decrypt the same, and encrypt to the same bytes."""
+        for value in VALUES:
+            encrypted = pyaes.AESModeOfOperationCTR(KEY).encrypt(value)
+            self.assertEqual(encrypted, crypto.ctr_encrypt(KEY, value))
+            self.assertEqual(value, crypto.credentials.decrypt(KEY, encrypted))
+
+    def test_pure_python(self):
+        with mock.patch.object(crypto, "Cipher", None):
+            for value in VALUES:
+                encrypted = pyaes.AESModeOfOperationCTR(KEY).encrypt(value)
+                self.assertEqual(encrypted, crypto.ctr_encrypt(KEY, value))
+                self.assertEqual(value, crypto.credentials.decrypt(KEY, encrypted))
+
+    def test_non_ascii(self):
+        """Non-ASCII text encrypts to the same bytes as pyaes, with either backend."""
+        for cipher in [crypto.Cipher, None]:
+            with mock.patch.object(crypto, "Cipher", cipher):
+                for value in NON_ASCII:
+                    self.assertEqual(
+                        pyaes.AESModeOfOperationCTR(KEY).encrypt(value),
+                        crypto.ctr_encrypt(KEY, value),
+                    )
+        # UTF-8 bytes decrypt to text
+        encrypted = crypto.ctr_encrypt(KEY, "café".encode("utf-8"))
+        self.assertEqual("café", crypto.credentials.decrypt(KEY, encrypted))
+        # pyaes can't encrypt characters above U+00FF, and neither can ctr_encrypt
+        with self.assertRaises(ValueError):
+            pyaes.AESModeOfOperationCTR(KEY).encrypt("x€")
+        with self.assertRaises(ValueError):
+            crypto.ctr_encrypt(KEY, "x€")
+
+    def test_batch_and_cache(self):
+        encrypted = [crypto.ctr_encrypt(KEY, value) for value in VALUES]
+        with mock.patch.object(
+            crypto, "keystream", side_effect=crypto.keystream
+        ) as keystream:
+            crypto.credentials.decrypt_all(KEY, encrypted + [None])
+            self.assertEqual(
+                VALUES, [crypto.credentials.decrypt(KEY, value) for value in encrypted]
+            )
+            self.assertEqual(1, keystream.call_count)
+
+        cached = list(crypto.credentials._values.values())
+        crypto.credentials.clear()
+        self.assertTrue(all(not any(value) for value in cached))
+
+    def test_decrypt_credentials(self):
+        def meter_data_source(username, password):
+            return SimpleNamespace(
+                account_data_source=SimpleNamespace(
+                    _username_bytes=datasource.aes_encrypt(username),
+                    _password_bytes=datasource.aes_encrypt(password),
+                )
+            )
+
+        data_sources = [
+            meter_data_source("user1", "secret1"),
+            meter_data_source("user2", "secret2"),
+            SimpleNamespace(account_data_source=None),
+        ]
+        datasource.decrypt_credentials(data_sources)
+        self.assertEqual(4, len(crypto.credentials._values))
+        self.assertEqual(
+            "secret2",
+            datasource.aes_decrypt(data_sources[1].account_data_source._password_bytes),
+        )
+        # SMD credentials are encrypted with their own key
+        self.assertEqual(
+            "token", encryption.aes_decrypt(encryption.aes_encrypt("token"))
+        )
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+import random
+import unittest
+
+from datafeeds.common.date_ranges import DisjointDateRanges
+from datafeeds.common.typing import BillingDatum, is_without_overlaps
+
+
+def billing_datum(start: date, end: date) -> BillingDatum:
+    return BillingDatum(
+        start=start,
+        end=end,
+        statement=end,
+        cost=0,
+        used=0,
+        peak=None,
+        items=[],
+        attachments=[],
+        utility_code=None,
+    )
+
+
+class DisjointDateRangesTests(unittest.TestCase):
+    def test_add(self):
+        ranges: DisjointDateRanges[str] = DisjointDateRanges()
+        self.assertTrue(ranges.add(date(2020, 2, 1), date(2020, 2, 29), "feb"))
+        self.assertTrue(ranges.add(date(2020, 1, 1), date(2020, 1, 31), "jan"))
+        # ranges are inclusive; sharing an end date is an overlap
+        self.assertFalse(ranges.add(date(2020, 2, 29), date(2020, 3, 31), "mar"))
+        self.assertTrue(ranges.add(date(2020, 3, 1), date(2020, 3, 31), "mar"))
+
+        self.assertEqual(["jan", "feb", "mar"], ranges.items())
+        self.assertEqual(
+            "jan", ranges.find_overlap(date(2019, 12, 1), date(2020, 2, 15))
+        )
+        self.assertIsNone(ranges.find_overlap(date(2020, 4, 1), date(2020, 4, 30)))
+        with self.assertRaises(ValueError):
+            ranges.add(date(2020, 5, 2), date(2020, 5, 1), "invalid")
+
+    def test_matches_pairwise_comparison(self):
+        """Ranges are accepted exactly when they don't overlap any accepted range."""
+        rand = random.Random(7)
+        start = date(2018, 1, 1)
+        ranges: DisjointDateRanges[int] = DisjointDateRanges()
+        accepted = []
+        for idx in range(2000):
+            a = start + timedelta(days=rand.randrange(0, 1500))
+            b = a + timedelta(days=rand.randrange(0, 40))
+            expected = not any(s <= b and a <= e for s, e in accepted)
+            self.assertEqual(expected, ranges.add(a, b, idx))
+            if expected:
+                accepted.append((a, b))
+        self.assertEqual(sorted(accepted), [(s, e) for s, e, _ in ranges.ranges()])
+
+    def test_is_without_overlaps(self):
+        jan = billing_datum(date(2020, 1, 1), date(2020, 1, 31))
+        feb = billing_datum(date(2020, 2, 1), date(2020, 2, 29))
+        apr = billing_datum(date(2020, 4, 1), date(2020, 4, 30))
+        self.assertTrue(is_without_overlaps([apr, jan, feb]))
+        self.assertFalse(is_without_overlaps([jan, feb, jan]))
+        self.assertFalse(
+            is_without_overlaps(
+                [jan, billing_datum(date(2020, 1, 31), date(2020, 2, 5))]
+            )
+        )
@@ -0,0 +1,98 @@
+from datetime import date
+import unittest
+
+from datafeeds.common import daylight_savings
+from datafeeds.common.daylight_savings import DSTCalendar
+from datafeeds.common.interval_csv import FIRST, LAST, SUM
+
+
+class DSTCalendarTests(unittest.TestCase):
+    def test_day_lengths(self):
+        calendar = DSTCalendar(
+            "America/Los_Angeles", date(2020, 1, 1), date(2020, 12, 31)
+        )
+        self.assertEqual([date(2020, 3, 8)], calendar.starts)
+        self.assertEqual([date(2020, 11, 1)], calendar.ends)
+        self.assertEqual(92, calendar.count(date(2020, 3, 8)))
+        self.assertEqual(100, calendar.count(date(2020, 11, 1)))
+        self.assertEqual(366 * 96, sum(calendar.counts))
+
+        for timezone in ["America/Phoenix", "Pacific/Honolulu"]:
+            calendar = DSTCalendar(timezone, date(2020, 1, 1), date(2020, 12, 31))
+            self.assertEqual(([], []), (calendar.starts, calendar.ends))
+
+        calendar = DSTCalendar(
+            "Europe/Copenhagen", date(2020, 1, 1), date(2020, 12, 31), interval=60
+        )
+        self.assertEqual([date(2020, 3, 29)], calendar.starts)
+        self.assertEqual([25], [calendar.count(day) for day in calendar.ends])
+
+    def test_us_rules(self):
+        self.assertIn(date(2021, 11, 7), daylight_savings.DST_ENDS)
+        self.assertIn(date(2021, 3, 14), daylight_savings.DST_STARTS)
+        # before 2007, daylight savings time started in April and ended in October
+        self.assertIn(date(2005, 4, 3), daylight_savings.DST_STARTS)
+        self.assertIn(date(2005, 10, 30), daylight_savings.DST_ENDS)
+        # after 2037, where pytz's transitions end
+        self.assertIn(date(2040, 3, 11), daylight_savings.DST_STARTS)
+        self.assertIn(date(2099, 11, 1), daylight_savings.DST_ENDS)
+        self.assertEqual(100, len(daylight_savings.DST_STARTS))
+        self.assertEqual(100, len(daylight_savings.DST_ENDS))
+        # the same days as the tz database
+        calendar = DSTCalendar(
+            "America/Los_Angeles", date(2000, 1, 1), date(2036, 12, 31), interval=60
+        )
+        self.assertEqual(
+            set(calendar.starts),
+            {day for day in daylight_savings.DST_STARTS if day.year < 2037},
+        )
+        self.assertEqual(
+            set(calendar.ends),
+            {day for day in daylight_savings.DST_ENDS if day.year < 2037},
+        )
+
+    def test_utc_offsets(self):
+        calendar = DSTCalendar(
+            "America/Los_Angeles", date(2020, 11, 1), date(2020, 11, 1)
+        )
+        offsets = calendar.utc_offsets()
+        self.assertEqual([-420] * 8 + [-480] * 92, list(offsets))
+        self.assertEqual(
+            [0, 1, 2, 3, 4, 5, 6, 7, 4, 5, 6, 7, 8], list(calendar.positions()[:13])
+        )
+
+    def test_to_fixed(self):
+        calendar = DSTCalendar("America/Chicago", date(2021, 3, 13), date(2021, 3, 14))
+        values = [1.0] * 96 + [2.0] * 92
+        values[96] = None
+        fixed = calendar.to_fixed(values)
+        self.assertEqual((2, 96), fixed.shape)
+        self.assertEqual([1.0] * 96, list(fixed[0]))
+        self.assertEqual(
+            [None, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, None, None, None, None, 2.0],
+            [None if value != value else value for value in fixed[1][:13]],
+        )
+        with self.assertRaises(ValueError):
+            calendar.to_fixed(values[1:])
+
+    def test_fixed_day(self):
+        calendar = DSTCalendar(
+            "America/Los_Angeles", date(2020, 10, 31), date(2020, 11, 2)
+        )
+        day = date(2020, 11, 1)
+        values = (
+            [1.0] * 4 + [2.0, 2.0, None, None] + [4.0, None, 4.0, None] + [1.0] * 88
+        )
+        self.assertEqual(
+            [1.0] * 4 + [3.0, 2.0, 4.0, None] + [1.0] * 88,
+            calendar.fixed_day(day, values),
+        )
+        self.assertEqual(
+            [6.0, 2.0, 4.0, None], calendar.fixed_day(day, values, SUM)[4:8]
+        )
+        self.assertEqual(
+            [2.0, 2.0, None, None], calendar.fixed_day(day, values, FIRST)[4:8]
+        )
+        self.assertEqual(
+            [4.0, 2.0, 4.0, None], calendar.fixed_day(day, values, LAST)[4:8]
+        )
@@ -1,4 +1,6 @@
 from datetime import datetime, date, timedelta
+import logging
+import tempfile
 import unittest
 from typing import List, Dict
 from unittest import mock
@@ -171,14 +173,97 @@ class IndexTests(unittest.TestCase):
         }
         self.assertEqual(expected, index_etl_run.call_args[0][1])
 
+    @mock.patch("datafeeds.common.index._get_es_connection")
+    @mock.patch("datafeeds.common.index.bulk")
     @mock.patch("datafeeds.common.index.index_etl_run")
-    def test_index_logs(self, index_etl_run):
+    def test_index_logs(self, index_etl_run, bulk_index, _es_conn):
+        bulk_index.return_value = (6, 0)
         log_fixture = "datafeeds/common/tests/log_fixture.txt"
         with open(log_fixture, "r") as f:
             log_data = f.read()
         with mock.patch("datafeeds.common.index.config.LOGPATH", log_fixture):
             index_logs("abc123")
         index_etl_run.assert_called_once_with("abc123", {"log": log_data})
+        docs = list(bulk_index.call_args[0][1])
+        self.assertEqual(6, len(docs))
+        self.assertEqual(
+            {
+                "_index": index.LOG_INDEX,
+                "_type": "_doc",
+                "_id": "abc123-1",
+                "_source": {
+                    "time": "2021-03-12T15:14:56.074",
+                    "level": "INFO",
+                    "logger": None,
+                    "message": "Scraper Launch Settings:",
+                    "task_id": "abc123",
+                    "meter": None,
+                },
+            },
+            docs[0],
+        )
+
+        # only the end of a large log is stored on the run doc
+        with mock.patch("datafeeds.common.index.config.LOGPATH", log_fixture):
+            with mock.patch("datafeeds.common.index.LOG_TAIL_BYTES", 100):
+                index_logs("abc123")
+        tail = index_etl_run.call_args[0][1]["log"]
+        self.assertTrue(log_data.endswith(tail))
+        self.assertTrue(50 < len(tail) <= 100)
+        self.assertTrue(tail.startswith("2021-03-12"))
+
+    @mock.patch("datafeeds.common.index._get_es_connection")
+    @mock.patch("datafeeds.common.index.bulk")
+    def test_index_log_records(self, bulk_index, _es_conn):
+        lines = [
+            "2021-03-12 15:14:56,074 : INFO : datafeeds.scrapers.ladwp : logging in",
+            "2021-03-12 15:14:57,100 : DEBUG : datafeeds.scrapers.ladwp : found element",
+            "2021-03-12 15:14:58,200 : ERROR : datafeeds.common.base : run failed",
+            "Traceback (most recent call last):",
+            '  File "launch.py", line 3, in <module>',
+            "Exception: failed",
+            "2021-03-12 15:14:59,300 : WARNING : datafeeds.common.base : done",
+            "2021-03-12 15:15:00,400 : WARNING : urllib3.connectionpool : retrying",
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".log") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+
+            def indexed():
+                index.index_log_records("abc123", 42, f.name)
+                return [
+                    (doc["_id"], doc["_source"]["level"], doc["_source"]["message"])
+                    for doc in bulk_index.call_args[0][1]
+                ]
+
+            bulk_index.return_value = (4, 0)
+            self.assertEqual(
+                [
+                    ("abc123-1", "INFO", "logging in"),
+                    ("abc123-3", "ERROR", "\n".join(["run failed"] + lines[3:6])),
+                    ("abc123-7", "WARNING", "done"),
+                    ("abc123-8", "WARNING", "retrying"),
+                ],
+                indexed(),
+            )
+            docs = list(index._log_docs(f.name, "abc123", 42, logging.DEBUG))
+            self.assertEqual(
+                [
+                    "datafeeds.scrapers.ladwp",
+                    "datafeeds.scrapers.ladwp",
+                    "datafeeds.common.base",
+                    "datafeeds.common.base",
+                    "urllib3.connectionpool",
+                ],
+                [doc["_source"]["logger"] for doc in docs],
+            )
+            self.assertEqual(42, docs[0]["_source"]["meter"])
+
+            with mock.patch("datafeeds.common.index.config.ES_LOG_MAX_BYTES", 100):
+                self.assertEqual(
+                    ["abc123-3", "abc123-7", "abc123-8"],
+                    [doc[0] for doc in indexed()],
+                )
 
     @mock.patch("datafeeds.common.index._get_es_connection")
     @mock.patch("datafeeds.common.index.bulk")
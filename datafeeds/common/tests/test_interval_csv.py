@@ -0,0 +1,128 @@
+from datetime import date, datetime
+import os
+import re
+import tempfile
+import unittest
+
+from datafeeds.common import interval_csv
+from datafeeds.common.exceptions import InvalidMeterDataException
+from datafeeds.common.timeline import Timeline
+from datafeeds.common.typing import IntervalReading
+from datafeeds.scrapers.pse_interval import PSEIntervalReportParser
+from datafeeds.scrapers.sce_react.errors import IntervalDataParseException
+from datafeeds.scrapers.sce_react.parser import parse_sce_csv_file
+
+# readings for 1:00 - 1:45 are repeated when daylight savings time ends
+FALL_BACK = """Account,123
+Report,Interval Usage
+
+Date,Time,1234567,7654321
+11/01/2020,12:45 AM,"1,000.5",1
+11/01/2020,1:00 AM,2.0,1
+11/01/2020,1:15 AM,,1
+11/01/2020,1:00 AM,4.0,1
+11/01/2020,1:15 AM,3.0,1
+11/01/2020,1:30 AM,null,1
+,,,
+"""
+
+
+class IntervalCSVTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def write(self, text: str) -> str:
+        path = os.path.join(self.tmp, "intervals.csv")
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def read(self, **kwargs):
+        path = self.write(FALL_BACK)
+        readings = interval_csv.read_interval_csv(
+            path, timestamp=["Date", "Time"], value="1234567", **kwargs
+        )
+        return {
+            dt.strftime("%H:%M"): value
+            for dt, value in zip(readings.index, readings.astype(object))
+        }
+
+    def test_duplicates(self):
+        self.assertEqual(
+            {"00:45": 1000.5, "01:00": 3.0, "01:15": 3.0, "01:30": None},
+            {
+                key: None if value != value else value
+                for key, value in self.read().items()
+            },
+        )
+        summed = self.read(duplicates=interval_csv.SUM)
+        self.assertEqual((6.0, 3.0), (summed["01:00"], summed["01:15"]))
+        first = self.read(duplicates=interval_csv.FIRST)
+        self.assertEqual(2.0, first["01:00"])
+        self.assertNotEqual(first["01:15"], first["01:15"])  # NaN
+        last = self.read(duplicates=interval_csv.LAST)
+        # missing readings are skipped
+        self.assertEqual((4.0, 3.0), (last["01:00"], last["01:15"]))
+        with self.assertRaises(ValueError):
+            self.read(duplicates="latest")
+
+    def test_detect_timestamp_format(self):
+        self.assertEqual(
+            "%m/%d/%y %H:%M",
+            interval_csv.detect_timestamp_format(["10/30/20 00:15", "10/30/20 13:00"]),
+        )
+        self.assertEqual(
+            "%m/%d/%Y %I:%M %p",
+            interval_csv.detect_timestamp_format(["11/1/2020 1:00 AM"]),
+        )
+        self.assertIsNone(interval_csv.detect_timestamp_format(["Nov 1 2020 1am"]))
+
+    def test_errors(self):
+        path = self.write(
+            "Date / Time,KW(ch: 1 set:0)\n10/30/20 00:15,1\n10/30/20 00:30,x\n"
+        )
+        with self.assertRaisesRegex(InvalidMeterDataException, "'x'"):
+            interval_csv.read_interval_csv(path, "date", re.compile(r"KW\(ch: 1"))
+        readings = interval_csv.read_interval_csv(
+            path, "date", re.compile(r"KW\(ch: 1"), errors=interval_csv.SKIP
+        )
+        self.assertEqual([1.0], list(readings))
+        with self.assertRaises(interval_csv.HeaderNotFoundError):
+            interval_csv.read_interval_csv(path, "date", "kvar")
+
+    def test_insert_readings(self):
+        path = self.write(FALL_BACK)
+        readings = interval_csv.read_interval_csv(path, [0, 1], "7654321")
+        timeline = Timeline(date(2020, 11, 1), date(2020, 11, 1))
+        interval_csv.insert_readings(timeline, readings)
+        self.assertEqual(
+            [None, None, None, 1.0, 1.0, 1.0, 1.0, None],
+            timeline.serialize()["2020-11-01"][:8],
+        )
+
+    def test_sce(self):
+        path = self.write(FALL_BACK)
+        readings = parse_sce_csv_file(path, "1234567")
+        self.assertEqual(
+            IntervalReading(dt=datetime(2020, 11, 1, 0, 45), value=1000.5), readings[0]
+        )
+        self.assertIsNone(readings[-1].value)
+        with self.assertRaisesRegex(IntervalDataParseException, "SAID=123456$"):
+            parse_sce_csv_file(path, "123456")
+
+    def test_pse(self):
+        path = self.write(
+            "Report\nMeter\n\n"
+            "Sun,2019-11-03 00:45,1.0,Sun,2020-11-01 00:45,0.5,-0.5\n"
+            "Sun,2019-11-03 01:00,1.0,Sun,2020-11-01 01:00,1.0,0\n"
+            "Sun,2019-11-03 01:00,1.0,Sun,2020-11-01 01:00,2.0,1\n"
+            "Sun,2019-11-03 01:00,1.0,Sun,2020-11-01 01:00,null,\n"
+            "Sun,2019-11-03 01:15,1.0,Sun,2020-11-01 01:15,null,\n"
+            "Sun,2019-11-03 01:30,1.0,Sun,2020-11-01 01:30,oops,\n"
+        )
+        parser = PSEIntervalReportParser(date(2020, 11, 1), date(2020, 11, 1))
+        parser.parse_csv(path)
+        # the last reading for a repeated timestamp is kept
+        self.assertEqual([2.0, 8.0, None, None], parser.serialize()["2020-11-01"][3:7])
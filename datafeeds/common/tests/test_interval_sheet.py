@@ -0,0 +1,105 @@
+from datetime import datetime
+import os
+import tempfile
+import unittest
+
+import openpyxl
+import pandas as pd
+
+from datafeeds.common import interval_sheet
+from datafeeds.common.exceptions import InvalidMeterDataException
+from datafeeds.common.interval_csv import HeaderNotFoundError, SKIP, SUM
+
+ATMOS = "datafeeds/scrapers/tests/fixtures/atmos-example-01.xls"
+
+
+def write_xlsx(path: str, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+
+class IntervalSheetTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "extract.xlsx")
+
+    def test_xlsx(self):
+        write_xlsx(
+            self.path,
+            [
+                ["Logo"],
+                [None, "Timestamp", "Site", "Fuel In", "Metric", "Electricity Out"],
+                [None, None, None, "(therms)", None, "(kWh)"],
+                [None, datetime(2021, 1, 1, 0, 0), "A", 1, None, 25],
+                # an Excel serial date: 2021-01-01 00:15
+                [None, 44197 + 1 / 96, "A", 1, None, "1,000"],
+                [None, datetime(2021, 1, 1, 0, 30), "A", 1, None, None],
+                [None, datetime(2021, 1, 1, 0, 30), "A", 1, None, 5],
+                [None, None, None, None, None, None],
+                [None, "01/01/2021 00:45", "A"],
+            ],
+        )
+        readings = interval_sheet.read_interval_sheet(
+            self.path, timestamp=1, value="Electricity Out", scale=4
+        )
+        self.assertEqual(
+            [
+                datetime(2021, 1, 1, 0, 0),
+                datetime(2021, 1, 1, 0, 15),
+                datetime(2021, 1, 1, 0, 30),
+                datetime(2021, 1, 1, 0, 45),
+            ],
+            list(readings.index.to_pydatetime()),
+        )
+        self.assertEqual([100.0, 4000.0, 20.0], list(readings.iloc[:3]))
+        self.assertNotEqual(readings.iloc[3], readings.iloc[3])  # NaN
+
+        summed = interval_sheet.read_interval_sheet(
+            self.path, timestamp=1, value="electricity", duplicates=SUM
+        )
+        self.assertEqual(5.0, summed[datetime(2021, 1, 1, 0, 30)])
+
+        with self.assertRaises(HeaderNotFoundError):
+            interval_sheet.read_interval_sheet(self.path, 1, "Electricity In")
+
+    def test_errors(self):
+        write_xlsx(
+            self.path,
+            [
+                ["Date", "kWh"],
+                [datetime(2021, 1, 1, 0, 0), 1],
+                [datetime(2021, 1, 1, 0, 15), "n/a"],
+                ["Total", 1],
+            ],
+        )
+        with self.assertRaisesRegex(InvalidMeterDataException, "'Total'"):
+            interval_sheet.read_interval_sheet(self.path, "date", "kwh")
+        readings = interval_sheet.read_interval_sheet(
+            self.path, "date", "kwh", errors=SKIP
+        )
+        self.assertEqual([1.0], list(readings))
+
+    def test_xls(self):
+        (accounts, used), datemode = interval_sheet._xls_columns(
+            ATMOS, 0, ["Service Account", "Billed CCF"]
+        )
+        self.assertEqual((3028521652.0, 323.0), (accounts[0], used[0]))
+        self.assertEqual(48, len(used))
+
+    def test_excel_timestamps(self):
+        noon = datetime(2021, 1, 1, 12, 0)
+        self.assertEqual(
+            [noon, noon, None],
+            [
+                None if when is pd.NaT else when.to_pydatetime()
+                for when in interval_sheet.excel_timestamps([44197.5, noon, "noon"])
+            ],
+        )
+        # workbooks that use the 1904 date system
+        self.assertEqual(
+            noon, interval_sheet.excel_timestamps([42735.5], datemode=1).iloc[0]
+        )
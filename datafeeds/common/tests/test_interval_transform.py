@@ -58,7 +58,7 @@ class IntervalTransformTests(unittest.TestCase):
             else:
                 self.assertEqual(abs(orig_val), val)
 
-    @patch("datafeeds.common.interval_transform.post_slack_message")
+    @patch("datafeeds.common.interval_transform.queue_alert")
     def test_mixed_transform(self, slack):
         meter = MagicMock()
         meter.interval = 15
@@ -91,7 +91,7 @@ class IntervalTransformTests(unittest.TestCase):
         with self.assertRaises(InvalidMeterDataException) as exc:
             interval_transform.to_positive(readings, meter)
             self.assertTrue("mixed positive and negative values" in exc)
-        self.assertIn("mixed positive and negative", slack.call_args_list[0][0][0])
+        self.assertIn("mixed positive and negative", slack.call_args_list[0][0][1])
 
     def test_transform(self):
         """Transform always runs positive transform."""
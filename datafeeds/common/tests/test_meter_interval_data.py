@@ -0,0 +1,96 @@
+from datetime import date, datetime, timedelta
+import unittest
+
+import numpy as np
+
+from datafeeds import db
+from datafeeds.common import test_utils
+from datafeeds.models import Meter
+from datafeeds.models.meter import MeterReading
+
+
+class MeterIntervalDataTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        test_utils.init_test_db()
+
+    def setUp(self):
+        self.day = date(2020, 3, 1)
+
+    def tearDown(self):
+        db.session.rollback()
+
+    def add_meter(self, interval=15, kind="main", parent=None, direction="forward"):
+        meter = Meter(
+            commodity="kw",
+            interval=interval,
+            kind=kind,
+            name="Test Meter %s" % kind,
+            parent=parent,
+            direction=direction,
+        )
+        db.session.add(meter)
+        db.session.flush()
+        return meter
+
+    def add_readings(self, meter, day, readings):
+        db.session.add(
+            MeterReading(meter=meter.oid, occurred=day, readings=readings, frozen=False)
+        )
+        db.session.flush()
+
+    def test_interval_data(self):
+        meter = self.add_meter(interval=60)
+        self.add_readings(meter, self.day, [1.0] * 12 + [None] * 12)
+        self.add_readings(meter, self.day + timedelta(days=2), [2.0] * 24)
+
+        start = datetime(2020, 3, 1, 6)
+        data = meter.interval_data(start, datetime(2020, 3, 3, 3))
+        # half open; a missing day is filled with None
+        self.assertEqual(24 * 2 - 6 + 3, len(data))
+        self.assertEqual((start, 1.0), data[0])
+        self.assertEqual((datetime(2020, 3, 1, 12), None), data[6])
+        self.assertEqual((datetime(2020, 3, 2, 0), None), data[18])
+        self.assertEqual((datetime(2020, 3, 3, 2), 2.0), data[-1])
+
+        self.assertEqual(
+            [], meter.interval_data(datetime(2020, 4, 1), datetime(2020, 4, 2))
+        )
+
+    def test_totalized_meter(self):
+        """Submeter readings are signed and summed; missing only if every submeter is missing."""
+        meter = self.add_meter(interval=60, kind="totalized")
+        forward = self.add_meter(interval=60, parent=meter.oid)
+        reverse = self.add_meter(interval=60, parent=meter.oid, direction="reverse")
+        self.add_readings(forward, self.day, [3.0] * 12 + [None] * 12)
+        self.add_readings(reverse, self.day, [1.0] * 6 + [None] * 12 + [2.0] * 6)
+
+        expected = [2.0] * 6 + [3.0] * 6 + [None] * 6 + [-2.0] * 6
+        data = meter.interval_data(datetime(2020, 3, 1), datetime(2020, 3, 2))
+        self.assertEqual(expected, [v for _, v in data])
+
+        index, values = meter.interval_arrays(
+            datetime(2020, 3, 1), datetime(2020, 3, 2)
+        )
+        self.assertEqual(np.datetime64("2020-03-01T00:00"), index[0])
+        np.testing.assert_array_equal(np.array(expected, dtype=np.float64), values)
+
+    def test_readings_array(self):
+        np.testing.assert_array_equal(
+            np.array([-1.5, np.nan, 0, -2e-5]),
+            Meter.readings_array("[1.5, null,0, 2e-05]", "reverse"),
+        )
+        self.assertEqual(0, len(Meter.readings_array("[]")))
+
+    def test_year_of_readings(self):
+        meter = self.add_meter(interval=5)
+        readings = [float(idx) for idx in range(288)]
+        for idx in range(366):
+            self.add_readings(meter, self.day + timedelta(days=idx), readings)
+
+        index, values = meter.interval_arrays(
+            datetime(2020, 3, 1), datetime(2021, 3, 1)
+        )
+        self.assertEqual(365 * 288, len(values))
+        self.assertEqual(np.datetime64("2021-02-28T23:55"), index[-1])
+        self.assertEqual(287.0, values[-1])
@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
+import unittest
+from unittest import mock
+
+from datafeeds.orm import OidGenerator
+
+
+def oid(clock, counter, node_id=3072):
+    return (clock << 22) | ((node_id % 1024) << 12) | counter
+
+
+def allocate_in_process(node_id, count):
+    """Allocate count OIDs in a fresh generator state, with the wall clock stopped."""
+    OidGenerator.node_id = node_id
+    OidGenerator._clock = None
+    OidGenerator._counter = 0
+    with mock.patch.object(OidGenerator, "_wall_clock", return_value=1000):
+        oids = OidGenerator.allocate_many(count // 2)
+        oids += [OidGenerator.allocate() for _ in range(count - len(oids))]
+    return oids
+
+
+class OidGeneratorTests(unittest.TestCase):
+    def setUp(self):
+        self.state = (OidGenerator.node_id, OidGenerator._clock, OidGenerator._counter)
+        OidGenerator.node_id = 3072
+        OidGenerator._clock = None
+        OidGenerator._counter = 0
+        self.now = 1000
+        patcher = mock.patch.object(
+            OidGenerator, "_wall_clock", side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sleep = mock.patch("datafeeds.orm.time.sleep").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def tearDown(self):
+        OidGenerator.node_id, OidGenerator._clock, OidGenerator._counter = self.state
+
+    def test_allocate_many(self):
+        """Bulk allocation borrows future clock ticks instead of sleeping."""
+        oids = OidGenerator.allocate_many(10000)
+        self.assertEqual(10000, len(set(oids)))
+        self.assertEqual(sorted(oids), oids)
+        self.assertEqual(1002, OidGenerator._clock)
+        self.assertEqual(oid(1000, 0), oids[0])
+        self.assertEqual(oid(1002, 10000 - 2 * 4096 - 1), oids[-1])
+
+        more = [OidGenerator.allocate() for _ in range(5000)]
+        more += OidGenerator.allocate_many(3)
+        self.assertTrue(oids[-1] < more[0])
+        self.assertEqual(15003, len(set(oids + more)))
+        self.sleep.assert_not_called()
+
+    def test_clock_catches_up(self):
+        OidGenerator.allocate_many(4096 * 3)
+        self.assertEqual(1002, OidGenerator._clock)
+        self.now = 1010
+        first = OidGenerator.allocate()
+        self.assertEqual(oid(1010, 4095), OidGenerator.allocate_many(4095)[-1])
+        self.assertEqual(oid(1010, 0), first)
+
+    def test_borrowed_ticks_are_limited(self):
+        with mock.patch.object(OidGenerator, "_max_borrowed_ticks", 2):
+            OidGenerator.allocate_many(4096 * 3)
+            self.sleep.assert_not_called()
+            OidGenerator.allocate()
+            self.sleep.assert_called_once_with(1)
+
+    def test_node_id(self):
+        """The low 10 bits of the Node ID are part of the OID."""
+        OidGenerator.node_id = 3072 + 1023
+        self.assertEqual(oid(1000, 0, 4095), OidGenerator.allocate())
+        self.assertEqual(oid(1000, 1, 4095), OidGenerator.allocate_many(1)[0])
+        self.assertTrue(OidGenerator.allocate() < 2 ** 52)
+
+    def test_processes(self):
+        """Processes with different Node IDs never hand out the same OID, even on the same ticks."""
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    allocate_in_process,
+                    [3072 + idx for idx in range(4)],
+                    [3 * 4096 + 100] * 4,
+                )
+            )
+        oids = [value for result in results for value in result]
+        self.assertEqual(4 * (3 * 4096 + 100), len(oids))
+        self.assertEqual(len(oids), len(set(oids)))
@@ -0,0 +1,101 @@
+import unittest
+
+from datafeeds.common import tracing
+from datafeeds.common.util.pagestate.pagestate import (
+    PageState,
+    PageStateMachine,
+    TransitionTimeoutException,
+    selector_present,
+)
+
+
+class FakeDriver:
+    """Evaluates ready scripts by looking up their expressions in ready."""
+
+    def __init__(self, ready=()):
+        self.ready = set(ready)
+        self.scripts = []
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        if "throw" in self.ready:
+            raise Exception("page is navigating")
+        # one result per expression in the script
+        expressions = script.split("return !!(")[1:]
+        return [
+            any(expression.startswith(ready) for ready in self.ready)
+            for expression in expressions
+        ]
+
+
+class DeclaredPage(PageState):
+    def __init__(self, driver, selector):
+        super().__init__(driver)
+        self.ready_selector = selector
+
+
+class ConditionPage(PageState):
+    def __init__(self, driver, ready):
+        super().__init__(driver)
+        self.ready = ready
+
+    def get_ready_condition(self):
+        return lambda driver: self.ready
+
+
+class PageStateMachineTests(unittest.TestCase):
+    def setUp(self):
+        tracing.reset()
+
+    def machine(self, driver, pages):
+        machine = PageStateMachine(driver)
+        machine.add_state("login", transitions=list(pages), wait_time=0)
+        for name, page in pages.items():
+            machine.add_state(name, page=page)
+        machine.set_initial_state("login")
+        return machine
+
+    def test_batched_scripts(self):
+        driver = FakeDriver([selector_present("#dashboard")])
+        machine = self.machine(
+            driver,
+            {
+                "login_failed": DeclaredPage(driver, ".error"),
+                "choose_account": ConditionPage(driver, False),
+                "dashboard": DeclaredPage(driver, "#dashboard"),
+            },
+        )
+        self.assertEqual("dashboard", machine.run())
+        # both declared pages are checked with one script
+        self.assertEqual(1, len(driver.scripts))
+        self.assertIn(selector_present(".error"), driver.scripts[0])
+        self.assertEqual(
+            [{"source": "login", "dest": "dashboard", "polls": 1}],
+            [
+                {key: value for key, value in times.items() if key != "seconds"}
+                for times in machine.transition_times
+            ],
+        )
+        self.assertEqual(
+            1, tracing.summary()["phases"]["transition login -> dashboard"]["calls"]
+        )
+
+    def test_first_ready(self):
+        driver = FakeDriver([selector_present("#dashboard")])
+        machine = self.machine(
+            driver,
+            {
+                "choose_account": ConditionPage(driver, True),
+                "dashboard": DeclaredPage(driver, "#dashboard"),
+            },
+        )
+        self.assertEqual("choose_account", machine.run())
+        # the first state is ready, so the scripts aren't run
+        self.assertEqual([], driver.scripts)
+
+    def test_script_error(self):
+        driver = FakeDriver(["throw"])
+        machine = self.machine(driver, {"dashboard": DeclaredPage(driver, "#x")})
+        with self.assertRaises(TransitionTimeoutException):
+            machine.run()
+        self.assertEqual([], machine.transition_times)
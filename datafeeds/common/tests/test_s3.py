@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+
+from datafeeds.common.tests.fake_s3 import FakeS3Client
+from datafeeds.common.util import s3
+from datafeeds.common.util.s3 import S3Inventory, S3Upload
+
+BUCKET = "bills"
+
+
+class S3InventoryTests(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeS3Client(["a1.pdf", "a2.pdf", "a3.pdf", "b1.pdf"])
+        patcher = mock.patch.object(s3, "_client", self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exists(self):
+        """Keys found are remembered; missing keys are checked again."""
+        inventory = S3Inventory(BUCKET)
+        self.assertTrue(inventory.exists("b1.pdf"))
+        self.assertTrue(inventory.exists("b1.pdf"))
+        self.assertFalse(inventory.exists("b2.pdf"))
+        self.assertFalse(inventory.exists("b2.pdf"))
+        self.assertEqual(
+            [("head_object", "b1.pdf")] + [("head_object", "b2.pdf")] * 2,
+            self.client.calls,
+        )
+
+    def test_list_prefix(self):
+        inventory = S3Inventory(BUCKET)
+        self.assertEqual(3, inventory.list_prefix("a"))
+        self.assertEqual([("list_objects_v2", "a")] * 2, self.client.calls)
+        self.client.calls = []
+
+        self.assertTrue(inventory.exists("a2.pdf"))
+        # under a listed prefix; known not to exist
+        self.assertFalse(inventory.exists("a4.pdf"))
+        self.assertEqual([], self.client.calls)
+        # not under a listed prefix
+        self.assertTrue(inventory.exists("b1.pdf"))
+        self.assertEqual([("head_object", "b1.pdf")], self.client.calls)
+
+    def test_ensure_uploaded(self):
+        """Only missing keys are uploaded, and their bodies fetched."""
+        inventory = S3Inventory(BUCKET)
+        inventory.list_prefix("a")
+        self.client.calls = []
+        fetched = []
+
+        def fetch(key):
+            def body():
+                fetched.append(key)
+                return None if key == "a6.pdf" else b"new"
+
+            return body
+
+        uploads = [
+            S3Upload(key, fetch(key))
+            for key in ["a1.pdf", "a4.pdf", "a5.pdf", "a3.pdf", "a6.pdf"]
+        ]
+        self.assertEqual(
+            ["a1.pdf", "a4.pdf", "a5.pdf", "a3.pdf", None],
+            inventory.ensure_uploaded(uploads),
+        )
+        self.assertEqual(["a4.pdf", "a5.pdf", "a6.pdf"], sorted(fetched))
+        self.assertEqual(
+            [("put_object", "a4.pdf"), ("put_object", "a5.pdf")],
+            sorted(self.client.calls),
+        )
+        self.assertEqual(b"new", self.client.objects["a5.pdf"])
+        self.assertTrue(inventory.exists("a5.pdf"))
+
+    @mock.patch("datafeeds.config.enabled")
+    def test_upload_file_to_s3(self, enabled):
+        enabled.return_value = True
+        with mock.patch.object(s3, "_inventories", {}):
+            self.assertEqual(
+                "c1.pdf",
+                s3.upload_pdf_to_s3(b"pdf", BUCKET, "c1.pdf", "statement.pdf"),
+            )
+            self.assertTrue(s3.s3_key_exists(BUCKET, "c1.pdf"))
+        self.assertEqual(
+            [("head_object", "c1.pdf"), ("put_object", "c1.pdf")], self.client.calls
+        )
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import time
+import unittest
+
+from selenium.common.exceptions import TimeoutException
+
+from datafeeds.common.util.selenium import (
+    dom_stable,
+    download_complete,
+    network_idle,
+    wait_for_download,
+    wait_until_settled,
+)
+
+
+class FakeDriver:
+    """Stand-in for a browser: returns page activity from a list, then the last one."""
+
+    def __init__(self, activity):
+        self.activity = activity
+        self.calls = 0
+
+    def execute_script(self, script):
+        self.calls += 1
+        return self.activity[min(self.calls, len(self.activity)) - 1]
+
+
+def activity(ready="complete", pending=0, resources=10, quiet=1000.0):
+    return {"ready": ready, "pending": pending, "resources": resources, "quiet": quiet}
+
+
+class WaitTests(unittest.TestCase):
+    def test_network_idle(self):
+        condition = network_idle(idle=0.05)
+        driver = FakeDriver(
+            [activity(ready="loading"), activity(pending=2), activity(), activity()]
+        )
+        self.assertFalse(condition(driver))
+        self.assertFalse(condition(driver))
+        # the first quiet poll starts the idle period
+        self.assertFalse(condition(driver))
+        time.sleep(0.06)
+        self.assertTrue(condition(driver))
+
+        # another resource loaded restarts it
+        driver.activity.append(activity(resources=11))
+        self.assertFalse(condition(driver))
+
+    def test_dom_stable(self):
+        self.assertFalse(dom_stable(0.5)(FakeDriver([activity(quiet=100.0)])))
+        self.assertTrue(dom_stable(0.5)(FakeDriver([activity(quiet=600.0)])))
+
+    def test_wait_until_settled(self):
+        self.assertTrue(wait_until_settled(FakeDriver([activity()]), idle=0.1))
+        busy = FakeDriver([activity(pending=1)])
+        start = time.monotonic()
+        # gives up after seconds, like the sleep it replaces
+        self.assertFalse(wait_until_settled(busy, seconds=0.3))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_wait_for_download(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "bill.pdf.crdownload"), "w") as f:
+                f.write("partial")
+            with self.assertRaises(TimeoutException):
+                wait_for_download(None, tmp, r".*\.pdf$", seconds=0.5, stable=0.1)
+
+            os.rename(
+                os.path.join(tmp, "bill.pdf.crdownload"), os.path.join(tmp, "bill.pdf")
+            )
+            self.assertEqual(
+                os.path.join(tmp, "bill.pdf"),
+                wait_for_download(None, tmp, r".*\.pdf$", seconds=2, stable=0.1),
+            )
+
+    def test_download_complete(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # a file left from an earlier download
+            with open(os.path.join(tmp, "z-old.pdf"), "w") as f:
+                f.write("old")
+            os.utime(os.path.join(tmp, "z-old.pdf"), (time.time() - 60,) * 2)
+            with open(os.path.join(tmp, "a-new.pdf"), "w") as f:
+                f.write("new")
+            os.utime(os.path.join(tmp, "a-new.pdf"), (time.time() - 30,) * 2)
+            # without stable, a finished download is returned right away
+            self.assertEqual("a-new.pdf", download_complete(tmp, r".*\.pdf$")(None))
+
+            condition = download_complete(tmp, r".*\.pdf$", stable=0.05)
+            self.assertFalse(condition(None))
+            time.sleep(0.06)
+            # the newest file changed: its size has to be stable for stable seconds again
+            with open(os.path.join(tmp, "b-newer.pdf"), "w") as f:
+                f.write("newer")
+            self.assertFalse(condition(None))
+            time.sleep(0.06)
+            self.assertEqual("b-newer.pdf", condition(None))
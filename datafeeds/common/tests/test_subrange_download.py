@@ -0,0 +1,163 @@
+from datetime import date
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from dateutil.relativedelta import relativedelta
+import requests
+from requests.adapters import HTTPAdapter
+
+from datafeeds.common import subrange_download
+from datafeeds.common.subrange_download import FormRequest, ReplayError
+from datafeeds.common.support import DateRange
+from datafeeds.scrapers.saltriver.intervals import SaltRiverIntervalScraper
+
+
+class FakeDriver:
+    def __init__(self, form):
+        self.form = form
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if "userAgent" in script:
+            return "Mozilla/5.0 (test)"
+        return self.form
+
+    def get_cookies(self):
+        return [
+            {"name": "ASPSESSIONID", "value": "abc", "domain": "example.com"},
+            {"name": "token", "value": "xyz", "path": "/reports"},
+        ]
+
+
+def respond(request, body: bytes, content_type: str, headers=None):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = content_type
+    response.headers.update(headers or {})
+    response._content = body
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class SubrangeDownloadTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def test_form_request(self):
+        driver = FakeDriver(
+            {
+                "method": "POST",
+                "url": "https://example.com/download.asp",
+                "fields": [["StartDate", "01/01/2021"], ["ID", "123"]],
+            }
+        )
+        request = subrange_download.form_request(
+            driver, "submit", {"#start": "01/01/2021"}
+        )
+        self.assertEqual(
+            FormRequest(
+                "POST",
+                "https://example.com/download.asp",
+                [("StartDate", "01/01/2021"), ("ID", "123")],
+            ),
+            request,
+        )
+        self.assertEqual(("submit", {"#start": "01/01/2021"}), driver.scripts[0][1])
+
+        session = subrange_download.session_from_driver(driver, 4)
+        self.assertEqual("Mozilla/5.0 (test)", session.headers["User-Agent"])
+        self.assertEqual("abc", session.cookies.get("ASPSESSIONID"))
+        self.assertEqual("xyz", session.cookies.get("token", path="/reports"))
+        self.assertEqual(4, session.get_adapter("https://example.com")._pool_maxsize)
+
+    def test_replay(self):
+        sent = []
+
+        def send(adapter, request, **kwargs):
+            sent.append(request)
+            if "expired" in request.url:
+                return respond(request, b"<html>login</html>", "text/html")
+            return respond(
+                request,
+                b"Date,KW\n",
+                "application/octet-stream",
+                {"Content-Disposition": 'attachment; filename="interval 1.csv"'},
+            )
+
+        session = requests.Session()
+        with mock.patch.object(HTTPAdapter, "send", send):
+            path = subrange_download.replay(
+                session,
+                FormRequest("POST", "https://example.com/d", [("ID", "1")]),
+                self.tmp,
+                "default.csv",
+            )
+            self.assertEqual(os.path.join(self.tmp, "interval 1.csv"), path)
+            with open(path) as f:
+                self.assertEqual("Date,KW\n", f.read())
+            self.assertEqual("ID=1", sent[0].body)
+
+            subrange_download.replay(
+                session,
+                FormRequest("GET", "https://example.com/d", [("ID", "1")]),
+                self.tmp,
+                "default.csv",
+            )
+            self.assertEqual("https://example.com/d?ID=1", sent[1].url)
+
+            with self.assertRaises(ReplayError):
+                subrange_download.replay(
+                    session,
+                    FormRequest("GET", "https://example.com/expired", []),
+                    self.tmp,
+                    "default.csv",
+                )
+
+    def test_download_subranges(self):
+        sub_ranges = list(
+            DateRange(date(2021, 1, 1), date(2021, 3, 31)).split_iter(
+                relativedelta(days=10)
+            )
+        )
+        lock = threading.Lock()
+        running = [0, 0]  # now, most at once
+
+        def download(sub_range: DateRange, directory: str) -> str:
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.02)
+            path = os.path.join(directory, "interval.csv")
+            with open(path, "w") as f:
+                f.write(str(sub_range.start_date))
+            with lock:
+                running[0] -= 1
+            return path
+
+        downloads = subrange_download.download_subranges(
+            sub_ranges, download, self.tmp, 3
+        )
+        self.assertEqual(sub_ranges, [sub_range for sub_range, _ in downloads])
+        self.assertLessEqual(running[1], 3)
+        self.assertGreater(running[1], 1)
+        for sub_range, path in downloads:
+            self.assertIn(sub_range.start_date.strftime("%Y%m%d"), path)
+            with open(path) as f:
+                self.assertEqual(str(sub_range.start_date), f.read())
+
+    def test_subrange_downloads(self):
+        scraper = SaltRiverIntervalScraper.__new__(SaltRiverIntervalScraper)
+        self.assertEqual(1, scraper.subrange_downloads())
+        with mock.patch("datafeeds.config.SUBRANGE_DOWNLOADS", 8):
+            self.assertEqual(
+                SaltRiverIntervalScraper.max_subrange_downloads,
+                scraper.subrange_downloads(),
+            )
@@ -0,0 +1,77 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from unittest import mock
+
+from datafeeds import db
+from datafeeds.common import test_utils, tracing
+
+
+class TracingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        test_utils.init_test_db()
+
+    def setUp(self):
+        tracing.reset()
+
+    def tearDown(self):
+        db.session.rollback()
+
+    @tracing.traced("download")
+    def download(self, nbytes):
+        tracing.record_download(nbytes)
+
+    def test_span(self):
+        """Nested phases are included in the totals of the phases they're in."""
+        with tracing.span("scrape"):
+            self.download(100)
+            self.download(50)
+            with tracing.span("upload_bills"):
+                db.session.execute("select 1")
+                db.session.execute("select 2")
+        with self.assertRaises(ValueError):
+            with tracing.span("upload_bills"):
+                raise ValueError()
+
+        summary = tracing.summary()
+        self.assertEqual(2, summary["queries"])
+        self.assertEqual(150, summary["downloadedBytes"])
+        phases = summary["phases"]
+        self.assertEqual({"scrape", "download", "upload_bills"}, set(phases))
+        self.assertEqual(
+            {"calls": 2, "queries": 0, "bytes": 150},
+            {k: v for k, v in phases["download"].items() if k != "seconds"},
+        )
+        self.assertEqual(
+            {"calls": 2, "queries": 2, "bytes": 0},
+            {k: v for k, v in phases["upload_bills"].items() if k != "seconds"},
+        )
+        self.assertEqual(
+            {"calls": 1, "queries": 2, "bytes": 150},
+            {k: v for k, v in phases["scrape"].items() if k != "seconds"},
+        )
+        self.assertGreaterEqual(
+            phases["scrape"]["seconds"], phases["download"]["seconds"]
+        )
+
+        tracing.reset()
+        self.assertEqual(
+            {"phases": {}, "queries": 0, "downloadedBytes": 0}, tracing.summary()
+        )
+
+    def test_profile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with tracing.profile(tmp):
+                self.download(10)
+            self.assertEqual([], os.listdir(tmp))
+
+            with mock.patch("datafeeds.config.PROFILE_RUNS", True):
+                with tracing.profile(tmp):
+                    self.download(10)
+            stats = pstats.Stats(os.path.join(tmp, tracing.PROFILE_FILENAME))
+            self.assertIn("download", {func[2] for func in stats.stats})  # type: ignore
+            with open(os.path.join(tmp, tracing.PHASES_FILENAME)) as f:
+                self.assertEqual(2, json.load(f)["phases"]["download"]["calls"])
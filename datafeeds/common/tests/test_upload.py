@@ -2,6 +2,7 @@ import unittest
 from unittest import mock
 
 import random
+from types import SimpleNamespace
 from datetime import date, datetime, timedelta
 
 from datafeeds import db
@@ -17,7 +18,10 @@ from datafeeds.common.typing import (
     BillingDatumItemsEntry,
     Status,
 )
+from datafeeds.common.tests.fake_s3 import FakeS3Client
 from datafeeds.common.upload import _upload_bills_to_services, AttachStatus
+from datafeeds.common.util import s3
+from datafeeds.models.bill_document import BillDocument
 from datafeeds.models.billaudit import BillAudit, WorkflowState
 from datafeeds.models.meter import ProductEnrollment, Building
 from datafeeds.models.utility_service import TND_ONLY
@@ -1916,6 +1920,100 @@ class TestPdfAttachment(unittest.TestCase):
         )
         self.assertEqual(status, Status.COMPLETED, "All PDF's already attached.")
 
+    def test_match_bills(self):
+        """Each window gets the bills with dates in it, including bills shared by windows."""
+        bills = [
+            SimpleNamespace(oid=oid, closing=closing)
+            for oid, closing in [
+                (1, date(2019, 3, 1)),
+                (2, date(2019, 1, 31)),
+                (3, date(2019, 2, 28)),
+                (4, date(2019, 6, 1)),
+            ]
+        ]
+        windows = [
+            (date(2019, 2, 15), date(2019, 3, 1)),
+            (date(2019, 1, 20), date(2019, 2, 2)),
+            (date(2019, 4, 1), date(2019, 4, 30)),
+            (date(2019, 2, 28), date(2019, 3, 15)),
+        ]
+        matches = upload.match_bills(windows, bills, lambda bill: bill.closing)
+        self.assertEqual(
+            [[3, 1], [2], [], [3, 1]],
+            [[bill.oid for bill in bills] for bills in matches],
+        )
+
+    def test_attach_bill_pdfs_saved(self):
+        """Attachments for several PDFs and bills are written to the database."""
+        bill_3 = Bill()
+        bill_3.initial = date(2019, 5, 3)
+        bill_3.closing = date(2019, 6, 2)
+        bill_3.service = self.service.oid
+        db.session.add(bill_3)
+        db.session.flush()
+        next_pdf = BillPdf(
+            self.service.utility_account_id,
+            self.service.utility_account_id,
+            date(2019, 5, 3),
+            date(2019, 6, 2),
+            date(2019, 6, 5),
+            "next.pdf",
+        )
+        status = upload.attach_bill_pdfs(
+            self.meter_ids[0], None, False, [self.bill_pdf, next_pdf]
+        )
+        self.assertEqual(status, Status.SUCCEEDED)
+
+        db.session.expire_all()
+        attachment = {"kind": "bill", "key": self.key, "format": "PDF"}
+        self.assertEqual([attachment], self.bill_1.attachments)
+        self.assertEqual([attachment], self.bill_2.attachments)
+        self.assertEqual(
+            [{"kind": "bill", "key": "next.pdf", "format": "PDF"}],
+            bill_3.attachments,
+        )
+
+    @mock.patch("datafeeds.config.enabled")
+    def test_upload_bills_to_s3(self, enabled):
+        """Bill PDFs are uploaded once per key, and recorded as bill documents."""
+        enabled.return_value = True
+        client = FakeS3Client(["existing.pdf"])
+        uploads = [
+            upload.BillUpload(
+                b"pdf",
+                key,
+                "pge.com",
+                date(2019, 5, 2),
+                "utility:pge",
+                self.service.utility_account_id,
+            )
+            for key in ["new.pdf", "existing.pdf", "new.pdf"]
+        ]
+        with mock.patch.object(s3, "_client", client), mock.patch.object(
+            s3, "_inventories", {}
+        ):
+            entries = upload.upload_bills_to_s3(uploads)
+        self.assertEqual(
+            ["new.pdf", "existing.pdf", "new.pdf"], [entry.key for entry in entries]
+        )
+        self.assertEqual(
+            [
+                ("head_object", "existing.pdf"),
+                ("head_object", "new.pdf"),
+                ("put_object", "new.pdf"),
+            ],
+            sorted(client.calls),
+        )
+        docs = (
+            db.session.query(BillDocument)
+            .filter(BillDocument.s3_key.in_(["new.pdf", "existing.pdf"]))
+            .all()
+        )
+        self.assertEqual(
+            ["existing.pdf", "new.pdf"], sorted(doc.s3_key for doc in docs)
+        )
+        self.assertEqual({"pge"}, {doc.utility for doc in docs})
+
     def test_attach_status(self):
         self.assertEqual(
             AttachStatus.FOUND,
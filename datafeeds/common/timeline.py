@@ -63,6 +63,15 @@ class Timeline:
         if self._start <= d <= self._end:
             self.index[d][t] = value
 
+    def update(self, readings):
+        """Insert readings in the form returned by serialize."""
+        for day, values in readings.items():
+            current = datetime.strptime(day, "%Y-%m-%d")
+            step = timedelta(minutes=24 * 60 // len(values)) if values else None
+            for value in values:
+                self.insert(current, value)
+                current += step
+
     def lookup(self, dt):
         """Lookup a value at the input datetime."""
         d = dt.date()
@@ -0,0 +1,133 @@
+"""Time the phases of a scraper run
+
+Wrap a phase of a run in a span (a context manager, or the traced decorator), and the
+time spent in it, the number of database queries made, and the bytes downloaded are added
+to the totals for that phase. Spans can nest; the totals for a phase include the phases
+within it. The totals are reset at the start of each run, and run_datafeed adds them to
+the run's Elasticsearch doc (see summary).
+
+Queries are counted for the datafeeds database (see db.init). Downloads are counted where
+they're recorded with record_download.
+
+With config.PROFILE_RUNS, the run is also profiled with cProfile, and the stats are written
+to profile.pstats in the working directory, to be archived with the run. Read them with
+pstats, or a viewer such as snakeviz or speedscope.
+"""
+import cProfile
+from contextlib import contextmanager
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from datafeeds import config
+
+log = logging.getLogger(__name__)
+
+PROFILE_FILENAME = "profile.pstats"
+PHASES_FILENAME = "phases.json"
+
+_lock = threading.Lock()
+# phase name -> seconds, calls, queries, bytes
+_phases: Dict[str, Dict[str, float]] = {}
+_totals = {"queries": 0, "bytes": 0}
+
+
+def reset():
+    """Clear the totals, at the start of a run."""
+    with _lock:
+        _phases.clear()
+        _totals["queries"] = 0
+        _totals["bytes"] = 0
+
+
+def count_query(*args, **kwargs):
+    """Count a database query; a before_cursor_execute listener."""
+    _totals["queries"] += 1
+
+
+def record_download(nbytes: int):
+    with _lock:
+        _totals["bytes"] += nbytes
+
+
+@contextmanager
+def span(name: str):
+    """Add the time, queries and downloads within this block to the totals for phase name."""
+    queries = _totals["queries"]
+    downloaded = _totals["bytes"]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(
+            name,
+            time.perf_counter() - start,
+            _totals["queries"] - queries,
+            _totals["bytes"] - downloaded,
+        )
+
+
+def record(name: str, seconds: float, queries: int = 0, nbytes: int = 0):
+    """Add a call to phase name, timed by the caller (eg when the name isn't known up front)."""
+    with _lock:
+        phase = _phases.setdefault(
+            name, {"seconds": 0.0, "calls": 0, "queries": 0, "bytes": 0}
+        )
+        phase["seconds"] += seconds
+        phase["calls"] += 1
+        phase["queries"] += queries
+        phase["bytes"] += nbytes
+
+
+def traced(name: str):
+    """Decorate a function to run it in a span."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def summary() -> Dict[str, Any]:
+    """Return the totals for each phase, and for the run, as fields for an ETL run doc."""
+    with _lock:
+        phases = {
+            name: dict(phase, seconds=round(phase["seconds"], 3))
+            for name, phase in _phases.items()
+        }
+        return {
+            "phases": phases,
+            "queries": _totals["queries"],
+            "downloadedBytes": _totals["bytes"],
+        }
+
+
+@contextmanager
+def profile(directory: Optional[str] = None):
+    """With config.PROFILE_RUNS, profile this block; write the stats and phases to directory."""
+    if not config.PROFILE_RUNS:
+        yield
+        return
+
+    directory = directory or config.WORKING_DIRECTORY
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        try:
+            profiler.dump_stats(os.path.join(directory, PROFILE_FILENAME))
+            with open(os.path.join(directory, PHASES_FILENAME), "w") as f:
+                json.dump(summary(), f, indent=2)
+        except OSError:
+            log.exception("Failed to write profile to %s.", directory)
@@ -6,6 +6,8 @@ from datetime import date, timedelta
 from functools import reduce
 import logging
 
+from datafeeds.common.date_ranges import DisjointDateRanges
+
 
 log = logging.getLogger(__name__)
 
@@ -186,18 +188,8 @@ def is_contiguous(bd: BillingData) -> bool:
 
 def is_without_overlaps(bd: BillingData) -> bool:
     """A date range that's permissive of gaps but not overlaps or dupes"""
-
-    def comparator(acc, elem: BillingDatum):
-        return (
-            elem.end
-            if acc is True
-            or (isinstance(acc, date) and acc <= elem.start - timedelta(days=1))
-            else False
-        )
-
-    chronologically = sorted(bd, key=lambda b: b.start)
-
-    return reduce(comparator, chronologically, True) is not False
+    ranges: DisjointDateRanges[BillingDatum] = DisjointDateRanges()
+    return all(b.start <= b.end and ranges.add(b.start, b.end, b) for b in bd)
 
 
 def _log_invalid_date_range(bd: BillingData) -> None:
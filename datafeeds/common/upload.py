@@ -6,14 +6,27 @@ from datetime import timedelta, date, datetime
 
 from deprecation import deprecated
 import os
-from sqlalchemy.orm.attributes import flag_modified
-from typing import Optional, Union, BinaryIO, List, Dict, Set, Any, Tuple
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 from io import BytesIO
 import hashlib
 from sqlalchemy import func
 
 from datafeeds import config, db
-from datafeeds.common import index, platform
+from datafeeds.common import index, platform, tracing
 from datafeeds.common.partial_billing import PartialBillProcessor
 from datafeeds.common.typing import (
     BillingData,
@@ -25,6 +38,8 @@ from datafeeds.common.typing import (
 )
 from datafeeds.common import interval_transform
 from datafeeds.common.util.s3 import (
+    S3Upload,
+    ensure_uploaded_to_s3,
     upload_pdf_to_s3,
     remove_file_from_s3,
     s3_key_exists,
@@ -83,6 +98,7 @@ def verify_bills(meter_oid: int, billing_data: BillingData) -> BillingData:
     return data
 
 
+@tracing.traced("upload_bills")
 def upload_bills(
     meter_oid: int,
     service_id: str,
@@ -122,16 +138,27 @@ def upload_bills(
     return Status.COMPLETED
 
 
+@tracing.traced("upload_readings")
 def upload_readings(
-    transforms, meter_oid: int, scraper: str, task_id: str, readings
+    transforms,
+    meter_oid: int,
+    scraper: str,
+    task_id: str,
+    readings,
+    completed: Optional[List[MeterReading]] = None,
 ) -> Status:
-    updated: List[MeterReading] = []
+    """Write the readings from the run to the database.
+
+    completed is the readings already written during the run by upload_completed_readings;
+    they count as updated for the run status and the Elasticsearch interval fields.
+    """
+    updated: List[MeterReading] = list(completed or [])
     if readings:
         readings = interval_transform.transform(
             transforms, task_id, scraper, meter_oid, readings
         )
         log.info("writing interval data to the database for %s %s", scraper, meter_oid)
-        updated = MeterReading.merge_readings(
+        updated += MeterReading.merge_readings(
             MeterReading.from_json(meter_oid, readings)
         )
 
@@ -161,6 +188,34 @@ def upload_readings(
     return Status.COMPLETED
 
 
+def upload_completed_readings(
+    transforms,
+    meter_oid: int,
+    scraper: str,
+    task_id: str,
+    readings,
+    completed: Optional[List[MeterReading]] = None,
+) -> List[MeterReading]:
+    """Write the readings from a completed sub-range to the database during the run.
+
+    See common/checkpoint.py; upload_readings writes all of the readings at the end of the run.
+    The updated readings are returned, and added to completed to pass to upload_readings.
+    """
+    readings = interval_transform.transform(
+        transforms, task_id, scraper, meter_oid, readings
+    )
+    log.info(
+        "writing %s days of interval data to the database for %s %s",
+        len(readings),
+        scraper,
+        meter_oid,
+    )
+    updated = MeterReading.merge_readings(MeterReading.from_json(meter_oid, readings))
+    if completed is not None:
+        completed.extend(updated)
+    return updated
+
+
 class AttachStatus(Enum):
     ATTACHED = "attached"
     FOUND = "found"
@@ -179,9 +234,50 @@ class AttachStatus(Enum):
         return None
 
 
+AttachedBill = Union[Bill, PartialBill]
+BillT = TypeVar("BillT", Bill, PartialBill)
+
+
+def _day(value: date) -> date:
+    """PDF dates may be datetimes; bill dates are dates."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def match_bills(
+    windows: List[Tuple[date, date]],
+    bills: List[BillT],
+    bill_date: Callable[[BillT], date],
+) -> List[List[BillT]]:
+    """For each (first, last) date window, return the bills with bill_date in it (inclusive).
+
+    Bills and windows are sorted by date and matched in one sweep, instead of querying
+    for each window.
+    """
+    bills = sorted(bills, key=bill_date)
+    dates = [bill_date(bill) for bill in bills]
+    matches: List[List[BillT]] = [[] for _ in windows]
+    lower = 0
+    for idx in sorted(range(len(windows)), key=lambda idx: windows[idx][0]):
+        first, last = windows[idx]
+        # bills before this window are before every later window too
+        while lower < len(bills) and dates[lower] < first:
+            lower += 1
+        upper = lower
+        while upper < len(bills) and dates[upper] <= last:
+            matches[idx].append(bills[upper])
+            upper += 1
+    return matches
+
+
 def add_attachment_to_bills(
-    pdf: BillPdf, bills: List[Union[Bill, PartialBill]]
+    pdf: BillPdf,
+    bills: List[AttachedBill],
+    updated: Dict[Tuple[type, int], AttachedBill],
 ) -> AttachStatus:
+    """Add pdf to the front of each bill's attachments.
+
+    Bills are updated in memory only, and added to updated; save them with save_attachments.
+    """
     att_status = AttachStatus.NOT_ATTACHED
     for bill in bills:
         bill_type = (
@@ -210,94 +306,157 @@ def add_attachment_to_bills(
                     bill.oid,
                 )
                 continue
-        if not bill.attachments:
-            bill.attachments = []
         # Insert new PDF's at the beginning so they are surfaced in the UI.
-        bill.attachments.insert(0, {"kind": "bill", "key": pdf.s3_key, "format": "PDF"})
-        flag_modified(bill, "attachments")
-        db.session.add(bill)
+        attachments = [{"kind": "bill", "key": pdf.s3_key, "format": "PDF"}]
+        attachments.extend(bill.attachments or [])
+        # the session doesn't track this change; save_attachments writes it
+        set_committed_value(bill, "attachments", attachments)
+        updated[(type(bill), bill.oid)] = bill
         log.info("adding attachment %s to %s %s", pdf.s3_key, bill_type, bill.oid)
         att_status = AttachStatus.ATTACHED
     return att_status
 
 
+def save_attachments(updated: Dict[Tuple[type, int], AttachedBill]):
+    """Write the attachments for updated bills, with one bulk update per table."""
+    by_model: Dict[type, List[Dict[str, Any]]] = {}
+    for (model, oid), bill in updated.items():
+        by_model.setdefault(model, []).append(
+            {"oid": oid, "attachments": bill.attachments}
+        )
+    for model, mappings in by_model.items():
+        db.session.bulk_update_mappings(model, mappings)
+        log.info("updated attachments for %s %s records", len(mappings), model.__name__)
+
+
+def _meter_only_matches(
+    meter_oid: int, pdfs: List[BillPdf]
+) -> List[List[AttachedBill]]:
+    """Match PDF start dates to Bill/PartialBill start dates on this meter's service, with a small buffer."""
+    windows = [
+        (_day(pdf.start) - timedelta(days=1), _day(pdf.start) + timedelta(days=1))
+        for pdf in pdfs
+    ]
+    first = min(window[0] for window in windows)
+    last = max(window[1] for window in windows)
+    bills = (
+        db.session.query(Bill)
+        .filter(
+            Bill.service == Meter.service,
+            Meter.oid == meter_oid,
+            Bill.initial >= first,
+            Bill.initial <= last,
+        )
+        .all()
+    )
+    partial_bills = (
+        db.session.query(PartialBill)
+        .filter(
+            PartialBill.service == Meter.service,
+            Meter.oid == meter_oid,
+            PartialBill.initial >= first,
+            PartialBill.initial <= last,
+            PartialBill.superseded_by.is_(None),
+            PartialBill.visible.is_(True),
+            PartialBill.provider_type == PartialBillProviderType.TND_ONLY.value,
+        )
+        .all()
+    )
+    bill_matches = match_bills(windows, bills, lambda bill: bill.initial)
+    partial_matches = match_bills(windows, partial_bills, lambda bill: bill.initial)
+    return [
+        cast(List[AttachedBill], bill_matches[idx])
+        + cast(List[AttachedBill], partial_matches[idx])
+        for idx in range(len(pdfs))
+    ]
+
+
+def _account_matches(pdfs: List[BillPdf]) -> List[List[AttachedBill]]:
+    """Match PDF statement dates to bills on services with the same utility account id.
+
+    A bill matches if it closed in the 14 days up to the statement date.
+    """
+    # closing > statement - 14 days, as an inclusive window
+    windows = [
+        (_day(pdf.statement) - timedelta(days=13), _day(pdf.statement)) for pdf in pdfs
+    ]
+    rows = (
+        db.session.query(Bill, UtilityService.utility_account_id)
+        .filter(
+            UtilityService.utility_account_id.in_(
+                {pdf.utility_account_id for pdf in pdfs}
+            )
+        )
+        .filter(UtilityService.oid == Bill.service)
+        .filter(Bill.closing >= min(window[0] for window in windows))
+        .filter(Bill.closing <= max(window[1] for window in windows))
+    )
+    bills_by_account: Dict[str, List[Bill]] = {}
+    for bill, utility_account_id in rows:
+        bills_by_account.setdefault(utility_account_id, []).append(bill)
+    pdfs_by_account: Dict[str, List[int]] = {}
+    for idx, pdf in enumerate(pdfs):
+        pdfs_by_account.setdefault(pdf.utility_account_id, []).append(idx)
+
+    matches: List[List[AttachedBill]] = [[] for _ in pdfs]
+    for utility_account_id, indexes in pdfs_by_account.items():
+        account_matches = match_bills(
+            [windows[idx] for idx in indexes],
+            bills_by_account.get(utility_account_id, []),
+            lambda bill: bill.closing,
+        )
+        for idx, bills in zip(indexes, account_matches):
+            matches[idx] = cast(List[AttachedBill], bills)
+    return matches
+
+
+@tracing.traced("attach_bill_pdfs")
 def attach_bill_pdfs(
     meter_oid: int,
     task_id: str,
     meter_only: bool,
     pdfs: List[BillPdf],
 ) -> Status:
-    """Attach a list of bill PDF files uploaded to S3 to bill records."""
+    """Attach a list of bill PDF files uploaded to S3 to bill records.
+
+    If meter_only, attach PDFs to bills on this meter's service only, by start date. Otherwise,
+    attach PDFs to bills on all services with the same utility account id, by statement date.
+    Candidate bills are loaded with one query for the whole list of PDFs, and the updated
+    bills are written with one bulk update.
+    """
     if not pdfs:
         return Status.COMPLETED
 
+    if meter_only:
+        matches = _meter_only_matches(meter_oid, pdfs)
+    else:
+        matches = _account_matches(pdfs)
+
     count = 0
     unused = []
-    for pdf in pdfs:
+    updated: Dict[Tuple[type, int], AttachedBill] = {}
+    # PDFs are attached in the order given, so that the last one ends up first.
+    for pdf, bills in zip(pdfs, matches):
         log.info(
             "bill PDF for utility_account_id=%s statement=%s",
             pdf.utility_account_id,
             pdf.statement,
         )
-
-        if meter_only:
-            # Attach PDFs to bills on this meter's service only.  Matches up PDF start dates with PartialBill/
-            # Bill start dates with a small buffer.
-            bill_query = db.session.query(Bill).filter(
-                Bill.service == Meter.service,
-                Meter.oid == meter_oid,
-                Bill.initial >= pdf.start - timedelta(days=1),
-                Bill.initial <= pdf.start + timedelta(days=1),
-            )
-            partial_bill_query = db.session.query(PartialBill).filter(
-                PartialBill.service == Meter.service,
-                Meter.oid == meter_oid,
-                PartialBill.initial >= pdf.start - timedelta(days=1),
-                PartialBill.initial <= pdf.start + timedelta(days=1),
-                PartialBill.superseded_by.is_(None),
-                PartialBill.visible.is_(True),
-                PartialBill.provider_type == PartialBillProviderType.TND_ONLY.value,
+        if not bills:
+            log.warning(
+                "no bills found for utility_account_id %s %s-%s",
+                pdf.utility_account_id,
+                pdf.start,
+                pdf.end,
             )
-            if not bill_query.count() and not partial_bill_query.count():
-                log.warning(
-                    "no bills found for utility_account_id %s %s-%s",
-                    pdf.utility_account_id,
-                    pdf.start,
-                    pdf.end,
-                )
-            bill_attach_status = add_attachment_to_bills(pdf, bill_query)
-            partial_attach_status = add_attachment_to_bills(pdf, partial_bill_query)
-            if (
-                AttachStatus.best([bill_attach_status, partial_attach_status])
-                == AttachStatus.ATTACHED
-            ):
-                # Only increase count if attachments were updated.
-                # Not adding any PDF's to "unused" because attachment could be in use on another meter.
-                count += 1
-
-        else:
-            # Attach PDF's to potentially multiple bills on multiple services with the same utility account id.
-            # Attach PDFs to bills on account that ended recently before the statement date:
-            query = (
-                db.session.query(Bill)
-                .filter(UtilityService.utility_account_id == pdf.utility_account_id)
-                .filter(UtilityService.oid == Bill.service)
-                .filter(Bill.closing > pdf.statement - timedelta(days=14))
-                .filter(Bill.closing <= pdf.statement)
-            )
-            bill_count = query.count()
-            if not bill_count:
-                log.warning(
-                    "no bills found for utility_account_id %s %s-%s",
-                    pdf.utility_account_id,
-                    pdf.start,
-                    pdf.end,
-                )
-            attached = add_attachment_to_bills(pdf, query)
-            if attached == AttachStatus.ATTACHED:
-                count += 1
-            elif attached == AttachStatus.NOT_ATTACHED:
-                unused.append(pdf.s3_key)
+        attached = add_attachment_to_bills(pdf, bills, updated)
+        if attached == AttachStatus.ATTACHED:
+            # Only increase count if attachments were updated.
+            count += 1
+        elif attached == AttachStatus.NOT_ATTACHED and not meter_only:
+            # Not removing meter only PDF's because attachment could be in use on another meter.
+            unused.append(pdf.s3_key)
+    save_attachments(updated)
     log.info("attached %s/%s pdfs", count, len(pdfs))
     for key in unused:
         remove_file_from_s3(config.BILL_PDF_S3_BUCKET, key)
@@ -310,6 +469,7 @@ def attach_bill_pdfs(
     return Status.COMPLETED
 
 
+@tracing.traced("upload_partial_bills")
 def upload_partial_bills(
     meter: Meter,
     task_id: str,
@@ -462,6 +622,33 @@ def hash_bill_datum(service_id: str, b: BillingDatum):
     return hash_bill(service_id, b.start, b.end, b.cost, b.peak, b.used)
 
 
+class BillUpload(NamedTuple):
+    """A bill PDF to upload with upload_bills_to_s3."""
+
+    # file contents, or a function that returns them
+    body: Union[bytes, Callable[[], Optional[bytes]]]
+    key: str
+    source: str
+    statement: date
+    utility: str
+    utility_account_id: str
+    gen_utility: Optional[str] = None
+    gen_utility_account_id: Optional[str] = None
+
+    def attachment_entry(self) -> AttachmentEntry:
+        return AttachmentEntry(
+            key=self.key,
+            kind="bill",
+            format="PDF",
+            source=self.source,
+            statement=self.statement.strftime("%Y-%m-%d"),
+            utility=self.utility,
+            utility_account_id=self.utility_account_id,
+            gen_utility=self.gen_utility,
+            gen_utility_account_id=self.gen_utility_account_id,
+        )
+
+
 def upload_bill_to_s3(
     file_handle: BytesLikeObject,
     key: str,
@@ -496,3 +683,33 @@ def upload_bill_to_s3(
         return None
 
     return entry
+
+
+def upload_bills_to_s3(
+    uploads: List[BillUpload], max_workers: int = 8
+) -> List[Optional[AttachmentEntry]]:
+    """Upload a batch of bill PDFs to S3, and record them as bill documents.
+
+    Uploads with the same key are uploaded once, and keys that already exist aren't
+    uploaded again; the rest are uploaded concurrently. Return the attachment entry for
+    each upload, or None if it failed.
+    """
+    unique: Dict[str, BillUpload] = {}
+    for upload in uploads:
+        unique.setdefault(upload.key, upload)
+    keys = ensure_uploaded_to_s3(
+        [S3Upload(upload.key, upload.body) for upload in unique.values()],
+        config.BILL_PDF_S3_BUCKET,
+        max_workers=max_workers,
+    )
+    # if upload is disabled, bill documents are still recorded
+    upload_enabled = config.enabled("S3_BILL_UPLOAD")
+    entries: Dict[str, AttachmentEntry] = {}
+    for upload, uploaded_key in zip(unique.values(), keys):
+        if upload_enabled and uploaded_key is None:
+            log.error("Failed to upload bill %s to S3.", upload.key)
+            continue
+        entries[upload.key] = upload.attachment_entry()
+    BillDocument.add_or_update_all(list(entries.values()))
+    log.info("uploaded %s/%s bill pdfs", len(entries), len(unique))
+    return [entries.get(upload.key) for upload in uploads]
@@ -1,14 +1,22 @@
+import json
 import logging
+import time
 from typing import Callable, Any, List, Dict, Optional
 
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 
+from datafeeds.common import tracing
 from datafeeds.common.webdriver.drivers.base import BaseDriver
 
 logger = None
 log = logging.getLogger(__name__)
 
+# a ready script, evaluated to a boolean; an error (eg a missing element) means "not ready"
+READY_EXPRESSION = (
+    "(function() {{ try {{ return !!({}); }} catch (e) {{ return false; }} }})()"
+)
+
 
 class NoInitialStateException(Exception):
     """Inidicates that an initial state was not set for a PageStateMachine"""
@@ -27,6 +35,19 @@ class MissingStateException(Exception):
         super().__init__(message)
 
 
+def selector_present(selector: str) -> str:
+    """A JavaScript expression that's true when an element matches a CSS selector."""
+    return "document.querySelector({}) !== null".format(json.dumps(selector))
+
+
+def xpath_present(xpath: str) -> str:
+    """A JavaScript expression that's true when an element matches an XPath."""
+    return (
+        "document.evaluate({}, document, null, "
+        "XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null"
+    ).format(json.dumps(xpath))
+
+
 class TransitionTimeoutException(Exception):
     """This exception is used by the PageStateMachine to indicate when a transition fails to occur."""
 
@@ -51,11 +72,28 @@ class PageState:
     """A simple Page Object class for Selenium scrapers
 
     This may be useful for modeling pages for a Selenium scraper. It is not currently used everywhere.
+
+    A page can declare when it's ready instead of implementing get_ready_condition: ready_selector
+    is a CSS selector for an element that's present when the page is ready, and ready_script is a
+    JavaScript expression that's true when it is (see selector_present and xpath_present). The
+    PageStateMachine checks the declared conditions of every state it could transition to with
+    one execute_script call, instead of a WebDriver round trip (or several) per state.
     """
 
+    ready_selector: Optional[str] = None
+    ready_script: Optional[str] = None
+
     def __init__(self, driver: BaseDriver):
         self.driver = driver
 
+    def get_ready_script(self) -> Optional[str]:
+        """A JavaScript expression that's true when this page is ready, or None if not declared."""
+        if self.ready_script:
+            return self.ready_script
+        if self.ready_selector:
+            return selector_present(self.ready_selector)
+        return None
+
     def get_ready_condition(self) -> Callable[[BaseDriver], Any]:
         """This should be implemented by subclasses. Returns a predicate indicating when this page is "ready"
 
@@ -63,8 +101,13 @@ class PageState:
         def get_ready_condition(self):
             return EC.presence_of_element_located((By.ID, "some_id"))
         ...or any other function that accepts a WebDriver object
+
+        Pages that declare ready_selector or ready_script don't need to implement it.
         """
-        raise NotImplementedError()
+        script = self.get_ready_script()
+        if script is None:
+            raise NotImplementedError()
+        return lambda driver: driver.execute_script("return !!({});".format(script))
 
     def is_ready(self) -> bool:
         """Determines whether the page is ready, using get_ready_condition"""
@@ -115,6 +158,8 @@ class PageStateMachine:
         self.state_machine: Dict[str, StateNode] = dict()
         self.initial_state: Optional[str] = None
         self.on_enter_state_fn: Optional[Callable] = None
+        # the source, dest, seconds and polls of each transition made by run
+        self.transition_times: List[Dict[str, Any]] = []
 
     def set_initial_state(self, name: str):
         if name not in self.state_machine:
@@ -176,24 +221,46 @@ class PageStateMachine:
                     )
                 )
                 wait = WebDriverWait(self.driver, cur_state.wait_time)
+                predicate = transition_is_ready(self.state_machine, cur_state_name)
+                start = time.perf_counter()
                 try:
-                    cur_state_name = wait.until(
-                        transition_is_ready(self.state_machine, cur_state_name)
-                    )
+                    dest_state_name = wait.until(predicate)
                 except TimeoutException as e:
                     log.info(
-                        "Transition timed out: src={}, dest={}".format(
-                            cur_state_name, cur_state.transitions
+                        "Transition timed out: src={}, dest={}, {:.1f}s, {} polls".format(
+                            cur_state_name,
+                            cur_state.transitions,
+                            time.perf_counter() - start,
+                            predicate.polls,
                         )
                     )
                     raise TransitionTimeoutException(
                         source=cur_state_name, dest=cur_state.transitions
                     ) from e
+                self._record_transition(
+                    cur_state_name,
+                    dest_state_name,
+                    time.perf_counter() - start,
+                    predicate.polls,
+                )
+                cur_state_name = dest_state_name
             else:
                 done = True
 
         return cur_state_name
 
+    def _record_transition(self, source: str, dest: str, seconds: float, polls: int):
+        """Log the time a transition took, and add it to the run's phases (see tracing)."""
+        log.info(
+            "Transition complete: src={}, dest={}, {:.2f}s, {} polls".format(
+                source, dest, seconds, polls
+            )
+        )
+        self.transition_times.append(
+            {"source": source, "dest": dest, "seconds": seconds, "polls": polls}
+        )
+        tracing.record("transition {} -> {}".format(source, dest), seconds)
+
     def validate(self):
         """Validate the state machine configuration.
 
@@ -211,26 +278,59 @@ class PageStateMachine:
 
 
 class transition_is_ready:
-    """This wait predicate is used by the PageStateMachine to wait for a transition state to be ready."""
+    """This wait predicate is used by the PageStateMachine to wait for a transition state to be ready.
+
+    The ready scripts of the transition states (see PageState.get_ready_script) are evaluated
+    together, in one execute_script call per poll; other states are checked with is_ready.
+    """
 
     def __init__(self, state_machine: dict, cur_state_name: str):
         self.state_machine = state_machine
         self.cur_state_name = cur_state_name
+        self.polls = 0
+
+    def _ready_scripts(self, driver, scripts: Dict[str, str]) -> Dict[str, bool]:
+        """Evaluate each state's ready script in the browser, with one call."""
+        names = list(scripts)
+        script = "return [{}];".format(
+            ", ".join(READY_EXPRESSION.format(scripts[name]) for name in names)
+        )
+        try:
+            results = driver.execute_script(script)
+        except:  # noqa E722
+            # as with is_ready, an error (eg the page is navigating) means "not ready"
+            return {}
+        return {name: bool(ready) for name, ready in zip(names, results or [])}
 
     def __call__(self, driver):
+        self.polls += 1
         cur_state = self.state_machine[self.cur_state_name]
 
-        # Note that we find the first transition in the list that is ready. It's possible that multiple such states will
-        # be ready, but we just choose the first one for now. This might need to be revisited later.
+        dest_states = []
         for dest_state_name in cur_state.transitions:
             dest_state = self.state_machine.get(dest_state_name)
             if not dest_state:
                 raise MissingStateException(dest_state_name)
+            dest_states.append((dest_state_name, dest_state))
+
+        scripts = {
+            name: state.page.get_ready_script()
+            for name, state in dest_states
+            if state.page and state.page.get_ready_script()
+        }
+        ready: Optional[Dict[str, bool]] = None
 
-            if dest_state.page:
-                if dest_state.page.is_ready():
+        # Note that we find the first transition in the list that is ready. It's possible that multiple such states will
+        # be ready, but we just choose the first one for now. This might need to be revisited later.
+        for dest_state_name, dest_state in dest_states:
+            if not dest_state.page:
+                return dest_state_name
+            if dest_state_name in scripts:
+                if ready is None:
+                    ready = self._ready_scripts(driver, scripts)
+                if ready.get(dest_state_name):
                     return dest_state_name
-            else:
+            elif dest_state.page.is_ready():
                 return dest_state_name
 
         return None
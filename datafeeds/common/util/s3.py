@@ -3,9 +3,25 @@
 This module has some functions that interact with Amazon S3.
 Currently, the main operation supported is uploading bill
 pdfs to a bucket.
+
+Bill pdf keys are content-addressed (a hash of the bill or statement), so once a key
+exists it never needs to be uploaded again. An S3Inventory remembers the keys known to
+exist in a bucket for the rest of the run, so each key is checked at most once; it can
+also list a prefix up front, so that keys under it don't need to be checked at all.
+
+The contents of files uploaded during the run are remembered (by size and hash), so that
+other copies of them, like the downloaded file in the working directory, can be recognized
+with uploaded_copy.
+
+S3MultipartWriter is a file-like object that uploads to S3 in parts while it's written.
 """
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+from io import BytesIO
 import logging
-from typing import Optional
+import os
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
 import boto3
 
@@ -14,21 +30,310 @@ from datafeeds import config
 
 log = logging.getLogger(__name__)
 
+_client = None
+_lock = threading.Lock()
+_inventories: Dict[str, "S3Inventory"] = {}
+# size -> sha256 -> (bucket, key) of files uploaded during this run
+_uploaded: Dict[int, Dict[str, Tuple[str, str]]] = {}
 
-def s3_key_exists(bucket, key):
-    """Determine if a key exists in an S3 bucket."""
+# S3 requires multipart upload parts (except the last) to be at least 5MB.
+PART_SIZE = 8 * 1024 * 1024
+
+
+def s3_client():
+    """Return an S3 client shared by this process; clients are thread safe."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = boto3.client("s3")
+        return _client
 
-    if not config.enabled("S3_BILL_UPLOAD"):
-        return False
 
-    client = boto3.client("s3")
+def _head(bucket: str, key: str) -> bool:
     try:
-        client.head_object(Bucket=bucket, Key=key)
+        s3_client().head_object(Bucket=bucket, Key=key)
         return True
     except:  # noqa: E722
         return False
 
 
+class S3Upload(NamedTuple):
+    key: str
+    # file contents, or a function that returns them (or None to skip the upload)
+    body: Union[bytes, Callable[[], Optional[bytes]]]
+    file_display_name: Optional[str] = None
+    content_type: Optional[str] = "application/pdf"
+
+
+class S3Inventory:
+    """The keys known to exist in an S3 bucket during this run."""
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+        self._keys: Set[str] = set()
+        self._listed: List[str] = []  # prefixes listed in full
+        self._lock = threading.Lock()
+
+    def list_prefix(self, prefix: str = "") -> int:
+        """List every key under prefix (with paginated list_objects_v2); return the number found.
+
+        Afterwards, keys under prefix that aren't in the inventory are known not to exist.
+        """
+        keys: Set[str] = set()
+        paginator = s3_client().get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            keys.update(item["Key"] for item in page.get("Contents", []))
+        with self._lock:
+            self._keys.update(keys)
+            self._listed.append(prefix)
+        log.debug("listed %s keys in %s/%s", len(keys), self.bucket, prefix)
+        return len(keys)
+
+    def add(self, key: str):
+        with self._lock:
+            self._keys.add(key)
+
+    def exists(self, key: str) -> bool:
+        """Determine if a key exists; checks S3 only if the key isn't known or listed."""
+        with self._lock:
+            if key in self._keys:
+                return True
+            if any(key.startswith(prefix) for prefix in self._listed):
+                return False
+        if _head(self.bucket, key):
+            self.add(key)
+            return True
+        return False
+
+    def discard(self, key: str):
+        with self._lock:
+            self._keys.discard(key)
+
+    def upload(self, upload: S3Upload) -> Optional[str]:
+        """Upload a file, whether or not its key exists; return the key, or None if there's no body."""
+        body = upload.body() if callable(upload.body) else upload.body
+        if body is None:
+            return None
+        digest = _digest(body)
+        resp = s3_client().put_object(
+            Body=body,
+            Bucket=self.bucket,
+            ContentDisposition="inline; filename=%s"
+            % (upload.file_display_name or upload.key),
+            ContentType=upload.content_type,
+            Key=upload.key,
+            StorageClass="STANDARD_IA",
+        )
+        self.add(upload.key)
+        if digest:
+            with _lock:
+                _uploaded.setdefault(digest[0], {})[digest[1]] = (
+                    self.bucket,
+                    upload.key,
+                )
+        log.debug("Attempted S3 upload to %s %s: %s", self.bucket, upload.key, resp)
+        return upload.key
+
+    def ensure_uploaded(
+        self, uploads: List[S3Upload], max_workers: int = 8
+    ) -> List[Optional[str]]:
+        """Upload files whose keys don't already exist, concurrently.
+
+        Bodies given as functions are only called for keys that need uploading. Return the
+        key for each upload, or None if it failed or its body was None.
+        """
+
+        def ensure(upload: S3Upload) -> Optional[str]:
+            try:
+                if self.exists(upload.key):
+                    log.debug(
+                        "Key %s already exists in bucket %s.", upload.key, self.bucket
+                    )
+                    return upload.key
+                return self.upload(upload)
+            except:  # noqa: E722
+                log.exception("Failed to upload %s to S3.", upload.key)
+                return None
+
+        if len(uploads) <= 1:
+            return [ensure(upload) for upload in uploads]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(ensure, uploads))
+
+
+def _digest(body) -> Optional[Tuple[int, str]]:
+    """Return the size and hash of an upload body, if it's in memory."""
+    if isinstance(body, BytesIO) and body.tell() == 0:
+        data = body.getvalue()
+    elif isinstance(body, (bytes, bytearray)):
+        data = bytes(body)
+    else:
+        return None
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+def uploaded_copy(path: str) -> Optional[Tuple[str, str]]:
+    """Return the bucket and key of a file uploaded during this run with the same contents as path.
+
+    Only files the same size as an uploaded file are read.
+    """
+    with _lock:
+        digests = _uploaded.get(os.path.getsize(path))
+    if not digests:
+        return None
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return digests.get(sha.hexdigest())
+
+
+class S3MultipartWriter:
+    """A write-only file that uploads to S3 in parts as it's written.
+
+    Parts are uploaded by a pool of threads while the caller carries on writing, and at
+    most 2 * max_workers parts are held in memory. An object smaller than one part is
+    uploaded with a single put_object. Use as a context manager: the upload is completed
+    on exit, or aborted if there was an exception.
+
+    extra_args are passed to put_object or create_multipart_upload (eg StorageClass).
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        part_size: int = PART_SIZE,
+        max_workers: int = 4,
+        **extra_args,
+    ):
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.extra_args = extra_args
+        self._buffer = bytearray()
+        self._written = 0
+        self._upload_id: Optional[str] = None
+        self._parts: List[Future] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = threading.BoundedSemaphore(max_workers * 2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._written += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._submit(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def tell(self) -> int:
+        """Return the number of bytes written."""
+        return self._written
+
+    def flush(self):
+        pass
+
+    def _submit(self, body: bytes):
+        for part in self._parts:
+            if part.done() and part.exception():
+                raise part.exception()  # type: ignore
+        if self._upload_id is None:
+            self._upload_id = s3_client().create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, **self.extra_args
+            )["UploadId"]
+        self._pending.acquire()
+        number = len(self._parts) + 1
+        self._parts.append(self._executor.submit(self._upload_part, number, body))
+
+    def _upload_part(self, number: int, body: bytes) -> Dict:
+        try:
+            resp = s3_client().upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                PartNumber=number,
+                Body=body,
+            )
+            return {"ETag": resp["ETag"], "PartNumber": number}
+        finally:
+            self._pending.release()
+
+    def close(self):
+        """Upload the rest of the file, and wait for the upload to finish."""
+        try:
+            if self._upload_id is None:
+                s3_client().put_object(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Body=bytes(self._buffer),
+                    **self.extra_args,
+                )
+            else:
+                if self._buffer:
+                    self._submit(bytes(self._buffer))
+                parts = [part.result() for part in self._parts]
+                s3_client().complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            self._buffer = bytearray()
+        except:  # noqa: E722
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown()
+
+    def abort(self):
+        """Discard the parts uploaded so far."""
+        self._executor.shutdown()
+        if self._upload_id is not None:
+            s3_client().abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+            self._upload_id = None
+
+
+def s3_inventory(bucket: str) -> S3Inventory:
+    """Return the inventory for a bucket, shared for the rest of the run."""
+    with _lock:
+        if bucket not in _inventories:
+            _inventories[bucket] = S3Inventory(bucket)
+        return _inventories[bucket]
+
+
+def s3_key_exists(bucket, key):
+    """Determine if a key exists in an S3 bucket."""
+
+    if not config.enabled("S3_BILL_UPLOAD"):
+        return False
+
+    return s3_inventory(bucket).exists(key)
+
+
+def ensure_uploaded_to_s3(
+    uploads: List[S3Upload], bucket: str, max_workers: int = 8
+) -> List[Optional[str]]:
+    """Upload a batch of files to s3, skipping keys that already exist.
+
+    See S3Inventory.ensure_uploaded. Returns None for every file if bill upload is disabled.
+    """
+    if not config.enabled("S3_BILL_UPLOAD"):
+        log.debug("Bill upload disabled, skipping S3 upload.")
+        return [None for _ in uploads]
+    return s3_inventory(bucket).ensure_uploaded(uploads, max_workers=max_workers)
+
+
 def upload_file_to_s3(body, bucket, key, file_display_name=None, content_type=None):
     """Upload a file to s3
 
@@ -66,23 +371,10 @@ def upload_file_to_s3(body, bucket, key, file_display_name=None, content_type=No
         log.debug("Key %s already exists in bucket %s.", key, bucket)
         return key
 
-    if file_display_name is None:
-        file_display_name = key
-
-    client = boto3.client("s3")
-    resp = client.put_object(
-        Body=body,
-        Bucket=bucket,
-        ContentDisposition="inline; filename=%s" % file_display_name,
-        ContentType=content_type,
-        Key=key,
-        StorageClass="STANDARD_IA",
+    return s3_inventory(bucket).upload(
+        S3Upload(key, body, file_display_name, content_type)
     )
 
-    log.debug("Attempted S3 upload to %s %s: %s", bucket, key, resp)
-
-    return key
-
 
 def upload_pdf_to_s3(body, bucket, key, file_display_name=None):
     return upload_file_to_s3(
@@ -96,9 +388,8 @@ def upload_pdf_to_s3(body, bucket, key, file_display_name=None):
 
 def read_file_from_s3(bucket: str, key: str) -> Optional[bytes]:
     """Return the data associated with a single file in S3."""
-    client = boto3.client("s3")
     try:
-        response = client.get_object(Bucket=bucket, Key=key)
+        response = s3_client().get_object(Bucket=bucket, Key=key)
     except:  # noqa: E722
         log.exception("Request to download file from S3 failed.")
         return None
@@ -110,8 +401,8 @@ def remove_file_from_s3(bucket: str, key: str) -> None:
     if not config.enabled("S3_BILL_UPLOAD"):
         log.debug("Bill upload disabled, skipping S3 remove.")
         return
-    client = boto3.client("s3")
     try:
-        client.delete_object(Bucket=bucket, Key=key)
+        s3_client().delete_object(Bucket=bucket, Key=key)
+        s3_inventory(bucket).discard(key)
     except:  # noqa: E722
         log.exception("Request to remove file %s/%s from S3 failed.", bucket, key)
@@ -4,12 +4,24 @@ This module provides some simple Selenium utility functions
 and classes, e.g. custom wait predicates, content managers
 for iframes/windows, etc.
 """
+import logging
 import os
 import re
+import time
+from typing import Optional
 
 from io import BytesIO
 from PIL import Image
-from selenium.common.exceptions import InvalidElementStateException
+from selenium.common.exceptions import (
+    InvalidElementStateException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+
+from datafeeds.common import tracing
+
+log = logging.getLogger(__name__)
 
 
 # Code to stitch full page screenshots together, credit to:
@@ -166,6 +178,183 @@ class file_exists_in_dir:
         return False
 
 
+# Installs hooks to track page activity (once per page), and returns it. The hooks count
+# XMLHttpRequest and fetch requests started after they're installed, and record when the
+# DOM last changed.
+PAGE_ACTIVITY_SCRIPT = """
+if (!window.__datafeedsActivity) {
+    var activity = window.__datafeedsActivity = {pending: 0, mutated: performance.now()};
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        activity.pending++;
+        this.addEventListener("loadend", function() { activity.pending--; });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function() {
+            activity.pending++;
+            return fetch.apply(this, arguments).then(
+                function(response) { activity.pending--; return response; },
+                function(error) { activity.pending--; throw error; }
+            );
+        };
+    }
+    new MutationObserver(function() { activity.mutated = performance.now(); }).observe(
+        document, {childList: true, subtree: true, attributes: true, characterData: true}
+    );
+}
+var activity = window.__datafeedsActivity;
+return {
+    ready: document.readyState,
+    pending: activity.pending + (window.jQuery ? jQuery.active : 0),
+    resources: performance.getEntriesByType("resource").length,
+    quiet: performance.now() - activity.mutated
+};
+"""
+
+# suffixes of files that are still being downloaded
+PARTIAL_DOWNLOADS = (".crdownload", ".part", ".tmp")
+
+
+class network_idle:
+    """Wait until the page has loaded, and no requests have been made for idle seconds.
+
+    Requests are XMLHttpRequest and fetch requests (including jQuery ajax) and other resources
+    the page loads (eg scripts and images).
+    """
+
+    def __init__(self, idle: float = 0.5):
+        self.idle = idle
+        self._resources = None
+        self._since = 0.0
+
+    def __call__(self, driver):
+        activity = driver.execute_script(PAGE_ACTIVITY_SCRIPT)
+        now = time.monotonic()
+        if activity["ready"] != "complete" or activity["pending"]:
+            self._resources = None
+            return False
+        if activity["resources"] != self._resources:
+            self._resources = activity["resources"]
+            self._since = now
+            return False
+        return now - self._since >= self.idle
+
+
+class dom_stable:
+    """Wait until the DOM hasn't changed for idle seconds."""
+
+    def __init__(self, idle: float = 0.5):
+        self.idle = idle
+
+    def __call__(self, driver):
+        return driver.execute_script(PAGE_ACTIVITY_SCRIPT)["quiet"] >= self.idle * 1000
+
+
+class elements_hidden:
+    """Wait until no element matching a css selector (eg a loading spinner) is displayed."""
+
+    def __init__(self, selector: str):
+        self.selector = selector
+
+    def __call__(self, driver):
+        try:
+            return not any(
+                element.is_displayed()
+                for element in driver.find_elements_by_css_selector(self.selector)
+            )
+        except StaleElementReferenceException:
+            return False
+
+
+class download_complete:
+    """Wait until a file matching a regex has finished downloading to a directory.
+
+    The file is finished when no other downloads are in progress in the directory, and its
+    size hasn't changed for stable seconds. If several files match, the most recently
+    modified one is used. Returns the filename.
+
+    Browsers download to a partial file (eg .crdownload) and rename it when it's complete,
+    so stable is only needed for files written in place, like a pdf from window.print().
+    """
+
+    def __init__(self, directory: str, pattern: str, stable: float = 0.0):
+        self.directory = directory
+        self.pattern = re.compile(pattern)
+        self.stable = stable
+        self._seen = None
+        self._since = 0.0
+
+    def __call__(self, driver):
+        filenames = os.listdir(self.directory)
+        if any(name.endswith(PARTIAL_DOWNLOADS) for name in filenames):
+            self._seen = None
+            return False
+        try:
+            matches = [
+                (os.stat(os.path.join(self.directory, name)), name)
+                for name in filenames
+                if self.pattern.match(name)
+            ]
+        except OSError:
+            return False
+        if not matches:
+            self._seen = None
+            return False
+        stat, name = max(matches, key=lambda match: match[0].st_mtime)
+        now = time.monotonic()
+        if (name, stat.st_size) != self._seen:
+            self._seen = (name, stat.st_size)
+            self._since = now
+        return name if now - self._since >= self.stable else False
+
+
+def wait_until_settled(
+    driver, seconds: float = 30, spinner: Optional[str] = None, idle: float = 0.5
+) -> bool:
+    """Wait until the page has finished updating, for up to seconds; use in place of a sleep.
+
+    The page has finished updating when no spinner (a css selector) is displayed, and the
+    network and DOM have been quiet for idle seconds. Returns False if the page didn't
+    settle within seconds, rather than raising; callers continue as they would after a sleep.
+    """
+    conditions = [network_idle(idle), dom_stable(idle)]
+    if spinner:
+        conditions.insert(0, elements_hidden(spinner))
+    start = time.monotonic()
+    with tracing.span("wait_settled"):
+        try:
+            WebDriverWait(driver, seconds, poll_frequency=0.1).until(
+                ec_and(*conditions)
+            )
+            settled = True
+        except TimeoutException:
+            settled = False
+    log.debug(
+        "page %s after %.1fs (limit %ss)",
+        "settled" if settled else "did not settle",
+        time.monotonic() - start,
+        seconds,
+    )
+    return settled
+
+
+def wait_for_download(
+    driver, directory: str, pattern: str, seconds: float = 60, stable: float = 0.0
+) -> str:
+    """Wait until a file matching pattern has finished downloading; return its path.
+
+    See download_complete for stable. Raises TimeoutException if the download doesn't
+    finish within seconds.
+    """
+    with tracing.span("wait_download"):
+        filename = WebDriverWait(driver, seconds, poll_frequency=0.2).until(
+            download_complete(directory, pattern, stable)
+        )
+    return os.path.join(directory, filename)
+
+
 class WindowSwitch:
     """Simple context manager for Selenium windows
 
@@ -78,6 +78,12 @@ URJANET_MYSQL_USER: str = os.environ.get("URJANET_MYSQL_USER", "gridium")
 URJANET_MYSQL_PASSWORD: str = os.environ.get("URJANET_MYSQL_PASSWORD", "gridium")
 URJANET_MYSQL_DB: str = os.environ.get("URJANET_MYSQL_DB", "urjanet")
 
+# Should Urjanet transformers record billing period decisions, and write them to
+# WORKING_DIRECTORY/transform_trace.json?
+URJANET_TRANSFORM_TRACE: bool = (
+    os.environ.get("URJANET_TRANSFORM_TRACE", "False").lower() == "true"
+)
+
 # What are the API credentials for gridium's Urjanet account?
 URJANET_HTTP_USER: str = os.environ.get("URJANET_HTTP_USER")
 URJANET_HTTP_PASSWORD: str = os.environ.get("URJANET_HTTP_PASSWORD")
@@ -88,6 +94,11 @@ ELASTICSEARCH_PORT: int = int(os.environ.get("ELASTICSEARCH_PORT", "9200"))
 ELASTICSEARCH_USER: str = os.environ.get("ELASTICSEARCH_USER")
 ELASTICSEARCH_PASSWORD: str = os.environ.get("ELASTICSEARCH_PASSWORD")
 
+# Which scraper log records should be indexed (with ES_INDEX_LOGS)? Logs larger than
+# ES_LOG_MAX_BYTES have only their warnings and errors indexed.
+ES_LOG_LEVEL: str = os.environ.get("ES_LOG_LEVEL", "INFO").upper()
+ES_LOG_MAX_BYTES: int = int(os.environ.get("ES_LOG_MAX_BYTES", 20 * 1024 * 1024))
+
 # How does datafeeds connect to webapps?
 WEBAPPS_DOMAIN: str = os.environ.get("WEBAPPS_DOMAIN")
 WEBAPPS_TOKEN: str = os.environ.get("WEBAPPS_TOKEN")
@@ -176,6 +187,34 @@ AES_SECRET_KEY = os.environ.get("AES_SECRET_KEY", None)
 # API key for captcha solving service
 CAPTCHA_API_KEY = os.environ.get("CAPTCHA_API_KEY", None)
 
+# Profile each scraper run with cProfile, and archive the stats with the run? (See common/tracing.py.)
+PROFILE_RUNS: bool = os.environ.get("PROFILE_RUNS", "false").lower() == "true"
+
+# Record or replay the HTTP requests made by API scrapers with this cassette file? (See
+# common/cassette.py.) HTTP_CASSETTE_MODE is replay or record; HTTP_CASSETTE_LATENCY is
+# the seconds to add to each replayed request.
+HTTP_CASSETTE = os.environ.get("HTTP_CASSETTE")
+HTTP_CASSETTE_MODE = os.environ.get("HTTP_CASSETTE_MODE", "replay")
+HTTP_CASSETTE_LATENCY = float(os.environ.get("HTTP_CASSETTE_LATENCY", "0"))
+
+# How many sub-ranges of a date range can a browser scraper download at once, by replaying its
+# export form with the browser's cookies? (See common/subrange_download.py.) The default, 1,
+# downloads each sub-range with the browser; each scraper caps it with max_subrange_downloads.
+SUBRANGE_DOWNLOADS = int(os.environ.get("SUBRANGE_DOWNLOADS", "1"))
+
+# Where should scrapers save checkpoints of the sub-ranges of interval data they've downloaded,
+# so that a retry or the next run can skip them? A directory, or s3 to save them in
+# ARTIFACT_S3_BUCKET; unset to keep them only for the run. (See common/checkpoint.py.)
+# CHECKPOINT_MAX_AGE is how long a checkpointed sub-range can be reused, in hours.
+CHECKPOINT_STORE = os.environ.get("CHECKPOINT_STORE")
+CHECKPOINT_MAX_AGE = float(os.environ.get("CHECKPOINT_MAX_AGE", "24"))
+
+# Where should scraper alerts (see common/alert.py) be sent? Unset to post them to Slack, or a
+# file to append them to, eg for testing offline. ALERT_WINDOW is the longest alerts are held, in
+# seconds, to combine them into one message; alerts are also sent at the end of each run.
+ALERT_SINK = os.environ.get("ALERT_SINK")
+ALERT_WINDOW = float(os.environ.get("ALERT_WINDOW", "300"))
+
 # Save utility service changes to the database only if true; default to false during testing phase.
 PERSIST_UTILITY_SERVICE_UPDATES = (
     "true" in os.environ.get("PERSIST_UTILITY_SERVICE_UPDATES", "false").lower()
@@ -184,13 +223,17 @@ PERSIST_UTILITY_SERVICE_UPDATES = (
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": True,
-    "formatters": {"standard": {"format": "%(asctime)s : %(levelname)s : %(message)s"}},
+    "formatters": {
+        "standard": {"format": "%(asctime)s : %(levelname)s : %(message)s"},
+        # parsed by index.index_logs
+        "file": {"format": "%(asctime)s : %(levelname)s : %(name)s : %(message)s"},
+    },
     "handlers": {
         "console": {"class": "logging.StreamHandler", "formatter": "standard"},
         "file": {
             "class": "logging.FileHandler",
             "filename": DATAFEEDS_LOG_NAME,
-            "formatter": "standard",
+            "formatter": "file",
         },
     },
     "root": {
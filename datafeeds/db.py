@@ -2,11 +2,12 @@ from functools import wraps
 import logging
 
 import pymysql
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import NullPool
 
 from datafeeds import config
+from datafeeds.common import tracing
 
 
 log = logging.getLogger(__name__)
@@ -36,6 +37,7 @@ def init(connstr=None, application_name="datafeeds", statement_timeout=60000):
 
     if engine is None or session is None or session_factory is None:
         engine = create_engine(connstr, **kwargs)
+        event.listen(engine, "before_cursor_execute", tracing.count_query)
         session_factory = sessionmaker(bind=engine)
         session = scoped_session(session_factory)
 
@@ -18,6 +18,8 @@ from sqlalchemy.ext.associationproxy import association_proxy
 from datafeeds.models.billaudit import BillAudit
 from datafeeds.models.meter import ProductEnrollment
 from datafeeds.orm import ModelMixin, Base
+from datafeeds.common import tracing
+from datafeeds.common.date_ranges import DisjointDateRanges
 from datafeeds.common.typing import (
     BillingDatum,
     AttachmentEntry,
@@ -59,20 +61,24 @@ def validate_incoming_bills(
 ) -> List["Bill"]:
     """Verifies incoming bills don't overlap and sorts chronologically."""
     to_add: List[Bill] = []
+    accepted: DisjointDateRanges[Bill] = DisjointDateRanges()
     for b in sorted(uncommitted, key=lambda x: x.initial):
-        for other in to_add:
-            if b.overlaps(other):
-                message = (
-                    "New bills must not overlap. %s-%s vs. %s-%s for service %s."
-                    % (
-                        b.initial,
-                        b.closing,
-                        other.initial,
-                        other.closing,
-                        service_oid,
-                    )
-                )
-                raise InvalidBillError(message)
+        if b.closing < b.initial:
+            raise InvalidBillError(
+                "New bills must not end before they start. %s-%s for service %s."
+                % (b.initial, b.closing, service_oid)
+            )
+        other = accepted.find_overlap(b.initial, b.closing)
+        if other is not None:
+            message = "New bills must not overlap. %s-%s vs. %s-%s for service %s." % (
+                b.initial,
+                b.closing,
+                other.initial,
+                other.closing,
+                service_oid,
+            )
+            raise InvalidBillError(message)
+        accepted.add(b.initial, b.closing, b)
         to_add.append(b)
     return to_add
 
@@ -86,6 +92,7 @@ class IncomingBillSummary(NamedTuple):
     skip: Optional[bool] = False
 
 
+@tracing.traced("process_incoming_bills")
 def process_incoming_bills(
     service: int, uncommitted: List["Bill"], source: Optional[str] = None
 ) -> List["IncomingBillSummary"]:
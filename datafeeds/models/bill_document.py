@@ -4,6 +4,7 @@ This module covers tables managed by webapps that describe utility services.
 Except for unit tests, analytics should treat these tables as Read Only.
 """
 from datetime import datetime
+from typing import Dict, List
 
 from dateutil import parser as date_parser
 
@@ -41,32 +42,47 @@ class BillDocument(ModelMixin, Base):
     @classmethod
     def add_or_update(cls, entry: AttachmentEntry):
         """Add or update a bill document record. s3_key is a unique key."""
-        doc = db.session.query(BillDocument).filter_by(s3_key=entry.key).first()
-        statement_date = None
-        if entry.statement:
-            statement_date = date_parser.parse(entry.statement)
-        gen_utility = entry.gen_utility
-        if gen_utility:
-            gen_utility = gen_utility.replace("utility:", "")
-        if doc:
-            if statement_date:
-                doc.statement_date = statement_date
-            doc.doc_format = entry.format
-            doc.utility = entry.utility.replace("utility:", "")
-            doc.utility_account_id = entry.utility_account_id
-            doc.gen_utility = gen_utility
-            doc.gen_utility_account_id = entry.gen_utility_account_id
-            doc.source = entry.source
-        else:
-            doc = BillDocument(
-                s3_key=entry.key,
-                doc_format=entry.format,
-                utility=entry.utility.replace("utility:", ""),
-                utility_account_id=entry.utility_account_id,
-                gen_utility=gen_utility,
-                gen_utility_account_id=entry.gen_utility_account_id,
-                statement_date=statement_date,
-                source=entry.source,
-                created=datetime.now(),
+        cls.add_or_update_all([entry])
+
+    @classmethod
+    def add_or_update_all(cls, entries: List[AttachmentEntry]):
+        """Add or update bill document records, loading the existing records in one query."""
+        if not entries:
+            return
+        docs: Dict[str, BillDocument] = {
+            doc.s3_key: doc
+            for doc in db.session.query(BillDocument).filter(
+                BillDocument.s3_key.in_({entry.key for entry in entries})
             )
-        db.session.add(doc)
+        }
+        for entry in entries:
+            statement_date = None
+            if entry.statement:
+                statement_date = date_parser.parse(entry.statement)
+            gen_utility = entry.gen_utility
+            if gen_utility:
+                gen_utility = gen_utility.replace("utility:", "")
+            doc = docs.get(entry.key)
+            if doc:
+                if statement_date:
+                    doc.statement_date = statement_date
+                doc.doc_format = entry.format
+                doc.utility = entry.utility.replace("utility:", "")
+                doc.utility_account_id = entry.utility_account_id
+                doc.gen_utility = gen_utility
+                doc.gen_utility_account_id = entry.gen_utility_account_id
+                doc.source = entry.source
+            else:
+                doc = BillDocument(
+                    s3_key=entry.key,
+                    doc_format=entry.format,
+                    utility=entry.utility.replace("utility:", ""),
+                    utility_account_id=entry.utility_account_id,
+                    gen_utility=gen_utility,
+                    gen_utility_account_id=entry.gen_utility_account_id,
+                    statement_date=statement_date,
+                    source=entry.source,
+                    created=datetime.now(),
+                )
+                docs[entry.key] = doc
+            db.session.add(doc)
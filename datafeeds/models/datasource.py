@@ -1,9 +1,11 @@
+from typing import Iterable
+
 import sqlalchemy as sa
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
-import pyaes
 
+from datafeeds.common import crypto
 from datafeeds.orm import ModelMixin, Base
 from datafeeds import db, config
 
@@ -15,14 +17,31 @@ def _aes_key():
 
 def aes_encrypt(text):
     """encrypt the given string and return bytes"""
-    aes = pyaes.AESModeOfOperationCTR(_aes_key())
-    return aes.encrypt(text)  # bytes
+    return crypto.ctr_encrypt(_aes_key(), text)
 
 
 def aes_decrypt(encrypted_bytes):
     """decrypt the given bytes and return a string"""
-    aes = pyaes.AESModeOfOperationCTR(_aes_key())
-    return aes.decrypt(encrypted_bytes).decode("utf-8")
+    return crypto.credentials.decrypt(_aes_key(), encrypted_bytes)
+
+
+def decrypt_credentials(meter_data_sources: Iterable["SnapmeterMeterDataSource"]):
+    """Decrypt the account credentials for a batch of meter data sources in one pass.
+
+    The decrypted values are cached for the process; username and password read them from the cache.
+    """
+    crypto.credentials.decrypt_all(
+        _aes_key(),
+        [
+            value
+            for mds in meter_data_sources
+            if mds.account_data_source
+            for value in (
+                mds.account_data_source._username_bytes,
+                mds.account_data_source._password_bytes,
+            )
+        ],
+    )
 
 
 class SnapmeterAccountDataSource(ModelMixin, Base):
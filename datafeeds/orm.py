@@ -1,6 +1,7 @@
 from enum import Enum
+import threading
 import time
-from typing import NewType
+from typing import List, NewType, Optional, Tuple
 
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.schema import Sequence
@@ -17,10 +18,10 @@ class OidGenerator:
     """The OidGenerator is a singleton (all state is stored in static members)."""
 
     _epoch = 1350654629.354
-    node_id = None
+    node_id: Optional[int] = None
 
     _counter = 0
-    _clock = None
+    _clock: Optional[int] = None
 
     #
     # In the platform system every server is assigned a Node ID between 0 and 4095 (inclusive). Any threads running
@@ -48,43 +49,91 @@ class OidGenerator:
 
         return (next_id % 1024) + 3072
 
+    # OIDs are handed out in blocks: a block is a range of counter values in one clock tick (second).
+    # When a tick's 4096 counter values are used up, we move on to the next tick, even if it's still
+    # in the future, rather than sleeping until the wall clock gets there. The clock state never goes
+    # backwards, and may run at most _max_borrowed_ticks ahead of the wall clock; we only sleep if a
+    # single process allocates more than that many ticks' worth of OIDs faster than real time.
+    #
+    # Because a process may run ahead of the wall clock, two processes can use the same tick; the low
+    # 10 bits of the Node ID are part of every OID (see _compose), so their OIDs still differ.
+    # _max_borrowed_ticks is kept small so a later process that is given the same Node ID (after
+    # 1024 others) doesn't start on a tick the earlier one already used.
+    _max_borrowed_ticks = 300
+    _lock = threading.Lock()
+
     @classmethod
-    def _check_clock(cls):
-        while True:
-            c = int(time.time() - OidGenerator._epoch)
-            if c == OidGenerator._clock or (c & 0xFFFFFF8000000000 != 0):
-                time.sleep(1)
-            else:
-                return c
+    def _wall_clock(cls) -> int:
+        return int(time.time() - OidGenerator._epoch)
 
     @classmethod
-    def allocate(cls):
-        """Synthesize a platform style OID."""
+    def _next_tick(cls) -> int:
+        """Return the next unused clock tick: now, or the tick after the last one used."""
+        now = OidGenerator._wall_clock()
+        if OidGenerator._clock is None:
+            tick = now
+        else:
+            tick = max(now, OidGenerator._clock + 1)
+        if tick - now > OidGenerator._max_borrowed_ticks:
+            time.sleep(tick - now - OidGenerator._max_borrowed_ticks)
+        if tick & 0xFFFFFFFFC0000000 != 0:
+            raise ValueError("OID clock state out of range: %s" % tick)
+        return tick
+
+    @classmethod
+    def _reserve(cls, n: int) -> List[Tuple[int, int, int]]:
+        """Reserve n OIDs, as (clock, first counter, count) blocks."""
         if OidGenerator.node_id is None:
             OidGenerator.node_id = OidGenerator._determine_node_id()
-            OidGenerator._counter = 0
-            OidGenerator._clock = 0
-            OidGenerator._clock = OidGenerator._check_clock()
 
-        OidGenerator._counter += 1
-        if OidGenerator._counter > 4095:
-            OidGenerator._counter = 0
-            OidGenerator._clock = OidGenerator._check_clock()
+        blocks = []
+        while n > 0:
+            if OidGenerator._clock is None or OidGenerator._counter > 4095:
+                OidGenerator._clock = OidGenerator._next_tick()
+                OidGenerator._counter = 0
+            count = min(n, 4096 - OidGenerator._counter)
+            blocks.append((OidGenerator._clock, OidGenerator._counter, count))
+            OidGenerator._counter += count
+            n -= count
+        return blocks
 
-        # A Platform OID looks like this in binary:
-        # - 52 bits in total.
-        # - Top 12 Bits: Node ID
-        # - Middle 27 Bits: Clock State
-        # - Last 13 Bits: Counter State
+    @classmethod
+    def _compose(cls, clock: int, counter: int) -> int:
+        # A Platform OID is 52 bits in total. Platform puts a 12 bit Node ID above a 27 bit clock and
+        # 13 bit counter, but the clock outgrew 27 bits in 2017, so here it looks like this in binary:
+        # - Top 30 Bits: Clock State (good until 2046)
+        # - Middle 10 Bits: Node ID % 1024 (all webapps Node IDs are 3072 + (seq % 1024))
+        # - Last 12 Bits: Counter State
+        # The clock state has been past 2**28 since 2021, so these OIDs are all above 2**50 and never
+        # collide with OIDs from the old layout (clock << 13 | counter), which are all below 2**42.
 
         mask = 0x000FFFFFFFFFFFFF
         result = mask & (
-            (OidGenerator.node_id << 52)
-            | (OidGenerator._clock << 13)
-            | OidGenerator._counter
+            (clock << 22) | ((OidGenerator.node_id & 0x3FF) << 12) | counter
         )
         return result
 
+    @classmethod
+    def allocate(cls):
+        """Synthesize a platform style OID."""
+        with OidGenerator._lock:
+            ((clock, counter, _),) = OidGenerator._reserve(1)
+        return OidGenerator._compose(clock, counter)
+
+    @classmethod
+    def allocate_many(cls, n: int) -> List[int]:
+        """Synthesize n platform style OIDs, in increasing order.
+
+        Reserves all n at once; use this instead of calling allocate in a loop for bulk inserts.
+        """
+        with OidGenerator._lock:
+            blocks = OidGenerator._reserve(n)
+        oids: List[int] = []
+        for clock, counter, count in blocks:
+            first = OidGenerator._compose(clock, counter)
+            oids.extend(range(first, first + count))
+        return oids
+
 
 class ModelMixin:
     @classmethod
@@ -92,6 +141,11 @@ class ModelMixin:
         """Create a platform style object ID. Use this only for tables that don't have a sequence oid."""
         return OidGenerator.allocate()
 
+    @classmethod
+    def get_new_oids(cls, n: int) -> List[int]:
+        """Create n platform style object IDs at once, for bulk inserts."""
+        return OidGenerator.allocate_many(n)
+
     def jsonapi_attributes(self):
         attr = {}
         for col in self.__mapper__.columns:
@@ -2,19 +2,19 @@ import logging
 import time
 from typing import Optional
 
-import xlrd
-
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 
-from datafeeds.common.alert import post_slack_message
+from datafeeds.common.alert import queue_alert
 from datafeeds.common.base import BaseWebScraper, CSSSelectorBasePageObject
 from datafeeds.common.batch import run_datafeed
 
 from datafeeds import db
 from datafeeds.common.exceptions import ApiError
+from datafeeds.common.interval_csv import insert_readings
+from datafeeds.common.interval_sheet import read_interval_sheet
 from datafeeds.common.support import Configuration, DateRange, Results
 from datafeeds.common.timeline import Timeline
 from datafeeds.common.typing import Status
@@ -28,6 +28,10 @@ from datafeeds.models import (
 log = logging.getLogger(__name__)
 DATE_FORMAT = "%m-%d-%Y"
 MAX_DOWNLOAD_DAYS = 178  # Max days set by Bloom minus one to get full previous day
+# Data extract workbooks have timestamps in the second column (the first is the logo),
+# and energy output in the column with this header.
+DATE_COLUMN = 1
+ENERGY_HEADER = "Electricity Out"
 
 
 class NoIntervalDataException(Exception):
@@ -121,54 +125,6 @@ class DataExtractPage(CSSSelectorBasePageObject):
         self.find_element(self.SubmitButton).click()
 
 
-class ExcelParser:
-    def __init__(self, file_path: str, sheet_index: int = 0):
-        self.file_path = file_path
-        self.xl_workbook = xlrd.open_workbook(self.file_path)
-        self.xl_sheet = self.xl_workbook.sheet_by_index(sheet_index)
-        self.date_col = 1
-        self.value_col = 5
-        self.check_energy_column()
-
-    def check_energy_column(self):
-        log.info("Confirming energy output is column %s", self.value_col)
-        output_string = "text:'Electricity Out'"
-
-        for cell in range(len(self.xl_sheet.col(self.value_col))):
-            if str(self.xl_sheet.col(self.value_col)[cell]) == output_string:
-                log.info("Electricity output is column %s", self.value_col)
-                return
-        log.error("Did not find electricity output in column %s", self.value_col)
-        raise Exception
-
-    def find_starting_date(self):
-        # Find the first date row where interval dates start.
-        # Starts in second column since first is just the logo.
-        for row_number in range(0, self.xl_sheet.nrows):
-            if self.xl_sheet.cell(row_number, 1).ctype == xlrd.XL_CELL_DATE:
-                return row_number
-
-        return None
-
-    def parse_date(self, row_number: int):
-        return datetime(
-            *xlrd.xldate_as_tuple(
-                self.xl_sheet.cell(row_number, self.date_col).value,
-                self.xl_workbook.datemode,
-            )
-        )
-
-    def parse_kwh(self, row_number: int, interval: int):
-        return self._convert_kwh_to_kw(
-            self.xl_sheet.cell(row_number, self.value_col).value, interval
-        )
-
-    @staticmethod
-    def _convert_kwh_to_kw(kwh: float, interval: int):
-        # 15 minute intervals (or 1440 for 1st gen models) so multiply by 60 minutes and divide by interval
-        return (kwh * 60) / interval
-
-
 class BloomScraper(BaseWebScraper):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -207,22 +163,23 @@ class BloomScraper(BaseWebScraper):
         return date_to_format.strftime(DATE_FORMAT)
 
     def _process_excel_file(self, file_path: str, start_date: date, interval) -> bool:
-        parser = ExcelParser(file_path)
-        start_row = parser.find_starting_date()
-        if start_row:
-            # Create timeline when we find the first date
-            if not self.timeline:
-                new_date = parser.parse_date(start_row).date()
-                if new_date < start_date:
-                    new_date = start_date
-                self.timeline = Timeline(new_date, self.end_date, interval=interval)
-
-            for row_number in range(start_row, parser.xl_sheet.nrows):
-                date_value = parser.parse_date(row_number)
-
-                raw_kwh = parser.parse_kwh(row_number, interval)
-                self.timeline.insert(date_value, raw_kwh)
-        return bool(start_row)
+        readings = read_interval_sheet(
+            file_path,
+            timestamp=DATE_COLUMN,
+            value=ENERGY_HEADER,
+            # 15 minute intervals (or 1440 for 1st gen models) so multiply by 60 minutes and divide by interval
+            scale=60 / interval,
+        )
+        if readings.empty:
+            return False
+        # Create timeline when we find the first date
+        if not self.timeline:
+            new_date = readings.index[0].date()
+            if new_date < start_date:
+                new_date = start_date
+            self.timeline = Timeline(new_date, self.end_date, interval=interval)
+        insert_readings(self.timeline, readings)
+        return True
 
     def _get_meter_interval(self):
         meter = db.session.query(Meter).get(self.meter_oid)
@@ -234,12 +191,11 @@ class BloomScraper(BaseWebScraper):
             log.info("Meter interval is already %s", interval)
             return
         log.error("Interval for meter %s is %s", self.meter_oid, interval)
-        post_slack_message(
+        queue_alert(
+            "empty interval data",
             "Bloom meter %s returned empty interval data. It may only have daily values"
             % self.meter_oid,
-            "#scrapers",
-            ":exclamation:",
-            username="Scraper monitor",
+            meter=self.meter_oid,
         )
         # An engineer will need to check the Bloom UI
         # and possibly change the meter interval in the database.
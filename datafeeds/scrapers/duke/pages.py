@@ -9,7 +9,7 @@ from datetime import date, timedelta
 from typing import List, Tuple
 
 from dateutil.parser import parse as parse_date
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
@@ -17,9 +17,12 @@ from selenium.webdriver.common.by import By
 from datafeeds import config
 from datafeeds.common.base import BaseWebScraper
 from datafeeds.common.upload import hash_bill, upload_bill_to_s3
-from datafeeds.common.util.selenium import file_exists_in_dir
 from datafeeds.common.typing import BillingDatum, BillingRange
-from datafeeds.common.util.selenium import ec_and
+from datafeeds.common.util.selenium import (
+    ec_and,
+    wait_for_download,
+    wait_until_settled,
+)
 from datafeeds.common.util.pagestate.pagestate import PageState
 from datafeeds.scrapers.duke import errors
 from datafeeds.scrapers.duke.errors import BillingScraperAccountUnavailable
@@ -32,6 +35,15 @@ def scroll_to(driver, elem):
     driver.execute_script("arguments[0].scrollIntoView(false);", elem)
 
 
+def switch_to_latest_window(driver, windows: int, seconds: int = 30):
+    """Wait for a window to open or close (from windows open), then switch to the latest."""
+    try:
+        driver.wait(seconds).until(lambda d: len(d.window_handles) != windows)
+    except TimeoutException:
+        log.info("still %s windows open after %ss", windows, seconds)
+    driver.switch_to.window(driver.window_handles[-1])
+
+
 class DukeLoginPage(PageState):
     UsernameInputLocator = (By.CSS_SELECTOR, "input#username")
     PasswordInputLocator = (By.CSS_SELECTOR, "input#password")
@@ -102,9 +114,9 @@ class DukeLandingPage(PageState):
         bills_page_for_meters_link = self.driver.find_element(
             *self.link_to_accs_locator
         )
+        windows = len(self.driver.window_handles)
         bills_page_for_meters_link.click()
-        self.driver.sleep(5)
-        self.driver.switch_to.window(self.driver.window_handles[-1])
+        switch_to_latest_window(self.driver, windows)
 
     def open_profiler_page(self):
         log.info("opening profilers page")
@@ -119,10 +131,9 @@ class DukeLandingPage(PageState):
             "//a[contains(text(), 'Energy Usage')]"
         )
         energy_usage_link.click()
-        self.driver.sleep(0.5)
         log.info("opening Electric Usage")
-        electrical_usage_link = self.driver.find_element_by_css_selector(
-            "a[href='/ElectricUsage']"
+        electrical_usage_link = self.driver.wait(10).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "a[href='/ElectricUsage']"))
         )
         electrical_usage_link.click()
         self.driver.screenshot(BaseWebScraper.screenshot_path("electric usage"))
@@ -305,21 +316,24 @@ class BillHistoryPage(PageState):
                 utility_code=None,
             )
 
+            windows = len(self.driver.window_handles)
             self.driver.find("a#billImageToPrint").click()
-            self.driver.sleep(1)
-            self.driver.switch_to.window(self.driver.window_handles[-1])
+            switch_to_latest_window(self.driver, windows)
 
             # the filename of the printed pdf is f"{current page title}.pdf"
             self.driver.execute_script("window.print();")
 
             try:
-                file_exists_in_dir(
-                    directory=self.download_dir, pattern=r"^Bill View Bill Image.pdf$"
+                # the pdf is written in place, not downloaded to a partial file
+                curr_path = wait_for_download(
+                    self.driver,
+                    self.download_dir,
+                    r"^Bill View Bill Image.pdf$",
+                    stable=1.0,
                 )
-            except Exception:
+            except TimeoutException:
                 raise Exception("Unable to download file for %s" % pdf_date)
 
-            curr_path = os.path.join(self.download_dir, "Bill View Bill Image.pdf")
             new_path = os.path.join(
                 self.download_dir, f"bill_{pdf_date.strftime('%Y-%m-%d')}.pdf"
             )
@@ -327,10 +341,10 @@ class BillHistoryPage(PageState):
 
             log.info("parsed bill for %s - %s", data.start, data.end)
 
+            windows = len(self.driver.window_handles)
             self.driver.find("a#close").click()
-            self.driver.sleep(1)
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            self.driver.sleep(1)
+            switch_to_latest_window(self.driver, windows)
+            wait_until_settled(self.driver, seconds=1)
 
             # upload PDF:
             key = hash_bill(
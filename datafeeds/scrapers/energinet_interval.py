@@ -2,13 +2,15 @@
 import json
 import logging
 import requests
-from typing import Optional
+from typing import List, Optional
 
-from datetime import timedelta, date, datetime
+from datetime import timedelta, date, datetime, time
+from dateutil import tz
 from dateutil.parser import parse as parse_date
 
 from datafeeds.common.base import BaseApiScraper
 from datafeeds.common.batch import run_datafeed
+from datafeeds.common.daylight_savings import DSTCalendar
 from datafeeds.common.exceptions import LoginError
 from datafeeds.common.support import Configuration as BaseConfiguration, Results
 from datafeeds.common.timeline import Timeline
@@ -18,6 +20,8 @@ from datafeeds.models import SnapmeterAccount, Meter, SnapmeterMeterDataSource
 
 log = logging.getLogger(__name__)
 
+TIMEZONE = "Europe/Copenhagen"
+
 
 class Configuration(BaseConfiguration):
     def __init__(self, metering_point):
@@ -72,17 +76,31 @@ class Scraper(BaseApiScraper):
             return
         data = doc["TimeSeries"][0].get("Period", [])
 
+        # Periods are local days, with 23 or 25 hours when daylight savings time starts or ends.
+        calendar = DSTCalendar(TIMEZONE, start, end, interval=60)
         for period in data:
-            date_ = parse_date(period["timeInterval"]["end"]).date()
+            date_ = (
+                parse_date(period["timeInterval"]["start"])
+                .astimezone(tz.gettz(TIMEZONE))
+                .date()
+            )
+            if date_ not in calendar.days:
+                log.warning("skipping period outside date range: %s", date_)
+                continue
+            values: List[Optional[float]] = [None] * calendar.count(date_)
             for point in period["Point"]:
-                # sometimes returns position outside of 1..24
+                # sometimes returns position outside of the day
                 try:
-                    hour = parse_date("%s:00" % (int(point["position"]) - 1)).time()
-                    value = float(point["out_Quantity.quantity"])
-                    timeline.insert(datetime.combine(date_, hour), value)
+                    position = int(point["position"])
+                    if not 1 <= position <= len(values):
+                        raise ValueError("position outside 1..%s" % len(values))
+                    values[position - 1] = float(point["out_Quantity.quantity"])
                 except ValueError as exc:
                     log.warning("error parsing point %s: %s", point, exc)
                     continue
+            # The repeated hour when daylight savings time ends is averaged.
+            for hour, value in enumerate(calendar.fixed_day(date_, values)):
+                timeline.insert(datetime.combine(date_, time(hour)), value)
 
     def _execute(self):
         log.info("Attempting to log into the eloverblik API.")
@@ -1,20 +1,28 @@
-import csv
 import time
 import logging
 
-from typing import Optional, Tuple, List, Callable, Union
+from typing import Optional, Tuple, List, Callable
 from datetime import timedelta, datetime, date, time as time_t
-from dateutil import parser as dateparser
 from dateutil.relativedelta import relativedelta
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 from retrying import retry
+import requests
 
 from datafeeds.common.batch import run_datafeed
 from datafeeds.common.support import DateRange
 from datafeeds.common.support import Results
 from datafeeds.common.base import BaseWebScraper, CSSSelectorBasePageObject
 from datafeeds.common.exceptions import LoginError
+from datafeeds.common.interval_csv import AVERAGE, insert_readings, read_interval_csv
+from datafeeds.common.subrange_download import (
+    FormRequest,
+    ReplayError,
+    download_subranges,
+    form_request,
+    replay,
+    session_from_driver,
+)
 from datafeeds.common.support import Configuration
 from datafeeds.common.timeline import Timeline
 from datafeeds.common.typing import Status
@@ -297,8 +305,33 @@ class IntervalForm(IFrameBasePageObject):
         # Click Save
         self.find_element(self.SaveButton).click()
 
+    @iframe_decorator
+    def export_requests(self, sub_ranges: List[DateRange]) -> List[FormRequest]:
+        """The Save request for each sub-range, to replay without the browser."""
+        save = self.find_element(self.SaveButton)
+        return [
+            form_request(
+                self._driver,
+                save,
+                {
+                    self.StartDate: IntervalForm._format_date(
+                        IntervalForm._backup_start_date(sub_range.start_date)
+                    ),
+                    self.EndDate: IntervalForm._format_date(sub_range.end_date),
+                },
+            )
+            for sub_range in sub_ranges
+        ]
+
+    @iframe_decorator
+    def export_session(self, pool_size: int) -> requests.Session:
+        """A requests Session logged in to MVWeb, for replaying Save requests."""
+        return session_from_driver(self._driver, pool_size)
+
 
 class HECOScraper(BaseWebScraper):
+    max_subrange_downloads = 3
+
     def __init__(self, *args, **kwargs):
         """
         HECO MVWeb Selenium Scraper
@@ -318,30 +351,10 @@ class HECOScraper(BaseWebScraper):
     def meter_id(self):
         return self._configuration.meter_id
 
-    @staticmethod
-    def _get_header_position(header_row: List[str], column_title: str) -> int:
-        """
-        CSV data has a lot of whitespace in the header rows, and the header titles
-        themselves are subject to change.  Searches every column title for a partial
-        case-insensitive match and returns the matching index.
-        """
-        for pos, column in enumerate(header_row):
-            if column_title.lower() in column.lower():
-                return pos
-
-        raise Exception("Expected column header not found for {}".format(column_title))
-
     @staticmethod
     def _format_time(time_to_format: time_t) -> str:
         return time_to_format.strftime("%H:%M")
 
-    @staticmethod
-    def _convert_demand_type(demand: str) -> Union[float, str]:
-        try:
-            return float(demand)
-        except ValueError:
-            return demand
-
     def _process_csv(self, file_path: str, timeline: Timeline):
         """
         Processes the demand download csv from Powertrax - lots of whitespace in
@@ -359,25 +372,34 @@ class HECOScraper(BaseWebScraper):
         :param file_path: path for the downloaded csv file
         :param timeline: timeline containing demand data
         """
-        with open(file_path) as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
-            header_row = next(csv_reader)
-
-            date_time_col = HECOScraper._get_header_position(header_row, "Date / Time")
-            # Assumes there's only one kW column - this is channel 1
-            demand_col = HECOScraper._get_header_position(header_row, "KW")
-
-            for row in csv_reader:
-                raw_datetime = dateparser.parse(row[date_time_col].strip())
-                raw_demand = row[demand_col].strip()
-                val = self._convert_demand_type(raw_demand)
-                # If we get two values for the same timestamp, average them.
-                # This is likely to happen on fall DST day, when we get two sets of readings for 1:00-1:45.
-                if timeline.lookup(raw_datetime):
-                    val = (timeline.lookup(raw_datetime) + val) / 2
-                timeline.insert(raw_datetime, val)
+        # Assumes there's only one kW column - this is channel 1
+        readings = read_interval_csv(
+            file_path,
+            timestamp="Date / Time",
+            value="KW",
+            # If we get two values for the same timestamp, average them.
+            # This is likely to happen on fall DST day, when we get two sets of readings for 1:00-1:45.
+            duplicates=AVERAGE,
+        )
+        insert_readings(timeline, readings)
         return timeline
 
+    def _complete_sub_range(
+        self, timeline: Timeline, sub_range: DateRange, file_path: str
+    ):
+        """Add the readings in a sub-range's csv to timeline, and checkpoint them."""
+        completed = self._process_csv(
+            file_path,
+            Timeline(
+                sub_range.start_date,
+                sub_range.end_date,
+                self._configuration.interval,
+            ),
+        )
+        serialized = completed.serialize(include_empty=False)
+        self.checkpoint.complete(sub_range, serialized, file_path)
+        timeline.update(serialized)
+
     def login_to_mvweb(self):
         """
         Log in through HECO interface and then navigate to MVWeb Portal
@@ -400,6 +422,26 @@ class HECOScraper(BaseWebScraper):
         self.screenshot("before navigating to powertrax")
         overview_page.navigate_to_powertrax()
 
+    def _replay_downloads(
+        self, interval_form: IntervalForm, sub_ranges: List[DateRange], workers: int
+    ) -> List[Tuple[DateRange, str]]:
+        """Download the csv for each sub-range concurrently, without the browser."""
+        export_requests = {
+            (sub_range.start_date, sub_range.end_date): request
+            for sub_range, request in zip(
+                sub_ranges, interval_form.export_requests(sub_ranges)
+            )
+        }
+        session = interval_form.export_session(workers)
+
+        def download(sub_range: DateRange, directory: str) -> str:
+            request = export_requests[(sub_range.start_date, sub_range.end_date)]
+            return replay(session, request, directory, "download.csv")
+
+        return download_subranges(
+            sub_ranges, download, self._driver.download_dir, workers
+        )
+
     def _execute(self):
         # Direct the driver to the login page
         self._driver.get(self.login_url)
@@ -451,7 +493,14 @@ class HECOScraper(BaseWebScraper):
         timeline = Timeline(adjusted_start, adjusted_end, self._configuration.interval)
         # Breaks the date range into small, manageable chunks and downloads a csv
         # of demands for each one.
-        for sub_range in date_range.split_iter(delta=interval_size):
+        # Sub-ranges downloaded by an earlier attempt are restored from the checkpoint.
+        sub_ranges = [
+            sub_range
+            for sub_range in date_range.split_iter(delta=interval_size)
+            if not self.checkpoint.restore(timeline, sub_range)
+        ]
+        workers = self.subrange_downloads()
+        for idx, sub_range in enumerate(sub_ranges):
             log.info("Getting interval data for date range: {}".format(sub_range))
             start = sub_range.start_date
             end = sub_range.end_date
@@ -461,7 +510,20 @@ class HECOScraper(BaseWebScraper):
             file_path = self.download_file("csv")
 
             # Extract intermediate info from csv
-            self._process_csv(file_path, timeline)
+            self._complete_sub_range(timeline, sub_range, file_path)
+
+            if idx == 0 and workers > 1 and len(sub_ranges) > 1:
+                # the form works; replay it for the rest, or carry on with the browser
+                try:
+                    downloads = self._replay_downloads(
+                        interval_form, sub_ranges[1:], workers
+                    )
+                except (ReplayError, requests.RequestException) as exc:
+                    log.warning("replaying interval downloads failed: %s", exc)
+                    continue
+                for replayed, path in downloads:
+                    self._complete_sub_range(timeline, replayed, path)
+                break
 
         return Results(readings=timeline.serialize(include_empty=False))
 
@@ -3,6 +3,7 @@ import time
 import os
 import logging
 
+from concurrent.futures import Future
 from io import BytesIO
 from typing import Optional, List, Set
 
@@ -17,9 +18,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
 
 from datafeeds import config, db
-from datafeeds.common.alert import post_slack_message
+from datafeeds.common.alert import queue_alert
 from datafeeds.common.batch import run_datafeed
-from datafeeds.common.captcha import recaptcha_v2
+from datafeeds.common.captcha import (
+    CaptchaFailed,
+    set_recaptcha_response,
+    start_recaptcha_v2,
+)
 from datafeeds.common.support import Results
 from datafeeds.common.base import BaseWebScraper, CSSSelectorBasePageObject
 from datafeeds.common.support import Configuration
@@ -69,11 +74,10 @@ def notify_rebill(meter_number: str, statement: date):
             meter_number,
             statement.strftime("%m/%d/%y"),
         )
-    post_slack_message(
+    queue_alert(
+        "bill corrections",
         "LAWDP PDF scraper found a bill with corrections: %s" % message,
-        "#scrapers",
-        ":exclamation:",
-        username="Scraper monitor",
+        meter=meter.oid if meter else None,
     )
 
 
@@ -722,12 +726,20 @@ class BillHistoryPage(CSSSelectorBasePageObject):
         )
         time.sleep(5)
 
-    def solve_captcha(self) -> bool:
+    def start_captcha(self) -> "Future[str]":
+        """Start solving the captcha; return a future for the token."""
         iframe_parent = self._driver.find_element_by_xpath(
             self.ReCaptchaIframeParentXpath
         )
         page_url = self._driver.current_url
-        if not recaptcha_v2(self._driver, iframe_parent, page_url):
+        return start_recaptcha_v2(
+            self._driver, iframe_parent, page_url, utility="utility:ladwp"
+        )
+
+    def solve_captcha(self, captcha: "Future[str]") -> bool:
+        try:
+            set_recaptcha_response(self._driver, captcha.result())
+        except CaptchaFailed:
             log.warning("failed captcha solving")
             return False
 
@@ -796,8 +808,9 @@ class LADWPBillPdfScraper(BaseWebScraper):
             bill_history_page.logout()
             raise Exception("too many sessions")
         bill_history_page.wait_until_ready()
+        captcha = bill_history_page.start_captcha()
         self.screenshot("after captcha")
-        if not bill_history_page.solve_captcha():
+        if not bill_history_page.solve_captcha(captcha):
             bill_history_page.logout()
             raise Exception("captcha failed")
 
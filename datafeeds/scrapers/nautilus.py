@@ -1,5 +1,4 @@
 from datetime import date, datetime, timedelta
-from time import sleep
 import os
 from typing import List, Optional, Tuple
 import csv
@@ -269,7 +268,7 @@ class NautilusScraper(BaseWebScraper):
     def _execute(self):
         self.construct_site_url()
         self._driver.get(self.site_url)
-        sleep(5)
+        self.wait_until_settled(seconds=5)
         if "Error?aspxerrorpath" in self._driver.current_url:
             raise NautilusException("Error - could not find site url")
 
@@ -282,7 +281,7 @@ class NautilusScraper(BaseWebScraper):
         log.info(msg)
 
         site_page.month_select()
-        sleep(5)
+        self.wait_until_settled(seconds=5)
 
         earliest_shown = site_page.get_earliest_shown()
         # coarse-grained: go back by month
@@ -290,11 +289,11 @@ class NautilusScraper(BaseWebScraper):
             msg = "finding where to start. earliest_shown is %s" % earliest_shown
             log.info(msg)
             site_page.double_back_arrow_select()
-            sleep(5)
+            self.wait_until_settled(seconds=5)
             earliest_shown = site_page.get_earliest_shown()
 
         site_page.five_days_select()
-        sleep(10)
+        self.wait_until_settled(seconds=10)
         earliest_shown = site_page.get_earliest_shown()
 
         # fine-grained: go back by 5-day increments
@@ -302,7 +301,7 @@ class NautilusScraper(BaseWebScraper):
             msg = "finding where to start. earliest_shown is %s" % earliest_shown
             log.info(msg)
             site_page.double_back_arrow_select()
-            sleep(5)
+            self.wait_until_settled(seconds=5)
             earliest_shown = site_page.get_earliest_shown()
 
         timeline = Timeline(self.start_date, self.end_date)
@@ -312,7 +311,7 @@ class NautilusScraper(BaseWebScraper):
             msg = "gathering data. earliest_shown is %s" % earliest_shown
             log.info(msg)
             site_page.hamburger_select()
-            sleep(2)
+            self.wait_until_settled(seconds=2)
             file_path = site_page.download_csv()
             data = CSVParser(file_path).process_csv()
             for dt, use_kw in data:
@@ -321,7 +320,7 @@ class NautilusScraper(BaseWebScraper):
             log.info("Cleaning up download.")
             clear_downloads(self._driver.download_dir)
             site_page.double_back_arrow_select()
-            sleep(5)
+            self.wait_until_settled(seconds=5)
             earliest_shown = site_page.get_earliest_shown()
 
         return Results(readings=timeline.serialize())
@@ -12,7 +12,7 @@ from datafeeds.common.support import Results, Configuration
 from datafeeds.common.typing import Status, BillPdf
 from datafeeds.common.util.selenium import file_exists_in_dir
 
-from datafeeds.common.upload import hash_bill, upload_bill_to_s3
+from datafeeds.common.upload import hash_bill, upload_bills_to_s3, BillUpload
 
 from datafeeds.models import (
     SnapmeterAccount,
@@ -100,6 +100,7 @@ class DashboardPage(CSSSelectorBasePageObject):
     ) -> List[BillPdf]:
         """Download bill PDFs for the specified date range."""
         pdfs: List[BillPdf] = []
+        uploads: List[BillUpload] = []
         log.info("Opening billing history")
 
         click(self._driver, css_selector="#arrowBillPaymentHistory")
@@ -194,12 +195,13 @@ class DashboardPage(CSSSelectorBasePageObject):
                 continue
 
             with open("%s/%s" % (download_dir, filename), "rb") as f:
-                key = hash_bill(
-                    self.account_id, approx_bill_start, approx_bill_end, cost, "", ""
-                )
-
-                upload_bill_to_s3(
-                    file_handle=f,
+                body = f.read()
+            key = hash_bill(
+                self.account_id, approx_bill_start, approx_bill_end, cost, "", ""
+            )
+            uploads.append(
+                BillUpload(
+                    body=body,
                     key=key,
                     source="pge.com",
                     statement=bill_date,
@@ -208,8 +210,8 @@ class DashboardPage(CSSSelectorBasePageObject):
                     gen_utility=gen_utility,
                     gen_utility_account_id=gen_utility_account_id,
                 )
-
-            log.info(f"Uploaded {filename} to {key}")
+            )
+            log.info(f"Downloaded {filename} for {key}")
             pdfs.append(
                 BillPdf(
                     utility_account_id=utility_account,
@@ -221,6 +223,8 @@ class DashboardPage(CSSSelectorBasePageObject):
                 )
             )
 
+        # upload the downloaded PDFs concurrently, once each
+        upload_bills_to_s3(uploads)
         return pdfs
 
 
@@ -3,7 +3,6 @@ from typing import List, Optional, Tuple
 import csv
 import logging
 import os
-import time
 
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
@@ -14,7 +13,11 @@ from datafeeds.common.base import BaseWebScraper
 from datafeeds.common.batch import run_datafeed
 from datafeeds.common.timeline import Timeline
 from datafeeds.common.support import Configuration, Results
-from datafeeds.common.util.selenium import file_exists_in_dir, clear_downloads
+from datafeeds.common.util.selenium import (
+    clear_downloads,
+    file_exists_in_dir,
+    wait_until_settled,
+)
 from datafeeds.common.typing import Status
 from datafeeds.models import (
     SnapmeterAccount,
@@ -116,7 +119,7 @@ class SiteStatusPage:
         hamburger_xpath = """//*[@class='svg-inline--fa fa-bars fa-w-14 fa-fw ']"""
         log.info("Waiting for hamburger to be clickable")
         # This wait is necessary or it fails with 'other element would get click'
-        time.sleep(5)
+        wait_until_settled(self.driver, seconds=5)
         hamburger = self.driver.wait(60).until(
             ec.element_to_be_clickable((By.XPATH, hamburger_xpath))
             # ec.element_to_be_clickable((By.CSS_SELECTOR, hamburger_selector))
@@ -266,9 +269,9 @@ class PowerTrackScraper(BaseWebScraper):
 
         self.screenshot("site selection")
         log.info("Selecting site")
-        time.sleep(5)
+        self.wait_until_settled(seconds=5)
         status_page = portfolio_page.go_to_status_page(self.site_id)
-        time.sleep(15)
+        self.wait_until_settled(seconds=15)
         self.install_date = status_page.get_install_date()
         msg = "Installation date is %s" % self.install_date
 
@@ -301,7 +304,7 @@ class PowerTrackScraper(BaseWebScraper):
             clear_downloads(self._driver.download_dir)
             status_page.calendar_back_click()
             earliest_shown = status_page.get_earliest_shown()
-            time.sleep(5)
+            self.wait_until_settled(seconds=5)
 
         return Results(readings=timeline.serialize())
 
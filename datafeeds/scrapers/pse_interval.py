@@ -1,6 +1,5 @@
 import os
 import sh
-import csv
 import json
 import time
 import logging
@@ -9,7 +8,6 @@ from datetime import date
 
 from typing import Optional
 from dateutil.relativedelta import relativedelta
-from dateutil.parser import parse as parse_date
 
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
@@ -18,6 +16,12 @@ from selenium.common.exceptions import TimeoutException
 from datafeeds import config
 from datafeeds.common.batch import run_datafeed
 from datafeeds.common.base import BaseWebScraper
+from datafeeds.common.interval_csv import (
+    LAST,
+    SKIP,
+    insert_readings,
+    read_interval_csv,
+)
 from datafeeds.common.support import Configuration, DateRange, Results
 from datafeeds.common.timeline import Timeline
 from datafeeds.common.typing import Status
@@ -242,8 +246,6 @@ class PSEIntervalReportParser:
         self.parse_csv(f2)
 
     def parse_csv(self, filepath):
-        lines = [line for line in open(filepath)]
-
         fields = [
             "compare_day_of_week",
             "compare_dt",
@@ -253,23 +255,20 @@ class PSEIntervalReportParser:
             "kWh",
             "delta",
         ]
-        rows = [row for row in csv.DictReader(lines[3:], fieldnames=fields)]
-
-        for row in rows:
-            try:
-                kWhStr = row.get("kWh")
-                if kWhStr == "null":
-                    # This form of null data happens often enough that
-                    # it's not worth alerting on.
-                    continue
-                kWh = float(row.get("kWh"))
-                dt = parse_date(row.get("dt"))
-                self.timeline.insert(dt, kWh * 4)  # Convert to demand.
-            except ValueError:
-                log.info(
-                    "Failed to parse data point: (dt: %s, kWh: %s)"
-                    % (row.get("dt"), row.get("kWh"))
-                )
+        # "null" readings happen often enough that it's not worth alerting on them;
+        # rows that can't be parsed are logged and skipped. A repeated timestamp keeps the
+        # last reading.
+        readings = read_interval_csv(
+            filepath,
+            timestamp="dt",
+            value="kWh",
+            names=fields,
+            skip_rows=3,
+            duplicates=LAST,
+            errors=SKIP,
+        )
+        # Convert to demand; missing readings are left empty.
+        insert_readings(self.timeline, readings.dropna() * 4)
 
     def serialize(self):
         return self.timeline.serialize()
@@ -1,20 +1,27 @@
 import os
-import csv
 import logging
 import re
-import time
-from typing import List, Optional
-from datetime import timedelta
+from typing import List, Optional, Tuple
 
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from dateutil.relativedelta import relativedelta
-from dateutil.parser import parse as parse_date
+import pandas as pd
+import requests
 
 from datafeeds.common.batch import run_datafeed
 import datafeeds.scrapers.saltriver.pages as saltriver_pages
 import datafeeds.scrapers.saltriver.errors as saltriver_errors
-from datafeeds.common.exceptions import InvalidDateRangeError
+from datafeeds.common.exceptions import (
+    InvalidDateRangeError,
+    InvalidMeterDataException,
+)
+from datafeeds.common.subrange_download import (
+    ReplayError,
+    download_subranges,
+    replay,
+)
+from datafeeds.common.interval_csv import AVERAGE, insert_readings, read_interval_csv
 from datafeeds.common.base import BaseWebScraper
 from datafeeds.common.support import Configuration
 from datafeeds.common.typing import Status
@@ -38,44 +45,24 @@ log = logging.getLogger(__name__)
 #   <set number> is another identifier that is not currently used
 # Example:
 # KW(ch: 1 set:0)
-# This regex identifies an interval data header and stores the channel number in the first group.
-header_regex = re.compile(r"\w+\(ch:\s*(\d+)\s*set:\s*\d+\)")
-
-
-def parse_spatia_interval_csv(path, channel_id):
-    with open(path, "r") as f:
-        reader = csv.reader(f)
-        # pylint: disable=stop-iteration-return
-        headers = next(reader, None)
-        if not headers:
-            raise saltriver_errors.IntervalDataParseError(
-                "No header row found in interval data download."
-            )
-
-        channel_columns = {}
-        for idx, header in enumerate(headers):
-            match = header_regex.match(header.strip())
-            if match:
-                channel_columns[match.group(1)] = idx
-
-        data_index = channel_columns.get(channel_id)
-        if not data_index:
-            raise saltriver_errors.IntervalDataParseError(
-                "No column found for channel with id='{}'".format(channel_id)
-            )
+# This regex identifies the interval data header for a channel (formatted with the channel number).
+header_regex = r"\w+\(ch:\s*{}\s*set:\s*\d+\)"
 
-        try:
-            for row in reader:
-                when = parse_date(row[1])
 
-                reading = None
-                reading_str = row[data_index].strip()
-                if reading_str:
-                    reading = float(row[data_index])
+def parse_spatia_interval_csv(path, channel_id) -> pd.Series:
+    """Return the readings for a channel, indexed by the end of each interval.
 
-                yield (when, reading)
-        except Exception as e:
-            raise saltriver_errors.IntervalDataParseError from e
+    Readings repeated when daylight savings time ends are averaged.
+    """
+    try:
+        return read_interval_csv(
+            path,
+            timestamp=1,
+            value=re.compile(header_regex.format(re.escape(channel_id))),
+            duplicates=AVERAGE,
+        )
+    except InvalidMeterDataException as e:
+        raise saltriver_errors.IntervalDataParseError(str(e)) from e
 
 
 class SaltRiverIntervalConfiguration(Configuration):
@@ -86,6 +73,8 @@ class SaltRiverIntervalConfiguration(Configuration):
 
 
 class SaltRiverIntervalScraper(BaseWebScraper):
+    max_subrange_downloads = 3
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.browser_name = "Chrome"
@@ -227,6 +216,63 @@ class SaltRiverIntervalScraper(BaseWebScraper):
         for path in to_remove:
             os.remove(path)
 
+    def download_sub_range(
+        self,
+        interval_download_page: saltriver_pages.IntervalDownloadPage,
+        sub_range: DateRange,
+    ) -> str:
+        """Download the interval data CSV for a sub-range with the browser."""
+        log.info("downloading %s", sub_range)
+        self.clear_csv_downloads()
+        interval_download_page.set_date_range(sub_range.start_date, sub_range.end_date)
+        interval_download_page.download_interval_data()
+        self.screenshot("download %s" % sub_range.end_date.strftime("%Y%m%d"))
+        try:
+            wait = WebDriverWait(self._driver, 180)
+            csv_file_name = wait.until(
+                file_exists_in_dir(self._driver.download_dir, r".*\.csv")
+            )
+        except TimeoutException:
+            raise TimeoutException("Downloading interval data from SPATIA failed.")
+        return os.path.join(self._driver.download_dir, csv_file_name)
+
+    def replay_downloads(
+        self,
+        interval_download_page: saltriver_pages.IntervalDownloadPage,
+        sub_ranges: List[DateRange],
+        workers: int,
+    ) -> List[Tuple[DateRange, str]]:
+        """Download the interval data CSVs for sub-ranges concurrently, without the browser."""
+        export_requests = {
+            (sub_range.start_date, sub_range.end_date): request
+            for sub_range, request in zip(
+                sub_ranges, interval_download_page.export_requests(sub_ranges)
+            )
+        }
+        session = interval_download_page.export_session(workers)
+
+        def download(sub_range: DateRange, directory: str) -> str:
+            request = export_requests[(sub_range.start_date, sub_range.end_date)]
+            return replay(session, request, directory, "interval.csv")
+
+        return download_subranges(
+            sub_ranges, download, self._driver.download_dir, workers
+        )
+
+    def insert_csv(
+        self, timeline: Timeline, sub_range: DateRange, csv_file_path: str, channel
+    ):
+        readings = parse_spatia_interval_csv(csv_file_path, channel.id)
+        # The CSV file reports readings at the end of each fifteen minute interval. So the first reading
+        # of the day occurs at 00:15. and the last at midnight. We want to report the readings at the
+        # _start_ of each interval, thus we subtract 15 minutes here.
+        readings.index = readings.index - pd.Timedelta(minutes=15)
+        completed = Timeline(sub_range.start_date, sub_range.end_date)
+        insert_readings(completed, readings)
+        serialized = completed.serialize(include_empty=False)
+        self.checkpoint.complete(sub_range, serialized, csv_file_path)
+        timeline.update(serialized)
+
     def reports_page_action(self, reports_page: saltriver_pages.SaltRiverReportsPage):
         log.info("goto_meter_profiles")
         reports_page.goto_meter_profiles()
@@ -244,7 +290,8 @@ class SaltRiverIntervalScraper(BaseWebScraper):
         log.info("goto reports")
         meter_page.goto_reports()
         WebDriverWait(self._driver, 30).until(page_is_ready(reports_page))
-        time.sleep(10)
+        # the report links are loaded after the page
+        self.wait_until_settled(seconds=10)
         log.info("looking for interval download")
         reports_page.goto_interval_download()
         interval_download_page = saltriver_pages.IntervalDownloadPage(self._driver)
@@ -272,30 +319,28 @@ class SaltRiverIntervalScraper(BaseWebScraper):
         date_range = DateRange(start, end)
         interval_size = relativedelta(days=30)
         timeline = Timeline(start, end)
-        for sub_range in date_range.split_iter(delta=interval_size):
-            log.info("downloading %s", sub_range)
-            self.clear_csv_downloads()
-            interval_download_page.set_date_range(
-                sub_range.start_date, sub_range.end_date
-            )
-            interval_download_page.download_interval_data()
-            self.screenshot("download %s" % sub_range.end_date.strftime("%Y%m%d"))
-            try:
-                wait = WebDriverWait(self._driver, 180)
-                csv_file_name = wait.until(
-                    file_exists_in_dir(self._driver.download_dir, r".*\.csv")
-                )
-                csv_file_path = os.path.join(self._driver.download_dir, csv_file_name)
-                for (when, reading) in parse_spatia_interval_csv(
-                    csv_file_path, channel.id
-                ):
-                    # The CSV file reports readings at the end of each fifteen minute interval. So the first reading
-                    # of the day occurs at 00:15. and the last at midnight. We want to report the readings at the
-                    # _start_ of each interval, thus we subtract 15 minutes here.
-                    when = when - timedelta(minutes=15)
-                    timeline.insert(when, reading)
-            except TimeoutException:
-                raise TimeoutException("Downloading interval data from SPATIA failed.")
+        # sub-ranges downloaded by an earlier attempt are restored from the checkpoint
+        sub_ranges = [
+            sub_range
+            for sub_range in date_range.split_iter(delta=interval_size)
+            if not self.checkpoint.restore(timeline, sub_range)
+        ]
+        workers = self.subrange_downloads()
+        for idx, sub_range in enumerate(sub_ranges):
+            csv_file_path = self.download_sub_range(interval_download_page, sub_range)
+            self.insert_csv(timeline, sub_range, csv_file_path, channel)
+            if idx == 0 and workers > 1 and len(sub_ranges) > 1:
+                # the form works; replay it for the rest, or carry on with the browser
+                try:
+                    downloads = self.replay_downloads(
+                        interval_download_page, sub_ranges[1:], workers
+                    )
+                except (ReplayError, requests.RequestException) as exc:
+                    log.warning("replaying interval downloads failed: %s", exc)
+                    continue
+                for replayed, path in downloads:
+                    self.insert_csv(timeline, replayed, path, channel)
+                break
 
         self.interval_data_timeline = timeline
 
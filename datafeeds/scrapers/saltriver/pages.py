@@ -1,12 +1,12 @@
 """Page object definitions for Salt River Project scrapers"""
 
 import logging
-import time
 from datetime import date, timedelta
 from io import BytesIO
 from typing import List, NamedTuple
 
 from dateutil import parser as date_parser
+import requests
 from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
@@ -22,6 +22,12 @@ from dateutil.parser import parse as parse_date
 
 from datafeeds import config
 from datafeeds.common.base import BaseWebScraper
+from datafeeds.common.subrange_download import (
+    FormRequest,
+    form_request,
+    session_from_driver,
+)
+from datafeeds.common.support import DateRange
 from datafeeds.common.typing import BillingDatum
 from datafeeds.common.upload import hash_bill_datum, upload_bill_to_s3
 from datafeeds.common.util.selenium import (
@@ -32,6 +38,7 @@ from datafeeds.common.util.selenium import (
     IFrameSwitch,
     WindowSwitch,
     file_exists_in_dir,
+    wait_until_settled,
 )
 from datafeeds.common.util.pagestate.pagestate import PageState
 from datafeeds.common.exceptions import LoginError
@@ -136,9 +143,7 @@ class SpatiaLoginPage(PageState):
 
 class SaltRiverLoginFailedPage(PageState):
     ErrorMessageLocator = (By.CSS_SELECTOR, "div.srp-alert-error.mb-2")
-
-    def get_ready_condition(self):
-        return EC.presence_of_element_located(self.ErrorMessageLocator)
+    ready_selector = "div.srp-alert-error.mb-2"
 
     def raise_on_error(self):
         """Raise an exception describing the login error."""
@@ -171,9 +176,7 @@ class SaltRiverLandingPage(PageState):
     UsageRadioButtonLocator = (By.XPATH, "//input[@type='radio' and @value='usage']")
     UsageTableBodyLocator = (By.XPATH, "//*[@id='usagetable']/tbody")
     UsageTableRowsLocator = (By.XPATH, "//*[@id='usagetable']/tbody/tr")
-
-    def get_ready_condition(self):
-        return EC.presence_of_element_located(self.AccountDropdownLocator)
+    ready_selector = "div#rw_1_input"
 
     def select_account(self, account_id: str):
         """Select account from dropdown.
@@ -210,7 +213,7 @@ class SaltRiverLandingPage(PageState):
                     log.debug("clicking %s", option.text)
                     option.click()
                     found = True
-                    time.sleep(5)
+                    wait_until_settled(self.driver, seconds=5)
                     break
         except StaleElementReferenceException:
             pass
@@ -605,8 +608,10 @@ class IntervalDownloadPage(PageState):
             selector = Select(self.driver.find_element(*self.MeterSelectLocator))
             selector.select_by_value(meter_id)
 
+    DateFormat = "%m/%d/%Y"
+
     def set_date_range(self, start: date, end: date):
-        date_format = "%m/%d/%Y"
+        date_format = self.DateFormat
         with IFrameSwitch(self.driver, "mainFrame"):
             start_elem = self.driver.find_element(*self.StartDateLocator)
             start_elem.clear()
@@ -621,6 +626,31 @@ class IntervalDownloadPage(PageState):
             log.info("clicking submit")
             self.driver.find_element(*self.SubmitSelector).click()
 
+    def export_requests(self, sub_ranges: List[DateRange]) -> List[FormRequest]:
+        """The download request for each sub-range, to replay without the browser."""
+        with IFrameSwitch(self.driver, "mainFrame"):
+            submit = self.driver.find_element(*self.SubmitSelector)
+            return [
+                form_request(
+                    self.driver,
+                    submit,
+                    {
+                        "input[name='StartDate']": sub_range.start_date.strftime(
+                            self.DateFormat
+                        ),
+                        "input[name='StopDate']": sub_range.end_date.strftime(
+                            self.DateFormat
+                        ),
+                    },
+                )
+                for sub_range in sub_ranges
+            ]
+
+    def export_session(self, pool_size: int) -> requests.Session:
+        """A requests Session logged in to SPATIA, for replaying export requests."""
+        with IFrameSwitch(self.driver, "mainFrame"):
+            return session_from_driver(self.driver, pool_size)
+
 
 class SaltRiverReportsPage(PageState):
     """This page contains links for navigating to various report types."""
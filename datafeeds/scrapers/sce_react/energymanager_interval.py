@@ -1,5 +1,4 @@
 import os
-import time
 import logging
 
 import datafeeds.scrapers.sce_react.pages as sce_pages
@@ -14,7 +13,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
 from datafeeds.common.util.pagestate.pagestate import PageStateMachine
-from datafeeds.common.util.selenium import file_exists_in_dir
+from datafeeds.common.util.selenium import wait_for_download
 
 from datafeeds.common.timeline import Timeline
 from datafeeds.common.batch import run_datafeed
@@ -159,7 +158,7 @@ class SceReactEnergyManagerIntervalScraper(BaseWebScraper):
     ):
         # A popup can show up here that ruins our day, so close it
         sce_pages.detect_and_close_survey(self._driver)
-        time.sleep(5)
+        self.wait_until_settled(seconds=5)
         page.select_basic_usage_report()
 
     def energy_manager_basic_usage_action(
@@ -177,6 +176,9 @@ class SceReactEnergyManagerIntervalScraper(BaseWebScraper):
         timeline = Timeline(self.start_date, self.end_date)
 
         for idx, subrange in enumerate(date_range.split_iter(delta=interval_size)):
+            # sub-ranges downloaded by an earlier attempt are restored from the checkpoint
+            if self.checkpoint.restore(timeline, subrange):
+                continue
             log.info("Requesting interval data for dates: %s", subrange)
             start = subrange.start_date
             end = subrange.end_date
@@ -186,7 +188,8 @@ class SceReactEnergyManagerIntervalScraper(BaseWebScraper):
 
             try:
                 page.generate_report()
-                time.sleep(5)
+                # wait for the report request to start (and the busy indicator to show)
+                self.wait_until_settled(seconds=5)
                 WebDriverWait(self._driver, 180).until(
                     EC.invisibility_of_element_located(
                         sce_pages.GenericBusyIndicatorLocator
@@ -203,6 +206,7 @@ class SceReactEnergyManagerIntervalScraper(BaseWebScraper):
             except sce_errors.EnergyManagerDataNotFoundException:
                 log.info("No data found for this time range, continuing...")
                 # If a given date range has no interval data, just move on to the next one
+                self.checkpoint.complete(subrange, {})
                 continue
 
             log.info("Downloading the interval data report.")
@@ -217,13 +221,15 @@ class SceReactEnergyManagerIntervalScraper(BaseWebScraper):
 
             try:
                 # Wait two minutes for the download to finish
-                wait = WebDriverWait(self._driver, 120)
-                csv_file_name = wait.until(
-                    file_exists_in_dir(self._driver.download_dir, r".*\.csv")
+                csv_file_path = wait_for_download(
+                    self._driver, self._driver.download_dir, r".*\.csv$", seconds=120
                 )
-                csv_file_path = os.path.join(self._driver.download_dir, csv_file_name)
+                completed = Timeline(subrange.start_date, subrange.end_date)
                 for reading in parse_sce_csv_file(csv_file_path, self.service_id):
-                    timeline.insert(reading.dt, reading.value)
+                    completed.insert(reading.dt, reading.value)
+                serialized = completed.serialize(include_empty=False)
+                self.checkpoint.complete(subrange, serialized, csv_file_path)
+                timeline.update(serialized)
             except TimeoutException:
                 raise TimeoutException(
                     "Downloading interval data from Energy Manager failed."
@@ -15,13 +15,17 @@ from selenium.webdriver import ActionChains
 from dateutil.parser import parse as parse_date
 
 from datafeeds.common.base import BaseWebScraper
-from datafeeds.common.captcha import recaptcha_v2
+from datafeeds.common.captcha import set_recaptcha_response, start_recaptcha_v2
 from datafeeds.common.util.selenium import (
     ec_and,
     ec_or,
     element_text_doesnt_contain,
 )
-from datafeeds.common.util.pagestate.pagestate import PageState
+from datafeeds.common.util.pagestate.pagestate import (
+    PageState,
+    selector_present,
+    xpath_present,
+)
 from datafeeds.common.webdriver.drivers.base import BaseDriver
 
 import datafeeds.scrapers.sce_react.errors as sce_errors
@@ -152,12 +156,9 @@ class SceLoginFailedPage(PageState):
     """
 
     LoginErrorLocator = (By.XPATH, "//react-login-main//mark")
-
-    def get_ready_condition(self):
-        return ec_and(
-            EC.title_contains("Log In"),
-            EC.presence_of_element_located(self.LoginErrorLocator),
-        )
+    ready_script = "document.title.indexOf('Log In') !== -1 && " + selector_present(
+        "react-login-main mark"
+    )
 
     def raise_on_error(self):
         """Raise an exception describing the login error."""
@@ -198,15 +199,15 @@ class SceLandingPage(PageState):
         super().__init__(driver)
         self.tolerate_error = tolerate_error
 
-    def get_ready_condition(self):
+    def get_ready_script(self):
         locator_set = [
-            EC.presence_of_element_located(self.BillingDataLocator),
-            EC.presence_of_element_located(self.AccountDataLocator),
-            EC.presence_of_element_located(self.VerificationPendingLocator),
+            self.BillingDataLocator,
+            self.AccountDataLocator,
+            self.VerificationPendingLocator,
         ]
         if self.tolerate_error:
-            locator_set.append(EC.presence_of_element_located(self.ErrorLocator))
-        return ec_or(*locator_set)
+            locator_set.append(self.ErrorLocator)
+        return " || ".join(xpath_present(xpath) for _, xpath in locator_set)
 
 
 class SceSingleAccountLandingPage(PageState):
@@ -1610,6 +1611,13 @@ class SceEnergyManagerGreenButtonDownload(PageState):
 
     def download(self, start_date: date, end_date: date):
         """Set date range, select CSV, and solve captch to download data."""
+        # start solving the captcha while filling in the form
+        captcha = start_recaptcha_v2(
+            self.driver,
+            self.driver.find_element_by_id("datadownload-content"),
+            "https://www.sce.com/sma/ESCAA/EscGreenButtonData#viewDDForParticularAccount",
+            utility="utility:sce",
+        )
         # set from date
         from_input = self.driver.find_element_by_id("fromDateTextBox")
         actions = ActionChains(self.driver)
@@ -1632,11 +1640,7 @@ class SceEnergyManagerGreenButtonDownload(PageState):
         )
         csv_type.click()
         self.driver.screenshot(BaseWebScraper.screenshot_path("gb download 1"))
-        recaptcha_v2(
-            self.driver,
-            self.driver.find_element_by_id("datadownload-content"),
-            "https://www.sce.com/sma/ESCAA/EscGreenButtonData#viewDDForParticularAccount",
-        )
+        set_recaptcha_response(self.driver, captcha.result())
         self.driver.find_element_by_id("dataDownload").click()
         # wait for download
         log.info("waiting for download")
@@ -1,20 +1,16 @@
-import csv
-from datetime import datetime
+import re
 from typing import List
 
-from dateutil.parser import parse as parse_date
-
+from datafeeds.common.exceptions import InvalidMeterDataException
+from datafeeds.common.interval_csv import (
+    HeaderNotFoundError,
+    read_interval_csv,
+    to_readings,
+)
 from datafeeds.common.typing import IntervalReading
 from datafeeds.scrapers.sce_react.errors import IntervalDataParseException
 
 
-def _to_float(text):
-    text = text.strip().replace(",", "")
-    if text:
-        return float(text)
-    return None
-
-
 def parse_sce_csv_file(path: str, service_id: str) -> List[IntervalReading]:
     """Extract interval data readings from a CSV file downloaded from the SCE website
 
@@ -42,46 +38,18 @@ def parse_sce_csv_file(path: str, service_id: str) -> List[IntervalReading]:
         IntervalDataParseException: If the desired service ID can't be found, or an error occurs while parsing.
     """
 
-    # Read lines until we find the interval data header line (starts with the string "Date",
-    # then store the raw data into data_lines
-    data_started = False
-    data_lines = []
-    with open(path) as f:
-        for line in f:
-            stripped_line = line.strip()
-            if not data_started:
-                if stripped_line.startswith("Date"):
-                    data_started = True
-                    data_lines.append(stripped_line)
-            else:
-                data_lines.append(stripped_line)
-
-    # Parse each reading row
-    csv_reader = csv.reader(data_lines)
-    first = True
-    data_column = None
-    results = []
-    for row in csv_reader:
-        if first:
-            first = False
-            headers = [th.strip() for th in row]
-            for idx, th in enumerate(headers):
-                if th == service_id:
-                    data_column = idx
-            if not data_column:
-                raise IntervalDataParseException(
-                    "Could not find data for SAID={}".format(service_id)
-                )
-        else:
-            try:
-                reading_date = parse_date(row[0].strip()).date()
-                reading_time = parse_date(row[1].strip()).time()
-                reading_datetime = datetime.combine(reading_date, reading_time)
-                reading_value = _to_float(row[data_column].strip())
-                results.append(
-                    IntervalReading(dt=reading_datetime, value=reading_value)
-                )
-            except Exception as e:
-                msg = "An error occured while trying to parse interval data from the SCE website."
-                raise IntervalDataParseException(msg) from e
-    return results
+    # The interval data header line has the string "Date", then the time and one column per service id.
+    try:
+        readings = read_interval_csv(
+            path, timestamp=[0, 1], value=re.compile(r"^%s$" % re.escape(service_id))
+        )
+    except HeaderNotFoundError:
+        raise IntervalDataParseException(
+            "Could not find data for SAID={}".format(service_id)
+        )
+    except InvalidMeterDataException as e:
+        msg = (
+            "An error occured while trying to parse interval data from the SCE website."
+        )
+        raise IntervalDataParseException(msg) from e
+    return to_readings(readings)
@@ -4,7 +4,7 @@ import csv
 
 from dateutil.parser import parse as parse_date
 from dateutil.relativedelta import relativedelta
-from typing import NewType, Tuple, List, Optional
+from typing import NewType, Tuple, List, Optional, Set
 from datetime import datetime, date, timedelta, time
 
 from datafeeds import config, db
@@ -56,13 +56,13 @@ DST_DOUBLE_COUNTED = [
 ]
 
 
-def fall_dst_hours() -> List[datetime]:
+def fall_dst_hours() -> Set[datetime]:
     """Returns datetimes where data is double counted due to Fall DST."""
-    dst_double_count = []
-    for dst_date in DST_ENDS:
-        for dst_time in DST_DOUBLE_COUNTED:
-            dst_double_count.append(datetime.combine(dst_date, dst_time))
-    return dst_double_count
+    return {
+        datetime.combine(dst_date, dst_time)
+        for dst_date in DST_ENDS
+        for dst_time in DST_DOUBLE_COUNTED
+    }
 
 
 def parse_usage_from_csv(csv_file_path) -> List[IntervalReading]:
@@ -335,6 +335,7 @@ class SCLMeterWatchScraper(BaseWebScraper):
     @staticmethod
     def _process_csv(csv_file_path: str, timeline: Timeline) -> None:
         # read kWh Usage with csv into timeline
+        dst_hours = fall_dst_hours()
         for reading in parse_usage_from_csv(csv_file_path):
             reading_datetime = reading[0]
             reading_value = reading[1]
@@ -348,7 +349,7 @@ class SCLMeterWatchScraper(BaseWebScraper):
             reading_datetime = reading_datetime - timedelta(seconds=1)
             current_value = timeline.lookup(reading_datetime)
 
-            if reading_datetime in fall_dst_hours():
+            if reading_datetime in dst_hours:
                 reading_value /= 2
                 log.info(
                     "Adjusted for daylight savings %s: %s",
@@ -24,9 +24,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from dateutil.relativedelta import relativedelta
 from dateutil import parser as dateparser
-from dateutil.rrule import rrule, SU, YEARLY
 
 from datafeeds.common.batch import run_datafeed
+from datafeeds.common.daylight_savings import DST_ENDS, DST_STARTS
 
 from datafeeds.common.support import DateRange
 from datafeeds.common.support import Results
@@ -631,24 +631,6 @@ def parse_xlsx(timeline: Timeline, filename: str, adjustment_factor: int = 1):
             timeline.insert(dt, kw)
 
 
-DST_STARTS = set(
-    # Daylight savings time starts on the second Sunday in March
-    dt.date()
-    for dt in rrule(
-        YEARLY, bymonth=3, byweekday=SU(2), dtstart=datetime(2000, 1, 1), count=100
-    )
-)
-
-
-DST_ENDS = set(
-    # Daylight savings time ends on the first Sunday in November
-    dt.date()
-    for dt in rrule(
-        YEARLY, bymonth=11, byweekday=SU(1), dtstart=datetime(2000, 1, 1), count=100
-    )
-)
-
-
 def adjust_for_dst(day, readings):
     if len(readings) == 1:
         return readings
@@ -14,7 +14,7 @@ from dateutil.relativedelta import relativedelta
 from datafeeds import config
 from datafeeds.common.base import BaseApiScraper
 from datafeeds.common.batch import run_datafeed
-from datafeeds.common.daylight_savings import DST_ENDS
+from datafeeds.common.daylight_savings import DSTCalendar
 from datafeeds.common.exceptions import DataSourceConfigurationError
 from datafeeds.common.support import Configuration
 from datafeeds.common.support import Results
@@ -33,6 +33,8 @@ log = logging.getLogger(__name__)
 CERT_PATH = "/tmp/smt_client.cert"
 KEY_PATH = "/tmp/smt_client.key"
 SMT_ENDPOINT = "https://services.smartmetertexas.net/15minintervalreads/"
+# Interval data days are in Central time (ERCOT)
+TIMEZONE = "America/Chicago"
 
 
 class SmartMeterTexasConfiguration(Configuration):
@@ -89,17 +91,13 @@ class SmartMeterTexasScraper(BaseApiScraper):
                 buffer.append(datum)
 
             # Note: SMT only supports 15 minute interval data, so we don't need to handle other possible
-            # buffer lengths.
-            if day in DST_ENDS and len(buffer) == 100:
-                revised = buffer[0:4] + buffer[8:]
-                for ii in range(4, 8):
-                    # If both intervals are defined, use the average. Otherwise,
-                    # prefer the first hour's interval if defined, using the second hour's interval as the fallback.
-                    if buffer[ii] and buffer[ii + 4]:
-                        revised[ii] = (buffer[ii] + buffer[ii + 4]) / 2
-                    elif buffer[ii]:
-                        revised[ii] = buffer[ii]
-                buffer = revised
+            # buffer lengths. When daylight savings time starts or ends, the day has fewer or more
+            # intervals. If both of a repeated interval are defined, use the average; otherwise use
+            # the one that's defined.
+            if len(buffer) != 96:
+                calendar = DSTCalendar(TIMEZONE, day, day)
+                if len(buffer) == calendar.count(day):
+                    buffer = calendar.fixed_day(day, buffer)
 
             if len(buffer) != 96:
                 raise ApiException(
@@ -13,6 +13,7 @@ from sqlalchemy import func, orm
 from typing import Dict, Any, Optional, List
 
 from datafeeds import db
+from datafeeds.common.date_ranges import DisjointDateRanges
 from datafeeds.common.typing import BillingDatum
 from datafeeds.common.typing import BillingDatumItemsEntry
 from datafeeds.models import UtilityService
@@ -291,12 +292,12 @@ class Bill(ModelMixin, Base):
         chronological_bills = sorted(
             data, key=lambda b: (b.safe_published, b.start), reverse=True
         )
+        accepted: DisjointDateRanges["Bill"] = DisjointDateRanges()
         results: List["Bill"] = []
 
         for b in chronological_bills:
-            if any(other.overlaps(b) for other in results):
-                continue
-            results.append(b)
+            if accepted.add(b.initial, b.closing, b):
+                results.append(b)
 
         return list(reversed(results))
 
@@ -16,7 +16,11 @@ from datafeeds.common.batch import run_datafeed
 from datafeeds.common.support import Configuration, Results
 from datafeeds.common.timeline import Timeline
 from datafeeds.common.typing import Status
-from datafeeds.common.util.pagestate.pagestate import PageState, PageStateMachine
+from datafeeds.common.util.pagestate.pagestate import (
+    PageState,
+    PageStateMachine,
+    xpath_present,
+)
 from datafeeds.models import (
     Meter,
     SnapmeterAccount,
@@ -58,9 +62,7 @@ class LoginFailedPage(PageState):
         By.XPATH,
         '//div[contains(text(), "Sorry, you could not be authenticated")]',
     )
-
-    def get_ready_condition(self):
-        return EC.presence_of_element_located(self.LoginErrorLocator)
+    ready_script = xpath_present(LoginErrorLocator[1])
 
     def raise_on_error(self):
         """Raise an exception describing the login error."""
@@ -70,10 +72,7 @@ class LoginFailedPage(PageState):
 
 
 class FindAccountPage(PageState):
-    def get_ready_condition(self):
-        return EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "div#account-selection-table")
-        )
+    ready_selector = "div#account-selection-table"
 
     def click_account_id(self, account_id):
         """Find account_id in the Accounts table and click it."""
@@ -83,11 +82,7 @@ class FindAccountPage(PageState):
 class DashboardPage(PageState):
     MyBusinessToolsLinkSelector = "a#link-for-my-business-tools"
     MyEnergyToolkitLinkSelector = "a#link-for-first-engage-entry"
-
-    def get_ready_condition(self):
-        return EC.presence_of_element_located(
-            (By.CSS_SELECTOR, self.MyBusinessToolsLinkSelector)
-        )
+    ready_selector = MyBusinessToolsLinkSelector
 
     def click_energy_toolkit(self):
         """Click My Business Tools, then My Energy Toolkit."""
@@ -99,11 +99,7 @@ class SmudMyAccountFailedLoginPage(PageState):
     """Represents the login page after a failed login."""
 
     LoginErrorsSelector = "div.validation-summary-errors"
-
-    def get_ready_condition(self):
-        return EC.presence_of_element_located(
-            (By.CSS_SELECTOR, self.LoginErrorsSelector)
-        )
+    ready_selector = LoginErrorsSelector
 
     def get_login_errors(self):
         validation_errors = self.driver.find_element_by_css_selector(
@@ -128,11 +124,7 @@ class SmudChooseAccountPage(PageState):
     AccountDivSelector = "div#accounts-available div"
     AccountRowsSelector = "div#accounts-available div.card-row"
     ShowMoreLinkSelector = "div.show-more-link a"
-
-    def get_ready_condition(self):
-        return EC.presence_of_element_located(
-            (By.CSS_SELECTOR, self.AccountDivSelector)
-        )
+    ready_selector = AccountDivSelector
 
     def expand_accounts(self):
         done = False
@@ -164,9 +156,7 @@ class SmudMyAccountOverviewPage(PageState):
     """Represents the SMUD overview page, which appears after login"""
 
     PageContentLocator = (By.XPATH, "//div[@id='page-content']")
-
-    def get_ready_condition(self):
-        return EC.presence_of_element_located(self.PageContentLocator)
+    ready_selector = "div#page-content"
 
 
 class SmudBillComparePage(PageState):
@@ -1,8 +1,11 @@
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import re
-from typing import Dict, Optional
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
 
 from dateutil import tz
 
@@ -493,12 +496,21 @@ def _parse_gas(root):
     return readings
 
 
-def _parse_interval_blocks(root, blocks, logger=None):
-    readings: Dict[str, Optional[dict]] = {}
-
+def _reading_type(root) -> Tuple[int, int]:
+    """Return the power of ten multiplier and unit of measure from the first ReadingType."""
     reading_type = root.find_content("espi:ReadingType")
     power_of_ten = int(reading_type.find("espi:powerOfTenMultiplier").text)
     uom = int(reading_type.find("espi:uom").text)
+    return power_of_ten, uom
+
+
+def _parse_interval_blocks(root, blocks, logger=None):
+    power_of_ten, uom = _reading_type(root)
+    return _parse_readings(power_of_ten, uom, blocks, logger=logger)
+
+
+def _parse_readings(power_of_ten, uom, blocks, logger=None):
+    readings: Dict[str, Optional[dict]] = {}
 
     for interval_block in blocks:
         for interval in interval_block.findall("espi:IntervalReading"):
@@ -601,13 +613,63 @@ def _aggregate_reading(interval_readings, uom, day, index, logger=None):
     return reading
 
 
-def parse_multi(filepath, parse_bills=True):  # noqa: C901
+ATOM_ENTRY = "http://www.w3.org/2005/Atom entry"
+ATOM_LINK = "http://www.w3.org/2005/Atom link"
+ATOM_CONTENT = "http://www.w3.org/2005/Atom content"
+
+INTERVAL_BLOCK_PATTERN = re.compile(
+    ".*/RetailCustomer/([a-zA-Z0-9]*)/UsagePoint/([a-zA-Z0-9]*)/.*"
+)
+USAGE_SUMMARY_PATTERN = re.compile(
+    ".*/RetailCustomer/([a-zA-Z0-9]*)/UsagePoint/([a-zA-Z0-9]*)/UsageSummary/([a-zA-Z0-9]*)"
+)
+
+
+def parse_multi(filepath, parse_bills=True, workers=1):
     """
     Parse GB file that includes multiple customers and usage points, eg. SCE
+
+    If workers > 1, usage points are parsed in a pool of that many processes. The file is
+    first indexed without building a tree; each process is then sent the byte ranges of one
+    usage point's entries, and reads and parses only those. The result is the same as
+    parsing in this process.
     """
+    if workers > 1:
+        return _parse_multi_parallel(filepath, parse_bills, workers)
+
     tree = GBCTree(filepath)
     root = tree.root()
 
+    customers, interval_block_entries, usage_summaries = _index_multi(root)
+
+    rval = {}
+    for customer in customers:
+        rval[customer] = defaultdict(dict)
+        for point in sorted(customers[customer]):
+            try:
+                readings = _parse_interval_blocks(root, interval_block_entries[point])
+
+                if parse_bills:
+                    bills = _bills(root, usage_summaries[point])
+                else:
+                    bills = []
+
+                rval[customer][point]["readings"] = readings
+                rval[customer][point]["bills"] = bills
+
+            except IntervalTypeException:
+                # print("Point {0} doesn't have 15 minute intervals".format(point))
+                pass
+
+    return rval
+
+
+def _index_multi(root):  # noqa: C901
+    """Index interval block and usage summary entries by usage point.
+
+    Return customer -> usage points, usage point -> interval blocks, and
+    usage point -> usage summaries.
+    """
     entries = root.findall("gb:entry")
 
     reading_types = {}
@@ -615,11 +677,6 @@ def parse_multi(filepath, parse_bills=True):  # noqa: C901
     usage_entries = {}
     interval_block_entries = defaultdict(list)
     usage_summaries = defaultdict(list)
-    p = re.compile(".*/RetailCustomer/([a-zA-Z0-9]*)/UsagePoint/([a-zA-Z0-9]*)/.*")
-
-    usage_pattern = re.compile(
-        ".*/RetailCustomer/([a-zA-Z0-9]*)/UsagePoint/([a-zA-Z0-9]*)/UsageSummary/([a-zA-Z0-9]*)"
-    )
 
     for entry in entries:
         reading_type_entry = entry.find("gb:content/espi:ReadingType")
@@ -654,7 +711,7 @@ def parse_multi(filepath, parse_bills=True):  # noqa: C901
             for link in links:
                 if link.attrib["rel"] == "self":
                     href = link.attrib["href"]
-                    m = p.match(href)
+                    m = INTERVAL_BLOCK_PATTERN.match(href)
                     if m:
                         customer = m.group(1)
                         point = m.group(2)
@@ -668,7 +725,7 @@ def parse_multi(filepath, parse_bills=True):  # noqa: C901
             for link in links:
                 if link.attrib["rel"] == "self":
                     href = link.attrib["href"]
-                    m = usage_pattern.match(href)
+                    m = USAGE_SUMMARY_PATTERN.match(href)
                     if m:
                         customer = m.group(1)
                         point = m.group(2)
@@ -676,24 +733,183 @@ def parse_multi(filepath, parse_bills=True):  # noqa: C901
                             customers[customer].add(point)
                         usage_summaries[point].append(content)
 
+    return customers, interval_block_entries, usage_summaries
+
+
+class EntryRange(NamedTuple):
+    """The location of a feed entry in a Green Button file, and what it holds."""
+
+    hrefs: List[str]  # self links
+    kinds: Set[str]  # local names of non-empty content elements, eg IntervalBlock
+    start: int  # byte offsets of the entry
+    end: int
+
+
+def _index_entry_ranges(filepath) -> Tuple[bytes, List[EntryRange]]:
+    """Find the byte range of each feed entry, without building a tree.
+
+    Return a header to read entries with, out of the context of the file (the xml
+    declaration, and an opening tag with the feed's namespace declarations), and the
+    entries that have content.
+    """
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    parser = expat.ParserCreate(namespace_separator=" ")
+    encoding = []
+    namespaces = {}
+    entries = []
+    tags: List[str] = []
+    current: Optional[EntryRange] = None
+
+    def xml_decl(version, enc, standalone):
+        if enc:
+            encoding.append(enc)
+
+    def start_namespace(prefix, uri):
+        if not tags:
+            namespaces[prefix] = uri
+
+    def start_element(tag, attrib):
+        nonlocal current
+        tags.append(tag)
+        depth = len(tags)
+        if depth == 2 and tag == ATOM_ENTRY:
+            current = EntryRange([], set(), parser.CurrentByteIndex, 0)
+        elif current is None:
+            pass
+        elif depth == 3 and tag == ATOM_LINK and attrib.get("rel") == "self":
+            current.hrefs.append(attrib.get("href", ""))
+        elif depth == 5 and tags[2] == ATOM_CONTENT:
+            # ElementTree content nodes are falsy unless they have children.
+            current.kinds.add(tags[3].rsplit(" ", 1)[-1])
+
+    def end_element(tag):
+        nonlocal current
+        if len(tags) == 2 and current is not None:
+            if current.kinds:
+                end = data.index(b">", parser.CurrentByteIndex) + 1
+                entries.append(current._replace(end=end))
+            current = None
+        tags.pop()
+
+    parser.XmlDeclHandler = xml_decl
+    parser.StartNamespaceDeclHandler = start_namespace
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.Parse(data, True)
+
+    header = '<?xml version="1.0" encoding=%s?>\n<entries' % quoteattr(
+        encoding[0] if encoding else "UTF-8"
+    )
+    for prefix, uri in namespaces.items():
+        header += " xmlns%s=%s" % (":" + prefix if prefix else "", quoteattr(uri))
+    header += ">"
+    return header.encode("ascii"), entries
+
+
+def _read_entries(filepath, header: bytes, ranges: List[Tuple[int, int]]) -> GBCNode:
+    """Read entries at the given byte ranges into a document with an entry for each."""
+    chunks = [header]
+    with open(filepath, "rb") as f:
+        for start, end in ranges:
+            f.seek(start)
+            chunks.append(f.read(end - start))
+    chunks.append(b"</entries>")
+    return GBCNode(ET.fromstring(b"".join(chunks)))
+
+
+def _parse_point(filepath, header, power_of_ten, uom, block_ranges, summary_ranges):
+    """Parse readings and bills for one usage point, reading only its entries from the file.
+
+    Return None if the usage point doesn't have 15 minute intervals. Bills are None if
+    summary_ranges is None.
+    """
+    entries = _read_entries(filepath, header, block_ranges).findall("gb:entry")
+    blocks = [entry.find("gb:content/espi:IntervalBlock") for entry in entries]
+    try:
+        readings = _parse_readings(power_of_ten, uom, blocks)
+    except IntervalTypeException:
+        return None
+
+    bills = None
+    if summary_ranges is not None:
+        entries = _read_entries(filepath, header, summary_ranges).findall("gb:entry")
+        bills = _bills(
+            None, [entry.find("gb:content/espi:UsageSummary") for entry in entries]
+        )
+
+    return readings, bills
+
+
+def _parse_multi_parallel(filepath, parse_bills, workers):  # noqa: C901
+    header, entries = _index_entry_ranges(filepath)
+
+    reading_type_ranges = []
+    customers = defaultdict(set)
+    block_ranges = defaultdict(list)
+    summary_ranges = defaultdict(list)
+    all_summary_ranges = []
+    for entry in entries:
+        if "ReadingType" in entry.kinds and not reading_type_ranges:
+            reading_type_ranges.append((entry.start, entry.end))
+        if "UsageSummary" in entry.kinds:
+            all_summary_ranges.append((entry.start, entry.end))
+        for href in entry.hrefs:
+            m = INTERVAL_BLOCK_PATTERN.match(href)
+            if m and "IntervalBlock" in entry.kinds:
+                customers[m.group(1)].add(m.group(2))
+                block_ranges[m.group(2)].append((entry.start, entry.end))
+            m = USAGE_SUMMARY_PATTERN.match(href)
+            if m and "UsageSummary" in entry.kinds:
+                customers[m.group(1)].add(m.group(2))
+                summary_ranges[m.group(2)].append((entry.start, entry.end))
+
+    if not customers:
+        return {}
+
+    power_of_ten, uom = _reading_type(
+        _read_entries(filepath, header, reading_type_ranges)
+    )
+    points = sorted(set.union(*customers.values()))
+
+    # _bills falls back to every usage summary in the file when a usage point has none;
+    # parse those once, here.
+    file_bills = None
+    if parse_bills and any(not summary_ranges[point] for point in points):
+        file_bills = _bills(_read_entries(filepath, header, all_summary_ranges))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _parse_point,
+                filepath,
+                header,
+                power_of_ten,
+                uom,
+                block_ranges[point],
+                summary_ranges[point]
+                if parse_bills and summary_ranges[point]
+                else None,
+            )
+            for point in points
+        ]
+        results = dict(zip(points, (future.result() for future in futures)))
+
     rval = {}
     for customer in customers:
         rval[customer] = defaultdict(dict)
-        for point in customers[customer]:
-            try:
-                readings = _parse_interval_blocks(root, interval_block_entries[point])
-
-                if parse_bills:
-                    bills = _bills(root, usage_summaries[point])
-                else:
-                    bills = []
+        for point in sorted(customers[customer]):
+            result = results[point]
+            if result is None:
+                continue
 
-                rval[customer][point]["readings"] = readings
-                rval[customer][point]["bills"] = bills
+            readings, bills = result
+            if bills is None:
+                bills = [dict(b) for b in file_bills] if parse_bills else []
 
-            except IntervalTypeException:
-                # print("Point {0} doesn't have 15 minute intervals".format(point))
-                pass
+            rval[customer][point]["readings"] = readings
+            rval[customer][point]["bills"] = bills
 
     return rval
 
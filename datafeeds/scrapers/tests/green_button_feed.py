@@ -0,0 +1,100 @@
+"""Build Green Button (ESPI) xml feeds for tests and benchmarks."""
+from typing import List
+
+BASE_URL = "https://example.com/espi/1_1/resource"
+START_TS = 1580544000  # 2020-02-01 08:00 UTC
+
+
+def entry(href: str, content: str) -> str:
+    return """
+    <entry>
+        <link href="{href}" rel="self"/>
+        <content>{content}</content>
+    </entry>""".format(
+        href=href, content=content
+    )
+
+
+def reading_type() -> str:
+    """A kWh reading type, used by every usage point in the feed."""
+    return entry(
+        BASE_URL + "/ReadingType/1",
+        """
+            <espi:ReadingType>
+                <espi:powerOfTenMultiplier>0</espi:powerOfTenMultiplier>
+                <espi:uom>72</espi:uom>
+            </espi:ReadingType>""",
+    )
+
+
+def interval_block(customer: str, point: str, block: int, duration: int) -> str:
+    readings = "".join(
+        """
+        <espi:IntervalReading>
+            <espi:timePeriod>
+                <espi:duration>{duration}</espi:duration>
+                <espi:start>{start}</espi:start>
+            </espi:timePeriod>
+            <espi:value>{value}</espi:value>
+        </espi:IntervalReading>""".format(
+            duration=duration,
+            start=START_TS + (block * 96 + idx) * duration,
+            value=100 + idx,
+        )
+        for idx in range(96)
+    )
+    return entry(
+        "{}/RetailCustomer/{}/UsagePoint/{}/MeterReading/1/IntervalBlock/{}".format(
+            BASE_URL, customer, point, block
+        ),
+        "<espi:IntervalBlock>{}</espi:IntervalBlock>".format(readings),
+    )
+
+
+def usage_summary(customer: str, point: str, summary: int) -> str:
+    return entry(
+        "{}/RetailCustomer/{}/UsagePoint/{}/UsageSummary/{}".format(
+            BASE_URL, customer, point, summary
+        ),
+        """
+        <espi:UsageSummary>
+            <espi:billingPeriod>
+                <espi:duration>2592000</espi:duration>
+                <espi:start>{start}</espi:start>
+            </espi:billingPeriod>
+            <espi:billLastPeriod>{cost}</espi:billLastPeriod>
+            <espi:overallConsumptionLastPeriod>
+                <espi:powerOfTenMultiplier>0</espi:powerOfTenMultiplier>
+                <espi:uom>72</espi:uom>
+                <espi:value>{used}</espi:value>
+            </espi:overallConsumptionLastPeriod>
+            <espi:tariffProfile>TOU-8</espi:tariffProfile>
+        </espi:UsageSummary>""".format(
+            start=START_TS + summary * 2592000,
+            cost=12345600 + summary,
+            used=5000000 + summary,
+        ),
+    )
+
+
+def feed(entries: List[str]) -> str:
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:espi="http://naesb.org/espi">{}
+</feed>""".format(
+        "".join(entries)
+    )
+
+
+def multi_customer_feed() -> str:
+    entries = [reading_type()]
+    # customer A: two 15-minute usage points with bills
+    for point in ["P1", "P2"]:
+        for block in range(3):
+            entries.append(interval_block("A", point, block, 900))
+        for summary in range(2):
+            entries.append(usage_summary("A", point, summary))
+    # customer B: an hourly usage point (skipped), and one without usage summaries
+    entries.append(interval_block("B", "P3", 0, 3600))
+    for block in range(2):
+        entries.append(interval_block("B", "P4", block, 900))
+    return feed(entries)
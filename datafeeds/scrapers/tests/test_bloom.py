@@ -1,7 +1,12 @@
+import os
+import tempfile
 import unittest
 from unittest import mock
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+
+import openpyxl
+
 from datafeeds.common.support import DateRange, Configuration
 
 from datafeeds.scrapers import bloom_interval
@@ -42,3 +47,20 @@ class TestBloomScraper(SetupBase):
         self.scraper.start_date = date(default_date - 1, 1, 1)
         self.scraper.adjust_start_and_end_dates(default_date)
         self.assertEqual(self.scraper.start_date, date(default_date, 1, 1))
+
+    def test_process_excel_file(self):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["Bloom Energy"])
+        sheet.append([None, "Date", "Site", None, None, "Electricity Out"])
+        for idx in range(96 * 2):
+            when = datetime(2018, 12, 31) + timedelta(minutes=15 * idx)
+            sheet.append([None, when, "San Jose", None, None, 25 + idx % 2])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "extract.xlsx")
+            workbook.save(path)
+            self.assertTrue(self.scraper._process_excel_file(path, self.start_date, 15))
+        readings = self.scraper.timeline.serialize(include_empty=False)
+        # kWh per 15 minutes to kW; the day before the start date is dropped
+        self.assertEqual(["2019-01-01"], list(readings))
+        self.assertEqual([100.0, 104.0] * 48, readings["2019-01-01"])
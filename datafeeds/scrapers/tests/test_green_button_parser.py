@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+
+from datafeeds.scrapers.socalgas import green_button_parser as gbparser
+from datafeeds.scrapers.tests.green_button_feed import multi_customer_feed
+
+
+class ParseMultiTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".xml")
+        with os.fdopen(fd, "w") as f:
+            f.write(multi_customer_feed())
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_parse_multi(self):
+        rval = gbparser.parse_multi(self.path)
+        self.assertEqual({"A", "B"}, set(rval))
+        self.assertEqual(["P1", "P2"], list(rval["A"]))
+        # P3 has hourly data
+        self.assertEqual(["P4"], list(rval["B"]))
+
+        readings = rval["A"]["P1"]["readings"]
+        values = [v for day in readings.values() for v in day if v is not None]
+        self.assertEqual(3 * 96, len(values))
+        self.assertEqual(
+            [5000.0, 5000.001], [b["used"] for b in rval["A"]["P1"]["bills"]]
+        )
+        # a usage point without usage summaries gets all bills in the file
+        self.assertEqual(rval["A"]["P1"]["bills"], rval["B"]["P4"]["bills"])
+
+    def test_parallel_matches_serial(self):
+        for parse_bills in [True, False]:
+            serial = gbparser.parse_multi(self.path, parse_bills=parse_bills)
+            parallel = gbparser.parse_multi(
+                self.path, parse_bills=parse_bills, workers=2
+            )
+            self.assertEqual(serial, parallel)
+            for customer in serial:
+                self.assertEqual(list(serial[customer]), list(parallel[customer]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -84,17 +84,6 @@ class HECOScraperTest(SetupBase, unittest.TestCase):
     def _build_demand_array(self):
         return [500 for i in range(96)]
 
-    def test_get_header_position(self):
-        test_header = [
-            "  Date / Time ",
-            "KW(ch:1 set:0)   ",
-            "   KVA(0(ch: 2  set:0)",
-            "PF(0(ch: 3  set:0)",
-        ]
-
-        self.assertEqual(heco.HECOScraper._get_header_position(test_header, "kw"), 1)
-        self.assertEqual(heco.HECOScraper._get_header_position(test_header, "date"), 0)
-
     def test_format_time(self):
         current_time = datetime.strptime("1:15", TEST_TIME_FORMAT)
         self.assertEqual(heco.HECOScraper._format_time(current_time), "01:15")
@@ -2,13 +2,13 @@ import csv
 import os
 from datetime import datetime, timedelta, date
 import uuid
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from datafeeds import db, config
-from datafeeds.common import test_utils
+from datafeeds.common import test_utils, tracing
 from datafeeds.common.base import BaseApiScraper
 from datafeeds.common.batch import run_datafeed
-from datafeeds.common.support import Configuration, Results
+from datafeeds.common.support import Configuration, DateRange, Results
 from datafeeds.common.timeline import Timeline
 from datafeeds.common.typing import Status, BillingDatum
 from datafeeds.models import SnapmeterMeterDataSource
@@ -87,6 +87,19 @@ class TestIntervalScraper(BaseApiScraper):
         return Results(readings=timeline.serialize())
 
 
+class TestCheckpointIntervalScraper(BaseApiScraper):
+    """A scraper that uploads interval data from a completed sub-range, then returns it."""
+
+    def _execute(self):
+        timeline = Timeline(self.start_date, self.end_date)
+        dt = datetime(self.start_date.year, self.start_date.month, self.start_date.day)
+        for idx in range(96):
+            timeline.insert(dt + timedelta(minutes=15 * idx), 1.0)
+        readings = timeline.serialize(include_empty=False)
+        self.checkpoint.complete(DateRange(self.start_date, self.start_date), readings)
+        return Results(readings=readings)
+
+
 class TestEndToEnd(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -190,6 +203,16 @@ class TestEndToEnd(TestCase):
             ],
             rows[1],
         )
+        # timed the run phases
+        phases = tracing.summary()["phases"]
+        self.assertEqual(
+            {"scrape", "execute", "upload_bills", "process_incoming_bills"},
+            set(phases),
+        )
+        self.assertGreater(phases["process_incoming_bills"]["queries"], 0)
+        self.assertGreaterEqual(
+            phases["scrape"]["queries"], phases["upload_bills"]["queries"]
+        )
 
     def test_run_datafeed_interval(self):
         """Run a test scraper that creates interval data."""
@@ -225,3 +248,42 @@ class TestEndToEnd(TestCase):
         self.assertEqual(1, len(readings))
         self.assertEqual(start_dt.date(), readings[0].occurred)
         self.assertEqual([1.0] * 96, readings[0].readings)
+
+    @mock.patch("datafeeds.common.index.index_etl_run")
+    @mock.patch("datafeeds.config.enabled")
+    def test_run_datafeed_completed_interval(self, enabled, index_etl_run):
+        """Readings uploaded from a completed sub-range count as updated at the end of the run."""
+        enabled.side_effect = lambda feature: feature == "ES_INDEX_JOBS"
+        us = self.meter.utility_service
+        configuration = TestConfiguration(
+            us.service_id, us.gen_service_id, scrape_readings=True
+        )
+        meter_ds = (
+            db.session.query(SnapmeterMeterDataSource)
+            .filter_by(meter=self.meter)
+            .first()
+        )
+        start = date.today() - timedelta(days=7)
+        params = {
+            "data_start": start.strftime("%Y-%m-%d"),
+            "data_end": date.today().strftime("%Y-%m-%d"),
+        }
+        task_id = uuid.uuid4().hex
+        rval = run_datafeed(
+            TestCheckpointIntervalScraper,
+            self.account,
+            self.meter,
+            meter_ds,
+            params,
+            configuration=configuration,
+            task_id=task_id,
+        )
+        self.assertEqual(Status.SUCCEEDED, rval)
+        readings = db.session.query(MeterReading).filter_by(meter=self.meter.oid)
+        self.assertEqual([[1.0] * 96], [row.readings for row in readings])
+        docs = [call[0][1] for call in index_etl_run.call_args_list]
+        self.assertIn(
+            {"updatedDays": 1, "intervalFrom": start, "intervalTo": start, "age": 7},
+            docs,
+        )
+        self.assertEqual("SUCCESS", docs[-1]["status"])
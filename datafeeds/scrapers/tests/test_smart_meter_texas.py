@@ -374,3 +374,19 @@ class SmartMeterTexasParserTest(TestCase):
         content = json.loads(FIXTURE_03)
         with self.assertRaises(ApiException):
             Smt.parse(content)
+
+    def test_response_parsing_dst(self):
+        """Days when daylight savings time starts or ends are placed into 96 intervals."""
+        fall = ["1.0"] * 4 + ["2.0"] * 4 + ["4.0", "", "4.0", "4.0"] + ["1.0"] * 88
+        spring = ["1.0"] * 92
+        content = {
+            "energyData": [
+                {"DT": "11/01/2020", "RD": ",".join("%s-A" % v for v in fall)},
+                {"DT": "03/14/2021", "RD": ",".join("%s-A" % v for v in spring)},
+            ]
+        }
+        actual = Smt.parse(content)
+        self.assertEqual(
+            [1.0] * 4 + [3.0, 2.0, 3.0, 3.0] + [1.0] * 88, actual[date(2020, 11, 1)]
+        )
+        self.assertEqual([1.0] * 8 + [None] * 4 + [1.0] * 84, actual[date(2021, 3, 14)])
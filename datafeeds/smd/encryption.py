@@ -1,11 +1,10 @@
 """This module describes how to decrypt secrets stored in our database (such as passwords for scraper runs).
 
-Uses pyaes; see https://github.com/ricmoo/pyaes
+See common/crypto.py; decrypted values are cached for the process.
 """
 
-import pyaes
-
 from datafeeds import config
+from datafeeds.common import crypto
 
 
 def _aes_key():
@@ -15,11 +14,9 @@ def _aes_key():
 
 def aes_encrypt(text):
     """Encrypt the given string and return bytes"""
-    aes = pyaes.AESModeOfOperationCTR(_aes_key())
-    return aes.encrypt(text)  # bytes
+    return crypto.ctr_encrypt(_aes_key(), text)
 
 
 def aes_decrypt(encrypted_bytes):
     """Decrypt the given bytes and return a string"""
-    aes = pyaes.AESModeOfOperationCTR(_aes_key())
-    return aes.decrypt(encrypted_bytes).decode("utf-8")
+    return crypto.credentials.decrypt(_aes_key(), encrypted_bytes)
@@ -8,7 +8,7 @@ from datafeeds.models import (
     SnapmeterMeterDataSource as MeterDataSource,
 )
 from datafeeds.urjanet.datasource.pymysql_adapter import UrjanetPyMySqlDataSource
-from datafeeds.urjanet.model import Account
+from datafeeds.urjanet.model import Account, Meter as UrjaMeter
 from datafeeds.urjanet.transformer import CityOfBellevueTransformer
 
 
@@ -29,7 +29,7 @@ class CityOfBellevueDatasource(UrjanetPyMySqlDataSource):
         result_set = self.fetch_all(query, acct_no)
         return [UrjanetPyMySqlDataSource.parse_account_row(row) for row in result_set]
 
-    def load_meters(self, account_pk: int) -> List[Meter]:
+    def load_meters(self, account_pk: int) -> List[UrjaMeter]:
         """Load meters based on the service id"""
         query = """
             select *
@@ -15,7 +15,7 @@ from datafeeds.urjanet.datasource.pymysql_adapter import (
     UrjanetPyMySqlDataSource,
     SqlQueryResult,
 )
-from datafeeds.urjanet.model import Account
+from datafeeds.urjanet.model import Account, Meter as UrjaMeter
 from datafeeds.urjanet.transformer import UrjanetGridiumTransformer
 
 
@@ -85,7 +85,7 @@ class DirectEnergyDatasource(UrjanetPyMySqlDataSource):
             for row in [max(group, key=get_date) for group in groups.values()]
         ]
 
-    def load_meters(self, account_pk: int) -> List[Meter]:
+    def load_meters(self, account_pk: int) -> List[UrjaMeter]:
         """Load all meters for an account."""
         query = """
             select *
@@ -8,7 +8,7 @@ from datafeeds.models import (
     SnapmeterMeterDataSource as MeterDataSource,
 )
 from datafeeds.urjanet.datasource.pymysql_adapter import UrjanetPyMySqlDataSource
-from datafeeds.urjanet.model import Account, Usage, Charge
+from datafeeds.urjanet.model import Account, Usage, Charge, Meter as UrjaMeter
 from datafeeds.urjanet.transformer import UrjanetGridiumTransformer
 
 
@@ -31,7 +31,7 @@ class FPLDatasource(UrjanetPyMySqlDataSource):
 
         return [UrjanetPyMySqlDataSource.parse_account_row(row) for row in result_set]
 
-    def load_meters(self, account_pk: int) -> List[Meter]:
+    def load_meters(self, account_pk: int) -> List[UrjaMeter]:
         """Load all meters for an account.
 
         Normally we'd pull only bill data that matches our service ID. However, FPL has a habit of
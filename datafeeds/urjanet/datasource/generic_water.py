@@ -9,7 +9,7 @@ from datafeeds.models import (
     SnapmeterMeterDataSource as MeterDataSource,
 )
 from datafeeds.urjanet.datasource.pymysql_adapter import UrjanetPyMySqlDataSource
-from datafeeds.urjanet.model import Account, Usage
+from datafeeds.urjanet.model import Account, Usage, Meter as UrjaMeter
 from datafeeds.urjanet.transformer import GenericWaterTransformer
 
 
@@ -41,7 +41,7 @@ class GenericWaterDatasource(UrjanetPyMySqlDataSource):
         result_set = self.fetch_all(query, self.account_number, self.utility_provider)
         return [UrjanetPyMySqlDataSource.parse_account_row(row) for row in result_set]
 
-    def load_meters(self, account_pk: int) -> List[Meter]:
+    def load_meters(self, account_pk: int) -> List[UrjaMeter]:
         """Load all meters for an account
 
         Currently, water, sewer meters are loaded.
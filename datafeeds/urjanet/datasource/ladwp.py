@@ -9,7 +9,7 @@ from datafeeds.models import (
 )
 from datafeeds.urjanet.datasource.pymysql_adapter import UrjanetPyMySqlDataSource
 from datafeeds.urjanet.transformer import LADWPTransformer
-from datafeeds.urjanet.model import Account
+from datafeeds.urjanet.model import Account, Meter as UrjaMeter
 
 
 class LADWPDatasource(UrjanetPyMySqlDataSource):
@@ -30,7 +30,7 @@ class LADWPDatasource(UrjanetPyMySqlDataSource):
         result_set = self.fetch_all(query, self.account_number)
         return [UrjanetPyMySqlDataSource.parse_account_row(row) for row in result_set]
 
-    def load_meters(self, account_pk: int) -> List[Meter]:
+    def load_meters(self, account_pk: int) -> List[UrjaMeter]:
         """LADWP formats these bills so that the 'meter number' is often on two lines.
 
         Urjanet pulls in that second line with a space. Gridium often munges the whole
@@ -10,7 +10,7 @@ from datafeeds.models import (
 from datafeeds.urjanet.transformer import PacificGasElectricTransformer
 
 from datafeeds.urjanet.datasource.pymysql_adapter import UrjanetPyMySqlDataSource
-from datafeeds.urjanet.model import Account
+from datafeeds.urjanet.model import Account, Meter as UrjaMeter
 
 
 class PacificGasElectricDatasource(UrjanetPyMySqlDataSource):
@@ -76,7 +76,7 @@ class PacificGasElectricDatasource(UrjanetPyMySqlDataSource):
         )
         return [UrjanetPyMySqlDataSource.parse_account_row(row) for row in result_set]
 
-    def load_meters(self, account_pk: int) -> List[Meter]:
+    def load_meters(self, account_pk: int) -> List[UrjaMeter]:
         """Load meters based on the service id"""
         query = """
             SELECT *
@@ -6,6 +6,7 @@ from datafeeds.common.batch import run_urjanet_datafeed
 from datafeeds.common.typing import Status
 from datafeeds.models import (
     SnapmeterAccount,
+    Meter,
     SnapmeterMeterDataSource as MeterDataSource,
 )
 from datafeeds.models.bill import PartialBillProviderType
@@ -14,7 +15,7 @@ from datafeeds.models.utility_service import (
     UtilityServiceSnapshot,
 )
 from datafeeds.urjanet.datasource.pge import PacificGasElectricDatasource
-from datafeeds.urjanet.model import Account, Meter, Charge, Usage
+from datafeeds.urjanet.model import Account, Meter as UrjaMeter, Charge, Usage
 from datafeeds.urjanet.transformer import PacificGasElectricUrjaXMLTransformer
 from datafeeds.urjanet.datasource.pymysql_adapter import (
     UrjanetPyMySqlDataSource,
@@ -334,7 +335,7 @@ class PacificGasElectricXMLDatasource(PacificGasElectricDatasource):
             return list(set(service_ids + esp_customer_numbers))
         return service_ids
 
-    def load_meters(self, account_pk: int) -> List[Meter]:
+    def load_meters(self, account_pk: int) -> List[UrjaMeter]:
         """Load meters based on all SAID's we have on record, and any ESP Customer Numbers found."""
         query = """
            SELECT *
@@ -11,7 +11,7 @@ from datafeeds.models import (
 )
 from datafeeds.urjanet.transformer import PseUrjanetTransformer
 from datafeeds.urjanet.datasource.pymysql_adapter import UrjanetPyMySqlDataSource
-from datafeeds.urjanet.model import Account
+from datafeeds.urjanet.model import Account, Meter as UrjaMeter
 
 
 class PseDatasource(UrjanetPyMySqlDataSource):
@@ -31,7 +31,7 @@ class PseDatasource(UrjanetPyMySqlDataSource):
         result_set = self.fetch_all(query, self.account_number)
         return [UrjanetPyMySqlDataSource.parse_account_row(row) for row in result_set]
 
-    def load_meters(self, account_pk: int) -> List[Meter]:
+    def load_meters(self, account_pk: int) -> List[UrjaMeter]:
         """Load all meters for an account.
 
         PSE meter numbers tend to have a single-letter prefix, e.g. "Z".
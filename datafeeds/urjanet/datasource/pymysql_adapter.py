@@ -12,15 +12,17 @@ from abc import abstractmethod
 from decimal import Decimal
 from datetime import date
 from datetime import datetime
-from typing import List, Dict, Callable, Any, Type, Optional
+from typing import List, Dict, Callable, Any, Tuple, Type, Optional
 
-from pymysql.cursors import DictCursor
+from pymysql.cursors import Cursor, DictCursor
 
 from datafeeds.urjanet.datasource.base import UrjanetDataSource
 from datafeeds.urjanet.model import UrjanetData, Account, Meter, Usage, Charge
+from datafeeds.urjanet.model.core import UrjanetModel
 
 SqlRowDict = Dict[str, Any]
 SqlQueryResult = List[SqlRowDict]
+SqlRowTuple = Tuple[Any, ...]
 Transform = Callable[[Any], Any]
 
 
@@ -28,6 +30,11 @@ def create_placeholders(item_list):
     return ",".join(["%s"] * len(item_list))
 
 
+def select_columns(model_cls: Type[UrjanetModel]) -> str:
+    """Build a SELECT list for the columns of a model class, in from_row order"""
+    return ",".join("`{}`".format(col) for col in model_cls.columns())
+
+
 def get_column(
     row: SqlRowDict,
     colname: str,
@@ -187,6 +194,15 @@ class UrjanetPyMySqlDataSource(UrjanetDataSource):
             cursor.execute(query, tuple(argv))
             return cursor.fetchone()
 
+    def fetch_all_tuples(self, query: str, *argv) -> List[SqlRowTuple]:
+        """Helper function for executing a query and fetching all results as tuples
+
+        This skips building a dict for every row; use it with select_columns and from_row.
+        """
+        with self.conn.cursor(Cursor) as cursor:
+            cursor.execute(query, tuple(argv))
+            return cursor.fetchall()
+
     def execute(self, query: str, *argv) -> SqlQueryResult:
         """Helper function for executing a query"""
         with self.conn.cursor(DictCursor) as cursor:
@@ -205,32 +221,38 @@ class UrjanetPyMySqlDataSource(UrjanetDataSource):
     def load_meter_charges(self, account_pk: int, meter_pk: int) -> List[Charge]:
         """Fetch all charge info for a given meter"""
         query = """
-            SELECT *
+            SELECT {}
             FROM Charge
             WHERE AccountFK=%s AND MeterFK=%s
-        """
-        result_set = self.fetch_all(query, account_pk, meter_pk)
-        return [UrjanetPyMySqlDataSource.parse_charge_row(row) for row in result_set]
+        """.format(
+            select_columns(Charge)
+        )
+        result_set = self.fetch_all_tuples(query, account_pk, meter_pk)
+        return [Charge.from_row(row) for row in result_set]
 
     def load_meter_usages(self, account_pk: int, meter_pk: int) -> List[Usage]:
         """Fetch all usage info for a given meter"""
         query = """
-            SELECT *
+            SELECT {}
             FROM `Usage`
             WHERE AccountFK=%s AND MeterFK=%s
-        """
-        result_set = self.fetch_all(query, account_pk, meter_pk)
-        return [UrjanetPyMySqlDataSource.parse_usage_row(row) for row in result_set]
+        """.format(
+            select_columns(Usage)
+        )
+        result_set = self.fetch_all_tuples(query, account_pk, meter_pk)
+        return [Usage.from_row(row) for row in result_set]
 
     def load_floating_charges(self, account_pk: int) -> List[Charge]:
         """Floating charges are charges on a statement attached to no meter"""
         query = """
-            SELECT *
+            SELECT {}
             FROM Charge
             WHERE AccountFK=%s AND MeterFK is null
-        """
-        result_set = self.fetch_all(query, account_pk)
-        return [UrjanetPyMySqlDataSource.parse_charge_row(row) for row in result_set]
+        """.format(
+            select_columns(Charge)
+        )
+        result_set = self.fetch_all_tuples(query, account_pk)
+        return [Charge.from_row(row) for row in result_set]
 
     def load(self) -> UrjanetData:
         """Load Urjanet data from the MySQL connection.
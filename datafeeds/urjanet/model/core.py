@@ -19,32 +19,245 @@ The primary goal of this data model is to define intermediate objects
 to faciliate the transformation of Urjanet data to other formats
 (e.g. Gridium billing periods).
 
-Currently, the jsonobject library is used to define these types
-(https://github.com/dimagi/jsonobject). This is a lightweight
-"ORM-like" system, where, conceptually, the backing store is a json
-document. The primary justification for this is testing: one can
-express a complex test case as a json document, and easily
-deserialized it into this data model.
+These types are plain python classes with __slots__ (see
+UrjanetModel). Transformers walk tens of thousands of charges and
+usages for a single account, so attribute access and object size
+matter; a slots-based object is a fraction of the size of a
+dict-backed one, and constructing it does no validation beyond simple
+type coercion. Each object can still be round-tripped through json
+(via the wrap/to_json methods), so that a complex test case can be
+expressed as a json document and easily deserialized into this data
+model.
 """
 
 import copy
 from collections import OrderedDict
-from typing import Any, Callable
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
 from datetime import date
+from decimal import Decimal
 
+T = TypeVar("T", bound="UrjanetModel")
 
-from jsonobject import (
-    JsonObject,
-    DecimalProperty,
-    StringProperty,
-    DateProperty,
-    IntegerProperty,
-    ListProperty,
-    BooleanProperty,
-)
 
+class Field:
+    """Describes how a model attribute is converted to and from json.
 
-class Usage(JsonObject):
+    The base class handles plain json values (strings, integers), which are stored as-is.
+    """
+
+    def wrap(self, value: Any) -> Any:
+        """Convert a json value to its python representation"""
+        return value
+
+    def unwrap(self, value: Any) -> Any:
+        """Convert a python value to its json representation"""
+        return value
+
+    def coerce(self, value: Any) -> Any:
+        """Normalize a python value assigned via the constructor"""
+        return value
+
+    def default(self) -> Any:
+        return None
+
+
+class BooleanField(Field):
+    def coerce(self, value: Any) -> Any:
+        # MySQL returns tinyint(1) columns as integers
+        return value if value is None else bool(value)
+
+
+class DecimalField(Field):
+    def wrap(self, value: Any) -> Any:
+        return value if value is None else Decimal(value)
+
+    def unwrap(self, value: Any) -> Any:
+        return value if value is None else str(value)
+
+    def coerce(self, value: Any) -> Any:
+        if value is None or isinstance(value, Decimal):
+            return value
+        if isinstance(value, float):
+            # Decimal(0.1) is 0.1000000000000000055511151231257827...
+            return Decimal(str(value))
+        return Decimal(value)
+
+
+class DateField(Field):
+    def wrap(self, value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError as e:
+            raise ValueError("Invalid ISO date {0!r} [{1}]".format(value, e))
+
+    def unwrap(self, value: Any) -> Any:
+        return value if value is None else value.isoformat()
+
+
+class ListField(Field):
+    """A list of model objects, or of plain json values when item_type is None."""
+
+    def __init__(self, item_type: Type["UrjanetModel"] = None):
+        self.item_type = item_type
+
+    def wrap(self, value: Any) -> Any:
+        if value is None:
+            return []
+        if self.item_type is None:
+            return list(value)
+        return [self.item_type.wrap(item) for item in value]
+
+    def unwrap(self, value: Any) -> Any:
+        if self.item_type is None:
+            return list(value)
+        return [item.to_json() for item in value]
+
+    def coerce(self, value: Any) -> Any:
+        return [] if value is None else list(value)
+
+    def default(self) -> Any:
+        return []
+
+
+def _field_for(annotation: Any) -> Field:
+    """Choose a Field for a class-level type annotation"""
+    if getattr(annotation, "__origin__", None) in (list, List):
+        (item_type,) = annotation.__args__
+        if isinstance(item_type, type) and issubclass(item_type, UrjanetModel):
+            return ListField(item_type)
+        return ListField()
+    if annotation is bool:
+        return BooleanField()
+    if annotation is Decimal:
+        return DecimalField()
+    if annotation is date:
+        return DateField()
+    return Field()
+
+
+class UrjanetModelMeta(type):
+    """Build __slots__ and the field table for an UrjanetModel from its type annotations"""
+
+    def __new__(mcs, clsname, bases, attrs):
+        annotations = attrs.get("__annotations__", {})
+        names = [
+            name
+            for name in annotations
+            if not name.startswith("_") and name not in attrs
+        ]
+        attrs["__slots__"] = tuple(names)
+        newclass = super().__new__(mcs, clsname, bases, attrs)
+
+        fields: Dict[str, Field] = {}
+        for base in reversed(newclass.__mro__[1:]):
+            fields.update(getattr(base, "_fields", {}))
+        for name in names:
+            fields[name] = _field_for(annotations[name])
+        newclass._fields = fields
+        newclass._columns = tuple(
+            name for name, field in fields.items() if not isinstance(field, ListField)
+        )
+        # Precomputed for from_row: (name, coerce function or None if values are stored as-is)
+        newclass._row_setters = tuple(
+            (name, None if type(fields[name]) is Field else fields[name].coerce)
+            for name in newclass._columns
+        )
+        newclass._list_fields = tuple(
+            name for name, field in fields.items() if isinstance(field, ListField)
+        )
+        return newclass
+
+
+class UrjanetModel(metaclass=UrjanetModelMeta):
+    """Base class for Urjanet model objects.
+
+    Attributes are declared with class-level type annotations; each annotated name becomes a
+    slot. Unset attributes default to None (or an empty list, for list attributes).
+
+    Objects can be created from keyword arguments, from a json dict (via wrap, or by passing
+    the dict as the single positional argument, as in UrjanetData(json_dict)), or from a
+    database row tuple whose values are in column order (via from_row).
+    """
+
+    _fields: Dict[str, Field] = {}
+    _columns: Tuple[str, ...] = ()
+    _row_setters: Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...] = ()
+    _list_fields: Tuple[str, ...] = ()
+
+    def __init__(self, _obj: Dict[str, Any] = None, **kwargs: Any):
+        unknown = kwargs.keys() - self._fields.keys()
+        if unknown:
+            raise TypeError(
+                "{} has no field(s) {}".format(
+                    type(self).__name__, ", ".join(sorted(unknown))
+                )
+            )
+        for name, field in self._fields.items():
+            if name in kwargs:
+                value = field.coerce(kwargs[name])
+            elif _obj is not None and name in _obj:
+                value = field.wrap(_obj[name])
+            else:
+                value = field.default()
+            setattr(self, name, value)
+
+    @classmethod
+    def wrap(cls: Type[T], obj: Dict[str, Any]) -> T:
+        """Deserialize an object from a json dict; unknown keys are ignored."""
+        return cls(obj)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Serialize this object (and any nested objects) to a json dict."""
+        return {
+            name: field.unwrap(getattr(self, name))
+            for name, field in self._fields.items()
+        }
+
+    @classmethod
+    def columns(cls) -> Tuple[str, ...]:
+        """The names of the non-list attributes, in declaration order.
+
+        These correspond to columns in the Urjanet schema, and define the order of values
+        expected by from_row.
+        """
+        return cls._columns
+
+    @classmethod
+    def from_row(cls: Type[T], row: Sequence[Any]) -> T:
+        """Create an object from a sequence of values ordered like columns()"""
+        obj = cls.__new__(cls)
+        for (name, coerce), value in zip(cls._row_setters, row):
+            setattr(obj, name, value if coerce is None else coerce(value))
+        for name in cls._list_fields:
+            setattr(obj, name, [])
+        return obj
+
+    def __copy__(self: T) -> T:
+        # Nested model objects are copied too, so that a copied account can have its meters
+        # modified without affecting the original (transformers rely on this).
+        result = type(self).__new__(type(self))
+        for name, field in self._fields.items():
+            value = getattr(self, name)
+            if isinstance(field, ListField):
+                if field.item_type is None:
+                    value = list(value)
+                else:
+                    value = [copy.copy(item) for item in value]
+            setattr(result, name, value)
+        return result
+
+    def __repr__(self) -> str:
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join(
+                "{}={!r}".format(name, getattr(self, name)) for name in self._fields
+            ),
+        )
+
+
+class Usage(UrjanetModel):
     """An Urjanet "Usage" object.
 
     From Urjanet's documentation:
@@ -55,31 +268,31 @@ class Usage(JsonObject):
     """
 
     # The primary key of the Usage object in the Urjanet database
-    PK = IntegerProperty(required=True)
+    PK: int
 
     # A string description of the usage measurement
-    UsageActualName = StringProperty()
+    UsageActualName: str
 
     # The measured amount of usage
-    UsageAmount = DecimalProperty()
+    UsageAmount: Decimal
 
     # The rate component, e.g. "on peak", "off peak", etc.
-    RateComponent = StringProperty()
+    RateComponent: str
 
     # The measurement type, "general_consumption", "demand", or "reactive_consumption"
-    MeasurementType = StringProperty()
+    MeasurementType: str
 
     # Unit of measure, typically kW or kWh
-    EnergyUnit = StringProperty()
+    EnergyUnit: str
 
     # The start date for the usage measurement
-    IntervalStart = DateProperty()
+    IntervalStart: date
 
     # The end date for the usage measurement
-    IntervalEnd = DateProperty()
+    IntervalEnd: date
 
 
-class Charge(JsonObject):
+class Charge(UrjanetModel):
     """An Urjanet "Charge" object.
 
     From the Urjanet documentation:
@@ -94,41 +307,41 @@ class Charge(JsonObject):
     """
 
     # The primary key of the Charge object in the Urjanet database
-    PK = IntegerProperty(required=True)
+    PK: int
 
     # The line item name
-    ChargeActualName = StringProperty()
+    ChargeActualName: str
 
     # The charge amount in dollars
-    ChargeAmount = DecimalProperty()
+    ChargeAmount: Decimal
 
     # The usage associated with this charge, if any
-    ChargeUnitsUsed = DecimalProperty()
+    ChargeUnitsUsed: Decimal
 
     # The units on the usage associated with this charge
-    UsageUnit = StringProperty()
+    UsageUnit: str
 
     # The rate associated with this charge (e.g. price per unit of usage)
-    ChargeRatePerUnit = DecimalProperty()
+    ChargeRatePerUnit: Decimal
 
     # The name of any third party provider (e.g. a CCA entity)
     # This is useful for identifying CCA charges
-    ThirdPartyProvider = StringProperty()
+    ThirdPartyProvider: str
 
     # TODO: Explain this flag in more detail. It may be a somewhat
     # misleading field. For now, avoid using it.
-    IsAdjustmentCharge = BooleanProperty()
+    IsAdjustmentCharge: bool
 
     # The start date for the period the charge applies to
-    IntervalStart = DateProperty()
+    IntervalStart: date
 
     # The end date for the period the charge applies to
-    IntervalEnd = DateProperty()
+    IntervalEnd: date
 
-    ChargeId = StringProperty()
+    ChargeId: str
 
 
-class Meter(JsonObject):
+class Meter(UrjanetModel):
     """An Urjanet "Meter" object
 
     From Urjanet's documentation:
@@ -139,25 +352,25 @@ class Meter(JsonObject):
     """
 
     # The primary key of the Meter object in the Urjanet database
-    PK = IntegerProperty(required=True)
+    PK: int
 
     # The tariff assigned to the meter.
     # Note: this is drawn from text in a PDF, and is not guaranteed
     # to have a consistent format (that is, tariff's on separate meters
     # cannot reliably be compared in a direct fashion)
-    Tariff = StringProperty()
+    Tariff: str
 
     # The service type of the meter (e.g. electric, natural_gas)
-    ServiceType = StringProperty()
+    ServiceType: str
 
     # The "Point of Delivery" identifier for the meter. Interpretation
     # of this field varies for different utilities. For Pacific Gas &
     # Electric, this corresponds to a service ID.
-    PODid = StringProperty()
+    PODid: str
 
     # The meter number for the meter. Interpretation of this field varies
     # for different utilities.
-    MeterNumber = StringProperty()
+    MeterNumber: str
 
     # The start/end dates for the Meter object. These fields are a little
     # difficult to interpret. Roughly speaking, they define, respectively, the
@@ -165,17 +378,17 @@ class Meter(JsonObject):
     # for the meter on a given statement. While this is usually set correctly,
     # there are times where individual charge/usage date ranges do not fully
     # interect with their parent meter.
-    IntervalStart = DateProperty()
-    IntervalEnd = DateProperty()
+    IntervalStart: date
+    IntervalEnd: date
 
     # The charges associated with this meter
-    charges = ListProperty(Charge)
+    charges: List[Charge]
 
     # The usage values associated with this meter
-    usages = ListProperty(Usage)
+    usages: List[Usage]
 
 
-class Account(JsonObject):
+class Account(UrjanetModel):
     """An Urjanet "Account" object
 
     From Urjanet documentation:
@@ -188,109 +401,109 @@ class Account(JsonObject):
     """
 
     # The primary key of the Account object in the Urjanet database
-    PK = IntegerProperty(required=True)
+    PK: int
 
     # The name of the utility company (often shortened, e.g. "PacGAndE")
-    UtilityProvider = StringProperty()
+    UtilityProvider: str
 
     # The account number with no preprocessing (e.g. to remove dashes)
-    RawAccountNumber = StringProperty()
+    RawAccountNumber: str
 
     # The preprocessed/cleaned account number (e.g. dashes removed for PG&E)
-    AccountNumber = StringProperty()
+    AccountNumber: str
 
     # A link to the source material for the statement (often a PDF)
-    SourceLink = StringProperty()
+    SourceLink: str
 
     # The statement type; typically, "statement_type_bill" or
     # "statement_type_adjustment". The latter is a little misleading,
     # because a statement can contain both adjustments and novel charges,
     # so take care when using this field
-    StatementType = StringProperty()
+    StatementType: str
 
     # The date on which the statement was issued
-    StatementDate = DateProperty()
+    StatementDate: date
 
     # The earliest start date for charges/usages appearing on the statement
     # (may be approximate)
-    IntervalStart = DateProperty()
+    IntervalStart: date
 
     # The latest start date for charges/usages appearing on the statement
     # (may be approximate)
-    IntervalEnd = DateProperty()
+    IntervalEnd: date
 
     # The sum of charges for the account on the statement
-    TotalBillAmount = DecimalProperty()
+    TotalBillAmount: Decimal
 
     # The amount due in this billing cycle
-    AmountDue = DecimalProperty()
+    AmountDue: Decimal
 
     # TODO: get clarification on how to interpret this field
-    NewCharges = DecimalProperty()
+    NewCharges: Decimal
 
     # TODO: get clarification on how to interpret this field
-    OutstandingBalance = DecimalProperty()
+    OutstandingBalance: Decimal
 
     # TODO: get clarification on how to interpret this field
-    PreviousBalance = DecimalProperty()
+    PreviousBalance: Decimal
 
     # The list of meters associated with this account
-    meters = ListProperty(Meter)
+    meters: List[Meter]
 
     # Charges associated with this account that are not associated with a meter
-    floating_charges = ListProperty(Charge)
+    floating_charges: List[Charge]
 
 
-class UrjanetData(JsonObject):
+class UrjanetData(UrjanetModel):
     """A top-level object representing a collection of Urjanet data."""
 
-    accounts = ListProperty(Account)
+    accounts: List[Account]
 
 
-class GridiumBillingPeriod(JsonObject):
+class GridiumBillingPeriod(UrjanetModel):
     """A gridium billing period synthesized from Urjanet data."""
 
     # The start date of the billing period
-    start = DateProperty()
+    start: date
 
     # The end date of the billing period
-    end = DateProperty()
+    end: date
 
     # The statement date of the billing period
-    statement = DateProperty()
+    statement: date
 
     # The tariff associated with this period
-    tariff = StringProperty()
+    tariff: str
 
     # A list of URLs pointing to the source documents for this billing period (e.g. PDF bills)
-    source_urls = ListProperty(StringProperty)
+    source_urls: List[str]
 
     # The total charge for this period
-    total_charge = DecimalProperty()
+    total_charge: Decimal
 
     # The peak demand for this period
-    peak_demand = DecimalProperty()
+    peak_demand: Decimal
 
     # The total usage for this period
-    total_usage = DecimalProperty()
+    total_usage: Decimal
 
     # The list of charges for this period
-    line_items = ListProperty(Charge)
+    line_items: List[Charge]
 
     # The service id (SAID) associated with this billing period
-    service_id = StringProperty()
+    service_id: str
 
     # The utility account id (account number) associated with this billing period
-    utility_account_id = StringProperty()
+    utility_account_id: str
 
     # The utility associated with this billing period, may also be a third party provider
-    utility = StringProperty()
+    utility: str
 
 
-class GridiumBillingPeriodCollection(JsonObject):
+class GridiumBillingPeriodCollection(UrjanetModel):
     """A top-level collection of billing periods."""
 
-    periods = ListProperty(GridiumBillingPeriod)
+    periods: List[GridiumBillingPeriod]
 
 
 # Some utility functions
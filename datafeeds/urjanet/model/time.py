@@ -1,19 +1,26 @@
-from datetime import date, timedelta
-from collections import deque
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import accumulate
 import logging
-from typing import Any, List, Callable
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from intervaltree import Interval, IntervalTree
+from intervaltree import Interval
 
 log = logging.getLogger(__name__)
 
 
 class DateIntervalTree:
-    """A slight adaption of the intervaltree library to support python dates
+    """An index of date intervals, each with an optional data element
 
-    The intervaltree data structure stores integer ranges, fundamentally. Therefore, if we want to
-    store dates, we must fist convert them to integers, in a way that preserves inequalities.
-    Luckily, the toordinal() function on datetime.date satisfies this requirement.
+    Intervals are stored as parallel arrays of date ordinals (see datetime.date.toordinal), kept
+    sorted by (begin, end). Alongside these, we keep a running maximum of the end ordinals; since
+    it never decreases, both ends of a range query can be found by binary search:
+      - intervals at or after bisect_left(begins, query_end) begin too late to overlap
+      - intervals before bisect_right(max_ends, query_begin) all end too early to overlap
+
+    Queries return intervaltree.Interval objects holding python dates. They are built lazily, on
+    the first query after the index changes, and shared by all queries until the next change.
 
     It's important to note that this interval tree structure is, unless otherwise noted inclusive of
     lower bounds and exclusive of upper bounds. That is to say, an interval from A to B includes the
@@ -21,7 +28,12 @@ class DateIntervalTree:
     """
 
     def __init__(self):
-        self.tree = IntervalTree()
+        self._begins = array("l")
+        self._ends = array("l")
+        self._data: List[Any] = []
+        # running max of _ends, and date intervals; rebuilt lazily after a change
+        self._max_ends: Optional[List[int]] = None
+        self._intervals: Optional[List[Interval]] = None
 
     @staticmethod
     def to_date_interval(begin: date, end: date, data: Any) -> Interval:
@@ -35,9 +47,59 @@ class DateIntervalTree:
             date.fromordinal(ival.begin), date.fromordinal(ival.end), ival.data
         )
 
+    def _changed(self):
+        self._max_ends = None
+        self._intervals = None
+
+    def _running_max_ends(self) -> List[int]:
+        if self._max_ends is None:
+            self._max_ends = list(accumulate(self._ends, max))
+        return self._max_ends
+
+    def _date_intervals(self) -> List[Interval]:
+        if self._intervals is None:
+            self._intervals = list(self)
+        return self._intervals
+
+    def _load(self, items: Iterable[Sequence[Any]]):
+        """Replace the contents of the index with (begin, end, data) ordinal triples"""
+        items = sorted(items, key=lambda item: (item[0], item[1]))
+        self._begins = array("l", (item[0] for item in items))
+        self._ends = array("l", (item[1] for item in items))
+        self._data = [item[2] for item in items]
+        self._changed()
+
+    def __len__(self) -> int:
+        return len(self._begins)
+
+    def __iter__(self) -> Iterator[Interval]:
+        """Yield date intervals in (begin, end) order; dates are created as they are needed."""
+        fromordinal = date.fromordinal
+        for begin, end, data in zip(self._begins, self._ends, self._data):
+            yield Interval(fromordinal(begin), fromordinal(end), data)
+
     def add(self, begin: date, end: date, data: Any = None):
         """Add a date interval to the interval tree, along with any associated date"""
-        self.tree.add(DateIntervalTree.to_date_interval(begin, end, data))
+        b, e = begin.toordinal(), end.toordinal()
+        if b >= e:
+            raise ValueError(
+                "DateIntervalTree: Null intervals not allowed: {0}".format(
+                    Interval(begin, end, data)
+                )
+            )
+        lo = bisect_left(self._begins, b)
+        hi = bisect_right(self._begins, b, lo)
+        for idx in range(lo, hi):
+            if self._ends[idx] == e and self._data[idx] == data:
+                return  # already present
+            if self._ends[idx] > e:
+                break
+        else:
+            idx = hi
+        self._begins.insert(idx, b)
+        self._ends.insert(idx, e)
+        self._data.insert(idx, data)
+        self._changed()
 
     def merge_overlaps(self, reducer: Callable = None, strict: bool = True):
         """Merge overlapping date intervals in the tree.
@@ -46,48 +108,85 @@ class DateIntervalTree:
         The strict argument determines whether "kissing" intervals are merged. If true (the default), only "strictly"
         overlapping intervals are merged, otherwise adjacent intervals will also be merged.
 
-        See the intervaltree library documentation for the merge_overlaps function for a more complete description.
+        This matches the merge_overlaps function in the intervaltree library: without a reducer, the data element
+        of a merged interval is None.
         """
-        self.tree.merge_overlaps(data_reducer=reducer, strict=strict)
+        merged: List[List[Any]] = []
+        for begin, end, data in zip(self._begins, self._ends, self._data):
+            if merged:
+                lower = merged[-1]
+                if begin < lower[1] or (not strict and begin == lower[1]):
+                    lower[1] = max(lower[1], end)
+                    lower[2] = reducer(lower[2], data) if reducer else None
+                    continue
+            merged.append([begin, end, data])
+        self._load(merged)
 
     def intervals(self) -> List[Interval]:
-        """Return all date intervals in this tree"""
-
-        # Note we convert from ordinal values to actual date objects
-        return [DateIntervalTree.from_date_interval(ival) for ival in self.tree.items()]
+        """Return all date intervals in this tree, ordered by (begin, end)"""
+        return list(self._date_intervals())
 
     def overlaps(self, begin: date, end: date, strict: bool = True) -> bool:
         """Determine whether the given date interval overlaps with any interval in the tree.
 
-        According to intervaltree, intervals include the lower bound but not the upper bound:
+        Intervals include the lower bound but not the upper bound:
         2015-07-23 -2015-08-21 does not overlap 2015-08-21-2015-09-21
         If strict is false, add a day to the end date to return True for single day overlaps.
         """
-        if strict:
-            ival = DateIntervalTree.to_date_interval(begin, end, None)
-        else:
-            ival = DateIntervalTree.to_date_interval(
-                begin, end + timedelta(days=1), None
-            )
-        return self.tree.overlaps(ival.begin, ival.end)
+        b, e = begin.toordinal(), end.toordinal()
+        if not strict:
+            e += 1
+        if b >= e:
+            return False
+        hi = bisect_left(self._begins, e)
+        return hi > 0 and self._running_max_ends()[hi - 1] > b
+
+    def _overlapping(self, b: int, e: int) -> List[int]:
+        """Indexes of intervals that strictly overlap the ordinal range [b, e)"""
+        if b >= e:
+            return []
+        ends = self._ends
+        lo = bisect_right(self._running_max_ends(), b)
+        hi = bisect_left(self._begins, e, lo)
+        return [idx for idx in range(lo, hi) if ends[idx] > b]
 
     def range_query(self, begin: date, end: date) -> List[Interval]:
         """Return all intervals in the tree that strictly overlap with the given interval"""
-        ival = DateIntervalTree.to_date_interval(begin, end, None)
+        intervals = self._date_intervals()
         return [
-            DateIntervalTree.from_date_interval(ival)
-            for ival in self.tree.overlap(ival.begin, ival.end)
+            intervals[idx]
+            for idx in self._overlapping(begin.toordinal(), end.toordinal())
         ]
 
-    def point_query(self, point: date) -> List[Interval]:
+    def range_query_many(
+        self, ranges: Iterable[Tuple[date, date]]
+    ) -> List[List[Interval]]:
+        """Run range_query for each (begin, end) pair; returns one list of intervals per pair."""
+        intervals = self._date_intervals()
         return [
-            DateIntervalTree.from_date_interval(ival)
-            for ival in self.tree.at(point.toordinal())
+            [intervals[idx] for idx in self._overlapping(b.toordinal(), e.toordinal())]
+            for b, e in ranges
         ]
 
+    def point_query(self, point: date) -> List[Interval]:
+        """Return all intervals in the tree that contain the given date"""
+        intervals = self._date_intervals()
+        p = point.toordinal()
+        return [intervals[idx] for idx in self._overlapping(p, p + 1)]
+
+    def _reload_after_shift(self):
+        for begin, end, data in zip(self._begins, self._ends, self._data):
+            if begin >= end:
+                raise ValueError(
+                    "DateIntervalTree: shifting endpoints produced a null interval: {0}".format(
+                        self.from_date_interval(Interval(begin, end, data))
+                    )
+                )
+        self._load(zip(self._begins, self._ends, self._data))
+
     @staticmethod
     def shift_endpoints(date_tree: "DateIntervalTree") -> "DateIntervalTree":
-        """Produce a new tree where adjacent intervals are guaranteed to not match at a boundary
+        """Adjust a tree in place so that adjacent intervals are guaranteed to not match at a boundary
 
         by shifting the end dates of touching intervals
         E.g., the intervals
@@ -95,25 +194,18 @@ class DateIntervalTree:
         become
             (1/1/2000, 1/9/2000), (1/10/2000, 1/20/2000)
                          ^--A day was subtracted here to avoid matching exactly with the next interval
-        Loop earliest -> latest, adjusting end date.
+        Loop earliest -> latest, adjusting end date. Returns the (modified) tree.
         """
-        adjusted = DateIntervalTree()
-        work_list = deque(sorted(date_tree.intervals()))
-        while work_list:
-            cur_ival = work_list.popleft()
-            if work_list:
-                next_ival = work_list[0]
-                if cur_ival.end == next_ival.begin:
-                    cur_ival = Interval(
-                        cur_ival.begin, cur_ival.end - timedelta(days=1), cur_ival.data
-                    )
-
-            adjusted.add(cur_ival.begin, cur_ival.end, cur_ival.data)
-        return adjusted
+        begins, ends = date_tree._begins, date_tree._ends
+        for idx in range(len(begins) - 1):
+            if ends[idx] == begins[idx + 1]:
+                ends[idx] -= 1
+        date_tree._reload_after_shift()
+        return date_tree
 
     @staticmethod
     def shift_endpoints_start(date_tree: "DateIntervalTree") -> "DateIntervalTree":
-        """Produce a new tree where adjacent intervals are guaranteed to not match at a boundary
+        """Adjust a tree in place so that adjacent intervals are guaranteed to not match at a boundary
 
         by shifting the start dates of touching intervals
         E.g., the intervals
@@ -122,53 +214,42 @@ class DateIntervalTree:
             (1/1/2000, 1/10/2000), (1/11/2000, 1/20/2000)
                                       ^--A day was added here to avoid matching exactly with
                                      the next interval
-        Loop latest -> earliest, adjusting start date.
+        Loop latest -> earliest, adjusting start date. Returns the (modified) tree.
         """
-        adjusted = DateIntervalTree()
-        work_list = deque(sorted(date_tree.intervals(), reverse=True))
-        while work_list:
-            cur_ival = work_list.popleft()
-            if work_list:
-                next_ival = work_list[0]
-                if cur_ival.begin == next_ival.end:
-                    log.debug(
-                        "adjusting start of billing period: %s-%s",
-                        cur_ival.begin,
-                        cur_ival.end,
-                    )
-                    cur_ival = Interval(
-                        cur_ival.begin + timedelta(days=1), cur_ival.end, cur_ival.data
-                    )
-            adjusted.add(cur_ival.begin, cur_ival.end, cur_ival.data)
-        return adjusted
+        begins, ends = date_tree._begins, date_tree._ends
+        for idx in range(len(begins) - 1, 0, -1):
+            if begins[idx] == ends[idx - 1]:
+                log.debug(
+                    "adjusting start of billing period: %s-%s",
+                    date.fromordinal(begins[idx]),
+                    date.fromordinal(ends[idx]),
+                )
+                begins[idx] += 1
+        date_tree._reload_after_shift()
+        return date_tree
 
     @staticmethod
     def shift_endpoints_end(date_tree: "DateIntervalTree") -> "DateIntervalTree":
-        """Produce a new tree where adjacent intervals are guaranteed to not match at a boundary
+        """Adjust a tree in place so that adjacent intervals are guaranteed to not match at a boundary
         by shifting the end dates of touching intervals
         E.g., the intervals
             (1/1/2000, 1/10/2000), (1/10/2000, 1/20/2000)
         become
             (1/1/2000, 1/9/2000), (1/10/2000, 1/20/2000)
                          ^--A day was subtracted here to avoid matching exactly with the next interval
-        Loop latest -> earliest, adjusting end date.
+        Loop latest -> earliest, adjusting end date. Returns the (modified) tree.
         """
-        adjusted = DateIntervalTree()
-        work_list = deque(sorted(date_tree.intervals(), reverse=True))
-        prev_ival = None
-        while work_list:
-            cur_ival = work_list.popleft()
-            if prev_ival:
-                while cur_ival.end >= prev_ival.begin:
-                    new_start, new_end = (
-                        cur_ival.begin,
-                        cur_ival.end - timedelta(days=1),
-                    )
-
-                    if new_start == new_end:
+        begins, ends = date_tree._begins, date_tree._ends
+        prev_begin = None
+        for idx in range(len(begins) - 1, -1, -1):
+            begin, end = begins[idx], ends[idx]
+            if prev_begin is not None:
+                while end >= prev_begin:
+                    end -= 1
+                    if begin == end:
                         # If new interval is one day long, shift start date back one day too.
-                        new_start = new_start - timedelta(days=1)
-                    cur_ival = Interval(new_start, new_end, cur_ival.data)
-            prev_ival = cur_ival
-            adjusted.add(cur_ival.begin, cur_ival.end, cur_ival.data)
-        return adjusted
+                        begin -= 1
+            begins[idx], ends[idx] = begin, end
+            prev_begin = begin
+        date_tree._reload_after_shift()
+        return date_tree
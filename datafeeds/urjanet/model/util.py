@@ -1,8 +1,12 @@
+import logging
+
 from . import Charge, Usage, Meter
 
 
 def log_charge(logger, charge: Charge, indent: int = 0):
     """Helper function for logging basic information about an Urjanet Charge object"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     indent_str = "\t" * indent
     logger.debug(
         "{0}Name='{1}',Amt=${2},Start='{3}',End='{4}',PK={5}".format(
@@ -18,6 +22,8 @@ def log_charge(logger, charge: Charge, indent: int = 0):
 
 def log_usage(logger, usage: Usage, indent: int = 0) -> None:
     """Helper function for logging basic information about an Urjanet Usage object"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     indent_str = "\t" * indent
     logger.debug(
         "{0}Amt={1}{2},Start='{3}',End='{4}',PK={5}".format(
@@ -33,6 +39,8 @@ def log_usage(logger, usage: Usage, indent: int = 0) -> None:
 
 def log_meter(logger, meter: Meter, indent: int = 0) -> None:
     """Helper function for logging basic information about an Urjanet Meter object"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     indent_str = "\t" * indent
     logger.debug(
         "{0}MeterNumber={1},PODid={2},ServiceType={3},Start='{4}',End='{5}',PK={6}".format(
@@ -9,6 +9,7 @@ from typing import Optional, List
 import requests
 
 from datafeeds import config
+from datafeeds.common import tracing
 from datafeeds.common.util.s3 import s3_key_exists, upload_file_to_s3
 from datafeeds.models.bill import PartialBillProviderType
 from datafeeds.urjanet.model import (
@@ -85,6 +86,7 @@ def statement_to_s3(source_link, s3_key=None):
                 bill_link,
             )
             return None
+        tracing.record_download(len(bill.content))
     except Exception as e:
         log.info("bill download failed. url=%s, exception=%s", (bill_link, e))
         return None
@@ -240,8 +242,10 @@ class BaseUrjanetScraper(BaseScraper):
         self.name = "Urjanet Scraper: {}".format(self._configuration.utility_name)
 
     def gridium_bills_to_billing_datum(self) -> BillingData:
-        data = self.urja_datasource.load()
-        gridium_bills = self.urja_transformer.urja_to_gridium(data)
+        with tracing.span("urjanet_load"):
+            data = self.urja_datasource.load()
+        with tracing.span("urja_to_gridium"):
+            gridium_bills = self.urja_transformer.urja_to_gridium(data)
 
         out_dir = config.WORKING_DIRECTORY
         if out_dir:
@@ -249,6 +253,7 @@ class BaseUrjanetScraper(BaseScraper):
             with open(bill_json_file, "w") as f:
                 json_data = order_json(gridium_bills.to_json())
                 f.write(json.dumps(json_data, indent=4))
+            self.urja_transformer.trace.dump(out_dir)
 
         utility = self.urja_datasource.utility  # type: ignore
         account_id = self.urja_datasource.account_number  # type: ignore
@@ -0,0 +1,145 @@
+"""Measure throughput and memory use of the Urjanet data model on the test fixtures
+
+Loads every json fixture under datafeeds/urjanet/tests/data, and reports:
+  - time to deserialize (wrap) and serialize (to_json) the fixtures
+  - throughput of building Charge/Usage objects from row tuples, as the pymysql datasource does
+  - memory retained by the deserialized model objects
+
+Usage:
+    python -m datafeeds.urjanet.scripts.benchmark_model [--repeat N]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+from datafeeds.urjanet.model import (
+    Charge,
+    Usage,
+    UrjanetData,
+    GridiumBillingPeriodCollection,
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+
+def load_fixtures() -> List[Dict[str, Any]]:
+    fixtures = []
+    for path in sorted(
+        glob.glob(os.path.join(FIXTURE_DIR, "**/*.json"), recursive=True)
+    ):
+        with open(path) as f:
+            fixtures.append(json.load(f))
+    return fixtures
+
+
+def wrap_all(fixtures: List[Dict[str, Any]]) -> List[Any]:
+    return [
+        UrjanetData.wrap(data)
+        if "accounts" in data
+        else GridiumBillingPeriodCollection.wrap(data)
+        for data in fixtures
+    ]
+
+
+def collect_rows(models: List[Any]) -> Tuple[List[Tuple], List[Tuple]]:
+    """Turn every charge and usage in the fixtures back into a row tuple, in column order."""
+    charge_rows: List[Tuple] = []
+    usage_rows: List[Tuple] = []
+    for model in models:
+        if not isinstance(model, UrjanetData):
+            continue
+        for account in model.accounts:
+            charges = list(account.floating_charges)
+            for meter in account.meters:
+                charges.extend(meter.charges)
+                usage_rows.extend(
+                    tuple(getattr(u, col) for col in Usage.columns())
+                    for u in meter.usages
+                )
+            charge_rows.extend(
+                tuple(getattr(c, col) for col in Charge.columns()) for c in charges
+            )
+    return charge_rows, usage_rows
+
+
+def count_objects(models: List[Any]) -> int:
+    total = 0
+    for model in models:
+        if isinstance(model, UrjanetData):
+            for account in model.accounts:
+                total += 1 + len(account.floating_charges)
+                for meter in account.meters:
+                    total += 1 + len(meter.charges) + len(meter.usages)
+        else:
+            for period in model.periods:
+                total += 1 + len(period.line_items)
+    return total
+
+
+def timed(fn, repeat: int) -> float:
+    """Return the best wall-clock time of repeat calls to fn."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+
+    tracemalloc.start()
+    models = wrap_all(fixtures)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    objects = count_objects(models)
+    charge_rows, usage_rows = collect_rows(models)
+
+    wrap_time = timed(lambda: wrap_all(fixtures), args.repeat)
+    to_json_time = timed(lambda: [m.to_json() for m in models], args.repeat)
+    row_time = timed(
+        lambda: (
+            [Charge.from_row(row) for row in charge_rows],
+            [Usage.from_row(row) for row in usage_rows],
+        ),
+        args.repeat,
+    )
+    rows = len(charge_rows) + len(usage_rows)
+
+    print("fixtures:          {}".format(len(fixtures)))
+    print("model objects:     {}".format(objects))
+    print(
+        "wrap:              {:.3f}s ({:,.0f} objects/s)".format(
+            wrap_time, objects / wrap_time
+        )
+    )
+    print(
+        "to_json:           {:.3f}s ({:,.0f} objects/s)".format(
+            to_json_time, objects / to_json_time
+        )
+    )
+    print(
+        "from_row:          {:.3f}s ({:,.0f} rows/s, {} rows)".format(
+            row_time, rows / row_time, rows
+        )
+    )
+    print(
+        "retained memory:   {:.1f} MB ({:.0f} bytes/object)".format(
+            retained / 1e6, retained / objects
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
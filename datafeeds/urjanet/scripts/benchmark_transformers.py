@@ -0,0 +1,191 @@
+"""Measure the time Urjanet transformers take on the test fixtures
+
+Runs each transformer over the Urjanet input fixtures in datafeeds/urjanet/tests/data, and
+reports the best time for each fixture directory, along with the time spent in DateIntervalTree
+methods (the index transformers use to lay out billing periods).
+
+Usage:
+    python -m datafeeds.urjanet.scripts.benchmark_transformers [--repeat N]
+"""
+
+import argparse
+import functools
+import glob
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+from datafeeds.urjanet.model import DateIntervalTree, UrjanetData
+from datafeeds.urjanet.transformer import (
+    AmericanTransformer,
+    AustinTXTransformer,
+    CityOfBellevueTransformer,
+    CityOfElSegundoTransformer,
+    ConstellationTransformer,
+    ContraCostaWaterTransformer,
+    DirectEnergyTransformer,
+    EbmudTransformer,
+    FortWorthWaterTransformer,
+    FosterCityWaterTransformer,
+    GenericWaterTransformer,
+    HecoTransformer,
+    LADWPTransformer,
+    NationalGridTransformer,
+    NVEnergyTransformer,
+    PacificGasElectricTransformer,
+    PacificGasElectricUrjaXMLTransformer,
+    SanDiegoWaterTransformer,
+    SanFranciscoWaterTransformer,
+    SDGETransformer,
+    SouthlakeTransformer,
+    TriCountyTransformer,
+    UrjanetGridiumTransformer,
+    WataugaTransformer,
+)
+from datafeeds.urjanet.transformer.clean_power_alliance import (
+    CleanPowerAllianceTransformer,
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+# fixture directory -> transformer used by the corresponding test case
+FIXTURE_TRANSFORMERS: Dict[str, Callable[[], UrjanetGridiumTransformer]] = {
+    "american": AmericanTransformer,
+    "austin_tx": AustinTXTransformer,
+    "calwater": GenericWaterTransformer,
+    "city_of_bellevue": CityOfBellevueTransformer,
+    "city_of_el_segundo": CityOfElSegundoTransformer,
+    "clean_power_alliance": CleanPowerAllianceTransformer,
+    "colleyville": GenericWaterTransformer,
+    "constellation": ConstellationTransformer,
+    "contra_costa_water": ContraCostaWaterTransformer,
+    "directenergy": DirectEnergyTransformer,
+    "ebmud": EbmudTransformer,
+    "fort-worth": FortWorthWaterTransformer,
+    "fortworth": GenericWaterTransformer,
+    "fostercity": FosterCityWaterTransformer,
+    "fpl": UrjanetGridiumTransformer,
+    "generic_water": GenericWaterTransformer,
+    "heco": HecoTransformer,
+    "irvineranch": GenericWaterTransformer,
+    "ladwp": LADWPTransformer,
+    "mountainview": GenericWaterTransformer,
+    "nationalgrid": NationalGridTransformer,
+    "nve": NVEnergyTransformer,
+    "pge": PacificGasElectricTransformer,
+    "pge_generation": PacificGasElectricUrjaXMLTransformer,
+    "pleasanton": GenericWaterTransformer,
+    "pse": UrjanetGridiumTransformer,
+    "sandiego": SanDiegoWaterTransformer,
+    "sdge": SDGETransformer,
+    "sfpuc": SanFranciscoWaterTransformer,
+    "sjwater": GenericWaterTransformer,
+    "southlake": SouthlakeTransformer,
+    "tricounty": TriCountyTransformer,
+    "watauga": WataugaTransformer,
+}
+
+TREE_METHODS = [
+    "add",
+    "merge_overlaps",
+    "intervals",
+    "overlaps",
+    "range_query",
+    "point_query",
+]
+TREE_STATIC_METHODS = [
+    "shift_endpoints",
+    "shift_endpoints_start",
+    "shift_endpoints_end",
+]
+
+
+def load_inputs() -> Dict[str, List[UrjanetData]]:
+    """Load Urjanet input fixtures (not expected outputs), by fixture directory."""
+    inputs: Dict[str, List[UrjanetData]] = defaultdict(list)
+    for name in sorted(FIXTURE_TRANSFORMERS):
+        for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, name, "*.json"))):
+            with open(path) as f:
+                data = json.load(f)
+            if "accounts" in data:
+                inputs[name].append(UrjanetData.wrap(data))
+    return inputs
+
+
+def instrument_tree() -> Dict[str, float]:
+    """Wrap DateIntervalTree methods to accumulate the time spent in each."""
+    totals: Dict[str, float] = defaultdict(float)
+
+    def timed_method(name, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                totals[name] += time.perf_counter() - start
+
+        return wrapper
+
+    for name in TREE_METHODS:
+        setattr(
+            DateIntervalTree, name, timed_method(name, getattr(DateIntervalTree, name))
+        )
+    for name in TREE_STATIC_METHODS:
+        setattr(
+            DateIntervalTree,
+            name,
+            staticmethod(timed_method(name, getattr(DateIntervalTree, name))),
+        )
+    return totals
+
+
+def run(inputs: Dict[str, List[UrjanetData]], repeat: int) -> List[Tuple[str, float]]:
+    """Return the best time to transform each fixture directory."""
+    results = []
+    for name, fixtures in inputs.items():
+        transformer = FIXTURE_TRANSFORMERS[name]()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for urja_data in fixtures:
+                transformer.urja_to_gridium(urja_data)
+            best = min(best, time.perf_counter() - start)
+        results.append((name, best))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.getLogger("datafeeds").setLevel(logging.WARNING)
+
+    inputs = load_inputs()
+    results = run(inputs, args.repeat)
+    total = sum(elapsed for _, elapsed in results)
+    for name, elapsed in sorted(results, key=lambda r: r[1], reverse=True):
+        print(
+            "{:<24}{:>4} fixtures {:>9.1f}ms".format(
+                name, len(inputs[name]), elapsed * 1000
+            )
+        )
+    print(
+        "{:<24}{:>4} fixtures {:>9.1f}ms".format(
+            "total", sum(len(fixtures) for fixtures in inputs.values()), total * 1000
+        )
+    )
+
+    # A second, single pass to see how much of the total is spent in the date interval index.
+    totals = instrument_tree()
+    run(inputs, 1)
+    print("\nDateIntervalTree (single pass):")
+    for name, elapsed in sorted(totals.items(), key=lambda t: t[1], reverse=True):
+        print("  {:<22}{:>9.1f}ms".format(name, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Check a transformer change against many accounts at once
+
+Snapshot Urjanet data for a list of accounts to local fixtures, then transform the fixtures
+with the transformers in this tree and in another checkout (eg the main branch), and report
+the accounts where the billing periods differ, and the time each took.
+
+  snapshot: load Urjanet data from MySQL for each line of an accounts file, and write it
+    to a directory with a manifest. Each line is a dump_urja_json subcommand and its
+    arguments, eg "nve 1234567 7654321 A1234". (--test-fixtures writes a manifest for the
+    Urjanet test fixtures instead, without connecting to MySQL.)
+  transform: transform each fixture in a snapshot, in a pool of --workers processes, and
+    write the billing periods and times to a JSON file.
+  compare: transform the snapshot with this tree, and with the tree at --old (in a
+    subprocess), and report the differences. Exits with status 1 if any account differs.
+
+For example, to check a change against the main branch:
+
+    git worktree add /tmp/main main
+    python -m datafeeds.urjanet.scripts.regression snapshot accounts.txt /tmp/snapshot
+    python -m datafeeds.urjanet.scripts.regression compare /tmp/snapshot --old /tmp/main
+
+Usage:
+    python -m datafeeds.urjanet.scripts.regression snapshot ACCOUNTS_FILE DIR
+    python -m datafeeds.urjanet.scripts.regression snapshot --test-fixtures DIR
+    python -m datafeeds.urjanet.scripts.regression transform DIR OUTFILE [--workers N]
+    python -m datafeeds.urjanet.scripts.regression compare DIR --old TREE [--workers N]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import importlib
+import json
+import logging
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from datafeeds.urjanet.model import UrjanetData
+
+MANIFEST = "manifest.json"
+
+
+def _class_path(cls) -> str:
+    return "%s.%s" % (cls.__module__, cls.__qualname__)
+
+
+def _load_class(path: str):
+    module, name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module), name)
+
+
+def write_manifest(directory: str, fixtures: List[Dict[str, str]]):
+    """Write the manifest for a snapshot: fixture name, path, and transformer class."""
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump({"fixtures": fixtures}, f, indent=2)
+
+
+def read_manifest(directory: str) -> List[Dict[str, str]]:
+    with open(os.path.join(directory, MANIFEST)) as f:
+        fixtures = json.load(f)["fixtures"]
+    for fixture in fixtures:
+        fixture["path"] = os.path.join(directory, fixture["path"])
+    return fixtures
+
+
+def snapshot_accounts(accounts_file: str, directory: str):
+    """Load Urjanet data for each account in accounts_file, and write a snapshot."""
+    import pymysql
+
+    from datafeeds import config
+    from datafeeds.urjanet.scripts.cli_hooks import get_cli_hooks
+    from datafeeds.urjanet.transformer import urja_to_json
+
+    parser = argparse.ArgumentParser(prog="accounts file")
+    subparsers = parser.add_subparsers()
+    for _, hook_cls in get_cli_hooks().items():
+        hook_cls().add_subparser(subparsers)
+
+    with open(accounts_file) as f:
+        lines = [line.strip() for line in f if line.strip() and line[0] != "#"]
+    os.makedirs(directory, exist_ok=True)
+    conn = pymysql.connect(
+        host=config.URJANET_MYSQL_HOST,
+        user=config.URJANET_MYSQL_USER,
+        passwd=config.URJANET_MYSQL_PASSWORD,
+        db=config.URJANET_MYSQL_DB,
+    )
+    fixtures = []
+    try:
+        for idx, line in enumerate(lines):
+            args = parser.parse_args(shlex.split(line))
+            datasource = args.datasource_cli.make_datasource(conn, args)
+            name = "%04d-%s" % (idx, line.split()[0])
+            with open(os.path.join(directory, "%s.json" % name), "w") as f:
+                json.dump(urja_to_json(datasource.load()), f)
+            fixtures.append(
+                {
+                    "name": name,
+                    "account": line,
+                    "path": "%s.json" % name,
+                    "transformer": _class_path(
+                        type(args.datasource_cli.make_transformer())
+                    ),
+                }
+            )
+            print("%s: %s" % (name, line))
+    finally:
+        conn.close()
+    write_manifest(directory, fixtures)
+
+
+def snapshot_test_fixtures(directory: str):
+    """Write a snapshot manifest for the Urjanet input fixtures used by the tests."""
+    from datafeeds.urjanet.scripts.benchmark_transformers import (
+        FIXTURE_DIR,
+        FIXTURE_TRANSFORMERS,
+    )
+
+    fixtures = []
+    for name, transformer in sorted(FIXTURE_TRANSFORMERS.items()):
+        fixture_dir = os.path.abspath(os.path.join(FIXTURE_DIR, name))
+        for filename in sorted(os.listdir(fixture_dir)):
+            path = os.path.join(fixture_dir, filename)
+            if not filename.endswith(".json"):
+                continue
+            with open(path) as f:
+                if "accounts" not in json.load(f):
+                    # an expected output
+                    continue
+            fixtures.append(
+                {
+                    "name": "%s/%s" % (name, filename[:-5]),
+                    "path": path,
+                    "transformer": _class_path(transformer),
+                }
+            )
+    os.makedirs(directory, exist_ok=True)
+    write_manifest(directory, fixtures)
+
+
+def _quiet():
+    logging.getLogger("datafeeds").setLevel(logging.ERROR)
+
+
+def transform_fixture(fixture: Dict[str, str]) -> Tuple[str, Dict[str, Any]]:
+    """Transform one fixture; return its name, and its billing periods and time (or error)."""
+    result: Dict[str, Any] = {"seconds": None, "periods": None, "error": None}
+    try:
+        with open(fixture["path"]) as f:
+            urja_data = UrjanetData(json.load(f))
+        transformer = _load_class(fixture["transformer"])()
+        start = time.perf_counter()
+        periods = transformer.urja_to_gridium(urja_data)
+        result["seconds"] = time.perf_counter() - start
+        result["periods"] = periods.to_json()["periods"]
+    except Exception as exc:
+        result["error"] = repr(exc)
+    return fixture["name"], result
+
+
+def transform_all(directory: str, workers: int) -> Dict[str, Dict[str, Any]]:
+    """Transform every fixture in a snapshot, in a pool of worker processes."""
+    fixtures = read_manifest(directory)
+    # start the largest first, so a big one doesn't finish last
+    fixtures.sort(key=lambda fixture: os.path.getsize(fixture["path"]), reverse=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_quiet) as pool:
+        return dict(pool.map(transform_fixture, fixtures))
+
+
+def transform_old(directory: str, tree: str, workers: int) -> Dict[str, Dict[str, Any]]:
+    """Transform a snapshot with the transformers in another checkout."""
+    with tempfile.TemporaryDirectory() as tmp:
+        outfile = os.path.join(tmp, "old.json")
+        # run this file, rather than the module, so the rest of datafeeds comes from tree
+        subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "transform",
+                directory,
+                outfile,
+                "--workers",
+                str(workers),
+            ],
+            env=dict(os.environ, PYTHONPATH=os.path.abspath(tree)),
+            check=True,
+        )
+        with open(outfile) as f:
+            return json.load(f)
+
+
+def _period_key(period: Dict[str, Any]) -> Tuple[str, str]:
+    return period["start"], period["end"]
+
+
+def diff_periods(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> List[str]:
+    """Describe the differences between two lists of billing periods (as JSON)."""
+    old_periods = {_period_key(period): period for period in old}
+    new_periods = {_period_key(period): period for period in new}
+    differences = []
+    for key in sorted(set(old_periods) | set(new_periods)):
+        if key not in new_periods:
+            differences.append("%s - %s: removed" % key)
+        elif key not in old_periods:
+            differences.append("%s - %s: added" % key)
+        else:
+            fields = [
+                field
+                for field in sorted(set(old_periods[key]) | set(new_periods[key]))
+                if old_periods[key].get(field) != new_periods[key].get(field)
+            ]
+            if fields:
+                differences.append("%s - %s: %s changed" % (key + (", ".join(fields),)))
+    return differences
+
+
+def compare(
+    old: Dict[str, Dict[str, Any]], new: Dict[str, Dict[str, Any]]
+) -> Dict[str, List[str]]:
+    """Return the differences for each fixture whose results differ."""
+    mismatches = {}
+    for name in sorted(set(old) | set(new)):
+        old_result = old.get(name) or {"error": "not transformed"}
+        new_result = new.get(name) or {"error": "not transformed"}
+        if old_result["error"] or new_result["error"]:
+            if old_result["error"] != new_result["error"]:
+                mismatches[name] = [
+                    "error: %s -> %s" % (old_result["error"], new_result["error"])
+                ]
+            continue
+        differences = diff_periods(old_result["periods"], new_result["periods"])
+        if differences:
+            mismatches[name] = differences
+    return mismatches
+
+
+def _seconds(result: Optional[Dict[str, Any]]) -> str:
+    if not result or result["seconds"] is None:
+        return "{:>10}".format("-")
+    return "{:>9.1f}ms".format(result["seconds"] * 1000)
+
+
+def report(
+    old: Dict[str, Dict[str, Any]],
+    new: Dict[str, Dict[str, Any]],
+    mismatches: Dict[str, List[str]],
+):
+    print("{:<40}{:>11}{:>11}".format("fixture", "old", "new"))
+    for name in sorted(set(old) | set(new)):
+        print(
+            "{:<40}{}{}{}".format(
+                name,
+                _seconds(old.get(name)),
+                _seconds(new.get(name)),
+                "  MISMATCH" if name in mismatches else "",
+            )
+        )
+    for name, differences in mismatches.items():
+        print("\n%s:" % name)
+        for line in differences:
+            print("  %s" % line)
+    total = {
+        label: sum(result["seconds"] or 0 for result in results.values())
+        for label, results in [("old", old), ("new", new)]
+    }
+    print(
+        "\n%s fixtures, %s mismatched; old %.1fs, new %.1fs"
+        % (len(set(old) | set(new)), len(mismatches), total["old"], total["new"])
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    snapshot = subparsers.add_parser("snapshot")
+    snapshot.add_argument("accounts_file", nargs="?")
+    snapshot.add_argument("directory")
+    snapshot.add_argument("--test-fixtures", action="store_true")
+    transform = subparsers.add_parser("transform")
+    transform.add_argument("directory")
+    transform.add_argument("outfile")
+    transform.add_argument("--workers", type=int, default=os.cpu_count())
+    comparison = subparsers.add_parser("compare")
+    comparison.add_argument("directory")
+    comparison.add_argument("--old", required=True, help="checkout to compare with")
+    comparison.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        if args.test_fixtures:
+            snapshot_test_fixtures(args.directory)
+        elif args.accounts_file:
+            snapshot_accounts(args.accounts_file, args.directory)
+        else:
+            parser.error("Specify an accounts file, or --test-fixtures.")
+    elif args.command == "transform":
+        results = transform_all(args.directory, args.workers)
+        with open(args.outfile, "w") as f:
+            json.dump(results, f)
+    else:
+        old = transform_old(args.directory, args.old, args.workers)
+        new = transform_all(args.directory, args.workers)
+        mismatches = compare(old, new)
+        report(old, new, mismatches)
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
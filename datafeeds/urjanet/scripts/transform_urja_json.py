@@ -20,6 +20,8 @@ def process_json(args):
         urja_data = UrjanetData(json_dict)
     transformer = args.transformer
     result = transformer.urja_to_gridium(urja_data)
+    if args.trace:
+        transformer.trace.dump(args.trace)
 
     outstream = sys.stdout
     opened_file = False
@@ -63,6 +65,11 @@ def main():
     parser.add_argument("--csv", action="store_true")
     parser.add_argument("--outfile")
     parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument(
+        "--trace",
+        metavar="DIR",
+        help="Write billing period decisions to DIR/transform_trace.json",
+    )
 
     subparsers = parser.add_subparsers()
     for key, hook_cls in get_cli_hooks().items():
@@ -75,6 +82,9 @@ def main():
     if args.verbose:
         logging.getLogger("datafeeds").setLevel(level=logging.DEBUG)
 
+    if args.trace:
+        config.URJANET_TRANSFORM_TRACE = True
+
     process_json(args)
 
 
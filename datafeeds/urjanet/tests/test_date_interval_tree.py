@@ -1,5 +1,8 @@
+import random
 import unittest
-from datetime import date
+from datetime import date, timedelta
+
+from intervaltree import IntervalTree
 
 import datafeeds.urjanet.model as urja_model
 
@@ -103,3 +106,82 @@ class TestDateIntervalTree(unittest.TestCase):
         self.assertEqual(shifted_intervals[2].begin, date(2019, 1, 21))
         self.assertEqual(shifted_intervals[2].end, date(2019, 1, 30))
         self.assertEqual(shifted_intervals[2].data, 3)
+        # the tree is adjusted in place
+        self.assertIs(shifted, tree)
+
+    def test_range_query_many(self):
+        tree = urja_model.DateIntervalTree()
+        tree.add(date(2019, 1, 1), date(2019, 1, 30), 1)
+        tree.add(date(2019, 1, 30), date(2019, 2, 28), 2)
+
+        results = tree.range_query_many(
+            [
+                (date(2018, 12, 1), date(2019, 1, 10)),
+                (date(2019, 1, 15), date(2019, 2, 15)),
+                (date(2018, 11, 1), date(2018, 12, 1)),
+            ]
+        )
+        self.assertEqual([[1], [1, 2], []], [[i.data for i in r] for r in results])
+
+    def test_add_and_merge(self):
+        """Duplicate and null intervals are handled like the intervaltree library."""
+        tree = urja_model.DateIntervalTree()
+        tree.add(date(2019, 1, 1), date(2019, 1, 10))
+        tree.add(date(2019, 1, 1), date(2019, 1, 10))
+        self.assertEqual(1, len(tree.intervals()))
+        with self.assertRaises(ValueError):
+            tree.add(date(2019, 1, 1), date(2019, 1, 1))
+
+        tree.add(date(2019, 1, 5), date(2019, 1, 20))
+        tree.add(date(2019, 1, 20), date(2019, 1, 30))
+        tree.merge_overlaps()
+        self.assertEqual(
+            [
+                (date(2019, 1, 1), date(2019, 1, 20)),
+                (date(2019, 1, 20), date(2019, 1, 30)),
+            ],
+            [(i.begin, i.end) for i in tree.intervals()],
+        )
+        tree.merge_overlaps(strict=False)
+        self.assertEqual(
+            [(date(2019, 1, 1), date(2019, 1, 30))],
+            [(i.begin, i.end) for i in tree.intervals()],
+        )
+
+    def test_matches_intervaltree(self):
+        """Queries return the same results as the intervaltree library, on random intervals."""
+        rand = random.Random(42)
+        start = date(2019, 1, 1)
+        tree = urja_model.DateIntervalTree()
+        reference = IntervalTree()
+        for idx in range(200):
+            begin = rand.randrange(0, 720)
+            end = begin + rand.randrange(1, 60)
+            tree.add(start + timedelta(days=begin), start + timedelta(days=end), idx)
+            reference.addi(begin, end, idx)
+
+        def to_days(intervals):
+            return sorted(
+                ((i.begin - start).days, (i.end - start).days, i.data)
+                for i in intervals
+            )
+
+        self.assertEqual(
+            sorted(tuple(i) for i in reference.items()), to_days(tree.intervals())
+        )
+        for _ in range(200):
+            begin = rand.randrange(-30, 780)
+            end = begin + rand.randrange(0, 40)
+            query_begin = start + timedelta(days=begin)
+            query_end = start + timedelta(days=end)
+            self.assertEqual(
+                sorted(tuple(i) for i in reference.overlap(begin, end)),
+                to_days(tree.range_query(query_begin, query_end)),
+            )
+            self.assertEqual(
+                reference.overlaps(begin, end), tree.overlaps(query_begin, query_end)
+            )
+            self.assertEqual(
+                sorted(tuple(i) for i in reference.at(begin)),
+                to_days(tree.point_query(query_begin)),
+            )
@@ -0,0 +1,143 @@
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+
+from pymysql.cursors import Cursor
+
+from datafeeds.urjanet.datasource.pymysql_adapter import UrjanetPyMySqlDataSource
+from datafeeds.urjanet.model import Charge, Usage
+
+# values as pymysql returns them: DECIMAL as Decimal, tinyint(1) as int, DATE as date,
+# DATETIME as datetime, and NULL as None
+CHARGE_ROWS = [
+    (
+        101,
+        "Energy Charge",
+        Decimal("123.45"),
+        Decimal("1000.000"),
+        "kWh",
+        Decimal("0.12345"),
+        None,
+        1,
+        date(2020, 1, 1),
+        date(2020, 2, 1),
+        "c-101",
+    ),
+    (
+        102,
+        "Adjustment",
+        Decimal("-5.00"),
+        None,
+        None,
+        None,
+        "Clean Power",
+        0,
+        datetime(2020, 1, 1, 0, 0),
+        datetime(2020, 2, 1, 0, 0),
+        None,
+    ),
+    (103, None, None, None, None, None, None, None, None, None, None),
+]
+
+USAGE_ROWS = [
+    (
+        201,
+        "Total Usage",
+        Decimal("1000.000"),
+        "on peak",
+        "general_consumption",
+        "kWh",
+        date(2020, 1, 1),
+        date(2020, 2, 1),
+    ),
+    (202, None, None, None, "demand", "kW", datetime(2020, 1, 1), None),
+]
+
+
+class FakeCursor:
+    def __init__(self, connection, cursor_class):
+        self.connection = connection
+        self.cursor_class = cursor_class
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, args):
+        self.connection.queries.append(query)
+
+    def fetchall(self):
+        assert self.cursor_class is Cursor
+        return self.connection.rows
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def cursor(self, cursor_class=Cursor):
+        return FakeCursor(self, cursor_class)
+
+
+class ExampleDataSource(UrjanetPyMySqlDataSource):
+    def load_accounts(self):
+        return []
+
+    def load_meters(self, account_pk):
+        return []
+
+
+def as_dict(columns, row):
+    """A row as a DictCursor would return it."""
+    return dict(zip(columns, row))
+
+
+class TestPyMySqlAdapter(unittest.TestCase):
+    def setUp(self):
+        self.datasource = ExampleDataSource("utility:test", "123")
+
+    def assertSameObject(self, expected, actual):
+        for name in type(expected).columns():
+            value = getattr(expected, name)
+            self.assertEqual(
+                (type(value), value),
+                (type(getattr(actual, name)), getattr(actual, name)),
+                name,
+            )
+
+    def test_charges(self):
+        """from_row on tuple rows gives the same charges as parse_charge_row on dict rows."""
+        self.datasource.conn = FakeConnection(CHARGE_ROWS)
+        charges = self.datasource.load_meter_charges(1, 2)
+        floating = self.datasource.load_floating_charges(1)
+        self.assertIn(
+            "SELECT `PK`,`ChargeActualName`,`ChargeAmount`",
+            self.datasource.conn.queries[0],
+        )
+        self.assertEqual(3, len(charges))
+        for row, charge, floating_charge in zip(CHARGE_ROWS, charges, floating):
+            expected = UrjanetPyMySqlDataSource.parse_charge_row(
+                as_dict(Charge.columns(), row)
+            )
+            self.assertSameObject(expected, charge)
+            self.assertSameObject(expected, floating_charge)
+            self.assertEqual(expected.to_json(), charge.to_json())
+        self.assertIs(True, charges[0].IsAdjustmentCharge)
+        self.assertIs(False, charges[1].IsAdjustmentCharge)
+        self.assertIsNone(charges[2].IsAdjustmentCharge)
+
+    def test_usages(self):
+        """from_row on tuple rows gives the same usages as parse_usage_row on dict rows."""
+        self.datasource.conn = FakeConnection(USAGE_ROWS)
+        usages = self.datasource.load_meter_usages(1, 2)
+        self.assertIn("FROM `Usage`", self.datasource.conn.queries[0])
+        self.assertEqual(2, len(usages))
+        for row, usage in zip(USAGE_ROWS, usages):
+            expected = UrjanetPyMySqlDataSource.parse_usage_row(
+                as_dict(Usage.columns(), row)
+            )
+            self.assertSameObject(expected, usage)
+            self.assertEqual(expected.to_json(), usage.to_json())
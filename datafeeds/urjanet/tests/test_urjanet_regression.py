@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from datafeeds.urjanet.scripts import regression
+
+
+def period(start, end, total_charge="100.00"):
+    return {"start": start, "end": end, "total_charge": total_charge, "line_items": []}
+
+
+class RegressionTests(unittest.TestCase):
+    def test_diff_periods(self):
+        old = [
+            period("2020-01-01", "2020-01-31"),
+            period("2020-02-01", "2020-02-29"),
+            period("2020-03-01", "2020-03-31"),
+        ]
+        new = [
+            period("2020-01-01", "2020-01-31"),
+            period("2020-02-01", "2020-02-29", "120.00"),
+            period("2020-04-01", "2020-04-30"),
+        ]
+        self.assertEqual(
+            [
+                "2020-02-01 - 2020-02-29: total_charge changed",
+                "2020-03-01 - 2020-03-31: removed",
+                "2020-04-01 - 2020-04-30: added",
+            ],
+            regression.diff_periods(old, new),
+        )
+        self.assertEqual([], regression.diff_periods(old, list(reversed(old))))
+
+    def test_compare(self):
+        ok = {
+            "seconds": 0.1,
+            "periods": [period("2020-01-01", "2020-01-31")],
+            "error": None,
+        }
+        failed = {"seconds": None, "periods": None, "error": "KeyError('x')"}
+        self.assertEqual(
+            {
+                "b": ["error: None -> KeyError('x')"],
+                "c": ["error: not transformed -> None"],
+            },
+            regression.compare({"a": ok, "b": ok}, {"a": ok, "b": failed, "c": ok}),
+        )
+
+    def test_transform_test_fixtures(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            regression.snapshot_test_fixtures(tmp)
+            fixtures = regression.read_manifest(tmp)
+            self.assertTrue(all(os.path.isfile(f["path"]) for f in fixtures))
+            fixtures = [f for f in fixtures if f["name"].startswith("pge/")]
+            for fixture in fixtures:
+                fixture["path"] = os.path.relpath(fixture["path"], tmp)
+            regression.write_manifest(tmp, fixtures)
+
+            results = regression.transform_all(tmp, workers=2)
+        self.assertEqual({f["name"] for f in fixtures}, set(results))
+        for result in results.values():
+            self.assertIsNone(result["error"])
+            self.assertTrue(result["periods"])
+        self.assertEqual({}, regression.compare(results, results))
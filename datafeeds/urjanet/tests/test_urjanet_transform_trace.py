@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from datafeeds import config
+from datafeeds.urjanet.model import UrjanetData
+from datafeeds.urjanet.transformer import (
+    PacificGasElectricTransformer,
+    UrjanetGridiumTransformer,
+)
+from datafeeds.urjanet.transformer.trace import TransformTrace, TRACE_FILENAME
+
+TEST_DIR = os.path.split(__file__)[0]
+DATA_DIR = os.path.join(TEST_DIR, "data")
+
+
+def load_fixture(name: str) -> UrjanetData:
+    with open(os.path.join(DATA_DIR, name)) as f:
+        return UrjanetData(json.load(f))
+
+
+class TestTransformTrace(unittest.TestCase):
+    def test_disabled_trace_records_nothing(self):
+        trace = TransformTrace(enabled=False)
+        trace.record("added", account_pk=1)
+        self.assertEqual([], trace.events)
+        with tempfile.TemporaryDirectory() as out_dir:
+            self.assertIsNone(trace.dump(out_dir))
+            self.assertEqual([], os.listdir(out_dir))
+
+    def test_pge_trace(self):
+        """The PG&E transformer records periods, shifts, skipped charges, and merges."""
+        transformer = PacificGasElectricTransformer()
+        with mock.patch.object(config, "URJANET_TRANSFORM_TRACE", True):
+            transformer.urja_to_gridium(load_fixture("pge/4504960933350245_input.json"))
+
+        events = transformer.trace.to_json()
+        kinds = {event["event"] for event in events}
+        for kind in ["added", "skipped_overlap", "merged", "period"]:
+            self.assertIn(kind, kinds)
+        added = [event for event in events if event["event"] == "added"]
+        periods = [event for event in events if event["event"] == "period"]
+        self.assertEqual(len(added), len(periods))
+        # values are rendered as json-friendly strings
+        self.assertRegex(periods[0]["start"], r"\d{4}-\d{2}-\d{2}")
+        self.assertIsInstance(periods[0]["total_charge"], str)
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = transformer.trace.dump(out_dir)
+            self.assertEqual(os.path.join(out_dir, TRACE_FILENAME), path)
+            with open(path) as f:
+                self.assertEqual(events, json.load(f))
+
+    def test_generic_trace(self):
+        transformer = UrjanetGridiumTransformer()
+        with mock.patch.object(config, "URJANET_TRANSFORM_TRACE", True):
+            result = transformer.urja_to_gridium(
+                load_fixture("calwater/calwater_input.json")
+            )
+        periods = [e for e in transformer.trace.events if e[0] == "period"]
+        self.assertEqual(len(result.periods), len(periods))
+
+    def test_trace_off_by_default(self):
+        transformer = UrjanetGridiumTransformer()
+        transformer.urja_to_gridium(load_fixture("calwater/calwater_input.json"))
+        self.assertFalse(transformer.trace.enabled)
+        self.assertEqual([], transformer.trace.events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ from datafeeds.urjanet.model import (
     Account,
     UrjanetData,
 )
+from datafeeds.urjanet.transformer.trace import TransformTrace
 
 log = logging.getLogger(__name__)
 
@@ -104,49 +105,57 @@ class GenericBillingPeriod:
 
 
 def log_generic_billing_periods(bill_history: DateIntervalTree) -> None:
-    """Helper function for logging data in an interval tree holding bill data"""
+    """Helper function for logging data in an interval tree holding bill data
+
+    This walks every charge and usage and computes period totals, so it returns immediately
+    unless debug logging is enabled.
+    """
+    if not log.isEnabledFor(logging.DEBUG):
+        return
     log.debug("Billing periods")
     for ival in sorted(bill_history.intervals()):
         period_data = ival.data
         log.debug(
-            "\t{} to {} ({} days)".format(
-                ival.begin, ival.end, (ival.end - ival.begin).days
-            )
+            "\t%s to %s (%s days)", ival.begin, ival.end, (ival.end - ival.begin).days
         )
         log.debug("\t\tUtility Charges:")
         for chg in period_data.iter_charges():
             log.debug(
-                "\t\t\tAmt=${0}\tName='{1}'\tPK={2}\t{3}\t{4}".format(
-                    chg.ChargeAmount,
-                    chg.ChargeActualName,
-                    chg.PK,
-                    chg.IntervalStart,
-                    chg.IntervalEnd,
-                )
+                "\t\t\tAmt=$%s\tName='%s'\tPK=%s\t%s\t%s",
+                chg.ChargeAmount,
+                chg.ChargeActualName,
+                chg.PK,
+                chg.IntervalStart,
+                chg.IntervalEnd,
             )
-        log.debug("\t\tTotal Charge: ${}".format(period_data.get_total_charge()))
+        log.debug("\t\tTotal Charge: $%s", period_data.get_total_charge())
         log.debug("\t\tUsages:")
         for usg in period_data.iter_unique_usages():
             log.debug(
-                "\t\t\tAmt={0}{1}\tComponent={2}\tPK={3}\t{4}\t{5}".format(
-                    usg.UsageAmount,
-                    usg.EnergyUnit,
-                    usg.RateComponent,
-                    usg.PK,
-                    usg.IntervalStart,
-                    usg.IntervalEnd,
-                )
+                "\t\t\tAmt=%s%s\tComponent=%s\tPK=%s\t%s\t%s",
+                usg.UsageAmount,
+                usg.EnergyUnit,
+                usg.RateComponent,
+                usg.PK,
+                usg.IntervalStart,
+                usg.IntervalEnd,
             )
-        log.debug("\t\tTotal Usage: {}".format(period_data.get_total_usage()))
+        log.debug("\t\tTotal Usage: %s", period_data.get_total_usage())
         log.debug("\t\tStatements:")
         log.debug(
-            "\t\t\t{0}\tPK={1}".format(
-                period_data.account.SourceLink, period_data.account.PK
-            )
+            "\t\t\t%s\tPK=%s", period_data.account.SourceLink, period_data.account.PK
         )
 
 
 class UrjanetGridiumTransformer:
+    # Billing period decisions made by the most recent transformation; see trace.py
+    trace: TransformTrace = TransformTrace(enabled=False)
+
+    def start_trace(self) -> TransformTrace:
+        """Begin recording a new transform trace for this transformer"""
+        self.trace = TransformTrace(logger=log)
+        return self.trace
+
     @staticmethod
     def filtered_accounts(
         urja_data: UrjanetData,
@@ -174,18 +183,21 @@ class UrjanetGridiumTransformer:
         # For each account, create a billing period, taking care to detect overlaps
         # (e.g. in the case that a correction bill in issued)
         bill_history = DateIntervalTree()
+        trace = self.start_trace()
         for account in ordered_accounts:
             if bill_history.overlaps(account.IntervalStart, account.IntervalEnd):
-                log.debug(
-                    "Skipping overlapping billing period: account_pk={}, start={}, end={}".format(
-                        account.PK, account.IntervalStart, account.IntervalEnd
-                    )
+                trace.record(
+                    "skipped_overlap",
+                    account_pk=account.PK,
+                    start=account.IntervalStart,
+                    end=account.IntervalEnd,
                 )
             else:
-                log.debug(
-                    "Adding billing period: account_pk={}, start={}, end={}".format(
-                        account.PK, account.IntervalStart, account.IntervalEnd
-                    )
+                trace.record(
+                    "added",
+                    account_pk=account.PK,
+                    start=account.IntervalStart,
+                    end=account.IntervalEnd,
                 )
                 bill_history.add(
                     account.IntervalStart,
@@ -194,10 +206,13 @@ class UrjanetGridiumTransformer:
                 )
 
         # Adjust date endpoints to avoid 1-day overlaps
+        before = bill_history.intervals() if trace.active else []
         bill_history = DateIntervalTree.shift_endpoints(bill_history)
+        trace.record_shifts(before, bill_history)
 
         # Log the billing periods we determined
         log_generic_billing_periods(bill_history)
+        trace.record_periods(bill_history)
         return bill_history
 
     def urja_to_gridium(self, urja_data: UrjanetData) -> GridiumBillingPeriodCollection:
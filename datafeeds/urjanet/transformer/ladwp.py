@@ -5,12 +5,11 @@ from decimal import Decimal
 
 from typing import List, Optional, Tuple, Set
 
-from datafeeds.models import Meter
 from datafeeds.urjanet.transformer import (
     GenericBillingPeriod,
     UrjanetGridiumTransformer,
 )
-from datafeeds.urjanet.model import Account, DateIntervalTree, UrjanetData
+from datafeeds.urjanet.model import Account, DateIntervalTree, Meter, UrjanetData
 from datafeeds.urjanet.transformer.base import log_generic_billing_periods
 
 
@@ -3,7 +3,7 @@ import re
 import logging
 from decimal import Decimal
 from collections import defaultdict
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta
 from typing import List, Dict, Optional
 
 from intervaltree import Interval
@@ -20,7 +20,6 @@ from datafeeds.urjanet.model import (
     Usage,
     Account,
     UrjanetData,
-    log_usage,
     log_charge,
     Meter,
 )
@@ -226,27 +225,34 @@ class PacificGasElectricTransformer(UrjanetGridiumTransformer):
         # First, we rough out the billing period dates, by iterating through the ordered accounts and pulling out
         # usage periods
         bill_history = DateIntervalTree()
+        trace = self.start_trace()
         for account in ordered_accounts:
             usage_periods = self.get_account_billing_periods(account)
             for ival in sorted(usage_periods.intervals(), reverse=True):
                 if bill_history.overlaps(ival.begin, ival.end):
-                    log.debug(
-                        "Skipping overlapping usage period: account_pk={}, start={}, end={}".format(
-                            account.PK, ival.begin, ival.end
-                        )
+                    trace.record(
+                        "skipped_overlap",
+                        account_pk=account.PK,
+                        start=ival.begin,
+                        end=ival.end,
                     )
                 else:
-                    log.debug("Adding usage period: %s - %s", ival.begin, ival.end)
+                    trace.record(
+                        "added", account_pk=account.PK, start=ival.begin, end=ival.end
+                    )
                     bill_history.add(
                         ival.begin, ival.end, self.billing_period_class(account)
                     )
         # fix periods where start/end are the same
+        before = bill_history.intervals() if trace.active else []
         bill_history = self.shift_endpoints(bill_history)
+        trace.record_shifts(before, bill_history)
 
         # Next, we go through the accounts again and insert relevant charge/usage information into the computed
         # billing periods
         for account in ordered_accounts:
             self.merge_statement_data(bill_history, account)
+        trace.record_periods(bill_history)
 
         # Convert the billing periods into the expected "gridium" format
         gridium_periods = []
@@ -338,11 +344,9 @@ class PacificGasElectricTransformer(UrjanetGridiumTransformer):
                     period = periods[0]
                     if charge.IntervalEnd <= period.end:
                         if self.is_correction_charge(charge):
-                            log.debug("Found a correction charge, skipping:")
-                            log_charge(log, charge, indent=1)
+                            self.trace.skip_charge(charge, "correction charge")
                         elif self.is_nem_charge(charge):
-                            log.debug("Found an NEM charge, skipping:")
-                            log_charge(log, charge, indent=1)
+                            self.trace.skip_charge(charge, "NEM charge")
                         elif charge.ThirdPartyProvider:
                             statement_data[period].add_third_party_charge(charge)
                         else:
@@ -377,25 +381,14 @@ class PacificGasElectricTransformer(UrjanetGridiumTransformer):
                             log_charge(log, charge, indent=1)
                             statement_data[period].add_third_party_charge(charge)
                         else:
-                            log.debug(
-                                "Charge %s end date %s exceeds billing period %s, skipping:",
-                                charge.PK,
-                                charge.IntervalEnd,
-                                period.end,
+                            self.trace.skip_charge(
+                                charge,
+                                "end date exceeds billing period %s" % period.end,
                             )
-                            log_charge(log, charge, indent=1)
                 elif not periods:
-                    log.debug(
-                        "Charge %s doesn't belong to a known billing period, skipping:",
-                        charge.PK,
-                    )
-                    log_charge(log, charge, indent=1)
+                    self.trace.skip_charge(charge, "no known billing period")
                 else:
-                    log.debug(
-                        "Charge %s maps to multiple billing periods, skipping:",
-                        charge.PK,
-                    )
-                    log_charge(log, charge, indent=1)
+                    self.trace.skip_charge(charge, "maps to multiple billing periods")
 
             for usage in meter.usages:
                 periods = self.get_best_interval_fits(
@@ -405,13 +398,9 @@ class PacificGasElectricTransformer(UrjanetGridiumTransformer):
                     period = periods[0]
                     statement_data[period].add_usage(usage)
                 elif not periods:
-                    log.debug(
-                        "Usage doesn't belong to a known billing period, skipping:"
-                    )
-                    log_usage(log, usage, indent=1)
+                    self.trace.skip_usage(usage, "no known billing period")
                 else:
-                    log.debug("Usage maps to multiple billing periods, skipping:")
-                    log_usage(log, usage, indent=1)
+                    self.trace.skip_usage(usage, "maps to multiple billing periods")
 
         # Second pass: iterate through the data we've collected for this statement, and try to merge it into what
         # we already know about each billing period
@@ -420,8 +409,17 @@ class PacificGasElectricTransformer(UrjanetGridiumTransformer):
             data_added = cur_data.merge(new_data)
             if data_added:
                 cur_data.add_source_statement(urja_account)
+                self.trace.record(
+                    "merged",
+                    account_pk=urja_account.PK,
+                    start=period.begin,
+                    end=period.end,
+                    utility_charges=len(new_data.utility_charges),
+                    third_party_charges=len(new_data.third_party_charges),
+                    usages=len(new_data.usages),
+                )
 
-    def get_duration(self, start: datetime, end: datetime) -> int:
+    def get_duration(self, start: date, end: date) -> int:
         return (end - start).days
 
     def get_account_billing_periods(
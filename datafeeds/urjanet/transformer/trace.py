@@ -0,0 +1,161 @@
+"""Record the billing-period decisions a transformer makes
+
+A transformer decides which Urjanet statements become billing periods: it adds some periods,
+skips others because they overlap a newer statement, shifts endpoints to avoid one-day
+overlaps, and merges charges from later statements into existing periods. When a transformed
+bill looks wrong, these decisions are what we need to see.
+
+Recording is cheap and off by default. Events are stored as (name, fields) pairs and are
+only rendered when the trace is written out; totals and other derived values should only be
+computed by callers when `trace.active` is true. A trace is enabled by setting
+URJANET_TRANSFORM_TRACE=true, and is also mirrored to the debug log when the transformer's
+logger is at DEBUG.
+"""
+
+import json
+import logging
+import os
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from intervaltree import Interval
+
+from datafeeds import config
+from datafeeds.urjanet.model import Charge, DateIntervalTree, Usage
+
+log = logging.getLogger(__name__)
+
+TRACE_FILENAME = "transform_trace.json"
+
+# Human readable descriptions of trace events, used when mirroring events to the debug log.
+EVENT_DESCRIPTIONS = {
+    "added": "Adding billing period",
+    "skipped_overlap": "Skipping overlapping billing period",
+    "shifted": "Shifted billing period endpoints",
+    "skipped_charge": "Skipping charge",
+    "skipped_usage": "Skipping usage",
+    "merged": "Merged statement data into billing period",
+}
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, (date, Decimal)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_to_json_value(v) for v in value]
+    return value
+
+
+class TransformTrace:
+    """An in-memory list of billing-period decisions for one transformation.
+
+    Arguments:
+        enabled: record events for dumping as json (defaults to config.URJANET_TRANSFORM_TRACE)
+        logger: mirror events to this logger when it is enabled for DEBUG
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, logger: logging.Logger = log):
+        self.enabled = (
+            config.URJANET_TRANSFORM_TRACE if enabled is None else bool(enabled)
+        )
+        self.logger = logger
+        self.debug = logger.isEnabledFor(logging.DEBUG)
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+
+    @property
+    def active(self) -> bool:
+        """True if recorded events will be used; callers can skip expensive work otherwise"""
+        return self.enabled or self.debug
+
+    def record(self, event: str, **fields: Any) -> None:
+        """Record an event; fields are stored as-is and only rendered on output."""
+        if self.enabled:
+            self.events.append((event, fields))
+        if self.debug:
+            self.logger.debug(
+                "%s: %s",
+                EVENT_DESCRIPTIONS.get(event, event),
+                ", ".join("%s=%s" % item for item in fields.items()),
+            )
+
+    def skip_charge(self, charge: Charge, reason: str) -> None:
+        self.record(
+            "skipped_charge",
+            reason=reason,
+            charge_pk=charge.PK,
+            name=charge.ChargeActualName,
+            amount=charge.ChargeAmount,
+            start=charge.IntervalStart,
+            end=charge.IntervalEnd,
+        )
+
+    def skip_usage(self, usage: Usage, reason: str) -> None:
+        self.record(
+            "skipped_usage",
+            reason=reason,
+            usage_pk=usage.PK,
+            amount=usage.UsageAmount,
+            unit=usage.EnergyUnit,
+            start=usage.IntervalStart,
+            end=usage.IntervalEnd,
+        )
+
+    def record_shifts(self, before: List[Interval], after: DateIntervalTree) -> None:
+        """Record the intervals whose endpoints changed when a tree's endpoints were shifted.
+
+        Arguments:
+            before: the tree's intervals before shifting; empty if the trace is not active
+            after: the shifted tree, holding the same data elements
+        """
+        if not self.active:
+            return
+        original = {id(ival.data): ival for ival in before}
+        for ival in after.intervals():
+            prev = original.get(id(ival.data))
+            if prev is not None and (prev.begin, prev.end) != (ival.begin, ival.end):
+                self.record(
+                    "shifted",
+                    start=prev.begin,
+                    end=prev.end,
+                    new_start=ival.begin,
+                    new_end=ival.end,
+                )
+
+    def record_periods(self, bill_history: DateIntervalTree) -> None:
+        """Record the final billing periods and their totals, if the trace is enabled.
+
+        Totals are not mirrored to the debug log; log_generic_billing_periods covers that.
+        """
+        if not self.enabled:
+            return
+        for ival in sorted(bill_history.intervals()):
+            period_data = ival.data
+            self.events.append(
+                (
+                    "period",
+                    dict(
+                        start=ival.begin,
+                        end=ival.end,
+                        account_pk=period_data.account.PK,
+                        total_charge=period_data.get_total_charge(),
+                        total_usage=period_data.get_total_usage(),
+                    ),
+                )
+            )
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        return [
+            dict(event=event, **{k: _to_json_value(v) for k, v in fields.items()})
+            for event, fields in self.events
+        ]
+
+    def dump(self, out_dir: str = None) -> Optional[str]:
+        """Write the trace to the working directory; return the path, or None if not enabled."""
+        out_dir = out_dir or config.WORKING_DIRECTORY
+        if not self.enabled or not out_dir:
+            return None
+        path = os.path.join(out_dir, TRACE_FILENAME)
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f, indent=4)
+        return path
@@ -4,15 +4,12 @@ from datetime import datetime, date
 import json
 import logging
 import os
-import shutil
 import subprocess
 import sys
 from typing import Optional
 import uuid
-import tarfile
-
-import boto3
 
+from datafeeds.common.archive import archive_directory, archive_key
 from datafeeds.common.index import index_logs
 
 from datafeeds.datasources.austin_energy_interval import (
@@ -246,28 +243,17 @@ def cleanup_workdir():
 
 def archive_run(task_id: str):
     """Write the files acquired during the scraper run to S3."""
-
-    # Copy the scraper process log into the archive bundle if available."""
-    if os.path.isfile(config.LOGPATH):
-        dest = os.path.join(config.WORKING_DIRECTORY, config.DATAFEEDS_LOG_NAME)
-        shutil.copy(config.LOGPATH, dest)
-
-    tarball = "{0}.tar.gz".format(config.WORKING_DIRECTORY)
-    s3_key = "{0}.tar.gz".format(task_id)
-    with tarfile.open(tarball, "w:gz") as f:
-        f.add(config.WORKING_DIRECTORY)
-
     try:
-        client = boto3.client("s3")
-        client.upload_file(
-            tarball,
+        # Include the scraper process log in the archive bundle if available.
+        archive_directory(
+            config.WORKING_DIRECTORY,
             config.ARTIFACT_S3_BUCKET,
-            s3_key,
-            ExtraArgs={"StorageClass": "STANDARD_IA", "ContentEncoding": "gzip"},
+            task_id,
+            extra_files={config.DATAFEEDS_LOG_NAME: config.LOGPATH},
         )
         log.info(
             "Successfully uploaded archive %s to S3 bucket %s.",
-            s3_key,
+            archive_key(task_id),
             config.ARTIFACT_S3_BUCKET,
         )
     except:  # noqa E722
@@ -333,7 +319,7 @@ def _launch_meter_datasource(mds: MeterDataSource, start: date, end: date):
         if config.enabled("S3_ARTIFACT_UPLOAD"):
             archive_run(task_id)
         if config.enabled("ES_INDEX_LOGS"):
-            index_logs(task_id)
+            index_logs(task_id, meter.oid)
     except:  # noqa=E722
         log.exception("The scraper run has failed due to an unhandled exception.")
         status = Status.FAILED
@@ -0,0 +1,150 @@
+"""Compare archiving a scraper working directory to a local tarball then uploading it, with archive_directory
+
+Creates a working directory like a browser scraper's (screenshots, downloaded csvs and bill
+pdfs, some of which were uploaded to S3 during the run), then archives it two ways:
+  - tarball: tarfile w:gz to a local file, then upload_file (what archive_run did)
+  - streaming: archive_directory
+and reports the time taken, the local disk used, and the size of the archive. It then
+fetches one file from the streamed archive using its manifest.
+
+Runs against moto (pip install moto) by default, or an S3-compatible server such as
+MinIO with --endpoint-url. --latency adds a delay to every request, to approximate a
+round trip to S3. (With moto 4 and botocore >= 1.36, set
+AWS_REQUEST_CHECKSUM_CALCULATION=when_required, or multipart uploads are stored incorrectly.)
+
+Usage:
+    python -m scripts.benchmark_archive [--screenshots 100] [--latency 20] [--endpoint-url URL]
+"""
+
+import argparse
+import contextlib
+from io import BytesIO
+import os
+import random
+import tarfile
+import tempfile
+import time
+import zlib
+
+import boto3
+
+from datafeeds.common import archive
+from datafeeds.common.util import s3
+
+BUCKET = "benchmark-datafeeds-archive"
+
+
+def make_client(endpoint_url, latency):
+    client = boto3.client("s3", endpoint_url=endpoint_url, region_name="us-east-1")
+
+    def before_call(**kwargs):
+        if latency:
+            time.sleep(latency / 1000)
+
+    client.meta.events.register("before-call.s3", before_call)
+    return client
+
+
+def make_workdir(directory: str, screenshots: int):
+    """Write screenshots, csvs, and pdfs; upload the pdfs, as a bill scraper would."""
+    rand = random.Random(0)
+    downloads = os.path.join(directory, "current", "downloaded")
+    os.makedirs(downloads)
+    for idx in range(screenshots):
+        # mostly flat color with some noise, deflated as in a png
+        pixels = bytearray(1000000)
+        for pos in rand.sample(range(len(pixels)), 50000):
+            pixels[pos] = rand.getrandbits(8)
+        with open(os.path.join(directory, "%03d_page.png" % idx), "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n" + zlib.compress(pixels))
+    for idx in range(screenshots // 4):
+        lines = [
+            "2020-%02d-%02d %02d:%02d,%.3f\n"
+            % (
+                1 + idx % 12,
+                1 + day,
+                hour,
+                15 * quarter,
+                rand.random() * 100,
+            )
+            for day in range(28)
+            for hour in range(24)
+            for quarter in range(4)
+        ]
+        with open(os.path.join(downloads, "usage_%03d.csv" % idx), "w") as f:
+            f.writelines(lines)
+    inventory = s3.s3_inventory(BUCKET)
+    for idx in range(screenshots // 4):
+        pdf = b"%PDF-1.4\n" + bytes(rand.getrandbits(8) for _ in range(200000))
+        with open(os.path.join(downloads, "bill_%03d.pdf" % idx), "wb") as f:
+            f.write(pdf)
+        inventory.upload(s3.S3Upload("bill_%03d.pdf" % idx, BytesIO(pdf)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--screenshots", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=20, help="ms per request")
+    parser.add_argument("--endpoint-url", help="S3-compatible server, eg MinIO")
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        backend = contextlib.nullcontext()
+    else:
+        from moto import mock_s3
+
+        backend = mock_s3()
+
+    with backend, tempfile.TemporaryDirectory() as tmp:
+        s3._client = make_client(args.endpoint_url, 0)
+        s3._client.create_bucket(Bucket=BUCKET)
+        workdir = os.path.join(tmp, "workdir")
+        make_workdir(workdir, args.screenshots)
+        s3._client = make_client(args.endpoint_url, args.latency)
+
+        start = time.perf_counter()
+        tarball = "%s.tar.gz" % workdir
+        with tarfile.open(tarball, "w:gz") as f:
+            f.add(workdir)
+        s3._client.upload_file(tarball, BUCKET, "tarball.tar.gz")
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(tarball)
+        print(
+            "{:<10} {:>9.1f}ms  {:>6.1f}MB archive  {:>6.1f}MB on disk".format(
+                "tarball", elapsed * 1000, size / 1e6, size / 1e6
+            )
+        )
+        os.remove(tarball)
+
+        start = time.perf_counter()
+        manifest = archive.archive_directory(workdir, BUCKET, "streaming")
+        elapsed = time.perf_counter() - start
+        size = s3._client.head_object(Bucket=BUCKET, Key="streaming.tar.gz")[
+            "ContentLength"
+        ]
+        print(
+            "{:<10} {:>9.1f}ms  {:>6.1f}MB archive  {:>6.1f}MB on disk  {} files, {} already in S3".format(
+                "streaming",
+                elapsed * 1000,
+                size / 1e6,
+                0,
+                len(manifest["files"]),
+                len([f for f in manifest["files"] if "s3" in f]),
+            )
+        )
+
+        filename = os.path.join(workdir, "current/downloaded/usage_000.csv").lstrip("/")
+        start = time.perf_counter()
+        data = archive.fetch_archived_file(BUCKET, "streaming", filename)
+        elapsed = time.perf_counter() - start
+        with open("/" + filename, "rb") as f:
+            assert data == f.read()
+        print(
+            "fetched {} ({} bytes) in {:.1f}ms".format(
+                os.path.basename(filename), len(data), elapsed * 1000
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure how Green Button multi-customer parsing scales with worker processes
+
+Parses a multi-customer Green Button file (eg, an SCE export) with parse_multi, once in
+process and then with each requested number of worker processes, checks that every run
+returns the same result, and reports the best time for each.
+
+Usage:
+    python -m scripts.benchmark_green_button FILE [--workers 1 2 4 8] [--repeat N]
+"""
+
+import argparse
+import os
+import time
+
+from datafeeds.scrapers.socalgas import green_button_parser as gbparser
+
+
+def timed_parse(path: str, workers: int, repeat: int, parse_bills: bool):
+    best = float("inf")
+    rval = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rval = gbparser.parse_multi(path, parse_bills=parse_bills, workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return rval, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("path", help="multi-customer Green Button xml file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({2, 4, os.cpu_count() or 1}),
+        help="worker process counts to compare with a serial parse",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-bills", dest="parse_bills", action="store_false")
+    args = parser.parse_args()
+
+    expected, serial = timed_parse(args.path, 1, args.repeat, args.parse_bills)
+    points = sum(len(points) for points in expected.values())
+    print(
+        "{} customers, {} usage points; {} cpus".format(
+            len(expected), points, os.cpu_count()
+        )
+    )
+    print("{:>8} {:>10.1f}ms".format("serial", serial * 1000))
+    for workers in args.workers:
+        if workers <= 1:
+            continue
+        rval, elapsed = timed_parse(args.path, workers, args.repeat, args.parse_bills)
+        if rval != expected:
+            raise ValueError("Result with %s workers differs from serial" % workers)
+        print(
+            "{:>8} {:>10.1f}ms {:>6.2f}x".format(
+                workers, elapsed * 1000, serial / elapsed
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Compare columnar interval CSV parsing with parsing row by row
+
+Parses interval data CSV files into a Timeline two ways, and checks that the results match:
+  - row: csv.reader, with dateutil parsing each timestamp, and averaging repeated readings
+    with Timeline lookups (how HECO, Salt River, SCE and PSE parsed their downloads)
+  - columnar: read_interval_csv and insert_readings
+
+Files are the MV-Web fixture (HECO and Salt River), and a year of generated readings in the
+MV-Web and SCE formats (with a day when daylight savings time ends), or files given with
+--mvweb (a Date / Time column, and a KW column).
+
+Usage:
+    python -m scripts.benchmark_interval_csv [--mvweb FILE ...] [--days N] [--repeat N]
+"""
+
+import argparse
+import csv
+from datetime import date, datetime, timedelta
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from dateutil import parser as dateparser
+
+from datafeeds.common import interval_csv
+from datafeeds.common.timeline import Timeline
+
+FIXTURE = "datafeeds/scrapers/tests/fixtures/mvweb_dst.csv"
+FALL_BACK = date(2020, 11, 1)
+
+
+def _timestamps(days: int) -> List[datetime]:
+    """15 minute timestamps for days ending after FALL_BACK, with 1:00 - 1:45 repeated."""
+    start = datetime.combine(FALL_BACK - timedelta(days=days - 2), datetime.min.time())
+    stamps = [start + timedelta(minutes=15 * idx) for idx in range(days * 96)]
+    # the clocks go back at 2:00
+    repeated = [dt for dt in stamps if dt.date() == FALL_BACK and dt.hour == 1]
+    idx = stamps.index(repeated[-1]) + 1
+    return stamps[:idx] + repeated + stamps[idx:]
+
+
+def write_mvweb(path: str, days: int):
+    with open(path, "w") as f:
+        f.write(
+            "Meter ID         , Date / Time          , KW(ch: 1  set:0)    , PF(ch: 3  set:0)\n"
+        )
+        for idx, dt in enumerate(_timestamps(days)):
+            f.write(
+                "000002776022     , {}       , {:<12} , 0.95\n".format(
+                    dt.strftime("%m/%d/%y %H:%M"), 30 + idx % 17
+                )
+            )
+
+
+def write_sce(path: str, days: int):
+    with open(path, "w") as f:
+        f.write("Customer,EXAMPLE\nService Account,1234567\n\nDate,Time,1234567\n")
+        for idx, dt in enumerate(_timestamps(days)):
+            f.write(
+                '{},{},"{:,.1f}"\n'.format(
+                    dt.strftime("%m/%d/%Y"), dt.strftime("%-I:%M %p"), 1000 + idx % 17
+                )
+            )
+
+
+def _insert(timeline: Timeline, when: datetime, value: float):
+    current = timeline.lookup(when)
+    if current:
+        value = (current + value) / 2
+    timeline.insert(when, value)
+
+
+def row_mvweb(path: str, timeline: Timeline):
+    with open(path) as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            _insert(timeline, dateparser.parse(row[1].strip()), float(row[2].strip()))
+
+
+def row_sce(path: str, timeline: Timeline):
+    with open(path) as f:
+        lines = [line.strip() for line in f]
+    start = [idx for idx, line in enumerate(lines) if line.startswith("Date")][0]
+    for row in csv.reader(lines[start:][1:]):
+        when = datetime.combine(
+            dateparser.parse(row[0]).date(), dateparser.parse(row[1]).time()
+        )
+        _insert(timeline, when, float(row[2].replace(",", "")))
+
+
+def columnar_mvweb(path: str, timeline: Timeline):
+    readings = interval_csv.read_interval_csv(path, "Date / Time", "KW")
+    interval_csv.insert_readings(timeline, readings)
+
+
+def columnar_sce(path: str, timeline: Timeline):
+    readings = interval_csv.read_interval_csv(path, ["Date", "Time"], "1234567")
+    interval_csv.insert_readings(timeline, readings)
+
+
+def timed(
+    parse: Callable[[str, Timeline], None], path: str, repeat: int
+) -> Tuple[dict, float]:
+    best = float("inf")
+    result = {}
+    for _ in range(repeat):
+        timeline = Timeline(date(2000, 1, 1), date(2030, 12, 31))
+        start = time.perf_counter()
+        parse(path, timeline)
+        best = min(best, time.perf_counter() - start)
+        result = {
+            day: values
+            for day, values in timeline.serialize(include_empty=False).items()
+        }
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--mvweb", nargs="+", default=[], help="MV-Web CSV files")
+    parser.add_argument("--days", type=int, default=365, help="days to generate")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = [("mvweb_dst.csv", FIXTURE, row_mvweb, columnar_mvweb)]
+        files += [
+            (os.path.basename(path), path, row_mvweb, columnar_mvweb)
+            for path in args.mvweb
+        ]
+        if args.days:
+            generated = os.path.join(tmp, "mvweb.csv")
+            write_mvweb(generated, args.days)
+            files.append(
+                ("%s days mv-web" % args.days, generated, row_mvweb, columnar_mvweb)
+            )
+            generated = os.path.join(tmp, "sce.csv")
+            write_sce(generated, args.days)
+            files.append(("%s days sce" % args.days, generated, row_sce, columnar_sce))
+
+        print(
+            "{:<24}{:>8}{:>12}{:>12}{:>9}".format("file", "rows", "row", "columnar", "")
+        )
+        for name, path, row, columnar in files:
+            expected, row_time = timed(row, path, args.repeat)
+            result, columnar_time = timed(columnar, path, args.repeat)
+            if result != expected:
+                raise ValueError("Columnar result for %s differs" % name)
+            with open(path) as f:
+                rows = sum(1 for _ in f)
+            print(
+                "{:<24}{:>8}{:>10.1f}ms{:>10.1f}ms{:>8.1f}x".format(
+                    name,
+                    rows,
+                    row_time * 1000,
+                    columnar_time * 1000,
+                    row_time / columnar_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Compare columnar spreadsheet interval parsing with parsing cell by cell
+
+Parses Bloom data extract workbooks into a Timeline two ways, and checks that the results match:
+  - cell: how ExcelParser (bloom_interval) parsed them: open the whole workbook, check the
+    energy column a cell at a time, find the first date row by row, and convert and insert
+    each row's date and value
+  - columnar: read_interval_sheet (streamed, whole columns) and insert_readings
+
+xlrd 2 only reads xls files, so for the generated xlsx workbook, the cell by cell parse opens
+the workbook with openpyxl (fully loaded, as xlrd loads xls files). Bloom xls files given with
+--xls are parsed cell by cell with xlrd, as ExcelParser did.
+
+Usage:
+    python -m scripts.benchmark_interval_sheet [--xls FILE ...] [--days N] [--repeat N]
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Tuple
+
+import openpyxl
+import xlrd
+
+from datafeeds.common.interval_csv import insert_readings
+from datafeeds.common.interval_sheet import read_interval_sheet
+from datafeeds.common.timeline import Timeline
+
+INTERVAL = 15
+DATE_COLUMN = 1
+VALUE_COLUMN = 5
+ENERGY_HEADER = "Electricity Out"
+
+
+def write_extract(path: str, days: int):
+    """Write a Bloom-style extract: a logo row, a header, and 15 minute kWh readings."""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["Bloom Energy"])
+    sheet.append(
+        [None, "Timestamp", "Site", "Fuel In", "Efficiency", ENERGY_HEADER, "Status"]
+    )
+    start = datetime(2020, 1, 1)
+    for idx in range(days * 24 * 60 // INTERVAL):
+        when = start + timedelta(minutes=INTERVAL * idx)
+        sheet.append([None, when, "Site A", 12.5, 0.61, 50 + idx % 13, "OK"])
+    workbook.save(path)
+
+
+def _kw(kwh: float) -> float:
+    return (kwh * 60) / INTERVAL
+
+
+def cell_xlsx(path: str, timeline: Timeline):
+    workbook = openpyxl.load_workbook(path)
+    sheet = workbook.worksheets[0]
+
+    def column(idx):
+        return [row[idx] for row in sheet.iter_rows()]
+
+    for cell in range(len(column(VALUE_COLUMN))):
+        if str(column(VALUE_COLUMN)[cell].value) == ENERGY_HEADER:
+            break
+    start_row = None
+    for row_number in range(1, sheet.max_row + 1):
+        if sheet.cell(row_number, DATE_COLUMN + 1).is_date:
+            start_row = row_number
+            break
+    for row_number in range(start_row, sheet.max_row + 1):
+        when = sheet.cell(row_number, DATE_COLUMN + 1).value
+        kwh = sheet.cell(row_number, VALUE_COLUMN + 1).value
+        timeline.insert(when, _kw(kwh))
+
+
+def cell_xls(path: str, timeline: Timeline):
+    workbook = xlrd.open_workbook(path)
+    sheet = workbook.sheet_by_index(0)
+    for cell in range(len(sheet.col(VALUE_COLUMN))):
+        if str(sheet.col(VALUE_COLUMN)[cell]) == "text:'%s'" % ENERGY_HEADER:
+            break
+    start_row = None
+    for row_number in range(0, sheet.nrows):
+        if sheet.cell(row_number, DATE_COLUMN).ctype == xlrd.XL_CELL_DATE:
+            start_row = row_number
+            break
+    for row_number in range(start_row, sheet.nrows):
+        when = datetime(
+            *xlrd.xldate_as_tuple(
+                sheet.cell(row_number, DATE_COLUMN).value, workbook.datemode
+            )
+        )
+        timeline.insert(when, _kw(sheet.cell(row_number, VALUE_COLUMN).value))
+
+
+def columnar(path: str, timeline: Timeline):
+    readings = read_interval_sheet(
+        path, DATE_COLUMN, ENERGY_HEADER, scale=60 / INTERVAL
+    )
+    insert_readings(timeline, readings)
+
+
+def timed(
+    parse: Callable[[str, Timeline], None], path: str, repeat: int
+) -> Tuple[dict, float]:
+    best = float("inf")
+    result = {}
+    for _ in range(repeat):
+        timeline = Timeline(date(2000, 1, 1), date(2030, 12, 31))
+        start = time.perf_counter()
+        parse(path, timeline)
+        best = min(best, time.perf_counter() - start)
+        result = timeline.serialize(include_empty=False)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--xls", nargs="+", default=[], help="Bloom xls extracts")
+    parser.add_argument("--days", type=int, default=365, help="days to generate")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = [(os.path.basename(path), path, cell_xls) for path in args.xls]
+        if args.days:
+            generated = os.path.join(tmp, "extract.xlsx")
+            write_extract(generated, args.days)
+            files.append(("%s days xlsx" % args.days, generated, cell_xlsx))
+
+        print(
+            "{:<24}{:>10}{:>12}{:>12}{:>9}".format(
+                "file", "size", "cell", "columnar", ""
+            )
+        )
+        for name, path, cell in files:
+            expected, cell_time = timed(cell, path, args.repeat)
+            result, columnar_time = timed(columnar, path, args.repeat)
+            if result != expected:
+                raise ValueError("Columnar result for %s differs" % name)
+            print(
+                "{:<24}{:>8}kB{:>10.0f}ms{:>10.0f}ms{:>8.1f}x".format(
+                    name,
+                    os.path.getsize(path) // 1024,
+                    cell_time * 1000,
+                    columnar_time * 1000,
+                    cell_time / columnar_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
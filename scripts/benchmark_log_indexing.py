@@ -0,0 +1,144 @@
+"""Compare indexing a scraper log as one document with indexing its records in chunks
+
+Writes a synthetic scraper log (--mb megabytes of info and debug records, with some
+warnings and tracebacks), then indexes it two ways:
+  - document: read the whole log and serialize it as the log field of one doc (what
+    index_logs did, not counting the search and refresh=wait_for)
+  - records: index_log_records, at ES_LOG_LEVEL=DEBUG and with the default size threshold
+and reports the time, peak Python memory, and the number and largest size of requests.
+
+Nothing is sent to Elasticsearch: requests go to a stand-in client that only counts them.
+
+Usage:
+    python -m scripts.benchmark_log_indexing [--mb 100]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+from elasticsearch import Elasticsearch
+
+from datafeeds import config
+from datafeeds.common import index
+
+
+class CountingElasticsearch(Elasticsearch):
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+        self.max_bytes = 0
+
+    def bulk(self, body, **kwargs):
+        self.requests += 1
+        self.max_bytes = max(self.max_bytes, len(body.encode("utf-8")))
+        items = body.count("\n") // 2
+        return {
+            "errors": False,
+            "items": [{"index": {"status": 201}} for _ in range(items)],
+        }
+
+
+def write_log(path: str, size: int):
+    rand = random.Random(0)
+    loggers = ["datafeeds.scrapers.ladwp_mvweb", "datafeeds.common.base"]
+    with open(path, "w") as f:
+        second = 0
+        while f.tell() < size:
+            second += 1
+            timestamp = "2021-03-12 %02d:%02d:%02d,%03d" % (
+                second // 3600 % 24,
+                second // 60 % 60,
+                second % 60,
+                rand.randrange(1000),
+            )
+            kind = rand.random()
+            if kind < 0.01:
+                f.write(
+                    "%s : ERROR : %s : failed to load page\n" % (timestamp, loggers[1])
+                )
+                f.write("Traceback (most recent call last):\n")
+                f.write(
+                    '  File "datafeeds/scrapers/ladwp_mvweb.py", line 1, in x\n' * 8
+                )
+                f.write("TimeoutException: Message: timed out\n")
+            elif kind < 0.05:
+                f.write(
+                    "%s : WARNING : %s : retrying %s\n" % (timestamp, loggers[0], kind)
+                )
+            elif kind < 0.6:
+                f.write(
+                    "%s : DEBUG : %s : found element %s\n"
+                    % (timestamp, loggers[0], "x" * rand.randrange(20, 200))
+                )
+            else:
+                f.write(
+                    "%s : INFO : %s : downloaded %s readings\n"
+                    % (timestamp, loggers[0], rand.randrange(10000))
+                )
+
+
+def as_document(path: str):
+    with open(path, "r") as f:
+        contents = f.read()
+    body = json.dumps({"log": contents})
+    return 1, len(body.encode("utf-8"))
+
+
+def as_records(path: str):
+    es = CountingElasticsearch()
+    with mock.patch.object(index, "_get_es_connection", return_value=es):
+        indexed = index.index_log_records("benchmark", 1, path)
+    return es.requests, es.max_bytes, indexed
+
+
+def measure(label: str, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        "{:<22} {:>9.1f}ms  peak {:>7.1f}MB  {:>6} requests, largest {:>7.1f}MB{}".format(
+            label,
+            elapsed * 1000,
+            peak / 1e6,
+            result[0],
+            result[1] / 1e6,
+            ", %s records" % result[2] if len(result) > 2 else "",
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--mb", type=int, default=100)
+    args = parser.parse_args()
+    logging.getLogger("elasticsearch").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "datafeeds.log")
+        write_log(path, args.mb * 1000000)
+        print("log: %.1fMB" % (os.path.getsize(path) / 1e6))
+        measure("document", as_document, path)
+        with mock.patch.object(config, "ES_LOG_LEVEL", "DEBUG"), mock.patch.object(
+            config, "ES_LOG_MAX_BYTES", os.path.getsize(path)
+        ):
+            measure("records (DEBUG)", as_records, path)
+        measure(
+            "records (>%dMB: WARNING)" % (config.ES_LOG_MAX_BYTES // 1024 // 1024),
+            as_records,
+            path,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Measure OID allocation throughput
+
+Allocates OIDs with OidGenerator.allocate_many and with repeated calls to allocate, and
+reports the time taken, the number of times the generator slept, and whether any OID
+was handed out twice. With --processes, the OIDs are split across that many processes
+(each with its own Node ID) and checked for duplicates across processes too.
+
+Node IDs are assigned here rather than from the database sequence, so this doesn't
+need a database connection.
+
+Usage:
+    python -m scripts.benchmark_oids [--count 1000000] [--batch 10000] [--processes N]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import time
+from typing import List, Tuple
+from unittest import mock
+
+from datafeeds.orm import OidGenerator
+
+
+def allocate(node_id: int, count: int, batch: int) -> Tuple[List[int], float, int]:
+    """Allocate count OIDs in batches; return the OIDs, elapsed time, and number of sleeps.
+
+    Starts from a fresh generator state, so each run needs its own Node ID.
+    """
+    OidGenerator.node_id = node_id
+    OidGenerator._clock = None
+    OidGenerator._counter = 0
+    oids: List[int] = []
+    with mock.patch("datafeeds.orm.time.sleep", wraps=time.sleep) as sleep:
+        start = time.perf_counter()
+        while len(oids) < count:
+            n = min(batch, count - len(oids))
+            if batch == 1:
+                oids.append(OidGenerator.allocate())
+            else:
+                oids.extend(OidGenerator.allocate_many(n))
+        elapsed = time.perf_counter() - start
+    return oids, elapsed, sleep.call_count
+
+
+def report(label: str, results: List[Tuple[List[int], float, int]]):
+    oids = [oid for result in results for oid in result[0]]
+    elapsed = max(result[1] for result in results)
+    sleeps = sum(result[2] for result in results)
+    print(
+        "{:<28}{:>9} OIDs {:>9.1f}ms {:>12,.0f}/s {:>4} sleeps {:>9} duplicates".format(
+            label,
+            len(oids),
+            elapsed * 1000,
+            len(oids) / elapsed,
+            sleeps,
+            len(oids) - len(set(oids)),
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--processes", type=int, default=0)
+    args = parser.parse_args()
+
+    report(
+        "allocate_many(%d)" % args.batch,
+        [allocate(3072, args.count, args.batch)],
+    )
+    report("allocate", [allocate(3073, args.count, 1)])
+
+    if args.processes > 1:
+        per_process = args.count // args.processes
+        with ProcessPoolExecutor(max_workers=args.processes) as executor:
+            results = list(
+                executor.map(
+                    allocate,
+                    [3074 + idx for idx in range(args.processes)],
+                    [per_process] * args.processes,
+                    [args.batch] * args.processes,
+                )
+            )
+        report("%d processes" % args.processes, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare per-key S3 checks with an S3Inventory for a batch of bill uploads
+
+Creates a bucket holding some existing bill pdfs, then uploads a batch of pdfs (half of
+them already present) two ways:
+  - per key: HEAD each key, and PUT it if missing (what upload_pdf_to_s3 does)
+  - inventory: list the prefix once, then upload the missing keys concurrently
+and reports the time and number of S3 requests of each kind.
+
+Runs against moto (pip install moto) by default, or an S3-compatible server such as
+MinIO with --endpoint-url. --latency adds a delay to every request, to approximate a
+round trip to S3.
+
+Usage:
+    python -m scripts.benchmark_s3_inventory [--keys 400] [--latency 20] [--endpoint-url URL]
+"""
+
+import argparse
+from collections import Counter
+import contextlib
+import hashlib
+import time
+
+import boto3
+
+from datafeeds.common.util import s3
+from datafeeds.common.util.s3 import S3Inventory, S3Upload
+
+BUCKET = "benchmark-bill-pdfs"
+
+
+def make_client(endpoint_url, latency, requests: Counter):
+    client = boto3.client("s3", endpoint_url=endpoint_url, region_name="us-east-1")
+
+    def before_call(model, **kwargs):
+        requests[model.name] += 1
+        if latency:
+            time.sleep(latency / 1000)
+
+    client.meta.events.register("before-call.s3", before_call)
+    return client
+
+
+def bill_key(idx: int) -> str:
+    return "%s.pdf" % hashlib.sha224(str(idx).encode("utf-8")).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--keys", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=20, help="ms per request")
+    parser.add_argument("--endpoint-url", help="S3-compatible server, eg MinIO")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        backend = contextlib.nullcontext()
+    else:
+        from moto import mock_s3
+
+        backend = mock_s3()
+
+    with backend:
+        requests: Counter = Counter()
+        s3._client = make_client(args.endpoint_url, 0, requests)
+        s3._client.create_bucket(Bucket=BUCKET)
+        for idx in range(0, args.keys, 2):
+            s3._client.put_object(Bucket=BUCKET, Key=bill_key(idx), Body=b"%PDF")
+        uploads = [S3Upload(bill_key(idx), b"%PDF") for idx in range(args.keys)]
+
+        for label in ["per key", "inventory"]:
+            # remove the keys uploaded by the previous run
+            for idx in range(1, args.keys, 2):
+                s3._client.delete_object(Bucket=BUCKET, Key=bill_key(idx))
+            requests = Counter()
+            s3._client = make_client(args.endpoint_url, args.latency, requests)
+            inventory = S3Inventory(BUCKET)
+
+            start = time.perf_counter()
+            if label == "per key":
+                for upload in uploads:
+                    if not inventory.exists(upload.key):
+                        inventory.upload(upload)
+            else:
+                inventory.list_prefix()
+                inventory.ensure_uploaded(uploads, max_workers=args.workers)
+            elapsed = time.perf_counter() - start
+
+            print(
+                "{:<10}{:>5} keys {:>9.1f}ms  {}".format(
+                    label,
+                    len(uploads),
+                    elapsed * 1000,
+                    ", ".join("%s=%s" % item for item in sorted(requests.items())),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,542 @@
+"""Time the hot paths of a scraper run, and compare them with a saved baseline
+
+Each case times one step of a run over the test fixtures (or synthetic data shaped like
+them): Urjanet transformers, Green Button parsing, PDF bill parsers, Timeline
+serialization, interval CSV and spreadsheet parsing, OID allocation, S3 uploads and run
+archives (with an in-memory S3), log indexing (without Elasticsearch), and, against the
+test database (see test_utils.init_test_db), interval_transform, process_incoming_bills,
+MeterReading.merge_readings and Meter.interval_arrays. Database cases run in a savepoint
+that's rolled back after each pass, so they can be repeated; use --no-db to skip them.
+The other scripts/benchmark_*.py scripts compare an implementation with the one it
+replaced, at configurable sizes.
+
+Each case is run --repeat times after a warmup pass; the minimum and median times are
+reported. --save writes the results to a JSON baseline, and --compare checks the results
+against one, exiting with status 1 if any case's minimum time is more than --threshold
+times the baseline. Times depend on the machine, so compare with a baseline saved on the
+same machine (eg save one from the main branch, then compare a change against it); the
+CircleCI benchmark job does this with master. scripts/benchmark_baseline.json is a
+baseline of every case from a development machine, for reference.
+
+Usage:
+    python -m scripts.benchmark_suite [--repeat 5] [--filter urjanet] [--no-db]
+        [--save scripts/benchmark_baseline.json]
+        [--compare scripts/benchmark_baseline.json] [--threshold 1.3]
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+import glob
+from io import BytesIO
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, NamedTuple
+from unittest import mock
+
+FIXTURES = os.path.join(
+    os.path.dirname(__file__), "..", "datafeeds", "scrapers", "tests", "fixtures"
+)
+
+
+class Case(NamedTuple):
+    name: str
+    # called once with a temporary directory; returns the function to time
+    setup: Callable[[str], Callable[[], Any]]
+    requires_db: bool
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, requires_db: bool = False):
+    """Register a benchmark case: a setup function that returns the function to time."""
+
+    def decorator(setup):
+        CASES[name] = Case(name, setup, requires_db)
+        return setup
+
+    return decorator
+
+
+def savepoint(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """Run fn in a savepoint, and roll it back, so that it can be run again."""
+    from datafeeds import db
+
+    def wrapper():
+        nested = db.session.begin_nested()
+        try:
+            fn()
+            db.session.flush()
+        finally:
+            nested.rollback()
+
+    return wrapper
+
+
+@case("urjanet_transformers")
+def urjanet_transformers(tmp: str):
+    from datafeeds.urjanet.scripts.benchmark_transformers import (
+        FIXTURE_TRANSFORMERS,
+        load_inputs,
+    )
+
+    inputs = load_inputs()
+
+    def run():
+        for name, fixtures in inputs.items():
+            transformer = FIXTURE_TRANSFORMERS[name]()
+            for urja_data in fixtures:
+                transformer.urja_to_gridium(urja_data)
+
+    return run
+
+
+def _green_button_file(tmp: str) -> str:
+    from datafeeds.scrapers.tests import green_button_feed as feed
+
+    # 4 customers with 2 usage points each, each with 30 days of readings and 3 bills
+    # (parse time grows faster than the number of entries, so keep this modest)
+    entries = [feed.reading_type()]
+    for customer in range(4):
+        for point in ["P1", "P2"]:
+            for block in range(30):
+                entries.append(feed.interval_block(str(customer), point, block, 900))
+            for summary in range(3):
+                entries.append(feed.usage_summary(str(customer), point, summary))
+    path = os.path.join(tmp, "green_button.xml")
+    with open(path, "w") as f:
+        f.write(feed.feed(entries))
+    return path
+
+
+@case("green_button_parse_multi")
+def green_button_parse_multi(tmp: str):
+    from datafeeds.scrapers.socalgas import green_button_parser as gbparser
+
+    path = _green_button_file(tmp)
+    return lambda: gbparser.parse_multi(path)
+
+
+@case("green_button_parse_workers")
+def green_button_parse_workers(tmp: str):
+    from datafeeds.scrapers.socalgas import green_button_parser as gbparser
+
+    # a usage point per worker process (see scripts/benchmark_green_button.py)
+    path = _green_button_file(tmp)
+    return lambda: gbparser.parse_multi(path, workers=2)
+
+
+@case("ladwp_bill_pdf")
+def ladwp_bill_pdf(tmp: str):
+    from datafeeds.scrapers import ladwp_bill_pdf
+
+    # parse_pdf writes the text of the pdf next to it; keep that out of the fixtures
+    pdfs = []
+    for filename, meter_number, commodity in [
+        ("ladwp-single.pdf", "PMY2V00231-00001054", "kw"),
+        ("ladwp-multi.pdf", "APMYD00209-00069098", "kw"),
+        ("ladwp-water-202010.pdf", "9479723015", "ccf"),
+    ]:
+        path = os.path.join(tmp, filename)
+        shutil.copy(os.path.join(FIXTURES, filename), path)
+        pdfs.append((path, meter_number, commodity))
+
+    def run():
+        with mock.patch.object(ladwp_bill_pdf, "notify_rebill"):
+            for args in pdfs:
+                ladwp_bill_pdf.parse_pdf(*args)
+
+    return run
+
+
+@case("keller_bill_pdf")
+def keller_bill_pdf(tmp: str):
+    from datafeeds.scrapers.keller.parsers import parse_bill_pdf
+
+    pdfs = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "city_of_keller_*.pdf"))):
+        with open(path, "rb") as f:
+            pdfs.append(f.read())
+
+    def run():
+        for data in pdfs:
+            parse_bill_pdf(BytesIO(data))
+
+    return run
+
+
+@case("pacific_power_bill_pdf")
+def pacific_power_bill_pdf(tmp: str):
+    from datafeeds.parsers.pacific_power import parse_bill_pdf
+
+    pdfs = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "pacific_power_test_*.pdf"))):
+        with open(path, "rb") as f:
+            pdfs.append(f.read())
+
+    def run():
+        for data in pdfs:
+            parse_bill_pdf(BytesIO(data), "13714552")
+
+    return run
+
+
+@case("timeline_serialize")
+def timeline_serialize(tmp: str):
+    from datafeeds.common.timeline import Timeline
+
+    # a year of 15-minute readings
+    start = date(2020, 1, 1)
+    end = date(2020, 12, 31)
+
+    def run():
+        timeline = Timeline(start, end)
+        dt = datetime(start.year, start.month, start.day)
+        while dt.date() <= end:
+            timeline.insert(dt, 1.5)
+            dt += timedelta(minutes=15)
+        timeline.serialize()
+
+    return run
+
+
+@case("interval_csv")
+def interval_csv(tmp: str):
+    from datafeeds.common.timeline import Timeline
+    from scripts import benchmark_interval_csv as bench
+
+    # a year of readings in the MV-Web and SCE formats (see scripts/benchmark_interval_csv.py)
+    mvweb = os.path.join(tmp, "mvweb.csv")
+    bench.write_mvweb(mvweb, 365)
+    sce = os.path.join(tmp, "sce.csv")
+    bench.write_sce(sce, 365)
+
+    def run():
+        bench.columnar_mvweb(mvweb, Timeline(date(2019, 1, 1), date(2020, 12, 31)))
+        bench.columnar_sce(sce, Timeline(date(2019, 1, 1), date(2020, 12, 31)))
+
+    return run
+
+
+@case("interval_sheet")
+def interval_sheet(tmp: str):
+    from datafeeds.common.timeline import Timeline
+    from scripts import benchmark_interval_sheet as bench
+
+    # a year of 15 minute readings in a Bloom extract (see scripts/benchmark_interval_sheet.py)
+    path = os.path.join(tmp, "extract.xlsx")
+    bench.write_extract(path, 365)
+
+    return lambda: bench.columnar(path, Timeline(date(2020, 1, 1), date(2020, 12, 31)))
+
+
+@case("oid_allocate_many")
+def oid_allocate_many(tmp: str):
+    from datafeeds.orm import OidGenerator
+
+    def run():
+        # from a fresh generator state each time, so repeats don't run ahead of the clock
+        with mock.patch.multiple(OidGenerator, node_id=3072, _clock=None, _counter=0):
+            for _ in range(10):
+                OidGenerator.allocate_many(10000)
+
+    return run
+
+
+@case("oid_allocate")
+def oid_allocate(tmp: str):
+    from datafeeds.orm import OidGenerator
+
+    def run():
+        with mock.patch.multiple(OidGenerator, node_id=3072, _clock=None, _counter=0):
+            for _ in range(10000):
+                OidGenerator.allocate()
+
+    return run
+
+
+@case("s3_inventory_upload")
+def s3_inventory_upload(tmp: str):
+    from datafeeds.common.tests.fake_s3 import FakeS3Client
+    from datafeeds.common.util import s3
+
+    # a batch of 400 bill pdfs, half of them already uploaded (see
+    # scripts/benchmark_s3_inventory.py to include request latency)
+    keys = ["%04d.pdf" % idx for idx in range(400)]
+    uploads = [s3.S3Upload(key, b"%PDF") for key in keys]
+
+    def run():
+        with mock.patch.object(s3, "_client", FakeS3Client(keys[::2])):
+            inventory = s3.S3Inventory("bills")
+            inventory.list_prefix()
+            inventory.ensure_uploaded(uploads)
+
+    return run
+
+
+@case("archive_directory")
+def archive_directory(tmp: str):
+    from datafeeds.common import archive
+    from datafeeds.common.tests.fake_s3 import FakeS3Client
+    from datafeeds.common.util import s3
+    from scripts import benchmark_archive as bench
+
+    # a browser scraper's working directory (see scripts/benchmark_archive.py)
+    client = FakeS3Client()
+    workdir = os.path.join(tmp, "workdir")
+    uploaded: Dict[int, Any] = {}
+    with mock.patch.multiple(s3, _client=client, _inventories={}, _uploaded=uploaded):
+        bench.make_workdir(workdir, 20)
+
+    def run():
+        with mock.patch.multiple(
+            s3, _client=FakeS3Client(), _inventories={}, _uploaded=dict(uploaded)
+        ):
+            archive.archive_directory(workdir, "archive", "benchmark")
+
+    return run
+
+
+@case("log_index_records")
+def log_index_records(tmp: str):
+    from datafeeds import config
+    from datafeeds.common import index
+    from scripts import benchmark_log_indexing as bench
+
+    # a 10MB log, indexed at DEBUG (see scripts/benchmark_log_indexing.py)
+    path = os.path.join(tmp, "datafeeds.log")
+    bench.write_log(path, 10 * 1000 * 1000)
+
+    def run():
+        with mock.patch.object(
+            index, "_get_es_connection", return_value=bench.CountingElasticsearch()
+        ), mock.patch.multiple(
+            config, ES_LOG_LEVEL="DEBUG", ES_LOG_MAX_BYTES=os.path.getsize(path)
+        ):
+            index.index_log_records("benchmark", 1, path)
+
+    return run
+
+
+def _readings(first: date, days: int, value: float) -> Dict[str, List[float]]:
+    return {
+        (first + timedelta(days=day)).strftime("%Y-%m-%d"): [
+            value + idx % 7 for idx in range(96)
+        ]
+        for day in range(days)
+    }
+
+
+def _add_readings(meter_oid: int, readings: Dict[str, List[float]]):
+    from datafeeds import db
+    from datafeeds.models.meter import MeterReading
+
+    db.session.add_all(MeterReading.from_json(meter_oid, readings))
+    db.session.flush()
+
+
+@case("interval_transform", requires_db=True)
+def interval_transform(tmp: str):
+    from datafeeds.common import interval_transform, test_utils
+
+    _, meters = test_utils.create_meters()
+    meter_oid = meters[0].oid
+    # 60 days of readings, with no optional transforms (as scrapers call it)
+    readings = _readings(date.today() - timedelta(days=60), 60, 10.0)
+
+    return lambda: interval_transform.transform(
+        [], None, "benchmark", meter_oid, readings
+    )
+
+
+@case("merge_readings", requires_db=True)
+def merge_readings(tmp: str):
+    from datafeeds.common import test_utils
+    from datafeeds.models.meter import MeterReading
+
+    _, meters = test_utils.create_meters()
+    meter = meters[0]
+    # a year of new readings; half of them update existing readings
+    first = date.today() - timedelta(days=365)
+    _add_readings(meter.oid, _readings(first, 180, 1.0))
+    readings = _readings(first, 365, 2.0)
+
+    return savepoint(
+        lambda: MeterReading.merge_readings(MeterReading.from_json(meter.oid, readings))
+    )
+
+
+@case("interval_arrays", requires_db=True)
+def interval_arrays(tmp: str):
+    from datafeeds.common import test_utils
+
+    _, meters = test_utils.create_meters()
+    meter = meters[0]
+    # a year of 15 minute readings, with the query included
+    first = date.today() - timedelta(days=365)
+    _add_readings(meter.oid, _readings(first, 365, 1.0))
+    start = datetime.combine(first, datetime.min.time())
+
+    return lambda: meter.interval_arrays(start, start + timedelta(days=365))
+
+
+@case("process_incoming_bills", requires_db=True)
+def process_incoming_bills(tmp: str):
+    from datafeeds import db
+    from datafeeds.common import test_utils
+    from datafeeds.models.bill import Bill, process_incoming_bills
+
+    _, meters = test_utils.create_meters()
+    service = meters[0].service
+    # five years of monthly bills; replace the last year, and add some new bills
+    first = date.today() - timedelta(days=5 * 360 + 90)
+
+    def bills(start: int, count: int, cost: float) -> List[Bill]:
+        return [
+            Bill(
+                service=service,
+                initial=first + timedelta(days=30 * idx),
+                closing=first + timedelta(days=30 * idx + 29),
+                cost=cost,
+                used=1000.0,
+                peak=10.0,
+            )
+            for idx in range(start, start + count)
+        ]
+
+    db.session.add_all(bills(0, 60, 100.0))
+    db.session.flush()
+
+    return savepoint(lambda: process_incoming_bills(service, bills(48, 15, 200.0)))
+
+
+def run_case(test: Case, repeat: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        return _time(test.setup(tmp), repeat)
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": round(min(times), 6),
+        "median": round(statistics.median(times), 6),
+        "repeat": repeat,
+    }
+
+
+def metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Return the names of cases that are more than threshold times slower than baseline."""
+    regressions = []
+    for name, result in results.items():
+        saved = baseline["results"].get(name)
+        if not saved:
+            print("{:<26} no baseline".format(name))
+            continue
+        ratio = result["min"] / saved["min"]
+        regressed = ratio > threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            "{:<26} {:>9.1f}ms  baseline {:>9.1f}ms  {:>5.2f}x{}".format(
+                name,
+                result["min"] * 1000,
+                saved["min"] * 1000,
+                ratio,
+                "  REGRESSION" if regressed else "",
+            )
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", help="only run cases with this in their name")
+    parser.add_argument("--no-db", action="store_true", help="skip database cases")
+    parser.add_argument("--save", help="write results to this baseline file")
+    parser.add_argument("--compare", help="compare results with this baseline file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.3,
+        help="a case regresses if its time is more than this times the baseline",
+    )
+    args = parser.parse_args()
+    # per-reading and per-page info logs would swamp the output
+    logging.disable(logging.INFO)
+
+    cases = [
+        test
+        for test in CASES.values()
+        if (not args.filter or args.filter in test.name)
+        and not (args.no_db and test.requires_db)
+    ]
+    if any(test.requires_db for test in cases):
+        from datafeeds import db
+        from datafeeds.common import test_utils
+
+        test_utils.init_test_db()
+
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for test in cases:
+            results[test.name] = run_case(test, args.repeat)
+            print(
+                "{:<26} min {:>9.1f}ms  median {:>9.1f}ms".format(
+                    test.name,
+                    results[test.name]["min"] * 1000,
+                    results[test.name]["median"] * 1000,
+                )
+            )
+    finally:
+        if any(test.requires_db for test in cases):
+            db.session.rollback()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"metadata": metadata(), "results": results}, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print("\ncompared with %s (%s)" % (args.compare, baseline["metadata"]))
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,25 +7,37 @@ from datafeeds.models import (
     SnapmeterMeterDataSource as MeterDataSource,
 )
 from datafeeds.models.account import SnapmeterAccount
+from datafeeds.models.datasource import decrypt_credentials
 from datafeeds.models.meter import Meter, Building
 from datafeeds.models.utility_service import UtilityService
 
 
-parser = argparse.ArgumentParser("Get credentials for a datasource")
-parser.add_argument("datasource", type=int)
+parser = argparse.ArgumentParser("Get credentials for datasources")
+parser.add_argument("datasource", type=int, nargs="+")
 
 
 def main():
     args = parser.parse_args()
-    mds = db.session.query(MeterDataSource).get(args.datasource)
-    if not mds:
-        print("Meter datasource %s not found" % args.datasource)
-        return
-    if not mds.account_data_source:
-        print("Account datasource for meter datasource %s not found" % args.datasource)
-    print(
-        "%s %s" % (mds.account_data_source.username, mds.account_data_source.password)
+    data_sources = (
+        db.session.query(MeterDataSource)
+        .filter(MeterDataSource.oid.in_(args.datasource))
+        .all()
     )
+    # decrypt them all at once
+    decrypt_credentials(data_sources)
+    by_oid = {mds.oid: mds for mds in data_sources}
+    for oid in args.datasource:
+        mds = by_oid.get(oid)
+        if not mds:
+            print("Meter datasource %s not found" % oid)
+            continue
+        if not mds.account_data_source:
+            print("Account datasource for meter datasource %s not found" % oid)
+            continue
+        print(
+            "%s %s %s"
+            % (oid, mds.account_data_source.username, mds.account_data_source.password)
+        )
 
 
 if __name__ == "__main__":